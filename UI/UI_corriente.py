@@ -20,7 +20,6 @@ from PyQt4 import QtCore, QtGui
 from numpy import all
 from scipy.special import erf
 
-from tools.UI_psychrometry import PsychroInput
 from lib.corriente import Corriente, Solid, PsyStream
 from lib import unidades, config
 from lib.thread import Evaluate
@@ -95,6 +94,12 @@ class Ui_corriente(QtGui.QWidget):
             QtGui.QIcon(os.environ["pychemqt"] + "/images/button/helpAbout.png"),
             QtGui.QApplication.translate("pychemqt", "Properties"))
 
+        # Phase envelope
+        self.pageEnvelope = StreamEnvelope()
+        self.toolBox.addTab(
+            self.pageEnvelope,
+            QtGui.QApplication.translate("pychemqt", "Phase envelope"))
+
         # Notes
         self.PageNotas = texteditor.TextEditor()
         self.toolBox.addTab(
@@ -131,6 +136,7 @@ class Ui_corriente(QtGui.QWidget):
         self.pageSolids.setSolido(self.corriente.solido)
         self.PageNotas.setText(self.corriente.notas)
         self.pageProperties.fill(self.corriente)
+        self.pageEnvelope.setStream(self.corriente)
         if isinstance(self, QtGui.QDialog):
             self.status.setState(self.corriente.status, self.corriente.msg)
         self.semaforo.release(1)
@@ -418,6 +424,8 @@ class PsychroDefinition(QtGui.QWidget):
         super(PsychroDefinition, self).__init__(parent)
         layout = QtGui.QGridLayout(self)
 
+        # Imported here to not load matplotlib with the equipments
+        from tools.UI_psychrometry import PsychroInput
         self.inputs = PsychroInput()
         self.inputs.stateChanged.connect(partial(self.calculo, "state"))
         layout.addWidget(self.inputs, 1, 1, 1, 2)
@@ -675,6 +683,79 @@ class StreamProperties(QtGui.QTableWidget):
                 self.Tension.setValue(stream.Liquido.epsilon)
 
 
+class StreamEnvelope(QtGui.QWidget):
+    """Widget to show the phase envelope of stream composition, it's only
+    calculated on demand"""
+    def __init__(self, stream=None, parent=None):
+        super(StreamEnvelope, self).__init__(parent)
+        self.stream = stream
+        layout = QtGui.QGridLayout(self)
+        self.buttonCalculate = QtGui.QPushButton(
+            QtGui.QApplication.translate("pychemqt", "Calculate"))
+        self.buttonCalculate.clicked.connect(self.calculate)
+        layout.addWidget(self.buttonCalculate, 0, 0)
+        layout.addWidget(QtGui.QLabel(
+            QtGui.QApplication.translate("pychemqt", "Temperature")), 0, 2)
+        layout.addWidget(QtGui.QLabel(
+            QtGui.QApplication.translate("pychemqt", "Pressure")), 0, 3)
+
+        self.points = {}
+        labels = [
+            ("critical", QtGui.QApplication.translate("pychemqt", "Critical point")),
+            ("cricondenbar", QtGui.QApplication.translate("pychemqt", "Cricondenbar")),
+            ("cricondentherm", QtGui.QApplication.translate("pychemqt", "Cricondentherm"))]
+        for i, (key, label) in enumerate(labels):
+            layout.addWidget(QtGui.QLabel(label), i+1, 1)
+            T = Entrada_con_unidades(unidades.Temperature, readOnly=True)
+            layout.addWidget(T, i+1, 2)
+            P = Entrada_con_unidades(unidades.Pressure, readOnly=True)
+            layout.addWidget(P, i+1, 3)
+            self.points[key] = (T, P)
+        layout.addItem(QtGui.QSpacerItem(
+            10, 10, QtGui.QSizePolicy.Expanding, QtGui.QSizePolicy.Fixed), 0, 4)
+
+        from lib.plot import mpl
+        self.plot = mpl()
+        layout.addWidget(self.plot, 4, 0, 1, 5)
+
+    def setStream(self, stream):
+        self.stream = stream
+        self.buttonCalculate.setEnabled(bool(stream and stream.status == 1))
+        self.plot.axes2D.clear()
+        self.plot.draw()
+        for T, P in self.points.values():
+            T.clear()
+            P.clear()
+
+    def calculate(self):
+        QtGui.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            envelope = self.stream.envelope()
+        finally:
+            QtGui.QApplication.restoreOverrideCursor()
+
+        T = [unidades.Temperature(t).config() for t in envelope["T"]]
+        P = [unidades.Pressure(p).config() for p in envelope["P"]]
+        self.plot.axes2D.clear()
+        self.plot.axes2D.plot(T, P, "b-")
+        for key, marker in (("critical", "ro"), ("cricondenbar", "g^"),
+                            ("cricondentherm", "g>")):
+            entryT, entryP = self.points[key]
+            if envelope[key]:
+                t = unidades.Temperature(envelope[key][0])
+                p = unidades.Pressure(envelope[key][1])
+                entryT.setValue(t)
+                entryP.setValue(p)
+                self.plot.axes2D.plot([t.config()], [p.config()], marker)
+            else:
+                entryT.clear()
+                entryP.clear()
+        self.plot.axes2D.set_xlabel("T, %s" % unidades.Temperature.text())
+        self.plot.axes2D.set_ylabel("P, %s" % unidades.Pressure.text())
+        self.plot.axes2D.grid(True)
+        self.plot.draw()
+
+
 class SolidDefinition(QtGui.QWidget):
     """Widget for solids edit/view"""
     Changed = QtCore.pyqtSignal(Solid)
@@ -7,7 +7,7 @@ from functools import partial
 from PyQt4 import QtCore, QtGui
 from matplotlib.backends.backend_qt4agg import FigureCanvasQTAgg
 #import matplotlib.gridspec as gridspec #necesita matplotlib >=1.0
-from pylab import Figure
+from matplotlib.figure import Figure
 from numpy import transpose
 
 from lib.unidades import Length, VolFlow, Power
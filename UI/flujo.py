@@ -20,10 +20,9 @@ from lib.thread import WaitforClick
 from lib.config import Preferences
 from lib.corriente import Corriente
 from UI import texteditor, UI_corriente
-from UI.plots import Plot_Distribucion
 from UI.widgets import createAction, Table_Graphics, PathConfig
 from tools.UI_Preferences import ConfLine
-from equipment import *
+from equipment import UI_equipments
 
 
 # Value for mouse wheel zoom
@@ -397,6 +396,11 @@ class StreamItem(GeometricItem, QtGui.QGraphicsPathItem, GraphicsEntity):
 #            if isinstance(self.scene().project.getDownToStream(self.id), flux.Mixer):
 #                kwargs["id_entrada"]=self.scene().project.streams[self.id][3]+1
 #            self.scene().project.getDownToStream(self.id)(**kwargs)
+            self.updateStatus()
+
+    def updateStatus(self):
+            """Update the stream color with its calculation status"""
+            corriente=self.corriente
             pen=self.pen()
             if corriente.status==1:
                 pen.setColor(QtGui.QColor("blue"))
@@ -552,6 +556,7 @@ class StreamItem(GeometricItem, QtGui.QGraphicsPathItem, GraphicsEntity):
 
     def solidFit(self):
         if self.corriente.solido:
+            from UI.plots import Plot_Distribucion
             dialog=Plot_Distribucion(self.id, self.corriente.solido)
             self.scene().parent().currentMdi.addSubWindow(dialog)
             dialog.show()
@@ -677,8 +682,9 @@ class EquipmentItem(QtSvg.QGraphicsSvgItem, GraphicsEntity):
             if dialog.exec_():
                 self.scene().project.setItem(self.id, dialog.Equipment)
 #                self.up[0].setCorriente(dialog.Equipment.entrada)
-                for i, corriente in enumerate(dialog.Equipment.salida):
-                    self.down[i].setCorriente(corriente)
+                # The project propagate the output streams, only repaint
+                for stream in self.down:
+                    stream.updateStatus()
 
                 self.itemChange(QtGui.QGraphicsItem.ItemPositionChange, 0)
         else:
@@ -3,26 +3,32 @@
 
 from ConfigParser import ConfigParser
 import os, time, platform, sys
+import importlib
 from functools import partial
 
 from PyQt4 import QtCore, QtGui
-from scipy import arange
-from scipy.optimize import fsolve
 
-from UI import texteditor, newComponent, flujo, wizard, charts, plots, viewComponents
+from UI import texteditor, flujo
 from UI.widgets import createAction, ClickableLabel, TreeEquipment, FlowLayout, Tabla
 from lib.config import conf_dir, getComponents
 from lib.project import Project
 from lib.EoS import K, H
-from lib import unidades, mEoS
-from equipment import *
-from tools import UI_confComponents, UI_Preferences, UI_confTransport, UI_confThermo, UI_confUnits, UI_confResolution, UI_databank, UI_Tables, UI_unitConverter, UI_steamTables, UI_psychrometry, costIndex, doi, dependences
-from UI.conversor_unidades import moneda
+from lib import unidades
+from equipment import UI_equipments
+
+# The dialogs of tools, wizard, plots and charts are imported when they are
+# used the first time to speed up the start
 
 __version__ = "0.1.0"
 
-other_window = (plots.Binary_distillation, UI_Tables.TablaMEoS,
-                UI_Tables.PlotMEoS)
+
+def other_window():
+    """Return the class of windows saved in project files apart of PFD, the
+    index is saved in file so don't change the order"""
+    from tools import UI_Tables
+    from UI import plots
+    return (plots.Binary_distillation, UI_Tables.TablaMEoS,
+            UI_Tables.PlotMEoS)
 
 
 class TabWidget(QtGui.QTabWidget):
@@ -87,10 +93,10 @@ class UI_pychemqt(QtGui.QMainWindow):
         ExitAction = createAction(QtGui.QApplication.translate("pychemqt", "&Exit"), self.closeEvent, QtGui.QKeySequence.Quit, os.environ["pychemqt"]+"/images/button/exit", QtGui.QApplication.translate("pychemqt", "Salir de pychemqt"), parent=self)
 
         self.actionWizard = createAction(QtGui.QApplication.translate("pychemqt", "Wizard"), icon=os.environ["pychemqt"]+"/images/button/wizard", slot=self.wizard, tip=QtGui.QApplication.translate("pychemqt", "Launch configuration wizard"), parent=self)
-        self.actionComponentList = createAction(QtGui.QApplication.translate("pychemqt", "Components list"), slot=partial(self.dialogConfig, UI_confComponents), tip=QtGui.QApplication.translate("pychemqt", "Defining componente list dialog"), parent=self)
-        self.actionThermo = createAction(QtGui.QApplication.translate("pychemqt", "Thermodynamic properties"), slot=partial(self.dialogConfig, UI_confThermo), tip=QtGui.QApplication.translate("pychemqt", "Defining thermodynamic properties methods"), parent=self)
-        self.actionTransporte = createAction(QtGui.QApplication.translate("pychemqt", "Transport properties"), slot=partial(self.dialogConfig, UI_confTransport), tip=QtGui.QApplication.translate("pychemqt", "Defining transport properties methods"), parent=self)
-        self.actionUnidades = createAction(QtGui.QApplication.translate("pychemqt", "Units"), slot=partial(self.dialogConfig, UI_confUnits), tip=QtGui.QApplication.translate("pychemqt", "Defining preferred units"), parent=self)
+        self.actionComponentList = createAction(QtGui.QApplication.translate("pychemqt", "Components list"), slot=partial(self.dialogConfig, "UI_confComponents"), tip=QtGui.QApplication.translate("pychemqt", "Defining componente list dialog"), parent=self)
+        self.actionThermo = createAction(QtGui.QApplication.translate("pychemqt", "Thermodynamic properties"), slot=partial(self.dialogConfig, "UI_confThermo"), tip=QtGui.QApplication.translate("pychemqt", "Defining thermodynamic properties methods"), parent=self)
+        self.actionTransporte = createAction(QtGui.QApplication.translate("pychemqt", "Transport properties"), slot=partial(self.dialogConfig, "UI_confTransport"), tip=QtGui.QApplication.translate("pychemqt", "Defining transport properties methods"), parent=self)
+        self.actionUnidades = createAction(QtGui.QApplication.translate("pychemqt", "Units"), slot=partial(self.dialogConfig, "UI_confUnits"), tip=QtGui.QApplication.translate("pychemqt", "Defining preferred units"), parent=self)
         self.actioncostIndex = createAction(QtGui.QApplication.translate("pychemqt", "&Cost Index"), slot=self.costos, tip=QtGui.QApplication.translate("pychemqt", "Defining cost index"), parent=self)
         self.actionPreferencias = createAction(QtGui.QApplication.translate("pychemqt", "&Preferences"), slot=self.Preferencias, icon=os.environ["pychemqt"]+"/images/button/configure", shortcut=QtGui.QKeySequence.Preferences, tip=QtGui.QApplication.translate("pychemqt", "Defining general preferences"), parent=self)
 
@@ -206,19 +212,19 @@ class UI_pychemqt(QtGui.QMainWindow):
         l2.addWidget(botonCorriente)
         actionSalida, botonSalida=createAction(icon=os.environ["pychemqt"]+"/images/equipment/out", text=QtGui.QApplication.translate("pychemqt", "Output"), slot=partial(self.addItem, "out"), button=True, parent=toolboxContenido)
         l2.addWidget(botonSalida)
-        actionDivider, botonDivider=createAction(icon=os.environ["pychemqt"]+"/images/equipment/divider", text=QtGui.QApplication.translate("pychemqt", "Divider"), slot=partial(self.addEquipment, UI_divider), button=True, parent=toolboxContenido)
+        actionDivider, botonDivider=createAction(icon=os.environ["pychemqt"]+"/images/equipment/divider", text=QtGui.QApplication.translate("pychemqt", "Divider"), slot=partial(self.addEquipment, "UI_divider"), button=True, parent=toolboxContenido)
         l2.addWidget(botonDivider)
-        actionValve, botonValve=createAction(icon=os.environ["pychemqt"]+"/images/equipment/valve", text=QtGui.QApplication.translate("pychemqt", "Valve"), slot=partial(self.addEquipment, UI_valve), button=True, parent=toolboxContenido)
+        actionValve, botonValve=createAction(icon=os.environ["pychemqt"]+"/images/equipment/valve", text=QtGui.QApplication.translate("pychemqt", "Valve"), slot=partial(self.addEquipment, "UI_valve"), button=True, parent=toolboxContenido)
         l2.addWidget(botonValve)
-        actionMixer, botonMixer=createAction(icon=os.environ["pychemqt"]+"/images/equipment/mixer", text=QtGui.QApplication.translate("pychemqt", "Mixer"), slot=partial(self.addEquipment, UI_mixer), button=True, parent=toolboxContenido)
+        actionMixer, botonMixer=createAction(icon=os.environ["pychemqt"]+"/images/equipment/mixer", text=QtGui.QApplication.translate("pychemqt", "Mixer"), slot=partial(self.addEquipment, "UI_mixer"), button=True, parent=toolboxContenido)
         l2.addWidget(botonMixer)
-        actionCompresor, botonCompresor=createAction(icon=os.environ["pychemqt"]+"/images/equipment/compressor", text=QtGui.QApplication.translate("pychemqt", "Compressor"), slot=partial(self.addEquipment, UI_compressor), button=True, parent=toolboxContenido)
+        actionCompresor, botonCompresor=createAction(icon=os.environ["pychemqt"]+"/images/equipment/compressor", text=QtGui.QApplication.translate("pychemqt", "Compressor"), slot=partial(self.addEquipment, "UI_compressor"), button=True, parent=toolboxContenido)
         l2.addWidget(botonCompresor)
-        actionTurbine, botonTurbine=createAction(icon=os.environ["pychemqt"]+"/images/equipment/turbine", text=QtGui.QApplication.translate("pychemqt", "Turbine"), slot=partial(self.addEquipment, UI_turbine), button=True, parent=toolboxContenido)
+        actionTurbine, botonTurbine=createAction(icon=os.environ["pychemqt"]+"/images/equipment/turbine", text=QtGui.QApplication.translate("pychemqt", "Turbine"), slot=partial(self.addEquipment, "UI_turbine"), button=True, parent=toolboxContenido)
         l2.addWidget(botonTurbine)
-        actionPump, botonPump=createAction(icon=os.environ["pychemqt"]+"/images/equipment/pump", text=QtGui.QApplication.translate("pychemqt", "Pump"), slot=partial(self.addEquipment, UI_pump), button=True, parent=toolboxContenido)
+        actionPump, botonPump=createAction(icon=os.environ["pychemqt"]+"/images/equipment/pump", text=QtGui.QApplication.translate("pychemqt", "Pump"), slot=partial(self.addEquipment, "UI_pump"), button=True, parent=toolboxContenido)
         l2.addWidget(botonPump)
-        actionPipe, botonPipe=createAction(icon=os.environ["pychemqt"]+"/images/equipment/pipe", text=QtGui.QApplication.translate("pychemqt", "Pipe"), slot=partial(self.addEquipment, UI_pipe), button=True, parent=toolboxContenido)
+        actionPipe, botonPipe=createAction(icon=os.environ["pychemqt"]+"/images/equipment/pipe", text=QtGui.QApplication.translate("pychemqt", "Pipe"), slot=partial(self.addEquipment, "UI_pipe"), button=True, parent=toolboxContenido)
         l2.addWidget(botonPipe)
         layouttoolbox.addItem(l2)
         layouttoolbox.addStretch(1)
@@ -227,22 +233,22 @@ class UI_pychemqt(QtGui.QMainWindow):
         txt.setAlignment(QtCore.Qt.AlignCenter)
         layouttoolbox.addWidget(txt)
         l3=FlowLayout()
-        actionTorreFUG, botonTorreFUG=createAction(icon=os.environ["pychemqt"]+"/images/equipment/columnFUG", text=QtGui.QApplication.translate("pychemqt", "Distillation tower (method FUG)"), slot=partial(self.addEquipment, UI_columnFUG), button=True, parent=toolboxContenido)
+        actionTorreFUG, botonTorreFUG=createAction(icon=os.environ["pychemqt"]+"/images/equipment/columnFUG", text=QtGui.QApplication.translate("pychemqt", "Distillation tower (method FUG)"), slot=partial(self.addEquipment, "UI_columnFUG"), button=True, parent=toolboxContenido)
         l3.addWidget(botonTorreFUG)
-        actionFlash, botonFlash=createAction(icon=os.environ["pychemqt"]+"/images/equipment/flash", text=QtGui.QApplication.translate("pychemqt", "Flash"), slot=partial(self.addEquipment, UI_flash), button=True, parent=toolboxContenido)
+        actionFlash, botonFlash=createAction(icon=os.environ["pychemqt"]+"/images/equipment/flash", text=QtGui.QApplication.translate("pychemqt", "Flash"), slot=partial(self.addEquipment, "UI_flash"), button=True, parent=toolboxContenido)
         l3.addWidget(botonFlash)
-        actionTorre, botonTorre=createAction(icon=os.environ["pychemqt"]+"/images/equipment/tower", text=QtGui.QApplication.translate("pychemqt", "Distillation tower (exact method)"), slot=partial(self.addEquipment, UI_tower), button=True, parent=toolboxContenido)
+        actionTorre, botonTorre=createAction(icon=os.environ["pychemqt"]+"/images/equipment/tower", text=QtGui.QApplication.translate("pychemqt", "Distillation tower (exact method)"), slot=partial(self.addEquipment, "UI_tower"), button=True, parent=toolboxContenido)
         l3.addWidget(botonTorre)
         botonTorre.setEnabled(False)
-        actionheatExchanger, botonheatExchanger=createAction(icon=os.environ["pychemqt"]+"/images/equipment/heatExchanger", text=QtGui.QApplication.translate("pychemqt", "Generic heat exchanger"), slot=partial(self.addEquipment, UI_heatExchanger), button=True, parent=toolboxContenido)
+        actionheatExchanger, botonheatExchanger=createAction(icon=os.environ["pychemqt"]+"/images/equipment/heatExchanger", text=QtGui.QApplication.translate("pychemqt", "Generic heat exchanger"), slot=partial(self.addEquipment, "UI_heatExchanger"), button=True, parent=toolboxContenido)
         l3.addWidget(botonheatExchanger)
-        actionhairpin, botonhairpin=createAction(icon=os.environ["pychemqt"]+"/images/equipment/hairpin", text=QtGui.QApplication.translate("pychemqt", "Hairpin heat exchanger"), slot=partial(self.addEquipment, UI_hairpin), button=True, parent=toolboxContenido)
+        actionhairpin, botonhairpin=createAction(icon=os.environ["pychemqt"]+"/images/equipment/hairpin", text=QtGui.QApplication.translate("pychemqt", "Hairpin heat exchanger"), slot=partial(self.addEquipment, "UI_hairpin"), button=True, parent=toolboxContenido)
         l3.addWidget(botonhairpin)
-        actionShellTube, botonShellTube=createAction(icon=os.environ["pychemqt"]+"/images/equipment/shellTube", text=QtGui.QApplication.translate("pychemqt", "Shell and tube heat exchanger"), slot=partial(self.addEquipment, UI_shellTube), button=True, parent=toolboxContenido)
+        actionShellTube, botonShellTube=createAction(icon=os.environ["pychemqt"]+"/images/equipment/shellTube", text=QtGui.QApplication.translate("pychemqt", "Shell and tube heat exchanger"), slot=partial(self.addEquipment, "UI_shellTube"), button=True, parent=toolboxContenido)
         l3.addWidget(botonShellTube)
-        actionFireHeater, botonFireHeater=createAction(icon=os.environ["pychemqt"]+"/images/equipment/fireHeater", text=QtGui.QApplication.translate("pychemqt", "Fired Heater heat exchanger"), slot=partial(self.addEquipment, UI_fireHeater), button=True, parent=toolboxContenido)
+        actionFireHeater, botonFireHeater=createAction(icon=os.environ["pychemqt"]+"/images/equipment/fireHeater", text=QtGui.QApplication.translate("pychemqt", "Fired Heater heat exchanger"), slot=partial(self.addEquipment, "UI_fireHeater"), button=True, parent=toolboxContenido)
         l3.addWidget(botonFireHeater)
-        actionReactor, botonReactor=createAction(icon=os.environ["pychemqt"]+"/images/equipment/reactor", text=QtGui.QApplication.translate("pychemqt", "Reactor"), slot=partial(self.addEquipment, UI_reactor), button=True, parent=toolboxContenido)
+        actionReactor, botonReactor=createAction(icon=os.environ["pychemqt"]+"/images/equipment/reactor", text=QtGui.QApplication.translate("pychemqt", "Reactor"), slot=partial(self.addEquipment, "UI_reactor"), button=True, parent=toolboxContenido)
         l3.addWidget(botonReactor)
         botonReactor.setEnabled(False)
         layouttoolbox.addItem(l3)
@@ -252,29 +258,29 @@ class UI_pychemqt(QtGui.QMainWindow):
         txt.setAlignment(QtCore.Qt.AlignCenter)
         layouttoolbox.addWidget(txt)
         l4=FlowLayout()
-        actionBaghouse, botonBaghouse=createAction(icon=os.environ["pychemqt"]+"/images/equipment/baghouse", text=QtGui.QApplication.translate("pychemqt", "Baghouse"), slot=partial(self.addEquipment, UI_baghouse), button=True, parent=toolboxContenido)
+        actionBaghouse, botonBaghouse=createAction(icon=os.environ["pychemqt"]+"/images/equipment/baghouse", text=QtGui.QApplication.translate("pychemqt", "Baghouse"), slot=partial(self.addEquipment, "UI_baghouse"), button=True, parent=toolboxContenido)
         l4.addWidget(botonBaghouse)
-        actionCentrifuge, botonCentrifuge=createAction(icon=os.environ["pychemqt"]+"/images/equipment/centrifuge", text=QtGui.QApplication.translate("pychemqt", "Centrifuge"), slot=partial(self.addEquipment, UI_centrifuge), button=True, parent=toolboxContenido)
+        actionCentrifuge, botonCentrifuge=createAction(icon=os.environ["pychemqt"]+"/images/equipment/centrifuge", text=QtGui.QApplication.translate("pychemqt", "Centrifuge"), slot=partial(self.addEquipment, "UI_centrifuge"), button=True, parent=toolboxContenido)
         l4.addWidget(botonCentrifuge)
         botonCentrifuge.setEnabled(False)
-        actionCiclon, botonCiclon=createAction(icon=os.environ["pychemqt"]+"/images/equipment/ciclon", text=QtGui.QApplication.translate("pychemqt", "Cyclone"), slot=partial(self.addEquipment, UI_ciclon), button=True, parent=toolboxContenido)
+        actionCiclon, botonCiclon=createAction(icon=os.environ["pychemqt"]+"/images/equipment/ciclon", text=QtGui.QApplication.translate("pychemqt", "Cyclone"), slot=partial(self.addEquipment, "UI_ciclon"), button=True, parent=toolboxContenido)
         l4.addWidget(botonCiclon)
-        actionElectroPrecipitator, botonElectroPrecipitator=createAction(icon=os.environ["pychemqt"]+"/images/equipment/electricPrecipitator", text=QtGui.QApplication.translate("pychemqt", "Electric precipitator"), slot=partial(self.addEquipment, UI_electricPrecipitator), button=True, parent=toolboxContenido)
+        actionElectroPrecipitator, botonElectroPrecipitator=createAction(icon=os.environ["pychemqt"]+"/images/equipment/electricPrecipitator", text=QtGui.QApplication.translate("pychemqt", "Electric precipitator"), slot=partial(self.addEquipment, "UI_electricPrecipitator"), button=True, parent=toolboxContenido)
         l4.addWidget(botonElectroPrecipitator)
-        actionGrinder, botonGrinder=createAction(icon=os.environ["pychemqt"]+"/images/equipment/grinder", text=QtGui.QApplication.translate("pychemqt", "Grinder"), slot=partial(self.addEquipment, UI_grinder), button=True, parent=toolboxContenido)
+        actionGrinder, botonGrinder=createAction(icon=os.environ["pychemqt"]+"/images/equipment/grinder", text=QtGui.QApplication.translate("pychemqt", "Grinder"), slot=partial(self.addEquipment, "UI_grinder"), button=True, parent=toolboxContenido)
         l4.addWidget(botonGrinder)
         botonGrinder.setEnabled(False)
-        actionDryer, botonDryer=createAction(icon=os.environ["pychemqt"]+"/images/equipment/dryer", text=QtGui.QApplication.translate("pychemqt", "Solids dryer"), slot=partial(self.addEquipment, UI_dryer), button=True, parent=toolboxContenido)
+        actionDryer, botonDryer=createAction(icon=os.environ["pychemqt"]+"/images/equipment/dryer", text=QtGui.QApplication.translate("pychemqt", "Solids dryer"), slot=partial(self.addEquipment, "UI_dryer"), button=True, parent=toolboxContenido)
         l4.addWidget(botonDryer)
-        actionWasher, botonWasher=createAction(icon=os.environ["pychemqt"]+"/images/equipment/solidWasher", text=QtGui.QApplication.translate("pychemqt", "Solid washer"), slot=partial(self.addEquipment, UI_solidWasher), button=True, parent=toolboxContenido)
+        actionWasher, botonWasher=createAction(icon=os.environ["pychemqt"]+"/images/equipment/solidWasher", text=QtGui.QApplication.translate("pychemqt", "Solid washer"), slot=partial(self.addEquipment, "UI_solidWasher"), button=True, parent=toolboxContenido)
         l4.addWidget(botonWasher)
         botonWasher.setEnabled(False)
-        actionVacuum, botonVacuum=createAction(icon=os.environ["pychemqt"]+"/images/equipment/vacuumfilter", text=QtGui.QApplication.translate("pychemqt", "Vacuum filter"), slot=partial(self.addEquipment, UI_vacuum), button=True, parent=toolboxContenido)
+        actionVacuum, botonVacuum=createAction(icon=os.environ["pychemqt"]+"/images/equipment/vacuumfilter", text=QtGui.QApplication.translate("pychemqt", "Vacuum filter"), slot=partial(self.addEquipment, "UI_vacuum"), button=True, parent=toolboxContenido)
         l4.addWidget(botonVacuum)
         botonVacuum.setEnabled(False)
-        actionScrubber, botonScrubber=createAction(icon=os.environ["pychemqt"]+"/images/equipment/scrubber", text=QtGui.QApplication.translate("pychemqt", "Scrubber"), slot=partial(self.addEquipment, UI_scrubber), button=True, parent=toolboxContenido)
+        actionScrubber, botonScrubber=createAction(icon=os.environ["pychemqt"]+"/images/equipment/scrubber", text=QtGui.QApplication.translate("pychemqt", "Scrubber"), slot=partial(self.addEquipment, "UI_scrubber"), button=True, parent=toolboxContenido)
         l4.addWidget(botonScrubber)
-        actionGravityChandler, botonGravityChandler=createAction(icon=os.environ["pychemqt"]+"/images/equipment/gravityChamber", text=QtGui.QApplication.translate("pychemqt", "Gravity chandler"), slot=partial(self.addEquipment, UI_gravityChamber), button=True, parent=toolboxContenido)
+        actionGravityChandler, botonGravityChandler=createAction(icon=os.environ["pychemqt"]+"/images/equipment/gravityChamber", text=QtGui.QApplication.translate("pychemqt", "Gravity chandler"), slot=partial(self.addEquipment, "UI_gravityChamber"), button=True, parent=toolboxContenido)
         l4.addWidget(botonGravityChandler)
         layouttoolbox.addItem(l4)
         layouttoolbox.addStretch(1)
@@ -283,13 +289,13 @@ class UI_pychemqt(QtGui.QMainWindow):
         txt.setAlignment(QtCore.Qt.AlignCenter)
         layouttoolbox.addWidget(txt)
         l5=FlowLayout()
-        actionControler, botonControler=createAction(icon=os.environ["pychemqt"]+"/images/equipment/controller", text=QtGui.QApplication.translate("pychemqt", "PID controller"), slot=partial(self.addEquipment, UI_solidWasher), button=True, parent=toolboxContenido)
+        actionControler, botonControler=createAction(icon=os.environ["pychemqt"]+"/images/equipment/controller", text=QtGui.QApplication.translate("pychemqt", "PID controller"), slot=partial(self.addEquipment, "UI_solidWasher"), button=True, parent=toolboxContenido)
         l5.addWidget(botonControler)
         botonControler.setEnabled(False)
-        actionControlValve, botonControlValve=createAction(icon=os.environ["pychemqt"]+"/images/equipment/controlvalve", text=QtGui.QApplication.translate("pychemqt", "Control valve"), slot=partial(self.addEquipment, UI_vacuum), button=True, parent=toolboxContenido)
+        actionControlValve, botonControlValve=createAction(icon=os.environ["pychemqt"]+"/images/equipment/controlvalve", text=QtGui.QApplication.translate("pychemqt", "Control valve"), slot=partial(self.addEquipment, "UI_vacuum"), button=True, parent=toolboxContenido)
         l5.addWidget(botonControlValve)
         botonControlValve.setEnabled(False)
-        actionSpreadsheet, botonSpreadsheet=createAction(icon=os.environ["pychemqt"]+"/images/equipment/spreadsheet", text=QtGui.QApplication.translate("pychemqt", "External spreadsheet module"), slot=partial(self.addEquipment, UI_spreadsheet), button=True, parent=toolboxContenido)
+        actionSpreadsheet, botonSpreadsheet=createAction(icon=os.environ["pychemqt"]+"/images/equipment/spreadsheet", text=QtGui.QApplication.translate("pychemqt", "External spreadsheet module"), slot=partial(self.addEquipment, "UI_spreadsheet"), button=True, parent=toolboxContenido)
         if not os.environ["ezodf"]:
             actionSpreadsheet.setEnabled(False)
             botonSpreadsheet.setEnabled(False)
@@ -378,7 +384,7 @@ class UI_pychemqt(QtGui.QMainWindow):
         self.menuObjetosTools.addAction(actionSpreadsheet)
 
         self.menuPFD = QtGui.QMenu(QtGui.QApplication.translate("pychemqt", "&PFD"))
-        self.actionResolution = createAction(QtGui.QApplication.translate("pychemqt", "Resolution"), slot=partial(self.dialogConfig, UI_confResolution), tip=QtGui.QApplication.translate("pychemqt", "Defining PFD resolution dialog"), parent=self)
+        self.actionResolution = createAction(QtGui.QApplication.translate("pychemqt", "Resolution"), slot=partial(self.dialogConfig, "UI_confResolution"), tip=QtGui.QApplication.translate("pychemqt", "Defining PFD resolution dialog"), parent=self)
         self.menuPFD.addAction( self.actionResolution)
         self.menuPFD.addSeparator()
         self.menuPFD.addAction(self.menuObjetosGraficos.menuAction())
@@ -390,17 +396,12 @@ class UI_pychemqt(QtGui.QMainWindow):
         self.menuPFD.addAction(saveAsImage)
         self.menubar.addAction(self.menuPFD.menuAction())
 
-        self.menuPlot = QtGui.QMenu(QtGui.QApplication.translate("pychemqt", "Pl&ot"))
-        for indice, grafico in enumerate(plots.__all__):
-            self.menuPlot.addAction(grafico.title, partial(self.plot, indice))
+        self.menuPlot = QtGui.QMenu(QtGui.QApplication.translate("pychemqt", "Pl&ot"), self)
+        self.menuPlot.aboutToShow.connect(self.aboutToShow_MenuPlot)
         self.menubar.addAction(self.menuPlot.menuAction())
 
         self.menuCharts = QtGui.QMenu(QtGui.QApplication.translate("pychemqt", "Charts"), self)
-        for titulo, lista in charts.__all__.iteritems():
-            menu= QtGui.QMenu(titulo, self)
-            for grafico in lista:
-                menu.addAction(grafico.title, partial(self.chart, grafico))
-            self.menuCharts.addAction(menu.menuAction())
+        self.menuCharts.aboutToShow.connect(self.aboutToShow_MenuCharts)
 
         self.menuAddComponent = QtGui.QMenu(QtGui.QApplication.translate("pychemqt", "New Component"))
         self.menuAddComponent.addAction(QtGui.QApplication.translate("pychemqt", "Component"), self.newcomponente)
@@ -423,7 +424,9 @@ class UI_pychemqt(QtGui.QMainWindow):
         self.menuHerramientas.addAction(currencyAction)
         self.menuHerramientas.addAction(TablaPeriodicaAction)
         self.menuHerramientas.addAction(steamTablesAction)
-        self.menuMEoS=UI_Tables.plugin(parent=self)
+        self.menuMEoS = QtGui.QMenu(QtGui.QApplication.translate("pychemqt", "MEoS properties"), self)
+        self.menuMEoS.aboutToShow.connect(self.aboutToShow_MenuMEoS)
+        self.pluginMEoS = None
         self.menuHerramientas.addAction(self.menuMEoS.menuAction())
         self.menuHerramientas.addAction(psychrometricChartAction)
         self.menuHerramientas.addSeparator()
@@ -480,10 +483,10 @@ class UI_pychemqt(QtGui.QMainWindow):
         self.statusPosition=QtGui.QLabel(self)
         self.statusbar.addPermanentWidget(self.statusPosition)
         self.statusResolution=ClickableLabel(self)
-        self.statusResolution.clicked.connect(partial(self.dialogConfig, UI_confResolution))
+        self.statusResolution.clicked.connect(partial(self.dialogConfig, "UI_confResolution"))
         self.statusbar.addPermanentWidget(self.statusResolution)
         self.statusThermo=ClickableLabel(self)
-        self.statusThermo.clicked.connect(partial(self.dialogConfig, UI_confThermo))
+        self.statusThermo.clicked.connect(partial(self.dialogConfig, "UI_confThermo"))
         self.statusbar.addPermanentWidget(self.statusThermo)
 
 
@@ -602,6 +605,33 @@ class UI_pychemqt(QtGui.QMainWindow):
         self.menuEditar.addSeparator()
         self.menuEditar.addAction(self.actionPreferencias)
 
+    def aboutToShow_MenuPlot(self):
+        """Populate the plot menu the first time it's shown"""
+        if self.menuPlot.isEmpty():
+            from UI import plots
+            for indice, grafico in enumerate(plots.__all__):
+                self.menuPlot.addAction(grafico.title, partial(self.plot, indice))
+
+    def aboutToShow_MenuCharts(self):
+        """Populate the charts menu the first time it's shown"""
+        if self.menuCharts.isEmpty():
+            from UI import charts
+            for titulo, lista in charts.__all__.iteritems():
+                menu= QtGui.QMenu(titulo, self)
+                for grafico in lista:
+                    menu.addAction(grafico.title, partial(self.chart, grafico))
+                self.menuCharts.addAction(menu.menuAction())
+
+    def aboutToShow_MenuMEoS(self):
+        """Show the actions of meos plugin, the plugin is loaded the first
+        time the menu is shown"""
+        if self.pluginMEoS is None:
+            from tools import UI_Tables
+            self.pluginMEoS = UI_Tables.plugin(parent=self)
+        self.pluginMEoS.aboutToShow_menu()
+        self.menuMEoS.clear()
+        self.menuMEoS.addActions(self.pluginMEoS.actions())
+
     def aboutToShow_MenuWindow(self):
         self.menuVentana.clear()
         self.menuVentana.addAction(QtGui.QIcon(os.environ["pychemqt"]+"/images/button/arrow-left.png"), QtGui.QApplication.translate("pychemqt", "&Previous"), self.currentMdi.activatePreviousSubWindow, QtGui.QKeySequence.PreviousChild)
@@ -718,7 +748,7 @@ class UI_pychemqt(QtGui.QMainWindow):
             stream.writeInt32(otras_ventanas)
             for ventana in self.centralwidget.currentWidget().subWindowList()[1:]:
                 clase = ventana.widget().__class__
-                stream.writeInt32(other_window.index(clase))
+                stream.writeInt32(other_window().index(clase))
                 ventana.widget().writeToStream(stream)
                 stream << ventana.pos()
                 stream << ventana.size()
@@ -815,7 +845,7 @@ class UI_pychemqt(QtGui.QMainWindow):
 
             otras_ventanas=stream.readInt32()
             for ventana in range(otras_ventanas):
-                widget = other_window[stream.readInt32()]
+                widget = other_window()[stream.readInt32()]
                 grafico = widget.readFromStream(stream, self)
                 mdiArea.addSubWindow(grafico)
                 pos=QtCore.QPoint()
@@ -841,6 +871,7 @@ class UI_pychemqt(QtGui.QMainWindow):
             del self.dirty[int]
             del self.config[int]
             del self.filename[int]
+            unidades.resetConfig()
             if self.centralwidget.count():
                 self.activeControl(True)
             else:
@@ -852,6 +883,7 @@ class UI_pychemqt(QtGui.QMainWindow):
 
 #Configuration
     def wizard(self):
+        from UI import wizard
         dialog=wizard.Wizard(self.config[self.idTab])
         if dialog.exec_():
             self.updateConfig(dialog.value)
@@ -869,6 +901,7 @@ class UI_pychemqt(QtGui.QMainWindow):
 
 #TODO: Delete this when its not necessary to run library isolated
         config.write(open(conf_dir+"pychemqtrc_temporal", "w"))
+        unidades.resetConfig()
 
     def updateStatus(self, text, success=True):
         """Función que añade entradas al cuadro de status
@@ -907,6 +940,7 @@ class UI_pychemqt(QtGui.QMainWindow):
                 self.statusResolution.setText("%i, %i" % (config.getint("PFD","x"), config.getint("PFD","y")))
 
     def dialogConfig(self, UIconfig):
+        UIconfig = importlib.import_module("tools."+UIconfig)
         Dialog = UIconfig.Dialog(self.config[self.idTab])
         if Dialog.exec_():
             config=Dialog.value(self.config[self.idTab])
@@ -914,16 +948,19 @@ class UI_pychemqt(QtGui.QMainWindow):
             self.saveControl()
 
     def costos(self):
+        from tools import costIndex
         dialog = costIndex.Ui_CostIndex()
         dialog.exec_()
 
     def Preferencias(self):
+        from tools import UI_Preferences
         dialog = UI_Preferences.Preferences(self.Preferences)
         if dialog.exec_():
             preferences=dialog.value()
             preferences.write(open(conf_dir+"pychemqtrc", "w"))
             self.Preferences=ConfigParser()
             self.Preferences.read(conf_dir+"pychemqtrc")
+            unidades.resetConfig()
             self.updateStatus(QtGui.QApplication.translate("pychemqt", "pychemqt configuration change"), True)
             self.changePreferenceLive()
         else:
@@ -976,6 +1013,7 @@ class UI_pychemqt(QtGui.QMainWindow):
     def currentTabChanged(self, indice):
 #        flujo.StreamItem.id=0
 #        flujo.EquipmentItem.id=0
+        unidades.resetConfig()
         if indice==-1:
             self.list.clear()
             self.activeControl(False)
@@ -992,6 +1030,7 @@ class UI_pychemqt(QtGui.QMainWindow):
 
 #Help
     def help(self):
+        from tools import doi
         dialog=doi.ShowReference()
         dialog.exec_()
 
@@ -1028,25 +1067,30 @@ class UI_pychemqt(QtGui.QMainWindow):
         Tabla_Periodica.exec_()
 
     def tablasVapor(self):
+        from tools import UI_steamTables
         SteamTables = UI_steamTables.Ui_SteamTables()
         self.updateStatus(QtGui.QApplication.translate("pychemqt", "Launched steam-water properties aplication"))
         SteamTables.exec_()
 
     def diagramaPsicrometrico(self):
+        from tools import UI_psychrometry
         Psychrometry=UI_psychrometry.UI_Psychrometry()
         self.updateStatus(QtGui.QApplication.translate("pychemqt", "Launched humid air properties aplication"))
         Psychrometry.exec_()
 
     def externalPrograms(self):
+        from tools import dependences
         dialog=dependences.ShowDependences()
         dialog.exec_()
 
     def conversor_unidades(self):
+        from tools import UI_unitConverter
         Conversor = UI_unitConverter.UI_unitConverter()
         self.updateStatus(QtGui.QApplication.translate("pychemqt", "Launched unit converter aplication"))
         Conversor.exec_()
 
     def conversor_moneda(self):
+        from UI.conversor_unidades import moneda
         Conversor = moneda()
         self.updateStatus(QtGui.QApplication.translate("pychemqt", "Launched currency converter aplication"))
         Conversor.exec_()
@@ -1057,24 +1101,29 @@ class UI_pychemqt(QtGui.QMainWindow):
         dialog.exec_()
 
     def verComponentes(self):
+        from tools import UI_databank
         Base_datos = UI_databank.UI_databank()
         Base_datos.exec_()
 
     def newcomponente(self):
+        from UI import viewComponents
         dialog=viewComponents.View_Component()
         dialog.exec_()
 
     def pseudocomponente(self):
+        from UI import newComponent
         Dialog = newComponent.Definicion_Petro()
         Dialog.exec_()
 
     def newComponent_Contribution(self, name):
+        from UI import newComponent
         Dialog = newComponent.Ui_Contribution(name)
         Dialog.exec_()
 
 
 #PFD
     def plot(self, indice, x=None, y=None):
+        from UI import plots
         grafico=plots.__all__[indice]
         indices, nombres, M=getComponents(config=self.config[self.idTab])
         dialog=grafico(indices, nombres, x, y)
@@ -1165,6 +1214,6 @@ class UI_pychemqt(QtGui.QMainWindow):
 
     def addEquipment(self, equipo):
         equip=UI_equipments.index(equipo)
-        object=flujo.EquipmentItem(equipo.__name__.split("_")[-1], equip)
+        object=flujo.EquipmentItem(equipo.split("_")[-1], equip)
         self.currentScene.waitClick(1, "equip", object)
 
@@ -8,7 +8,7 @@ from PyQt4 import QtCore, QtGui
 from scipy import array, exp, optimize, linspace
 
 from lib.plot import Plot
-from lib.compuestos import Componente
+from lib.compuestos import Componente, clearComponentes
 from lib import unidades, sql
 from entrada_datos import Entrada_Datos, eqDIPPR
 from UI.delegate import SpinEditor
@@ -1435,6 +1435,7 @@ class View_Component(QtGui.QDialog):
         elif role==QtGui.QDialogButtonBox.ApplyRole:
             componente=self.getComponent()
             sql.updateElement(componente, self.indice)
+            clearComponentes([self.indice])
             self.accept()
         elif role==QtGui.QDialogButtonBox.DestructiveRole:
             componente=self.getComponent()
@@ -1445,6 +1446,7 @@ class View_Component(QtGui.QDialog):
                 func=sql.updateElement
                 arg=(componente, self.indice)
             if okToContinue(self, self.dirty, func, arg):
+                clearComponentes([self.indice])
                 self.accept()
             else:
                 self.reject()
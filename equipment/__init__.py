@@ -3,53 +3,59 @@
 
 ###Modulo de equipos
 
-#Inicializa importando las interfaces gráficas de los equipos
-
-#flow
-import UI_divider
-import UI_valve
-import UI_mixer
-import UI_compressor
-import UI_turbine
-import UI_pump
-import UI_pipe
-
-#Operaciones
-import UI_flash
-import UI_columnFUG
-import UI_heatExchanger
-import UI_hairpin
-import UI_shellTube
-import UI_fireHeater
-
-#solids
-import UI_ciclon
-import UI_gravityChamber
-import UI_baghouse
-import UI_electricPrecipitator
-import UI_dryer
-
-#Tools
-import UI_spreadsheet
-
-#No funcionales
-import UI_centrifuge
-import UI_crystallizer
-import UI_filter
-import UI_grinder
-import UI_screen
-import UI_solidWasher
-import UI_vacuum
-import UI_scrubber
-import UI_tank
-import UI_tower
-import UI_reactor
-
-
-UI_equipments=[UI_divider, UI_valve, UI_mixer, UI_pump, UI_compressor, UI_turbine, UI_pipe, UI_flash, UI_columnFUG, UI_heatExchanger, UI_shellTube, UI_hairpin, UI_fireHeater, UI_ciclon, UI_gravityChamber, UI_baghouse, UI_electricPrecipitator, UI_dryer, UI_scrubber, UI_spreadsheet]
+#Las interfaces gráficas de los equipos se importan solo cuando se usan, la
+#lista de equipos de cálculo se importa directamente
+
+import importlib
+
+from flux import Divider, Valve, Mixer
+from pump import Pump
+from compressor import Compressor, Turbine
+from pipe import Pipe
+from distillation import Flash, ColumnFUG
+from heatExchanger import Heat_Exchanger, Shell_Tube, Hairpin, Fired_Heater
+from gas_solid import Ciclon, GravityChamber, Baghouse, ElectricPrecipitator
+from gas_solid_liquid import Dryer, Scrubber
+from spreadsheet import Spreadsheet
+
+
+class UIModules(object):
+    """List of graphic interface modules of equipments, each module is
+    imported the first time it's accessed"""
+    def __init__(self, names):
+        self.names = names
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        return importlib.import_module("equipment.%s" % self.names[index])
+
+    def __iter__(self):
+        for index in range(len(self.names)):
+            yield self[index]
+
+    def index(self, module):
+        """Index of module, given as module or name, without import it"""
+        if not isinstance(module, str):
+            module = module.__name__.split(".")[-1]
+        return self.names.index(module)
+
+
+UI_equipments = UIModules([
+    "UI_divider", "UI_valve", "UI_mixer", "UI_pump", "UI_compressor",
+    "UI_turbine", "UI_pipe", "UI_flash", "UI_columnFUG", "UI_heatExchanger",
+    "UI_shellTube", "UI_hairpin", "UI_fireHeater", "UI_ciclon",
+    "UI_gravityChamber", "UI_baghouse", "UI_electricPrecipitator", "UI_dryer",
+    "UI_scrubber", "UI_spreadsheet"])
 #, UI_tower, UI_reactor, UI_centrifuge, UI_grinder, UI_solidWasher, UI_vacuum, ]
 
-equipments=[ui.UI_equipment.Equipment.__class__ for ui in UI_equipments]
+# Calculation class of each equipment in UI_equipments, the index is saved in
+# project files so the order must be the same
+equipments = [Divider, Valve, Mixer, Pump, Compressor, Turbine, Pipe, Flash,
+              ColumnFUG, Heat_Exchanger, Shell_Tube, Hairpin, Fired_Heater,
+              Ciclon, GravityChamber, Baghouse, ElectricPrecipitator, Dryer,
+              Scrubber, Spreadsheet]
 
 # To get a list of equipment available to add to lib/firstrun.py file:
 # equipos=[equipment.__name__ for equipment in equipments]
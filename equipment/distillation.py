@@ -11,7 +11,6 @@ from PyQt4.QtGui import QApplication
 
 from lib import unidades
 from lib.corriente import Corriente
-from lib.plot import Plot
 from parents import equipment
 from heatExchanger import Heat_Exchanger
 
@@ -338,6 +337,7 @@ class Tower(equipment):
         xP = xD
         yP = xD
 
+        from lib.plot import Plot
         dialog=Plot()
         dialog.plot.ax.grid(True)
         dialog.plot.ax.set_title(QApplication.translate("pychemqt", "x-y Diagram for") + "{:s}/{:s} P={:s}".format(A,B,P.str), size="x-large")
@@ -95,12 +95,14 @@ class equipment(Entity):
 
     def __call__(self, **kwargs):
         """All equipment are callables, so we can instance or add/change
-        input value with flexibility"""
+        input value with flexibility, the calculation is skipped if the
+        inputs, input streams state included, don't change"""
         Entity.__call__(self, **kwargs)
-        if self._oldkwargs != self.kwargs and self.isCalculable:
+        if self.dirty and self.isCalculable:
             self.calculo()
             if self.statusCoste:
                 self.coste()
+            self._inputKey = self.inputKey()
 
     @property
     def isCalculable(self):
@@ -9,11 +9,13 @@ from scipy import exp, log, log10, tan, sinh, tanh, arctan, sqrt
 from scipy import roots, r_
 from scipy.constants import pi, Avogadro, R
 from scipy.optimize import fsolve
+from copy import copy
 
 from lib import unidades, config
 from lib.physics import R_atml, factor_acentrico_octano
 
 from lib.eos import EoS
+from lib.EoS.cubic import RK
 
 class Grayson_Streed(EoS):
     """Ecuación de estado de Grayson Streed modificada por Chao-Seader
@@ -35,7 +37,7 @@ class Grayson_Streed(EoS):
         self.x, self.xi, self.yi, self.Ki=self._Flash()
 
     def _k(self, xi, yi):
-        fi=self.rk._fug(self.rk.Z[0], yi)
+        fi=exp(self.rk._phaseLnphi([yi], [False])[1][0])
         suma1=0
         suma2=0
         Vi=[]
@@ -70,52 +72,14 @@ class Grayson_Streed(EoS):
         return tital, fi
 
 
-    def _Flash(self):
-        """Cálculo de los coeficientes de reparto entre fases, Ref Naji - Conventional and rapid flash claculations"""
-        #Estimación inicial de K mediante correlación wilson Eq 19
-        Ki=[]
-        for i in self.componente:
-            Ki.append(i.Pc/self.P*exp(5.37*(1.+i.f_acent)*(1.-i.Tc/self.T)))
-
-        Rachford=lambda x: sum([zi*(ki-1.)/(1.-x+x*ki) for zi, ki in zip(self.fraccion, Ki)])
-
-        if Rachford(0)>0 and Rachford(1)>0: #x>1, por tanto solo fase vapor
-            xi=self.fraccion
-            yi=self.fraccion
-            x=1.
-        elif Rachford(0)<0 and Rachford(1)<0: #x<0, por tanto solo fase líquida
-            xi=self.fraccion
-            yi=self.fraccion
-            x=0.
-        else:
-            x=0.5
-            while True:
-                xo=x
-                solucion=fsolve(Rachford, x, full_output=True)
-                if solucion[2]!=1:
-                    print solucion
-                    break
-                else:
-                    x=solucion[0]
-                    xi=[]
-                    yi=[]
-                    for zi, ki in zip(self.fraccion, Ki):
-                        xi.append(zi/(1-x+x*ki))
-                        yi.append(zi*ki/(1-x+x*ki))
-
-                    titas=self._k(xi, yi)
-                    tital=titas[0]
-                    titav=titas[1]
-
-                    fiv=[z*t*self.P for z, t in zip(yi, titav)]
-                    fil=[z*t*self.P for z, t in zip(xi, tital)]
-                    #criterio de convergencia Eq 21
-                    if sum([abs(l/v-1) for l, v in zip(fil, fiv)])< 1e-12 and (x-xo)**2 < 1e-15:
-                        break
-                    else:
-                        Ki=[l/v for l, v in zip(tital, titav)]
-
-        return x, xi, yi, Ki
+    def _fugacityCoefficients(self, xi, yi):
+        return self._k(xi, yi)
+
+    def _setState(self, T, P):
+        self.T=unidades.Temperature(T)
+        self.P=unidades.Pressure(P, "atm")
+        self.rk=copy(self.rk)
+        self.rk._setState(T, P)
 
 
 _all = [Grayson_Streed]
@@ -5,16 +5,28 @@
 # Virial equation of state implementation
 ###############################################################################
 
-from scipy import roots, r_, log, exp, sqrt
+from numpy import (array, asarray, broadcast_arrays, dot, errstate, fmax, fmin,
+                   nan, unique, where)
+from numpy import exp as exp_a, log as log_a, sqrt as sqrt_a
+from scipy import r_, log, exp, sqrt
 
 from lib import unidades, config
 from lib.eos import EoS
-from lib.physics import R_atml
+from lib.physics import R_atml, roots_poly3
 
 
 class Cubic(EoS):
     """Clase que modela de manera generalizada las ecuaciones de estado cúbicas
-    ref. Prausnick  Propiedades de gases y liquidos, pag 203"""
+    ref. Prausnick  Propiedades de gases y liquidos, pag 203
+
+    The equations are written in the generalized form
+        P = RT/(V-b) - a/(V²+u·b·V+w·b²)
+    the subclasses define the u, w parameters and the _parameters method,
+    returning the component a(T), b as arrays, the kij matrix and the
+    temperature derivative of the mixture a parameter"""
+    u=0
+    w=0
+
     def __init__(self, T, P, mezcla):
         self.T=unidades.Temperature(T)
         self.P=unidades.Pressure(P, "atm")
@@ -22,33 +34,200 @@ class Cubic(EoS):
         self.componente=mezcla.componente
         self.fraccion=mezcla.fraccion
 
+        self.ai, self.bi, kij, self.dTitadT=self._parameters(mezcla, self.T)
+        self.kij=array(kij, dtype=float)
+        a, b, Ai=self._mixture(self.fraccion, self.ai, self.bi)
+        self.tita=a[0]
+        self.b=b[0]
+        self.delta=self.u*self.b
+        self.epsilon=self.w*self.b**2
+        self.eta=self.b
+
         self.B=self.b*self.P.atm/R_atml/self.T
         self.Tita=self.tita*self.P.atm/(R_atml*self.T)**2
-
-        delta=self.delta*self.P.atm/R_atml/self.T
-        epsilon=self.epsilon*(self.P.atm/R_atml/self.T)**2
-        eta=self.eta*self.P.atm/R_atml/self.T
-        Z=roots([1, delta-self.B-1, self.Tita+epsilon-delta*(self.B+1), -epsilon*(self.B+1)-self.Tita*eta])
-        self.Z=r_[Z[0].real, Z[2].real]
+        Zl, Zv=self._Z(self.Tita, self.B)
+        self.Z=r_[Zv, Zl]
 
         self.V=self.Z*R_atml*self.T/self.P.atm  #mol/l
         self.x, self.xi, self.yi, self.Ki=self._Flash()
         self.H_exc=-(self.tita+self.dTitadT)/R_atml/self.T/(self.delta**2-4*self.epsilon)**0.5*log((2*self.V+self.delta-(self.delta**2-4*self.epsilon)**0.5)/(2*self.V+self.delta+(self.delta**2-4*self.epsilon)**0.5))+1-self.Z
 
+    def _components(self, mezcla, T, lib):
+        """Evaluate the lib function of the equation for each component,
+        return an array for each parameter returned"""
+        par=[lib(cmp, T) for cmp in mezcla.componente]
+        return [array(p, dtype=float) for p in zip(*par)]
+
+    def _dTitadT(self, mezcla, T, kij, aci, mi=1):
+        """Temperature derivative of the a mixture parameter,
+        -ΣΣ xi·xj·mj·(aci·acj·Trj)^0.5·(1-kij)"""
+        x=array(mezcla.fraccion, dtype=float)
+        Tr=array([cmp.tr(T) for cmp in mezcla.componente])
+        xa=x*sqrt_a(aci)
+        return -dot(xa, dot(1-array(kij, dtype=float), xa*mi*Tr**0.5))
+
+    def _mixture(self, X, ai, bi):
+        """van der Waals mixing rules for the compositions in rows of X,
+        ai and bi can be a row of component parameters for each composition
+        Return the arrays with a, b and the 2·Σxj·aij/a term of the
+        fugacity coefficients"""
+        X=array(X, dtype=float, ndmin=2)
+        sqa=sqrt_a(ai)
+        xa=X*sqa
+        Q=dot(xa, (1-self.kij).T)
+        a=(xa*Q).sum(axis=-1)
+        b=(X*bi).sum(axis=-1)
+        return a, b, 2*sqa*Q/a[:, None]
+
+    def _Z(self, A, B):
+        """Compressibility factor of liquid and vapor phase, the smallest
+        and greatest real root over B of the cubic equation in Z, the
+        equation parameters A, B can be arrays"""
+        A, B=asarray(A, dtype=float), asarray(B, dtype=float)
+        u, w=self.u, self.w
+        Z=roots_poly3((u-1)*B-1, A+w*B**2-u*B*(B+1), -w*B**2*(B+1)-A*B)
+        with errstate(invalid="ignore"):
+            Z=where(Z>B[..., None], Z, nan)
+        Zl=fmin.reduce(Z, axis=-1)
+        Zv=fmax.reduce(Z, axis=-1)
+        return Zl, Zv
+
+    def _L(self, Z, B):
+        """Attractive term integral, ln((Z+δ1·B)/(Z+δ2·B))/(δ1-δ2)"""
+        s=(self.u**2-4*self.w)**0.5
+        if s:
+            return log_a((Z+B*(self.u+s)/2)/(Z+B*(self.u-s)/2))/s
+        else:
+            return B/(Z+self.u*B/2)
+
+    def _stable(self, Zl, Zv, A, B):
+        """Select the root with lower Gibbs energy, the residual Gibbs
+        energy is Z-1-ln(Z-B)-A/B·L"""
+        dG=Zl-Zv-log_a((Zl-B)/(Zv-B))-A/B*(self._L(Zl, B)-self._L(Zv, B))
+        return where(dG<0, Zl, Zv)
+
+    def _lnphi(self, Z, A, B, Ai, bib):
+        """Logarithm of fugacity coefficients, with a row for each value of
+        compressibility factor Z and mixture parameters A, B
+        Ai: 2·Σxj·aij/a term of each component
+        bib: bi/b term of each component"""
+        Z=Z[:, None]
+        A=A[:, None]
+        B=B[:, None]
+        return bib*(Z-1)-log_a(Z-B)-A/B*self._L(Z, B)*(Ai-bib)
+
+    def _phaseLnphi(self, X, liquid=None):
+        """Compressibility factor and logarithm of fugacity coefficients of
+        phases with compositions in rows of X at the T, P of state
+        liquid: flags to select the liquid or vapor root of each row, by
+        default the root with lower Gibbs energy is used"""
+        a, b, Ai=self._mixture(X, self.ai, self.bi)
+        A=a*self.P.atm/(R_atml*self.T)**2
+        B=b*self.P.atm/R_atml/self.T
+        Zl, Zv=self._Z(A, B)
+        if liquid is None:
+            Z=self._stable(Zl, Zv, A, B)
+        else:
+            Z=where(liquid, Zl, Zv)
+        return Z, self._lnphi(Z, A, B, Ai, self.bi/b[:, None])
+
+    def _fugacityCoefficients(self, xi, yi):
+        """Fugacity coefficients of both phases calculated together, using
+        for each one the root with lower Gibbs energy"""
+        Z, lnphi=self._phaseLnphi([xi, yi])
+        return exp_a(lnphi[0]), exp_a(lnphi[1])
+
+    def _setState(self, T, P):
+        """Change the temperature and pressure of the equation, the
+        component parameters are recalculated only if temperature change"""
+        if T!=self.T:
+            self.T=unidades.Temperature(T)
+            self.ai, self.bi=self._parameters(self.mezcla, self.T)[:2]
+        self.P=unidades.Pressure(P, "atm")
 
-
-    def _fug(self, Z, xi):
-        Ai=[]
-        for i in range(len(self.componente)):
-            suma=0
-            for j in range(len(self.componente)):
-                suma+=self.fraccion[j]*self.ai[j]**0.5*(1-self.kij[i][j])
-            Ai.append(1/self.tita*2*self.ai[i]**0.5*suma)
-        tita=[]
-        for i in range(len(self.componente)):
-            tita.append(exp(self.bi[i]/self.b*(Z-1)-log(Z-self.B)-self.Tita/self.B/sqrt(self.u**2-4*self.w)*(Ai[i]-self.bi[i]/self.b)*log((Z+self.B/2*(self.u+sqrt(self.u**2-4*self.w)))/(Z+self.B/2*(self.u-sqrt(self.u**2-4*self.w))))).real)
-        return tita
-
+    def _dlnadlnT(self, h=1e-6):
+        """Derivative of logarithm of component a parameters respect to
+        logarithm of temperature, the alpha functions are only defined as
+        values so it's calculated by forward difference"""
+        ai=self._parameters(self.mezcla, self.T*exp_a(h))[0]
+        return log_a(ai/self.ai)/h
+
+    def _lnKDerivative(self, xi, yi, var):
+        """Logarithm of partition coefficients, with xi in the liquid root
+        and yi in the vapor root, and its analytic derivative respect to the
+        logarithm of temperature or pressure"""
+        X=array([xi, yi], dtype=float)
+        a, b, Ai=self._mixture(X, self.ai, self.bi)
+        A=a*self.P.atm/(R_atml*self.T)**2
+        B=b*self.P.atm/R_atml/self.T
+        Zl, Zv=self._Z(A, B)
+        Z=r_[Zl[0], Zv[1]]
+        bib=self.bi/b[:, None]
+        lnphi=self._lnphi(Z, A, B, Ai, bib)
+
+        if var=="P":
+            dA=A
+            dB=B
+            dAi=0
+        else:
+            g=self._dlnadlnT()
+            sqa=sqrt_a(self.ai)
+            xa=X*sqa
+            S=sqa*dot(xa, (1-self.kij).T)
+            Sg=sqa*dot(xa*g, (1-self.kij).T)
+            dlna=(X*g*Ai).sum(axis=-1)/2
+            dAi=Ai*(g/2+Sg/S/2-dlna[:, None])
+            dA=A*(dlna-2)
+            dB=-B
+
+        # Z derivative from the cubic equation
+        u, w=self.u, self.w
+        FZ=3*Z**2+2*((u-1)*B-1)*Z+A+w*B**2-u*B*(B+1)
+        FA=Z-B
+        FB=(u-1)*Z**2+(2*w*B-u*(2*B+1))*Z-w*(3*B**2+2*B)-A
+        dZ=-(FA*dA+FB*dB)/FZ
+
+        L=self._L(Z, B)[:, None]
+        D=(Z**2+u*B*Z+w*B**2)[:, None]
+        E=Ai-bib
+        Z, A, B, dZ, dA, dB=[v[:, None] for v in (Z, A, B, dZ, dA, dB)]
+        dlnphi=(bib-1/(Z-B)+A/D*E)*dZ-L/B*E*dA + \
+            (1/(Z-B)+A/B**2*L*E-A/B*Z/D*E)*dB-A/B*L*dAi
+        return lnphi[0]-lnphi[1], dlnphi[0]-dlnphi[1]
+
+    @classmethod
+    def sweep(cls, T, P, mezcla):
+        """Evaluate the equation for the mezcla composition at several T, P
+        points without flash calculation, the component parameters are
+        calculated once for each different temperature
+        T: temperatures, K
+        P: pressures, atm
+        Return a dict with the liquid and vapor compressibility factor, Zl
+        and Zv, and logarithm of fugacity coefficients, lnphil and lnphiv,
+        with a row for each point, and the root with lower Gibbs energy, Z"""
+        T, P=broadcast_arrays(asarray(T, dtype=float), asarray(P, dtype=float))
+        T=T.ravel()
+        P=P.ravel()
+
+        eq=cls.__new__(cls)
+        eq.mezcla=mezcla
+        eq.componente=mezcla.componente
+        eq.fraccion=mezcla.fraccion
+        Tu, index=unique(T, return_inverse=True)
+        par=[eq._parameters(mezcla, t) for t in Tu]
+        eq.kij=array(par[0][2], dtype=float)
+        ai=array([p[0] for p in par])[index]
+        bi=array([p[1] for p in par])[index]
+
+        a, b, Ai=eq._mixture(mezcla.fraccion, ai, bi)
+        A=a*P/(R_atml*T)**2
+        B=b*P/R_atml/T
+        Zl, Zv=eq._Z(A, B)
+        bib=bi/b[:, None]
+        return {"T": T, "P": P, "Zl": Zl, "Zv": Zv,
+                "Z": eq._stable(Zl, Zv, A, B),
+                "lnphil": eq._lnphi(Zl, A, B, Ai, bib),
+                "lnphiv": eq._lnphi(Zv, A, B, Ai, bib)}
 
 
 class van_Waals(Cubic):
@@ -56,33 +235,16 @@ class van_Waals(Cubic):
         van der Waals, J.D. Over de continuiteit van den gas- en vloestof-toestand. Dissertation, Leiden University, Leiden, Niederlande, 1873."""
     __title__="van der Waals (1890)"
     __status__="vdW"
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        for componente in mezcla.componente:
-            a, b=self.__lib(componente)
-            ai.append(a)
-            bi.append(b)
-        self.kij=mezcla.Kij(None)
-        a, b=mezcla.Mixing_Rule([ai, bi], self.kij)
-
-        self.ai=ai
-        self.bi=bi
-        self.b=b
-        self.tita=a
-        self.delta=0
-        self.epsilon=0
-        self.eta=b
-
-        #TODO: Find relation between u,w y tita,delta, epsilon...
-        self.u=0
-        self.w=0
-
-        self.dTitadT=0
-        super(van_Waals, self).__init__(T, P, mezcla)
-
-
-    def __lib(self, compuesto):
+    u=0
+    w=0
+
+    def _parameters(self, mezcla, T):
+        ai, bi=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(None)
+        return ai, bi, kij, 0
+
+
+    def __lib(self, compuesto, T):
         a=0.421875*R_atml**2*compuesto.Tc**2/compuesto.Pc.atm
         b=0.125*R_atml*compuesto.Tc/compuesto.Pc.atm
         return  a, b
@@ -93,31 +255,13 @@ class RK(Cubic):
     Redlich, O.; Kwong, J.N.S., On The Thermodynamics of Solutions. Chem. Rev. 1949, 44, 233."""
     __title__="Redlich-Kwong (1949)"
     __status__="RK"
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        for componente in mezcla.componente:
-            a, b=self.__lib(componente, T)
-            ai.append(a)
-            bi.append(b)
-        self.kij=mezcla.Kij(None)
-        a, b=mezcla.Mixing_Rule([ai, bi], self.kij)
-        tdadt=0
-
-        self.ai=ai
-        self.bi=bi
-        self.b=b
-        self.tita=a
-        self.delta=b
-        self.epsilon=0
-        self.eta=b
-
-        #TODO: Find relation between u,w y tita,delta, epsilon...
-        self.u=1
-        self.w=0
-
-        self.dTitadT=tdadt
-        super(RK, self).__init__(T, P, mezcla)
+    u=1
+    w=0
+
+    def _parameters(self, mezcla, T):
+        ai, bi=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(None)
+        return ai, bi, kij, 0
 
     def __lib(self, compuesto, T):
         a=0.42747*R_atml**2*compuesto.Tc**2/compuesto.Pc.atm
@@ -131,31 +275,13 @@ class Wilson(Cubic):
     Wilson, G. M.: Adv. Cryogenic Eng., 9: 168 (1964)."""
     __title__="Wilson (1964)"
     __status__="Wilson"
+    u=1
+    w=0
 
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        for componente in mezcla.componente:
-            a, b=self.__lib(componente, T)
-            ai.append(a)
-            bi.append(b)
-        self.kij=mezcla.Kij(None)
-        a, b=mezcla.Mixing_Rule([ai, bi], self.kij)
-        tdadt=0
-
-        self.ai=ai
-        self.bi=bi
-        self.b=b
-        self.tita=a
-        self.delta=b
-        self.epsilon=0
-        self.eta=b
-
-        self.u=1
-        self.w=0
-
-        self.dTitadT=tdadt
-        super(Wilson, self).__init__(T, P, mezcla)
+    def _parameters(self, mezcla, T):
+        ai, bi=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(None)
+        return ai, bi, kij, 0
 
     def __lib(self, compuesto, T):
         """Librería de cálculo de la ecuación de estado de Wilson"""
@@ -170,34 +296,14 @@ class Fuller(Cubic):
     Fuller, G. G.: Ind. Eng. Chem. Fundam., 15: 254 (1976)."""
     __title__="Fuller (1976)"
     __status__="Fuller"
+    u=0
+    w=0
 
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        ci=[]
-        for componente in mezcla.componente:
-            a, b, c=self.__lib(componente, T)
-            ai.append(a)
-            bi.append(b)
-            ci.append(ac)
-        self.kij=mezcla.Kij(SRK)
-        a, b=mezcla.Mix_van_der_Waals([ai, bi, ci], self.kij)
-        tdadt=0
-
-        self.ai=ai
-        self.bi=bi
-        self.ci=ci
-        self.b=b
-        self.tita=a
-        self.delta=b
-        self.epsilon=0
-        self.eta=b
-
-        self.u=c
-        self.w=0
-
-        self.dTitadT=tdadt
-        super(Fuller, self).__init__(T, P, mezcla)
+    def _parameters(self, mezcla, T):
+        ai, bi, ci=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(SRK)
+        self.u=dot(mezcla.fraccion, ci)
+        return ai, bi, kij, 0
 
 
     def __lib(self, compuesto, T):
@@ -220,38 +326,13 @@ class SRK(Cubic):
     Soave, G. Equilibrium constants from a modified Redlich-Kwong equation of state. Chem. Eng. Sci. 1972, 27, 1197."""
     __title__="SRK (1972)"
     __status__="SRK"
+    u=1
+    w=0
 
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        aci=[]
-        mi=[]
-        for componente in mezcla.componente:
-            a, b, ac, m=self.__lib(componente, T)
-            ai.append(a)
-            bi.append(b)
-            aci.append(ac)
-            mi.append(m)
-        self.kij=mezcla.Kij(SRK)
-        a, b=mezcla.Mixing_Rule([ai, bi], self.kij)
-        tdadt=0
-        for i in range(len(mezcla.componente)):
-            for j in range(len(mezcla.componente)):
-                tdadt-=mezcla.fraccion[i]*mezcla.fraccion[j]*mi[j]*(aci[i]*aci[j]*mezcla.componente[j].tr(T))**0.5*(1-self.kij[i][j])
-
-        self.ai=ai
-        self.bi=bi
-        self.b=b
-        self.tita=a
-        self.delta=b
-        self.epsilon=0
-        self.eta=b
-
-        self.u=1
-        self.w=0
-
-        self.dTitadT=tdadt
-        super(SRK, self).__init__(T, P, mezcla)
+    def _parameters(self, mezcla, T):
+        ai, bi, aci, mi=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(SRK)
+        return ai, bi, kij, self._dTitadT(mezcla, T, kij, aci, mi)
 
 
     def __lib(self, compuesto, T):
@@ -277,38 +358,13 @@ class SRK_API(Cubic):
     Soave, G.: Inst. Chem. Eng. Symp. Ser., 56(1.2): 1 (1979)."""
     __title__="SRK-API (1979)"
     __status__="SRK-API"
+    u=1
+    w=0
 
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        aci=[]
-        mi=[]
-        for componente in mezcla.componente:
-            a, b, ac, m=self.__lib(componente, T)
-            ai.append(a)
-            bi.append(b)
-            aci.append(ac)
-            mi.append(m)
-        self.kij=mezcla.Kij(SRK)
-        a, b=mezcla.Mix_van_der_Waals([ai, bi], self.kij)
-        tdadt=0
-        for i in range(len(mezcla.componente)):
-            for j in range(len(mezcla.componente)):
-                tdadt-=mezcla.fraccion[i]*mezcla.fraccion[j]*mi[j]*(aci[i]*aci[j]*mezcla.componente[j].tr(T))**0.5*(1-self.kij[i][j])
-
-        self.ai=ai
-        self.bi=bi
-        self.b=b
-        self.tita=a
-        self.delta=b
-        self.epsilon=0
-        self.eta=b
-
-        self.u=1
-        self.w=0
-
-        self.dTitadT=tdadt
-        super(SRK_API, self).__init__(T, P, mezcla)
+    def _parameters(self, mezcla, T):
+        ai, bi, aci, mi=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(SRK)
+        return ai, bi, kij, self._dTitadT(mezcla, T, kij, aci, mi)
 
 
     def __lib(self, compuesto, T):
@@ -334,38 +390,13 @@ class MSRK(Cubic):
     Soave, G.: Chem. Eng. Sci., 39: 357 (1984)."""
     __title__="M-SRK (1984)"
     __status__="MSRK"
+    u=1
+    w=0
 
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        aci=[]
-        mi=[]
-        for componente in mezcla.componente:
-            a, b, ac, m=self.__lib(componente, T)
-            ai.append(a)
-            bi.append(b)
-            aci.append(ac)
-            mi.append(m)
-        self.kij=mezcla.Kij(SRK)
-        a, b=mezcla.Mix_van_der_Waals([ai, bi], self.kij)
-        tdadt=0
-        for i in range(len(mezcla.componente)):
-            for j in range(len(mezcla.componente)):
-                tdadt-=mezcla.fraccion[i]*mezcla.fraccion[j]*mi[j]*(aci[i]*aci[j]*mezcla.componente[j].tr(T))**0.5*(1-self.kij[i][j])
-
-        self.ai=ai
-        self.bi=bi
-        self.b=b
-        self.tita=a
-        self.delta=b
-        self.epsilon=0
-        self.eta=b
-
-        self.u=1
-        self.w=0
-
-        self.dTitadT=tdadt
-        super(MSRK, self).__init__(T, P, mezcla)
+    def _parameters(self, mezcla, T):
+        ai, bi, aci, mi=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(SRK)
+        return ai, bi, kij, self._dTitadT(mezcla, T, kij, aci, mi)
 
 
     def __lib(self, compuesto, T):
@@ -385,31 +416,13 @@ class SRK_Graboski(Cubic):
        Graboski, M. S., Daubert, T. E., “A Modified Soave Equation of State for Phase Equilibrium Calculations-II. Systems Containing CO,, H,S, N2, and C0,”Ind. Eng. Chem. ProcessDes. Develop. 17 (1978)."""
     __title__="SRK-Graboski-Daubert (1978)"
     __status__="SRK-GD"
+    u=1
+    w=0
 
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        for componente in mezcla.componente:
-            a, b=self.__lib(componente, T)
-            ai.append(a)
-            bi.append(b)
-        self.kij=mezcla.Kij(SRK)
-        a, b=mezcla.Mix_van_der_Waals([ai, bi], self.kij)
-        tdadt=0
-
-        self.ai=ai
-        self.bi=bi
-        self.b=b
-        self.tita=a
-        self.delta=b
-        self.epsilon=0
-        self.eta=b
-
-        self.u=1
-        self.w=0
-
-        self.dTitadT=tdadt
-        super(SRK_Thorwart, self).__init__(T, P, mezcla)
+    def _parameters(self, mezcla, T):
+        ai, bi=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(SRK)
+        return ai, bi, kij, 0
 
 
     def __lib(self, compuesto, T):
@@ -439,38 +452,13 @@ class SRK_Mathias(Cubic):
     Mathias, P.M.: A versatile phase equilibrium equation of state. Industrial and Engineering Chemistry PRocess Design and Development 22, 385-391 (1983)"""
     __title__="SRK-Mathias (1983)"
     __status__="SRK-Math"
+    u=1
+    w=0
 
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        aci=[]
-        mi=[]
-        for componente in mezcla.componente:
-            a, b, ac, m=self.__lib(componente, T)
-            ai.append(a)
-            bi.append(b)
-            aci.append(ac)
-            mi.append(m)
-        self.kij=mezcla.Kij(SRK)
-        a, b=mezcla.Mixing_Rule([ai, bi], self.kij)
-        tdadt=0
-        for i in range(len(mezcla.componente)):
-            for j in range(len(mezcla.componente)):
-                tdadt-=mezcla.fraccion[i]*mezcla.fraccion[j]*mi[j]*(aci[i]*aci[j]*mezcla.componente[j].tr(T))**0.5*(1-self.kij[i][j])
-
-        self.ai=ai
-        self.bi=bi
-        self.b=b
-        self.tita=a
-        self.delta=b
-        self.epsilon=0
-        self.eta=b
-
-        self.u=1
-        self.w=0
-
-        self.dTitadT=tdadt
-        super(SRK, self).__init__(T, P, mezcla)
+    def _parameters(self, mezcla, T):
+        ai, bi, aci, mi=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(SRK)
+        return ai, bi, kij, self._dTitadT(mezcla, T, kij, aci, mi)
 
 
     def __lib(self, compuesto, T):
@@ -496,38 +484,13 @@ class SRK_Adachi(Cubic):
    Adachi, Y., Lu, B.C.Y.: Simplest equation of state for vapor-liquid equilibrium calculation: a modification of the van der Walls equation. Journal of the American Institute of Chemical Engineers 30, 991-993 (1984)"""
     __title__="SRK-Adachi-Lu (1984)"
     __status__="SRK-Adachi"
+    u=1
+    w=0
 
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        aci=[]
-        mi=[]
-        for componente in mezcla.componente:
-            a, b, ac, m=self.__lib(componente, T)
-            ai.append(a)
-            bi.append(b)
-            aci.append(ac)
-            mi.append(m)
-        self.kij=mezcla.Kij(SRK)
-        a, b=mezcla.Mixing_Rule([ai, bi], self.kij)
-        tdadt=0
-        for i in range(len(mezcla.componente)):
-            for j in range(len(mezcla.componente)):
-                tdadt-=mezcla.fraccion[i]*mezcla.fraccion[j]*mi[j]*(aci[i]*aci[j]*mezcla.componente[j].tr(T))**0.5*(1-self.kij[i][j])
-
-        self.ai=ai
-        self.bi=bi
-        self.b=b
-        self.tita=a
-        self.delta=b
-        self.epsilon=0
-        self.eta=b
-
-        self.u=1
-        self.w=0
-
-        self.dTitadT=tdadt
-        super(SRK, self).__init__(T, P, mezcla)
+    def _parameters(self, mezcla, T):
+        ai, bi, aci, mi=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(SRK)
+        return ai, bi, kij, self._dTitadT(mezcla, T, kij, aci, mi)
 
 
     def __lib(self, compuesto, T):
@@ -545,38 +508,13 @@ class SRK_Androulakis(Cubic):
     Andoulakis I.P., Kalospiros, N.S., Tassios, D.P.: Thermophysical properties of pure polar and nonpolar compounds with a modified vdW-711 equation of state. Fluid Phase Equilibria 45, 135-163 (1989)"""
     __title__="SRK-Androulakis (1984)"
     __status__="SRK-And"
+    u=1
+    w=0
 
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        aci=[]
-        mi=[]
-        for componente in mezcla.componente:
-            a, b, ac, m=self.__lib(componente, T)
-            ai.append(a)
-            bi.append(b)
-            aci.append(ac)
-            mi.append(m)
-        self.kij=mezcla.Kij(SRK)
-        a, b=mezcla.Mixing_Rule([ai, bi], self.kij)
-        tdadt=0
-        for i in range(len(mezcla.componente)):
-            for j in range(len(mezcla.componente)):
-                tdadt-=mezcla.fraccion[i]*mezcla.fraccion[j]*mi[j]*(aci[i]*aci[j]*mezcla.componente[j].tr(T))**0.5*(1-self.kij[i][j])
-
-        self.ai=ai
-        self.bi=bi
-        self.b=b
-        self.tita=a
-        self.delta=b
-        self.epsilon=0
-        self.eta=b
-
-        self.u=1
-        self.w=0
-
-        self.dTitadT=tdadt
-        super(SRK, self).__init__(T, P, mezcla)
+    def _parameters(self, mezcla, T):
+        ai, bi, aci, mi=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(SRK)
+        return ai, bi, kij, self._dTitadT(mezcla, T, kij, aci, mi)
 
 
     def __lib(self, compuesto, T):
@@ -600,38 +538,13 @@ class PR(Cubic):
     Peng, D.-Y.; Robinson, D.B. A New Two-Constant Equation of State. I&EC Fundam. 1976, 15(1), 59."""
     __title__="Peng-Robinson (1976)"
     __status__="PR"
+    u=2
+    w=-1
 
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        aci=[]
-        mi=[]
-        for componente in mezcla.componente:
-            a, b, ac, m=self.__lib(componente, T)
-            ai.append(a)
-            bi.append(b)
-            aci.append(ac)
-            mi.append(m)
-        self.kij=mezcla.Kij(PR)
-        a, b=mezcla.Mixing_Rule([ai, bi], self.kij)
-        tdadt=0
-        for i in range(len(mezcla.componente)):
-            for j in range(len(mezcla.componente)):
-                tdadt-=mezcla.fraccion[i]*mezcla.fraccion[j]*mi[j]*(aci[i]*aci[j]*mezcla.componente[j].tr(T))**0.5*(1-self.kij[i][j])
-
-        self.ai=ai
-        self.bi=bi
-        self.b=b
-        self.tita=a
-        self.delta=2*b
-        self.epsilon=-b**2
-        self.eta=b
-
-        self.u=2
-        self.w=-1
-
-        self.dTitadT=tdadt
-        super(PR, self).__init__(T, P, mezcla)
+    def _parameters(self, mezcla, T):
+        ai, bi, aci, mi=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(PR)
+        return ai, bi, kij, self._dTitadT(mezcla, T, kij, aci, mi)
 
 
     def __lib(self, compuesto, T):
@@ -657,38 +570,13 @@ class PR_SV(Cubic):
     Stryjek, R.; Vera, J.H. PRSV2: A Cubic Equation of State for Accurate Vapor-Liquid Equilibria Calculations. Can. J. Chem. Eng. 1986b, 64, 820."""
     __title__="PR-SV (1986)"
     __status__="PR-SV"
+    u=2
+    w=-1
 
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        aci=[]
-        mi=[]
-        for componente in mezcla.componente:
-            a, b, ac, m=self.__lib(componente, T)
-            ai.append(a)
-            bi.append(b)
-            aci.append(ac)
-            mi.append(m)
-        self.kij=mezcla.Kij(PR)
-        a, b=mezcla.Mixing_Rule([ai, bi], self.kij)
-        tdadt=0
-        for i in range(len(mezcla.componente)):
-            for j in range(len(mezcla.componente)):
-                tdadt-=mezcla.fraccion[i]*mezcla.fraccion[j]*mi[j]*(aci[i]*aci[j]*mezcla.componente[j].tr(T))**0.5*(1-self.kij[i][j])
-
-        self.ai=ai
-        self.bi=bi
-        self.b=b
-        self.tita=a
-        self.delta=2*b
-        self.epsilon=-b**2
-        self.eta=b
-
-        self.u=2
-        self.w=-1
-
-        self.dTitadT=tdadt
-        super(PR_SV, self).__init__(T, P, mezcla)
+    def _parameters(self, mezcla, T):
+        ai, bi, aci, mi=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(PR)
+        return ai, bi, kij, self._dTitadT(mezcla, T, kij, aci, mi)
 
 
     def __lib(self, compuesto, T):
@@ -731,38 +619,13 @@ class PR_Gasem(Cubic):
     Gasem, Gao, Pan & Robinson: Fluid Phase Equilibria, 181, 113-125 (2001)"""
     __title__="PR Gassem (2001)"
     __status__="PR-Gas"
+    u=2
+    w=-1
 
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        aci=[]
-        mi=[]
-        for componente in mezcla.componente:
-            a, b, ac, m=self.__lib(componente, T)
-            ai.append(a)
-            bi.append(b)
-            aci.append(ac)
-            mi.append(m)
-        self.kij=mezcla.Kij(PR)
-        a, b=mezcla.Mixing_Rule([ai, bi], self.kij)
-        tdadt=0
-        for i in range(len(mezcla.componente)):
-            for j in range(len(mezcla.componente)):
-                tdadt-=mezcla.fraccion[i]*mezcla.fraccion[j]*mi[j]*(aci[i]*aci[j]*mezcla.componente[j].tr(T))**0.5*(1-self.kij[i][j])
-
-        self.ai=ai
-        self.bi=bi
-        self.b=b
-        self.tita=a
-        self.delta=2*b
-        self.epsilon=-b**2
-        self.eta=b
-
-        self.u=2
-        self.w=-1
-
-        self.dTitadT=tdadt
-        super(PR_Gasem, self).__init__(T, P, mezcla)
+    def _parameters(self, mezcla, T):
+        ai, bi, aci, mi=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(PR)
+        return ai, bi, kij, self._dTitadT(mezcla, T, kij, aci, mi)
 
 
     def __lib(self, compuesto, T):
@@ -779,36 +642,13 @@ class PR_Melhem(Cubic):
     Melhem, G.A.; Saini, R.; Goodwin, B.M. A Modified Peng-Robinson Equation of State. Fluid Phase Eq. 1989, 47, 189."""
     __title__="PR Melhem (1989)"
     __status__="PR-Mel"
+    u=2
+    w=-1
 
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        aci=[]
-        for componente in mezcla.componente:
-            a, b, ac=self.__lib(componente, T)
-            ai.append(a)
-            bi.append(b)
-            aci.append(ac)
-        self.kij=mezcla.Kij(PR)
-        a, b=mezcla.Mixing_Rule([ai, bi], self.kij)
-        tdadt=0
-        for i in range(len(mezcla.componente)):
-            for j in range(len(mezcla.componente)):
-                tdadt-=mezcla.fraccion[i]*mezcla.fraccion[j]*(aci[i]*aci[j]*mezcla.componente[j].tr(T))**0.5*(1-self.kij[i][j])
-
-        self.ai=ai
-        self.bi=bi
-        self.b=b
-        self.tita=a
-        self.delta=2*b
-        self.epsilon=-b**2
-        self.eta=b
-
-        self.u=2
-        self.w=-1
-
-        self.dTitadT=tdadt
-        super(PR_Melhem, self).__init__(T, P, mezcla)
+    def _parameters(self, mezcla, T):
+        ai, bi, aci=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(PR)
+        return ai, bi, kij, self._dTitadT(mezcla, T, kij, aci)
 
 
     def __lib(self, compuesto, T):
@@ -824,36 +664,13 @@ class PR_Almeida(Cubic):
     Almeida, G.S.; Aznar, M. and Silva Telles, A., Uma Nova Forma de Dependência com a Temperatura do Termo Atrativo de Equaçöes de Estado Cúbicas, RBE, Cad. Eng. Quim., 8, 95-123, (1991)"""
     __title__="PR Almeida (1991)"
     __status__="PR-Alm"
+    u=2
+    w=-1
 
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        aci=[]
-        for componente in mezcla.componente:
-            a, b, ac=self.__lib(componente, T)
-            ai.append(a)
-            bi.append(b)
-            aci.append(ac)
-        self.kij=mezcla.Kij(PR)
-        a, b=mezcla.Mixing_Rule([ai, bi], self.kij)
-        tdadt=0
-        for i in range(len(mezcla.componente)):
-            for j in range(len(mezcla.componente)):
-                tdadt-=mezcla.fraccion[i]*mezcla.fraccion[j]*(aci[i]*aci[j]*mezcla.componente[j].tr(T))**0.5*(1-self.kij[i][j])
-
-        self.ai=ai
-        self.bi=bi
-        self.b=b
-        self.tita=a
-        self.delta=2*b
-        self.epsilon=-b**2
-        self.eta=b
-
-        self.u=2
-        self.w=-1
-
-        self.dTitadT=tdadt
-        super(PR_Almeida, self).__init__(T, P, mezcla)
+    def _parameters(self, mezcla, T):
+        ai, bi, aci=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(PR)
+        return ai, bi, kij, self._dTitadT(mezcla, T, kij, aci)
 
 
     def __lib(self, compuesto, T):
@@ -869,38 +686,13 @@ class PR_Mathias_Copeman(Cubic):
     Mathias, P.M., Copeman, T.W.: Extension of the Peng-Robinson equation of the various forms of the local composition concept. Fluid Phase Equilibria 13, 91-108."""
     __title__="PR-Mathias-Copeman (1983)"
     __status__="PR-MC"
+    u=2
+    w=-1
 
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        aci=[]
-        mi=[]
-        for componente in mezcla.componente:
-            a, b, ac, m=self.__lib(componente, T)
-            ai.append(a)
-            bi.append(b)
-            aci.append(ac)
-            mi.append(m)
-        self.kij=mezcla.Kij(PR)
-        a, b=mezcla.Mixing_Rule([ai, bi], self.kij)
-        tdadt=0
-        for i in range(len(mezcla.componente)):
-            for j in range(len(mezcla.componente)):
-                tdadt-=mezcla.fraccion[i]*mezcla.fraccion[j]*mi[j]*(aci[i]*aci[j]*mezcla.componente[j].tr(T))**0.5*(1-self.kij[i][j])
-
-        self.ai=ai
-        self.bi=bi
-        self.b=b
-        self.tita=a
-        self.delta=2*b
-        self.epsilon=-b**2
-        self.eta=b
-
-        self.u=2
-        self.w=-1
-
-        self.dTitadT=tdadt
-        super(PR_Mathias_Copeman, self).__init__(T, P, mezcla)
+    def _parameters(self, mezcla, T):
+        ai, bi, aci, mi=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(PR)
+        return ai, bi, kij, self._dTitadT(mezcla, T, kij, aci, mi)
 
 
     def __lib(self, compuesto, T):
@@ -922,38 +714,13 @@ class PR_Yu_Lu(Cubic):
     Yu, J.-M.; Lu, B.C.-Y. A three-parameter cubic equation of state for asymmetric mixture density calculations. Fluid Phase Eq. 1987, 34, 1."""
     __title__="PR-Yu Lu (1987)"
     __status__="PR-YL"
+    u=2
+    w=-1
 
-    def __init__(self, T, P, mezcla):
-        ai=[]
-        bi=[]
-        aci=[]
-        mi=[]
-        for componente in mezcla.componente:
-            a, b, ac, m=self.__lib(componente, T)
-            ai.append(a)
-            bi.append(b)
-            aci.append(ac)
-            mi.append(m)
-        self.kij=mezcla.Kij(PR)
-        a, b=mezcla.Mixing_Rule([ai, bi], self.kij)
-        tdadt=0
-        for i in range(len(mezcla.componente)):
-            for j in range(len(mezcla.componente)):
-                tdadt-=mezcla.fraccion[i]*mezcla.fraccion[j]*mi[j]*(aci[i]*aci[j]*mezcla.componente[j].tr(T))**0.5*(1-self.kij[i][j])
-
-        self.ai=ai
-        self.bi=bi
-        self.b=b
-        self.tita=a
-        self.delta=2*b
-        self.epsilon=-b**2
-        self.eta=b
-
-        self.u=2
-        self.w=-1
-
-        self.dTitadT=tdadt
-        super(PR_Yu_Lu, self).__init__(T, P, mezcla)
+    def _parameters(self, mezcla, T):
+        ai, bi, aci, mi=self._components(mezcla, T, self.__lib)
+        kij=mezcla.Kij(PR)
+        return ai, bi, kij, self._dTitadT(mezcla, T, kij, aci, mi)
 
 
     def __lib(self, compuesto, T):
@@ -0,0 +1,311 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# Calculation of project files without gui, for batch or regression runs
+#   - DataStream: Pure python reader/writer of the QDataStream subset used in
+#       project files
+#   - setup: Prepare environment and config files without gui
+#   - loadProject: Load a project file with its config in memory
+#   - runProject: Load, solve and report the results of a project file
+#   - runBatch: Run several project files in a process pool
+#   - writeJSON, writeCSV: Save the results of runBatch
+#
+# Command line usage:
+#   python -m lib.batch [-j processes] [--json file] [--csv file] files
+###############################################################################
+
+import os
+import struct
+import sys
+import time
+import traceback
+
+if "pychemqt" not in os.environ:
+    os.environ["pychemqt"] = os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))) + os.sep
+
+
+class DataStream(object):
+    """Minimal replacement of QDataStream in Qt_4_2 version to read and write
+    project files without Qt, only the types used in entities are supported:
+        int32: big endian signed integer
+        string: uint32 length, bytes and null character
+        float: big endian single precision float"""
+    def __init__(self, fh):
+        self.fh = fh
+
+    def _read(self, n):
+        data = self.fh.read(n)
+        if len(data) != n:
+            raise IOError("unexpected end of file")
+        return data
+
+    def readInt32(self):
+        return struct.unpack(">i", self._read(4))[0]
+
+    def readFloat(self):
+        return struct.unpack(">f", self._read(4))[0]
+
+    def readString(self):
+        length = struct.unpack(">I", self._read(4))[0]
+        if length == 0xFFFFFFFF:
+            return ""
+        return self._read(length).rstrip("\0")
+
+    def writeInt32(self, value):
+        self.fh.write(struct.pack(">i", value))
+
+    def writeFloat(self, value):
+        self.fh.write(struct.pack(">f", value))
+
+    def writeString(self, value):
+        value = str(value)+"\0"
+        self.fh.write(struct.pack(">I", len(value)))
+        self.fh.write(value)
+
+
+def setup():
+    """Prepare the environment for calculation without gui, the optional
+    modules availability and the config files are checked as in gui start,
+    but the currency rates are copied from the archived file"""
+    import shutil
+    from tools.dependences import optional_modules, findModule
+    for module, use in optional_modules:
+        if module in os.environ:
+            continue
+        if findModule(module):
+            os.environ[module] = "True"
+        else:
+            os.environ[module] = ""
+
+    from lib import firstrun
+    from lib.config import conf_dir
+    if not os.path.isdir(conf_dir):
+        os.mkdir(conf_dir)
+    if not os.path.isfile(conf_dir + "pychemqtrc"):
+        Preferences = firstrun.Preferences()
+        Preferences.write(open(conf_dir + "pychemqtrc", "w"))
+    if not os.path.isfile(conf_dir + "pychemqtrc_temporal"):
+        Config = firstrun.config()
+        Config.write(open(conf_dir + "pychemqtrc_temporal", "w"))
+    if not os.path.isfile(conf_dir + "CostIndex.dat"):
+        with open(os.environ["pychemqt"] + "dat/costindex.dat") as cost_index:
+            lista = cost_index.readlines()[-1][:-1].split(" ")
+            with open(conf_dir + "CostIndex.dat", "w") as archivo:
+                for data in lista:
+                    archivo.write(data + os.linesep)
+    if not os.path.isfile(conf_dir+"moneda.dat"):
+        origen = os.environ["pychemqt"]+"dat"+os.sep+"moneda.dat"
+        shutil.copy(origen, conf_dir+"moneda.dat")
+
+
+def loadProject(path):
+    """Load the project saved in file path, the project config is used in
+    memory so the config files aren't changed"""
+    setup()
+    from lib.project import Project
+
+    with open(path, "rb") as fh:
+        stream = DataStream(fh)
+        magic = stream.readInt32()
+        if magic != Project.MAGIC_NUMBER:
+            raise IOError("unrecognized file type")
+        version = stream.readInt32()
+        if version < Project.FILE_VERSION:
+            raise IOError("old and unreadable file format")
+        elif version > Project.FILE_VERSION:
+            raise IOError("new and unreadable file format")
+
+        project = Project()
+        project.loadFromStream(stream, huella=False, memory=True)
+    return project
+
+
+def _value(value):
+    """Convert a property value to a json compatible value, SI units"""
+    if value is None or isinstance(value, (bool, int, long)):
+        return value
+    elif isinstance(value, float):
+        return float(value)
+    elif isinstance(value, (list, tuple)):
+        return [_value(v) for v in value]
+    elif isinstance(value, str):
+        return value.decode("utf-8", "replace")
+    elif isinstance(value, unicode):
+        return value
+    else:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return unicode(value)
+
+
+def entityResults(entity):
+    """Return a dict with the properties of entity reported in gui, with the
+    attribute name as key"""
+    results = {"class": entity.__class__.__name__,
+               "status": getattr(entity, "status", 0),
+               "msg": _value(getattr(entity, "msg", "")),
+               "properties": {}}
+    if not results["status"]:
+        return results
+    for name, attr, unit in entity.propertiesNames():
+        if attr in ("className", "notasPlain"):
+            continue
+        if isinstance(attr, tuple):
+            key = attr[1]
+        else:
+            key = attr
+        try:
+            value = entity._prop(attr)
+        except Exception:
+            value = None
+        results["properties"][key] = _value(value)
+    return results
+
+
+def runProject(path, processes=0):
+    """Load, solve and return the results of a project file as a dict with
+    the streams and equipment properties and the solver report, errors are
+    returned in the error key so a bad file don't stop a batch"""
+    result = {"file": path, "error": "", "time": 0}
+    start = time.time()
+    try:
+        project = loadProject(path)
+        result["converged"] = project.solve(processes=processes)
+        result["failed"] = project.failed
+        result["loops"] = [dict((k, _value(v)) for k, v in loop.iteritems())
+                           for loop in project.loops]
+        result["streams"] = {}
+        for key, stream in project.streams.iteritems():
+            result["streams"][str(key)] = entityResults(stream[-1])
+        result["equipment"] = {}
+        for key, item in project.items.iteritems():
+            if key[0] == "e":
+                result["equipment"][key] = entityResults(item)
+    except Exception:
+        result["error"] = traceback.format_exc()
+    result["time"] = time.time()-start
+    return result
+
+
+def _runProcess(path):
+    """Worker of runBatch, each project is run in a process"""
+    return runProject(path)
+
+
+def runBatch(paths, processes=None, callback=None):
+    """Run all the project files in paths using a pool with processes
+    workers, None to use all the cpu cores. callback is called with each
+    result when it's available. Return the results in the paths order"""
+    from multiprocessing import Pool
+
+    if processes == 1:
+        results = []
+        for path in paths:
+            result = runProject(path)
+            results.append(result)
+            if callback:
+                callback(result)
+        return results
+
+    pool = Pool(processes)
+    results = {}
+    try:
+        for result in pool.imap_unordered(_runProcess, paths):
+            results[result["file"]] = result
+            if callback:
+                callback(result)
+    finally:
+        pool.close()
+        pool.join()
+    return [results[path] for path in paths]
+
+
+def writeJSON(results, fh):
+    """Save the results of runBatch in json format"""
+    import json
+    json.dump(results, fh, indent=1, sort_keys=True)
+
+
+def writeCSV(results, fh):
+    """Save the results of runBatch in csv format, a row for each value with
+    columns file, entity, property, index and value, easy to compare between
+    runs"""
+    import csv
+    writer = csv.writer(fh)
+    writer.writerow(["file", "entity", "property", "index", "value"])
+
+    def row(path, entity, prop, value):
+        if isinstance(value, list):
+            for i, val in enumerate(value):
+                writer.writerow([path, entity, prop, i, _csv(val)])
+        else:
+            writer.writerow([path, entity, prop, "", _csv(value)])
+
+    for result in results:
+        path = result["file"]
+        if result["error"]:
+            row(path, "", "error", result["error"].strip().split("\n")[-1])
+            continue
+        row(path, "", "converged", result["converged"])
+        row(path, "", "failed", result["failed"])
+        for kind, prefix in (("streams", "s"), ("equipment", "")):
+            for key in sorted(result[kind]):
+                entity = result[kind][key]
+                name = prefix+key
+                row(path, name, "status", entity["status"])
+                for prop in sorted(entity["properties"]):
+                    row(path, name, prop, entity["properties"][prop])
+
+
+def _csv(value):
+    if isinstance(value, unicode):
+        return value.encode("utf-8")
+    elif isinstance(value, float):
+        return repr(value)
+    return value
+
+
+def main(argv=None):
+    """Command line entry point"""
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="python -m lib.batch",
+        description="Calculate pychemqt project files without gui")
+    parser.add_argument("files", nargs="+", help="project files (.pcq)")
+    parser.add_argument("-j", "--processes", type=int, default=None,
+                        help="number of worker processes, default all cores")
+    parser.add_argument("--json", help="save results to json file")
+    parser.add_argument("--csv", help="save results to csv file")
+    args = parser.parse_args(argv)
+
+    setup()
+
+    def report(result):
+        if result["error"]:
+            status = "ERROR " + result["error"].strip().split("\n")[-1]
+        elif result["converged"]:
+            status = "OK"
+        elif result["failed"]:
+            status = "FAILED " + ", ".join(result["failed"])
+        else:
+            status = "NOT CONVERGED"
+        print("%s %0.2fs %s" % (result["file"], result["time"], status))
+        sys.stdout.flush()
+
+    results = runBatch(args.files, args.processes, report)
+    if args.json:
+        with open(args.json, "w") as fh:
+            writeJSON(results, fh)
+    if args.csv:
+        with open(args.csv, "wb") as fh:
+            writeCSV(results, fh)
+
+    errors = len([r for r in results if r["error"]])
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# Memoizing cache for thermodynamic state calculation
+#   - StateCache: Bounded LRU cache with hit and miss counters
+#   - stateCache: Global instance used by MEoS, IAPWS97 and GERG
+#   - cached: Decorator to put the cache in front of a calculo method
+#   - clear: Global hook to clear all cache content
+#
+# The cache is disabled by default, it must be enabled explicitly with
+# stateCache.enable(), useful in iterative equipment or flowsheet calculation
+# where the same state is calculated again and again.
+###############################################################################
+
+from collections import OrderedDict
+from functools import wraps
+
+
+def stateKey(value, digits=12):
+    """Return a hashable version of value, rounding floats to the significant
+    digits specified, so slight numerical differences share key. Entities
+    are replaced by its input key and numpy arrays by its values"""
+    if isinstance(value, bool) or value is None:
+        return value
+    elif isinstance(value, (int, long, float)):
+        return float("%.*g" % (digits, value))
+    elif isinstance(value, (list, tuple)):
+        return tuple([stateKey(v, digits) for v in value])
+    elif isinstance(value, dict):
+        return tuple([(k, stateKey(value[k], digits)) for k in sorted(value)])
+    elif hasattr(value, "inputKey"):
+        return value.inputKey()
+    elif hasattr(value, "tolist"):
+        return stateKey(value.tolist(), digits)
+    else:
+        return value
+
+
+class StateCache(object):
+    """Least recently used cache for calculated states
+
+    Each item save the instance attributes after a calculation, the
+    attributes are shared between the instances restored from cache so it
+    mustn't be changed in place"""
+    def __init__(self, size=1000):
+        self.enabled = False
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def enable(self, size=None):
+        if size is not None:
+            self.size = size
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self.clear()
+
+    def clear(self):
+        """Remove all saved states and reset counters"""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the value saved for key, None if it isn't in cache"""
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+        self._data[key] = value
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self._data.pop(key, None)
+        self._data[key] = value
+        while len(self._data) > self.size:
+            self._data.popitem(last=False)
+
+    def info(self):
+        """Return a dict with cache statistic"""
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "size": self.size,
+                "current": len(self._data)}
+
+    def __len__(self):
+        return len(self._data)
+
+
+stateCache = StateCache()
+
+
+def clear():
+    """Global hook to clear the state cache, call when the calculation
+    parameters change outside the cache key"""
+    stateCache.clear()
+
+
+def cached(calculo):
+    """Decorator for the calculo method of thermodynamic classes, the class
+    must define a _stateKey method returning a hashable key from its input
+    values, or None if the state mustn't be cached"""
+    @wraps(calculo)
+    def wrapper(self):
+        if not stateCache.enabled:
+            return calculo(self)
+
+        key = self._stateKey()
+        if key is None:
+            return calculo(self)
+
+        state = stateCache.get(key)
+        if state is not None:
+            self.__dict__.update(state)
+            return
+
+        calculo(self)
+        state = self.__dict__.copy()
+        del state["kwargs"]
+        stateCache.set(key, state)
+    return wrapper
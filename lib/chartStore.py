@@ -0,0 +1,135 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# Columnar store for precomputed meos chart data
+#   - chartName: Name of chart data for a fluid, equation, reference state and
+#       resolution
+#   - save: Save chart data
+#   - load: Load chart data, only the properties requested
+#
+# Each chart is saved as a uncompressed numpy .npz file, with an array for
+# each property of each type of line. The isolines of a type are
+# concatenated in the same array, with two index arrays:
+#   kind:values: value of fixed property of each isoline
+#   kind:offsets: index of first point of each isoline, and the end
+# Undefined values are saved as nan. The members of npz file are read only
+# when accessed, so loading a chart read only the properties used in axes.
+#
+# The files are saved in conf_dir/mEoS, the dat/mEoS folder of installation
+# is used as read only fallback for distributed data
+###############################################################################
+
+import os
+
+from numpy import array, concatenate, cumsum, float64, int64, load as _load
+from numpy import savez
+
+from lib.config import conf_dir
+from lib.utilities import replaceFile
+
+
+VERSION = 1
+chartDir = conf_dir+"mEoS"+os.sep
+_dirs = [chartDir, os.environ["pychemqt"]+"dat"+os.sep+"mEoS"+os.sep]
+_config = ("fluid", "eq", "visco", "thermal")
+
+
+def chartName(fluid, eq, ref, points):
+    """Return the name of chart data
+        fluid: class of meos fluid
+        eq: index of equation used
+        ref: code of reference state
+        points: number of points for line segment"""
+    return "%s-%i-%s-%i" % (fluid.__name__, eq, ref, points)
+
+
+def save(name, data):
+    """Save chart data
+        name: name of chart, from chartName
+        data: dict with the lines of chart, with the config dict and a dict
+            of properties values for each line or a dict of isolines with
+            the fixed value as key"""
+    arrays = {"version": array(VERSION)}
+    for key in _config:
+        arrays["config:%s" % key] = array(data["config"][key])
+
+    for kind, lines in data.iteritems():
+        if kind == "config":
+            continue
+        if lines and isinstance(lines.keys()[0], str):
+            for prop, values in lines.iteritems():
+                arrays["%s:%s" % (kind, prop)] = array(values, dtype=float64)
+        else:
+            values = sorted(lines)
+            arrays["%s:values" % kind] = array(values, dtype=float64)
+            if not values:
+                arrays["%s:offsets" % kind] = array([0], dtype=int64)
+                continue
+            props = lines[values[0]].keys()
+            length = [len(lines[value][props[0]]) for value in values]
+            arrays["%s:offsets" % kind] = concatenate(
+                ([0], cumsum(length))).astype(int64)
+            for prop in props:
+                column = [array(lines[value][prop], dtype=float64)
+                          for value in values]
+                arrays["%s:%s" % (kind, prop)] = concatenate(column)
+
+    if not os.path.isdir(chartDir):
+        os.makedirs(chartDir)
+    temp = chartDir+name+".tmp.npz"
+    with open(temp, "wb") as archivo:
+        savez(archivo, **arrays)
+    replaceFile(temp, chartDir+name+".npz")
+
+
+def load(name, props=None):
+    """Load chart data, return None if it's not available or it's saved
+    with other format version
+        name: name of chart, from chartName
+        props: list of properties to load, default all"""
+    for folder in _dirs:
+        filename = folder+name+".npz"
+        if os.path.isfile(filename):
+            break
+    else:
+        return None
+
+    archivo = _load(filename)
+    try:
+        if "version" not in archivo.files or archivo["version"] != VERSION:
+            return None
+
+        columns = {}
+        for member in archivo.files:
+            if ":" in member:
+                kind, prop = member.split(":", 1)
+                columns.setdefault(kind, []).append(prop)
+
+        data = {}
+        data["config"] = {}
+        for key in _config:
+            data["config"][key] = int(archivo["config:%s" % key])
+        for kind, available in columns.iteritems():
+            if kind == "config":
+                continue
+            if props is None:
+                keys = [p for p in available if p not in ("values", "offsets")]
+            else:
+                keys = [p for p in props if p in available]
+
+            if "values" in available:
+                values = archivo["%s:values" % kind]
+                offsets = archivo["%s:offsets" % kind]
+                cols = dict([(p, archivo["%s:%s" % (kind, p)]) for p in keys])
+                data[kind] = {}
+                for i, value in enumerate(values):
+                    ini, end = offsets[i], offsets[i+1]
+                    data[kind][float(value)] = dict(
+                        [(p, cols[p][ini:end]) for p in keys])
+            else:
+                data[kind] = dict(
+                    [(p, archivo["%s:%s" % (kind, p)]) for p in keys])
+    finally:
+        archivo.close()
+    return data
@@ -16,13 +16,14 @@ import unidades, config, eos, sql
 class Componente(object):
     """Clase que define los compuestos químicos con todas sus caracteristicas,
     algunas sacadas de la base de datos, otras calculadas a partir de estas
-    Introduciendo el id del componente de la base de datos quedaría perfectamente definido"""
+    Introduciendo el id del componente de la base de datos quedaría perfectamente definido
+    Use getComponente to get the shared instance of a databank component"""
+    _readOnly=False
 
     def __init__(self, indice=None):
         if not indice:
             return
         self.indice=indice
-        self.Config=config.getMainWindowConfig()
         componente=sql.getElement(indice)
         self.formula=componente[1]
         self.nombre=componente[2]
@@ -198,6 +199,18 @@ class Componente(object):
         if self.C and self.H:
             self.HC=self.H/self.C
 
+    def __setattr__(self, name, value):
+        if self._readOnly:
+            raise AttributeError(QApplication.translate(
+                "pychemqt", "Shared component can't be modified"))
+        object.__setattr__(self, name, value)
+
+    @property
+    def Config(self):
+        """Configuration of current project, for transport properties
+        methods"""
+        return unidades.unidad.Config
+
     def tr(self,T):
        return T/self.Tc
     def pr(self,P):
@@ -1251,6 +1264,32 @@ class Componente(object):
         return P/z/R_atml/T
 
 
+_registry={}
+
+
+def getComponente(indice):
+    """Return the shared read-only instance of the databank component indice,
+    it's calculated only the first time it's requested"""
+    indice=int(indice)
+    try:
+        return _registry[indice]
+    except KeyError:
+        componente=Componente(indice)
+        object.__setattr__(componente, "_readOnly", True)
+        _registry[indice]=componente
+        return componente
+
+
+def clearComponentes(indices=None):
+    """Discard the shared instances of indices, all if not specified, must be
+    called when the databank is edited"""
+    if indices is None:
+        _registry.clear()
+    else:
+        for indice in indices:
+            _registry.pop(int(indice), None)
+
+
 class newComponente(object):
     """Clase general que define la creaccion de nuevos componentes"""
     def export2Component(self):
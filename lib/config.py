@@ -5,6 +5,7 @@
 # Module with configuration tools
 #   - getComponents: Get component list from project
 #   - getMainWindowConfig: Return config of current project
+#   - setMainWindowConfig: Set in memory config of current project
 #   - Entity: General class for model object
 #   - Fluid: dict class wiih custom properties
 
@@ -29,7 +30,8 @@ import os
 
 from ConfigParser import ConfigParser
 from PyQt4 import QtGui
-from lib.sql import databank
+from lib.sql import getElement
+from lib.cache import stateKey
 
 
 conf_dir = os.path.expanduser('~') + os.sep+".pychemqt"+os.sep
@@ -59,9 +61,7 @@ def getComponents(solidos=False, config=None, name=True):
         nombres = []
         M = []
         for componente in indices:
-            databank.execute("select nombre, peso_molecular from compuestos \
-where id == %s" % str(componente))
-            texto = databank.fetchone()
+            texto = getElement(componente)[2:4]
             nombres.append(texto[0])
             M.append(texto[1])
         return indices, nombres, M
@@ -69,8 +69,23 @@ where id == %s" % str(componente))
         return indices
 
 
+# Project configuration set in memory for calculation without gui
+_config = None
+
+
+def setMainWindowConfig(config):
+    """Set the config of current project in memory, used instead of main
+    window or pychemqtrc_temporal config, None to restore the usual
+    behaviour"""
+    global _config
+    _config = config
+
+
 def getMainWindowConfig():
     """Return config of current project"""
+    if _config is not None:
+        return _config
+
     # FIXME: For now need pychemqtrc_temporal for save config of last project
     widget = QtGui.QApplication.activeWindow()
     config = None
@@ -109,8 +124,13 @@ class Entity(object):
     Child class include:
         -Corriente, Mezcla, Solids
         -equipment
+
+    The input key of entity is a hashable value of its kwargs, with the input
+    entities replaced by its own input key, used to skip the calculation
+    when the inputs don't change
     """
     _bool = False
+    _inputKey = None
     kwargs_forbidden = ["entrada"]
     notas = ""
     notasPlain = ""
@@ -162,6 +182,15 @@ class Entity(object):
     def __nonzero__(self):
         return self._bool
 
+    def inputKey(self):
+        """Return a hashable key with the input values of entity"""
+        return (self.__class__.__name__, stateKey(self.kwargs))
+
+    @property
+    def dirty(self):
+        """Entity with inputs changed since its last calculation"""
+        return self.inputKey() != self._inputKey
+
     def show(self):
         """General function to show entity properties as key: value text"""
         for key in sorted(self.__dict__):
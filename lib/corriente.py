@@ -15,10 +15,10 @@ from scipy.optimize import fsolve, leastsq
 from scipy.special import erf
 from scipy.linalg import det
 from scipy import roots, log, sqrt, log10, exp, sin, r_, zeros
-from pylab import triu
+from numpy import triu
 from PyQt4.QtGui import QApplication
 
-from compuestos import Componente
+from compuestos import getComponente
 from bip import srk
 from physics import R_atml, R
 from lib import unidades, config
@@ -68,7 +68,7 @@ class Mezcla(config.Entity):
                 self.ids = eval(txt)
             else:
                 self.ids = txt
-        self.componente = [Componente(int(i)) for i in self.ids]
+        self.componente = [getComponente(i) for i in self.ids]
         fraccionMolar = self.kwargs.get("fraccionMolar", None)
         fraccionMasica = self.kwargs.get("fraccionMasica", None)
         caudalMasico = self.kwargs.get("caudalMasico", None)
@@ -153,10 +153,7 @@ class Mezcla(config.Entity):
                                     for q in caudalUnitarioMolar]
         self.M = unidades.Dimensionless(caudalMasico/caudalMolar)
 
-        mixing = [self.Mix_van_der_Waals, self.Mix_Stryjek_Vera,
-                  self.Mix_Panagiotopoulos, self.Mix_Melhem]
-        conf = config.getMainWindowConfig().getint("Thermo", "Mixing")
-        self.Mixing_Rule = mixing[conf]
+        self._mixing = config.getMainWindowConfig().getint("Thermo", "Mixing")
 
         if tipo == 0:
             self._bool = False
@@ -369,6 +366,14 @@ class Mezcla(config.Entity):
 #        return unidades.Temperature(Tc), unidades.Pressure(Pc, "atm"), unidades.SpecificVolume(VcCorr/self.M, "lg")
 
     # Mixing Rules
+    @property
+    def Mixing_Rule(self):
+        """Mixing rule selected in configuration, the option is saved as
+        index so the instance can be pickled"""
+        mixing = [self.Mix_van_der_Waals, self.Mix_Stryjek_Vera,
+                  self.Mix_Panagiotopoulos, self.Mix_Melhem]
+        return mixing[self._mixing]
+
     def Mix_van_der_Waals(self, parameters, kij):
         """Miwing rules of van der Waals"""
         ai = parameters[0]
@@ -837,7 +842,7 @@ class Mezcla(config.Entity):
 
     def Tension_inferfacial_water(self, T):
         """Método de cálculo de la tensión interfacial entre agua e hidrocarburos, API procedure 10B1.3, pag 1007"""
-        agua = Componente(62)
+        agua = getComponente(62)
         sigma_w=agua.Tension_parametrica(T).dyncm
         sigma_h=self.Tension_superficial(T).dyncm
         return unidades.Tension(sigma_h+sigma_w-1.1*sqrt(sigma_h*sigma_w), "dyncm")
@@ -1113,7 +1118,7 @@ class Solid(config.Entity):
             self.ids = eval(txt)
         else:
             self.ids = txt
-        self.componente = [Componente(int(i)) for i in self.ids]
+        self.componente = [getComponente(i) for i in self.ids]
         
         caudal = self.kwargs.get("caudalSolido", [])
         diametro_medio = self.kwargs.get("diametroMedio", 0.0)
@@ -1698,6 +1703,28 @@ class Corriente(config.Entity):
                               tdb=self.T, w=xw/xa)
         return psystream
 
+    def envelope(self, **kwargs):
+        """Phase envelope of stream composition, with GERG if it's the
+        thermodynamic method of stream or with the K equation of state,
+        starting at atmospheric pressure in the dew side, see
+        lib.eos.PhaseEnvelope for the continuation options and the returned
+        dict, with the pressures converted to Pa"""
+        if self._thermo == "gerg":
+            mix = self.cmp._mix
+            return mix.envelope(self.cmp._x, **kwargs)
+
+        eos = getattr(self, "eos", None)
+        if eos is None:
+            T = getattr(self, "T", None) or 298.15
+            eos = EoS.K[self.Config.getint("Thermo", "K")](T, 1., self.mezcla)
+        envelope = eos.envelope(**kwargs)
+        envelope["P"] = [unidades.Pressure(P, "atm") for P in envelope["P"]]
+        for key in ("critical", "cricondenbar", "cricondentherm"):
+            if envelope[key]:
+                T, P = envelope[key]
+                envelope[key] = (T, unidades.Pressure(P, "atm"))
+        return envelope
+
     def clone(self, **kwargs):
         """Create a new stream instance with change only kwags new values"""
         old_kwargs = self.kwargs.copy()
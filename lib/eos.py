@@ -5,10 +5,15 @@
 # Library to add EoS common functionality
 ###############################################################################
 
+from copy import copy
+
 from scipy import exp, log, log10, tan, sinh, tanh, arctan, sqrt
 from scipy import roots, r_
 from scipy.constants import pi, Avogadro, R
 from scipy.optimize import fsolve
+from numpy import absolute, array, dot, empty, polyfit, zeros
+from numpy import exp as exp_a, log as log_a
+from numpy.linalg import solve, LinAlgError
 
 import unidades
 import config
@@ -83,6 +88,127 @@ def volume_Correction_Peneloux(compuesto):
     return 0.40768*(0.29441-compuesto.rackett)*R_atml*compuesto.Tc/compuesto.Pc.atm
 
 
+def RachfordRice(zi, Ki, tol=1e-12, maxiter=100):
+    """Solve the Rachford-Rice equation for the vapor fraction, using Newton
+    iteration safeguarded by bisection in the interval between the
+    asymptotes, where the function is monotone so the convergence is
+    guaranteed, Leibovici, C.F.; Neoschil, J. A new look at the
+    Rachford-Rice equation. Fluid Phase Equilib. 1992, 74, 303.
+    The vapor fraction can be outside the 0-1 range (negative flash)"""
+    zi=array(zi, dtype=float)
+    ci=array(Ki, dtype=float)-1
+    if ci.max()<=0:
+        return 0.
+    elif ci.min()>=0:
+        return 1.
+
+    xmin=-1/ci.max()
+    xmax=-1/ci.min()
+    x=0.5
+    for i in range(maxiter):
+        t=ci/(1+x*ci)
+        f=dot(zi, t)
+        if f>0:
+            xmin=x
+        else:
+            xmax=x
+        x_new=x+f/dot(zi, t*t)
+        if not xmin<x_new<xmax:
+            x_new=(xmin+xmax)/2
+        if abs(x_new-x)<tol:
+            return x_new
+        x=x_new
+    return x
+
+
+def _vertex(x, y):
+    """Extreme of the parabola through the three points x, y, the middle
+    point is returned if the vertex is out of the points range"""
+    a, b, c=polyfit(x, y, 2)
+    if a!=0:
+        xv=-b/2/a
+        if min(x)<=xv<=max(x):
+            return xv, c-b**2/4/a
+    return x[1], y[1]
+
+
+def PhaseEnvelope(X, J, newton, Pmin, step=0.1, maxstep=0.3, maxpoints=500):
+    """Phase envelope tracing by continuation from a converged saturation
+    point, Michelsen, M.L. Calculation of phase envelopes and critical points
+    for multicomponent mixtures. Fluid Phase Equilib. 1980, 4, 1.
+
+    The variables X are the lnK of components, lnT and lnP. In each step the
+    specified variable is the one with larger sensitivity along the curve,
+    the next point is extrapolated with the tangent from the jacobian and
+    the step is adapted to the number of Newton iterations needed
+
+        X: variables in the initial point
+        J: jacobian of the equations in X, the specification is the last row
+        newton: function newton(X, s, S) solving the point with the variable
+            s specified to S, return the solution, the jacobian, the
+            convergence state and the number of iterations
+        Pmin: pressure where the tracing stop in the other side
+
+    Return a dict with T, P and K lists of points, and the critical point,
+    cricondenbar and cricondentherm as (T, P) tuples, None if not found"""
+    N=len(X)-2
+    Ts=[exp_a(X[N])]
+    Ps=[exp_a(X[N+1])]
+    Ks=[exp_a(X[:N])]
+    critical=None
+    direction=1
+    h=step
+    e=zeros(N+2)
+    e[-1]=1
+    while len(Ts)<maxpoints:
+        # Sensitivity of the variables with the specified one
+        try:
+            tangent=direction*solve(J, e)
+        except LinAlgError:
+            break
+        s=absolute(tangent).argmax()
+        direction=1 if tangent[s]>0 else -1
+        tangent/=abs(tangent[s])
+        Xo=X
+        X, J_new, converged, iterations=newton(Xo+h*tangent, s, Xo[s]+direction*h)
+        if not converged:
+            h/=2
+            X=Xo
+            if h<1e-4:
+                break
+            continue
+        J=J_new
+
+        lnK=X[:N]
+        k=absolute(Xo[:N]).argmax()
+        if Xo[k]*lnK[k]<0 and critical is None:
+            # The partition coefficients change sign in critical point
+            f=Xo[k]/(Xo[k]-lnK[k])
+            Xc=Xo+f*(X-Xo)
+            critical=(exp_a(Xc[N]), exp_a(Xc[N+1]))
+
+        Ts.append(exp_a(X[N]))
+        Ps.append(exp_a(X[N+1]))
+        Ks.append(exp_a(lnK))
+        if iterations<4:
+            h=min(h*1.5, maxstep)
+        elif iterations>8:
+            h/=2
+        if Ps[-1]<Pmin:
+            break
+
+    cricondenbar=None
+    cricondentherm=None
+    if len(Ts)>2:
+        i=min(max(int(array(Ps).argmax()), 1), len(Ts)-2)
+        cricondenbar=_vertex(Ts[i-1:i+2], Ps[i-1:i+2])
+        i=min(max(int(array(Ts).argmax()), 1), len(Ts)-2)
+        P, T=_vertex(Ps[i-1:i+2], Ts[i-1:i+2])
+        cricondentherm=(T, P)
+    return {"T": Ts, "P": Ps, "K": Ks, "critical": critical,
+            "cricondenbar": cricondenbar, "cricondentherm": cricondentherm}
+
+
 class EoS(object):
     def __init__(self, T, P, mezcla, **kwargs):
         self.T = unidades.Temperature(T)
@@ -92,88 +218,299 @@ class EoS(object):
         self.fraccion = mezcla.fraccion
         self.kwargs = kwargs
 
-    def _Flash(self):
-        """Cálculo de los coeficientes de reparto entre fases, Ref Naji - Conventional and rapid flash claculations"""
+    def _Flash(self, tol=1e-10, maxiter=100):
+        """Cálculo de los coeficientes de reparto entre fases, Ref Naji - Conventional and rapid flash claculations
+
+        Successive substitution in lnK accelerated every five iterations with
+        the dominant eigenvalue method (GDEM), Crowe, A.M.; Nishio, M.
+        Convergence promotion in the simulation of chemical processes - the
+        general dominant eigenvalue method. AIChE J. 1975, 21, 528.
+        Near the solution it switch to Newton steps with numerical jacobian.
+        The convergence details are saved in the convergence attribute"""
+        zi=array(self.fraccion, dtype=float)
+
         #Estimación inicial de K mediante correlación wilson Eq 19
-        Ki=[]
-        for i in self.componente:
-            Ki.append(i.Pc/self.P*exp(5.37*(1.+i.f_acent)*(1.-i.Tc/self.T)))
-
-        Rachford=lambda x: sum([zi*(ki-1.)/(1.-x+x*ki) for zi, ki in zip(self.fraccion, Ki)])
-
-        if Rachford(0)>0 and Rachford(1)>0: #x>1, por tanto solo fase vapor
-            xi=self.fraccion
-            yi=self.fraccion
-            x=1.
-        elif Rachford(0)<0 and Rachford(1)<0: #x<0, por tanto solo fase líquida
-            xi=self.fraccion
-            yi=self.fraccion
-            x=0.
-        else:
-            x=0.5
-            while True:
-                xo=x
-                solucion=fsolve(Rachford, x, full_output=True)
-                if solucion[2]!=1:
-                    print solucion
-                    break
-                else:
-                    x=solucion[0][0]
-
-                    xi=[]
-                    yi=[]
-                    for zi, ki in zip(self.fraccion, Ki):
-                        xi.append(float(zi/(1-x+x*ki)))
-                        yi.append(float(zi*ki/(1-x+x*ki)))
-
-                    tital=self._fug(self.Z[1], xi)
-                    titav=self._fug(self.Z[0], yi)
-                    fiv=[z*t*self.P for z, t in zip(yi, titav)]
-                    fil=[z*t*self.P for z, t in zip(xi, tital)]
-                    #criterio de convergencia Eq 21
-                    if sum([abs(l/v-1) for l, v in zip(fil, fiv)])< 1e-14 and abs(x-xo) < 1e-10:
-                        break
-                    else:
-                        Ki=[l/v for l, v in zip(tital, titav)]
+        Ki=self._Wilson(self.T, self.P.atm)
+
+        self.convergence={"converged": True, "iterations": 0, "error": 0.,
+                          "method": ""}
+        if dot(zi, Ki-1)>0 and 1-dot(zi, 1/Ki)>0: #x>1, por tanto solo fase vapor
+            return 1., self.fraccion, self.fraccion, Ki.tolist()
+        elif dot(zi, Ki-1)<0 and 1-dot(zi, 1/Ki)<0: #x<0, por tanto solo fase líquida
+            return 0., self.fraccion, self.fraccion, Ki.tolist()
+
+        method="SS"
+        lnK=log_a(Ki)
+        x, xi, yi, lnKs=self._successiveSubstitution(zi, lnK)
+        g=lnKs-lnK
+        g_old=None
+        error=absolute(g).max()
+        for iteration in range(1, maxiter+1):
+            if error<tol:
+                break
+
+            if error<1e-4:
+                # Newton step near convergence, accepted only if it improves
+                try:
+                    lnKn=self._newtonStep(zi, lnK, g)
+                except LinAlgError:
+                    lnKn=None
+                if lnKn is not None:
+                    step=self._successiveSubstitution(zi, lnKn)
+                    gn=step[3]-lnKn
+                    if absolute(gn).max()<error:
+                        method="Newton"
+                        lnK=lnKn
+                        x, xi, yi, lnKs=step
+                        g=gn
+                        g_old=None
+                        error=absolute(g).max()
+                        continue
+
+            lnK_new=lnKs
+            if iteration%5==0 and g_old is not None:
+                # Dominant eigenvalue extrapolation
+                lamb=dot(g, g)/dot(g, g_old)
+                if 0<lamb<1:
+                    lnK_new=lnK_new+g*lamb/(1-lamb)
+                    method="GDEM"
+            g_old=g
+            lnK=lnK_new
+            x, xi, yi, lnKs=self._successiveSubstitution(zi, lnK)
+            g=lnKs-lnK
+            error=absolute(g).max()
+
+        self.convergence={"converged": error<tol, "iterations": iteration,
+                          "error": error, "method": method}
 
         if x < 0:
             x = 0
         elif x > 1:
             x = 1
-            
-        return x, xi, yi, Ki
-
-
-    def _Bubble_T(self):
-        def f(T):
-            eq=self.__class__(T, self.P.atm, self.mezcla)
-            return sum([k*x for k, x in zip(eq.Ki, self.fraccion)])-1.
 
-        T=fsolve(f, self.T)
+        return x, xi.tolist(), yi.tolist(), exp_a(lnKs).tolist()
+
+    def _fugacityCoefficients(self, xi, yi):
+        """Return the liquid and vapor fugacity coefficients of components,
+        K-value models not based in fugacity coefficients must override it"""
+        return self._fug(self.Z[1], xi), self._fug(self.Z[0], yi)
+
+    def _successiveSubstitution(self, zi, lnK):
+        """Successive substitution step, return the phase compositions for
+        distribution coefficients K and the updated lnK"""
+        Ki=exp_a(lnK)
+        x=RachfordRice(zi, Ki)
+        xi=zi/(1+x*(Ki-1))
+        yi=Ki*xi
+        tital, titav=self._fugacityCoefficients(xi, yi)
+        return x, xi, yi, log_a(array(tital, dtype=float)/array(titav, dtype=float))
+
+    def _newtonStep(self, zi, lnK, g, h=1e-7):
+        """Newton step for the successive substitution residual g(lnK) with
+        forward difference jacobian"""
+        n=len(lnK)
+        J=empty((n, n))
+        for j in range(n):
+            lnKj=lnK.copy()
+            lnKj[j]+=h
+            J[:, j]=(self._successiveSubstitution(zi, lnKj)[3]-lnKj-g)/h
+        return lnK-solve(J, g)
+
+
+    def _Wilson(self, T, P):
+        """Partition coefficients estimation with Wilson correlation
+        T: temperature, K
+        P: pressure, atm"""
+        Pc=array([i.Pc.atm for i in self.componente])
+        Tc=array([i.Tc for i in self.componente])
+        w=array([i.f_acent for i in self.componente])
+        return Pc/P*exp_a(5.37*(1.+w)*(1.-Tc/T))
+
+    def _setState(self, T, P):
+        """Change the temperature and pressure of the equation without
+        flash calculation, the equations with T, P dependent parameters
+        must override it, this version build a new instance
+        P: pressure, atm"""
+        self.__dict__.update(self.__class__(T, P, self.mezcla).__dict__)
+
+    def _lnKDerivative(self, xi, yi, var):
+        """Logarithm of partition coefficients for the phase compositions at
+        the state T, P and its derivative respect to the logarithm of the
+        variable var, "T" or "P", calculated by forward difference, the
+        equations can override it with analytic expressions"""
+        tital, titav=self._fugacityCoefficients(xi, yi)
+        lnK=log_a(array(tital, dtype=float)/array(titav, dtype=float))
+
+        h=1e-6
+        eq=copy(self)
+        if var=="T":
+            eq._setState(self.T*exp_a(h), self.P.atm)
+        else:
+            eq._setState(self.T, self.P.atm*exp_a(h))
+        tital, titav=eq._fugacityCoefficients(xi, yi)
+        lnKh=log_a(array(tital, dtype=float)/array(titav, dtype=float))
+        return lnK, (lnKh-lnK)/h
+
+    def _saturation(self, bubble, var, K=None, value=None, tol=1e-10,
+                    maxiter=50):
+        """Bubble or dew point at the pressure or temperature of state
+        Newton iteration in the logarithm of the unknown variable for
+        ln ΣKi·zi=0 in the bubble point or ln Σzi/Ki=0 in the dew point,
+        with the composition of the incipient phase updated in each step.
+        The equation is evaluated in a copy of state changing only its T, P
+        dependent parameters
+
+            bubble: True for bubble point, False for dew point
+            var: unknown variable, "T" or "P", the other is the state value
+            K: Initial partition coefficients, by default it's estimated
+               with Wilson correlation
+            value: Initial value of unknown variable, K or atm
+
+        Return a dict with the T, P (atm), partition coefficients K and
+        the incipient phase composition, the converged K can be used to
+        start other saturation point calculation"""
+        zi=array(self.fraccion, dtype=float)
+        T=float(self.T)
+        P=self.P.atm
+        if value is not None:
+            if var=="T":
+                T=float(value)
+            else:
+                P=float(value)
+        if bubble:
+            sign=1
+        else:
+            sign=-1
+
+        if K is None:
+            # Initial value of unknown variable from Wilson correlation
+            Tc=array([i.Tc for i in self.componente])
+            w=array([i.f_acent for i in self.componente])
+            for i in range(maxiter):
+                lnK=log_a(self._Wilson(T, P))
+                Kz=zi*exp_a(sign*lnK)
+                f=log_a(Kz.sum())
+                if var=="T":
+                    step=-f/(sign*dot(Kz, 5.37*(1.+w)*Tc/T)/Kz.sum())
+                else:
+                    step=f/sign
+                step=max(min(step, 0.5), -0.5)
+                if var=="T":
+                    T*=exp_a(step)
+                else:
+                    P*=exp_a(step)
+                if abs(step)<1e-6:
+                    break
+            K=self._Wilson(T, P)
+        lnK=log_a(array(K, dtype=float))
+
+        eq=copy(self)
+        converged=False
+        for iteration in range(1, maxiter+1):
+            eq._setState(T, P)
+            Kz=zi*exp_a(sign*lnK)
+            if bubble:
+                xi, yi=zi, Kz/Kz.sum()
+            else:
+                xi, yi=Kz/Kz.sum(), zi
+            lnK_new, dlnK=eq._lnKDerivative(xi, yi, var)
+            Kz=zi*exp_a(sign*lnK_new)
+            f=log_a(Kz.sum())
+            df=sign*dot(Kz, dlnK)/Kz.sum()
+            error=max(abs(f), absolute(lnK_new-lnK).max())
+            lnK=lnK_new
+
+            if absolute(lnK).max()<1e-4:
+                # Trivial solution
+                break
+            step=-f/df
+            step=max(min(step, 0.2), -0.2)
+            if var=="T":
+                T*=exp_a(step)
+            else:
+                P*=exp_a(step)
+            if error<tol:
+                converged=True
+                break
+
+        Kz=zi*exp_a(sign*lnK)
+        return {"T": T, "P": P, "K": exp_a(lnK), "x": Kz/Kz.sum(),
+                "converged": converged, "iterations": iteration}
+
+    def _envelopeNewton(self, zi, beta, X, s, S, tol=1e-10, maxiter=20):
+        """Newton solution of a phase envelope point for the vapor fraction
+        beta, the variables X are lnK, lnT and lnP (atm), with the variable
+        s specified to S, the jacobian is calculated by forward difference
+        Return the solution, the jacobian and the convergence details"""
+        N=len(zi)
+        eq=copy(self)
+
+        def F(X):
+            K=exp_a(X[:N])
+            xi=zi/(1-beta+beta*K)
+            yi=K*xi
+            eq._setState(exp_a(X[N]), exp_a(X[N+1]))
+            tital, titav=eq._fugacityCoefficients(xi/xi.sum(), yi/yi.sum())
+            lnK=log_a(array(tital, dtype=float)/array(titav, dtype=float))
+            return r_[X[:N]-lnK, (yi-xi).sum(), X[s]-S]
+
+        h=1e-7
+        Fo=F(X)
+        J=empty((N+2, N+2))
+        converged=False
+        for iteration in range(1, maxiter+1):
+            for j in range(N+2):
+                Xj=X.copy()
+                Xj[j]+=h
+                J[:, j]=(F(Xj)-Fo)/h
+            try:
+                dX=solve(J, -Fo)
+            except LinAlgError:
+                break
+            # Limit the step in temperature and pressure
+            scale=min(1, 0.2/max(absolute(dX[N:]).max(), 1e-10),
+                      2/max(absolute(dX[:N]).max(), 1e-10))
+            X=X+scale*dX
+            Fo=F(X)
+            if absolute(dX).max()*scale<tol or absolute(Fo).max()<tol:
+                converged=absolute(X[:N]).max()>1e-6
+                break
+        return X, J, converged, iteration
+
+    def envelope(self, P0=1., beta=1., **kwargs):
+        """Phase envelope of the mixture for vapor fraction beta, starting
+        at P0, atm, in the dew side, see PhaseEnvelope for the other options
+        and the returned dict, with pressures in atm"""
+        zi=array(self.fraccion, dtype=float)
+        N=len(zi)
+        eq=copy(self)
+        eq._setState(self.T, P0)
+        sat=eq._saturation(False, "T")
+        X=r_[log_a(sat["K"]), log_a(sat["T"]), log_a(P0)]
+        X, J, converged, iterations=self._envelopeNewton(
+            zi, beta, X, N+1, log_a(P0))
+        if not converged:
+            return {"T": [], "P": [], "K": [], "critical": None,
+                    "cricondenbar": None, "cricondentherm": None}
+
+        def newton(X, s, S):
+            return self._envelopeNewton(zi, beta, X, s, S)
+        return PhaseEnvelope(X, J, newton, P0, **kwargs)
+
+    def _Bubble_T(self, K=None, T=None):
+        T=self._saturation(True, "T", K, T)["T"]
         return unidades.Temperature(T)
 
-    def _Bubble_P(self):
-        def f(P):
-            eq=self.__class__(self.T, P, self.mezcla)
-            return sum([k*x for k, x in zip(eq.Ki, self.fraccion)])-1.
-
-        P=fsolve(f, self.P.atm)
+    def _Bubble_P(self, K=None, P=None):
+        P=self._saturation(True, "P", K, P)["P"]
         return unidades.Pressure(P, "atm")
 
-    def _Dew_T(self):
-        def f(T):
-            eq=self.__class__(T, self.P.atm, self.mezcla)
-            return 1./sum([x/k for k, x in zip(eq.Ki, self.fraccion)])-1.
-
-        T=fsolve(f, self.T)
+    def _Dew_T(self, K=None, T=None):
+        T=self._saturation(False, "T", K, T)["T"]
         return unidades.Temperature(T)
 
-    def _Dew_P(self):
-        def f(P):
-            eq=self.__class__(self.T, P, self.mezcla)
-            return sum([x/k for k, x in zip(eq.Ki, self.fraccion)])-1.
-
-        P=fsolve(f, self.P.atm)
+    def _Dew_P(self, K=None, P=None):
+        P=self._saturation(False, "P", K, P)["P"]
         return unidades.Pressure(P, "atm")
 
 
@@ -101,20 +101,21 @@ class Freesteam(object):
                 freesteam.steam_pv, freesteam.steam_Ts, freesteam.steam_Tx][self._thermo]
         fluido = func(self.var1, self.var2)
 
-        self.M = unidades.Dimensionless(mEoS.H2O.M)
+        H2O = mEoS.__all__[mEoS.id_mEoS.index(62)]
+        self.M = unidades.Dimensionless(H2O.M)
         self.Pc = unidades.Pressure(freesteam.PCRIT)
         self.Tc = unidades.Temperature(freesteam.TCRIT)
         self.rhoc = unidades.Density(freesteam.RHOCRIT*self.M)
-        self.Tt = mEoS.H2O.Tt
-        self.Tb = mEoS.H2O.Tb
-        self.f_accent = unidades.Dimensionless(mEoS.H2O.f_acent)
-        self.momentoDipolar = mEoS.H2O.momentoDipolar
+        self.Tt = H2O.Tt
+        self.Tb = H2O.Tb
+        self.f_accent = unidades.Dimensionless(H2O.f_acent)
+        self.momentoDipolar = H2O.momentoDipolar
 
         self.phase = self.getphase(fluido)
         self.x = unidades.Dimensionless(fluido.x)
-        self.name = mEoS.H2O.name
-        self.synonim = mEoS.H2O.synonym
-        self.CAS = mEoS.H2O.CASNumber
+        self.name = H2O.name
+        self.synonim = H2O.synonym
+        self.CAS = H2O.CASNumber
 
         self.T = unidades.Temperature(fluido.T)
         self.P = unidades.Pressure(fluido.p)
@@ -10,19 +10,23 @@
 #   hydrogen sulfide, nonane, decane from 2008 update
 ###############################################################################
 
-# TODO: Not implemented gas-liquid equilibrium yet
-
 import cPickle
 import os
+from functools import wraps
 
-from scipy import exp, log, zeros, r_
-from scipy.constants import R
-from scipy.optimize import fsolve
+from numpy import (absolute, array, clip, concatenate, diag, dot, empty, eye,
+                   isfinite, ones, outer, sqrt, triu_indices, where, zeros)
+from numpy import exp as exp_a, log as log_a
+from numpy.linalg import solve, LinAlgError
+from scipy import exp, log
+from scipy.optimize import fsolve, brentq
 
 import unidades
+from lib.cache import cached, stateKey
 from physics import R_atml
 from lib import mEoS
 from lib.config import Fluid
+from lib.eos import RachfordRice, PhaseEnvelope
 
 Tref = 298.15
 Pref = 101325.
@@ -32,7 +36,26 @@ Pref = 101325.
 
 class GERG(object):
     """Multiparameter equation of state GERG 2008
-    ref http://dx.doi.org/10.1021/je300655b"""
+    ref http://dx.doi.org/10.1021/je300655b
+
+    Check value of GERG-2008 in AGA8 Part 2 (2017), 21 components mixture at
+    400 K and 50 MPa, ρ=12.79828626 mol/l, Z=1.17469067
+    >>> x = {"CH4": 0.77824, "N2": 0.02, "CO2": 0.06, "C2": 0.08, "C3": 0.03,
+    ...      "nC4": 0.003, "iC4": 0.0015, "nC5": 0.00165, "iC5": 0.0005,
+    ...      "nC6": 0.00215, "nC7": 0.00088, "nC8": 0.00024, "H2": 0.004,
+    ...      "O2": 0.005, "CO": 0.002, "H2O": 0.0001, "He": 0.007, "Ar": 0.001,
+    ...      "H2S": 0.0025, "nC9": 0.00015, "nC10": 0.00009}
+    >>> fraccion = [x[cmp.__name__] for cmp in GERG.componentes]
+    >>> gas = GERG(T=400, P=50, componente=range(21), fraccion=fraccion)
+    >>> print "%0.4f %0.5f" % (gas.rho/gas.M, gas.Z)
+    12.7984 1.17468
+
+    The asymmetric parameters βT and βv are tabulated in the component order
+    of GERG-2008, decane before hydrogen
+    >>> Tr, rhor = getMixture([12, 20]).reducing([0.5, 0.5])[:2]
+    >>> print "%0.4f %0.4f" % (Tr, rhor/1000)
+    433.2351 3.4482
+    """
     kwargs = {"componente": [],
               "fraccion": [],
               "T": 0.0,
@@ -45,12 +68,17 @@ class GERG(object):
               "x": None,
               "mezcla": None}
 
-    componentes = [mEoS.CH4.CH4, mEoS.N2.N2, mEoS.CO2.CO2, mEoS.C2.C2,
-                   mEoS.C3.C3, mEoS.nC4.nC4, mEoS.iC4.iC4, mEoS.nC5.nC5,
-                   mEoS.iC5.iC5, mEoS.nC6.nC6, mEoS.nC7.nC7, mEoS.nC8.nC8,
-                   mEoS.H2.H2, mEoS.O2.O2, mEoS.CO.CO, mEoS.H2O.H2O,
-                   mEoS.He.He, mEoS.Ar.Ar, mEoS.H2S.H2S, mEoS.nC9.nC9,
-                   mEoS.nC10.nC10]
+    componentes = mEoS.Fluids([
+        "CH4.CH4", "N2.N2", "CO2.CO2", "C2.C2", "C3.C3", "nC4.nC4", "iC4.iC4",
+        "nC5.nC5", "iC5.iC5", "nC6.nC6", "nC7.nC7", "nC8.nC8", "H2.H2",
+        "O2.O2", "CO.CO", "H2O.H2O", "He.He", "Ar.Ar", "H2S.H2S", "nC9.nC9",
+        "nC10.nC10"])
+
+    # Index of components in the GERG-2008 paper, the binary parameters are
+    # tabulated in this order, nonane, decane and hydrogen sulfide are
+    # appended here at end of GERG-2004 components
+    index2008 = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 14, 15, 16, 17, 19, 20,
+                 18, 12, 13]
 
     Fij = cPickle.load(open(os.environ["pychemqt"]+"dat/mEoS_Fij.pkl"))
     Prop_c = cPickle.load(open(os.environ["pychemqt"]+"dat/mEoS_Tc.pkl"))
@@ -231,12 +259,15 @@ class GERG(object):
            It need to specified state define two properties from this:
                 -T: temperature, K
                 -rho: density, kg/m3
-                -P: pressure, Pa
+                -P: pressure, MPa
                 -v: specific volume, m3/kg
                 -h: enthalpy, J/kg
                 -s: entropy, J/kgK
                 -u: internal energy, J/kg
-                -x: quality
+                -x: quality, vapor molar fraction
+
+           The phase equilibrium is calculated with the T-P, P-h, P-s, T-x
+           and P-x inputs, the others are considered single phase states
             """
         self.kwargs = GERG.kwargs.copy()
         self.__call__(**kwargs)
@@ -265,6 +296,16 @@ class GERG(object):
                 thermo += 1
         return self._definition and thermo >= 2
 
+    def _stateKey(self):
+        """Key of state in cache, the mixture composition and the input
+        values"""
+        inputs = [self.kwargs[key] for key in
+                  ("T", "P", "rho", "v", "h", "s", "u", "x")]
+        return stateKey(("GERG", self.kwargs["componente"],
+                         self.kwargs["fraccion"], inputs,
+                         getattr(self.kwargs["mezcla"], "Pc", None)))
+
+    @cached
     def calculo(self):
         T = self.kwargs["T"]
         rho = self.kwargs["rho"]
@@ -275,89 +316,38 @@ class GERG(object):
         u = self.kwargs["u"]
         x = self.kwargs["x"]
 
-        self.comp = []
-        for i in self.kwargs["componente"]:
-            c = self.componentes[i](eq="GERG", **self.kwargs)
-            self.comp.append(c)
+        self._mix = getMixture(self.kwargs["componente"])
+        self.comp = self._mix.componentes
         self.id = self.kwargs["componente"]
         self.xi = self.kwargs["fraccion"]
+        self._x = array(self.xi, dtype=float)
 
         # Critic properties for mixture,
         # eq. 7.9, 7.10 pag.125, Tabla 7.10 pag 136
-        bt = self.Prop_c["beta_t"]
-        bv = self.Prop_c["beta_v"]
-        gt = self.Prop_c["gamma_t"]
-        gv = self.Prop_c["gamma_v"]
-        c_T = zeros((len(self.comp), len(self.comp)))
-        c_rho = zeros((len(self.comp), len(self.comp)))
-        for i, cmpi in enumerate(self.comp):
-            for j, cmpj in enumerate(self.comp):
-                c_T[i, j] = 2*bt[i][j]*gt[i][j]*(cmpi.Tc*cmpj.Tc)**0.5
-                c_rho[i, j] = 2*bv[i][j]*gv[i][j]/8. * \
-                    (1./cmpi.rhoc**(1./3)+1./cmpj.rhoc**(1./3))**3
-
-        f_T = zeros((len(self.comp), len(self.comp)))
-        f_rho = zeros((len(self.comp), len(self.comp)))
-        dFT_ik = zeros((len(self.comp), len(self.comp)))
-        dFT_ki = zeros((len(self.comp), len(self.comp)))
-        dFrho_ik = zeros((len(self.comp), len(self.comp)))
-        dFrho_ki = zeros((len(self.comp), len(self.comp)))
-        for i, x_i in enumerate(self.xi):
-            for j, x_j in enumerate(self.xi):
-                f_T[i, j] = x_i*x_j*(x_i+x_j)/(bt[i][j]**2*x_i+x_j)
-                f_rho[i, j] = x_i*x_j*(x_i+x_j)/(bv[i][j]**2*x_i+x_j)
-                dFT_ik[i, j] = x_j*(x_j+x_i)/(bt[i][j]**2*x_i+x_j) + \
-                    x_j*x_i/(bt[i][j]**2*x_i+x_j) * \
-                    (1-bt[i][j]**2*(x_j+x_i)/(bt[i][j]**2*x_i+x_j))
-                dFrho_ik[i, j] = x_j*(x_j+x_i)/(bv[i][j]**2*x_i+x_j) + \
-                    x_j*x_i/(bv[i][j]**2*x_i+x_j) * \
-                    (1-bv[i][j]**2*(x_j+x_i)/(bv[i][j]**2*x_i+x_j))
-                dFT_ki[j, i] = x_j*(x_j+x_i)/(bt[i][j]**2*x_j+x_i)+x_j*x_i / \
-                    (bt[i][j]**2*x_j+x_i)*(1-(x_j+x_i)/(bt[i][j]**2*x_j+x_i))
-                dFrho_ki[j, i] = x_j*(x_j+x_i)/(bv[i][j]**2*x_j+x_i)+x_j*x_i /\
-                    (bv[i][j]**2*x_j+x_i)*(1-(x_j+x_i)/(bv[i][j]**2*x_j+x_i))
-
-        sumai_v = sumaij_v = sumai_T = sumaij_T = m = 0
-        for i, componentei in enumerate(self.comp):
-            sumai_v += self.xi[i]**2/componentei.rhoc
-            sumai_T += self.xi[i]**2*componentei.Tc
-            m += self.xi[i]*componentei.M
-            for j, componentej in enumerate(self.comp):
-                if j > i:
-                    sumaij_v += c_rho[i, j]*f_rho[i, j]
-                    sumaij_T += c_T[i, j]*f_T[i, j]
-
-        self.rhoc = unidades.Density(1./(sumai_v+sumaij_v))
-        self.Tc = unidades.Temperature(sumai_T+sumaij_T)
-        self.M = m  # g/mol
-        self.R = unidades.SpecificHeat(R/self.M, "kJkgK")
-
-        Tcxi = rhocxi = []
-        for i, componentei in enumerate(self.comp):
-            sumav1 = sumat1 = 0
-            for k in range(i):
-                sumav1 += c_rho[k, i]*dFrho_ki[k, i]
-                sumat1 += c_T[k, i]*dFT_ki[k, i]
-            sumav2 = sumat2 = 0
-            for k in range(i+1, len(self.xi)):
-                sumav2 += c_rho[i, k]*dFrho_ik[i, k]
-                sumat2 += c_T[i, k]*dFT_ik[i, k]
-
-            Tcxi.append(2*self.xi[i]*componentei.Tc+sumat1+sumat2)
-            rhocxi.append(2*self.xi[i]/componentei.rhoc+sumav1+sumav2)
+        Tr, rhor, Tcxi, rhocxi = self._mix.reducing(self._x)
+        self.M = dot(self._x, self._mix.M)  # g/mol
+        self.rhoc = unidades.Density(rhor*self.M/1000.)
+        self.Tc = unidades.Temperature(Tr)
+        self.R = unidades.SpecificHeat(self._mix.R/self.M, "kJkgK")
         self.Tcxi = Tcxi
         self.rhocxi = rhocxi
 
-        if v and not rho:
-            rho = 1./v
-
-        if T and x is not None:
-            pass
+        if T and P:
+            eq = self._mix.flashTP(self._x, T, P*1e6)
+        elif T and x is not None:
+            eq = self._mix.saturation(self._x, x, T=T)
+        elif P and x is not None:
+            eq = self._mix.saturation(self._x, x, P=P*1e6)
+        elif P and h is not None:
+            eq = self._mix.flashPH(self._x, P*1e6, h*self.M/1000.)
+        elif P and s is not None:
+            eq = self._mix.flashPS(self._x, P*1e6, s*self.M/1000.)
         else:
-            if T and P:
-                rhoo = 2.
-                rho = fsolve(lambda rho: self._solve(rho, T)["P"]-P*1e6, rhoo)
-            elif T and rho:
+            # Single phase state definitions
+            if v and not rho:
+                rho = 1./v
+
+            if T and rho:
                 pass
             elif T and h is not None:
                 rho = fsolve(lambda rho: self._solve(rho, T)["h"]-h, 200)
@@ -367,14 +357,6 @@ class GERG(object):
                 rho = fsolve(lambda rho: self._solve(rho, T)["u"]-u, 200)
             elif P and rho:
                 T = fsolve(lambda T: self._solve(rho, T)["P"]-P*1e6, 600)
-            elif P and h is not None:
-                rho, T = fsolve(lambda par: (
-                    self._solve(par[0], par[1])["P"]-P*1e6, self._solve(
-                        par[0], par[1])["h"]-h), [200, 600])
-            elif P and s is not None:
-                rho, T = fsolve(lambda par: (
-                    self._solve(par[0], par[1])["P"]-P*1e6, self._solve(
-                        par[0], par[1])["s"]-s), [200, 600])
             elif P and u is not None:
                 rho, T = fsolve(lambda par: (
                     self._solve(par[0], par[1])["P"]-P*1e6, self._solve(
@@ -399,46 +381,94 @@ class GERG(object):
                         par[0], par[1])["u"]-u), [200, 600])
             else:
                 raise IOError
+            eq = self._mix._singlePhase(self._x, float(T),
+                                        float(rho)*1000./self.M)
+
+        self.equilibrium = eq
+        beta = eq["beta"]
+        self.T = unidades.Temperature(eq["T"])
+        self.P = unidades.Pressure(eq["P"])
+        self.x = unidades.Dimensionless(beta)
+        self.xl = list(eq["x"])
+        self.xv = list(eq["y"])
+        self.Ki = list(eq["K"])
+        if beta < 1:
+            self.Liquido = self._fase(eq["T"], eq["rhoL"], eq["x"])
+        else:
+            self.Liquido = Fluid()
+        if beta > 0:
+            self.Gas = self._fase(eq["T"], eq["rhoV"], eq["y"])
+        else:
+            self.Gas = Fluid()
+
+        if 0 < beta < 1:
+            # Two phases, the extensive properties are added with the mass
+            # of each phase, the derivative properties are undefined
+            mL = (1-beta)*self.Liquido.M/self.M
+            mV = beta*self.Gas.M/self.M
+            self.v = unidades.SpecificVolume(mL*self.Liquido.v+mV*self.Gas.v)
+            self.rho = unidades.Density(1./self.v)
+            self.Z = (1-beta)*self.Liquido.Z+beta*self.Gas.Z
+            self.h = unidades.Enthalpy(mL*self.Liquido.h+mV*self.Gas.h)
+            self.s = unidades.SpecificHeat(mL*self.Liquido.s+mV*self.Gas.s)
+            self.u = unidades.Enthalpy(mL*self.Liquido.u+mV*self.Gas.u)
+            self.g = unidades.Enthalpy(mL*self.Liquido.g+mV*self.Gas.g)
+            self.cp = unidades.SpecificHeat(None)
+            self.cv = unidades.SpecificHeat(None)
+            self.w = unidades.Speed(None)
+        else:
+            if beta:
+                fase = self.Gas
+            else:
+                fase = self.Liquido
+            for key in ("rho", "v", "Z", "h", "s", "u", "g", "cp", "cv", "w"):
+                self.__setattr__(key, fase.__getattribute__(key))
 
-        fio, fiot, fiott, fiod, fiodd, fiodt, fir, firt, firtt, fird, firdd,\
-            firdt, firdtt, nfioni, nfirni = self._eq(rho, T)
-
-        # Tabla 7.1 pag 127
-        tau = self.Tc/T
-        delta = rho/self.rhoc
+        if self.kwargs["mezcla"]:
+            self.Pc = self.kwargs["mezcla"].Pc
 
-        self.T = unidades.Temperature(T)
-        self.rho = unidades.Density(rho)
-        self.v = unidades.SpecificVolume(1./rho)
-        self.P = unidades.Pressure((1+delta*fird)*self.R.JkgK*T*rho)
-        self.Z = 1+delta*fird
-        self.s = unidades.SpecificHeat(self.R.kJkgK*(tau*(fiot+firt)-fio-fir))
-        self.u = unidades.Enthalpy(self.R*T*tau*(fiot+firt))
-        self.h = unidades.Enthalpy(self.R*T*(1+tau*(fiot+firt)+delta*fird))
-        self.cp = unidades.SpecificHeat(self.R*(
+    def _fase(self, T, rho, x):
+        """Properties of a phase with molar density rho, mol/m3, and molar
+        fractions x, Tabla 7.1 pag 127"""
+        Tr, rhor = self._mix.reducing(x)[:2]
+        tau = Tr/T
+        delta = rho/rhor
+        fio, fiot, fiott, fiod, fiodd, fiodt, nfioni = self._mix.phi0(
+            tau, delta, x)
+        phir = self._mix.phir(tau, delta, x)
+        fir, firt, firtt, fird, firdd, firdt, firdtt = phir[:7]
+        M = dot(x, self._mix.M)
+        R = unidades.SpecificHeat(self._mix.R/M, "kJkgK")
+
+        fase = Fluid()
+        fase.fraccion = list(x)
+        fase.M = unidades.Dimensionless(M)
+        fase.rho = unidades.Density(rho*M/1000.)
+        fase.v = unidades.SpecificVolume(1./fase.rho)
+        fase.Z = 1+delta*fird
+        fase.s = unidades.SpecificHeat(R*(tau*(fiot+firt)-fio-fir))
+        fase.u = unidades.Enthalpy(R*T*tau*(fiot+firt))
+        fase.h = unidades.Enthalpy(R*T*(1+tau*(fiot+firt)+delta*fird))
+        fase.cp = unidades.SpecificHeat(R*(
             -tau**2*(fiott+firtt)+(1+delta*fird-delta*tau*firdt)**2 /
             (1+2*delta*fird+delta**2*firdd)))
-        self.cv = unidades.SpecificHeat(-self.R*tau**2*(fiott+firtt))
-        self.g = unidades.Enthalpy(self.R*T*(1+fio+fir+delta*fird))
-        self.w = unidades.Speed((self.R*T*(
+        fase.cv = unidades.SpecificHeat(-R*tau**2*(fiott+firtt))
+        fase.g = unidades.Enthalpy(R*T*(1+fio+fir+delta*fird))
+        fase.w = unidades.Speed((R*T*(
             1+2*delta*fird+delta**2*firdd-(1+delta*fird-delta*tau*firdt)**2 /
             tau**2/(fiott+firtt)))**0.5)
 
-        f, FI = self.fug(rho, T, nfirni)
-        Ki, xi, yi, Q = self.flash()
-        self.x = unidades.Dimensionless(Q)
-        self.xl = xi
-        self.xv = yi
-        if self.kwargs["mezcla"]:
-            self.Pc = self.kwargs["mezcla"].Pc
-        self.Liquido = Fluid()
-        self.Gas = Fluid()
+        P = rho*self._mix.R*T*fase.Z
+        lnphi = self._mix.nfirni(tau, delta, x, phir)-log_a(fase.Z)
+        fase.fi = [unidades.Dimensionless(fi) for fi in exp_a(lnphi)]
+        fase.f = [unidades.Pressure(xi*fi*P) for xi, fi in zip(x, fase.fi)]
+        return fase
 
     def fug(self, rho, T, nfirni=None):
-        if not nfirni:
+        if nfirni is None:
             tau = self.Tc/T
             delta = rho/self.rhoc
-            fir, firt, firtt, fird, firdd, firdt, firdtt, nfirni = self._phir(tau, delta)
+            nfirni = self._phir(tau, delta)[-1]
         f = []
         FI = []
         for xi, dn in zip(self.xi, nfirni):
@@ -446,41 +476,6 @@ class GERG(object):
             FI.append(dn-log(self.Z))
         return f, FI
 
-#        firn=delta*fird*(1-1./self.rhoc*n*rhodn)+tau*firt/self.Tc*n*Tcdn
-#        nfirn=fir+n*dfirn
-#        f
-
-
-#        propiedades["alfap"]=(1-delta*tau*firdt/(1+delta*fird))/T
-#        propiedades["betap"]=rho*(1+(delta*fird+delta**2*firdd)/(1+delta*fird))
-#        propiedades["fugacity"]=exp(fir+delta*fird-log(1+delta*fird))
-#        propiedades["B"]=B
-#        propiedades["C"]=C
-#        propiedades["dpdrho"]=self.R*T*(1+2*delta*fird+delta**2*firdd)
-#        propiedades["dpdT"]=self.R*rho*(1+delta*fird+delta*tau*firdt)
-#
-#        self.a=unidades.Enthalpy(self.u-self.T*self.s)
-#        self.Z=self.P*self.v/self.T/self.R.kJkgK/1000
-#        self.alfap=propiedades["alfap"]     #inversa de la temperatura
-#        self.betap=unidades.Density(propiedades["betap"])
-#
-#        self.Tr=T/self.Tc
-#
-#        self.cp0=self._Cp0(self._constants["cp"])
-#        self.gamma=-self.v/self.P.kPa*self.derivative("P", "v", "s")
-#        self.fi=propiedades["fugacity"]
-#        self.f=unidades.Pressure(self.fi*self.P)
-#        self.virialB=propiedades["B"]
-#        self.virialC=propiedades["C"]
-
-    def _eq(self, rho, T):
-        tau = self.Tc/T
-        delta = rho/self.rhoc
-        fio, fiot, fiott, fiod, fiodd, fiodt, nfioni = self._phi0(tau, delta)
-        fir, firt, firtt, fird, firdd, firdt, firdtt, nfirni = self._phir(tau, delta)
-        return (fio, fiot, fiott, fiod, fiodd, fiodt, fir, firt, firtt, fird,
-                firdd, firdt, firdtt, nfioni, nfirni)
-
     def _solve(self, rho, T):
         tau = self.Tc/T
         delta = rho/self.rhoc
@@ -488,202 +483,887 @@ class GERG(object):
         fir, firt, firtt, fird, firdd, firdt, firdtt, nfirni = self._phir(tau, delta)
         propiedades = {}
         propiedades["P"] = (1+delta*fird)*self.R.JkgK*T*rho
-        propiedades["s"] = self.R.kJkgK*(tau*(fiot+firt)-fio-fir)
-        propiedades["u"] = self.R.kJkgK*T*tau*(fiot+firt)
-        propiedades["h"] = self.R.kJkgK*T*(1+tau*(fiot+firt)+delta*fird)
+        propiedades["s"] = self.R*(tau*(fiot+firt)-fio-fir)
+        propiedades["u"] = self.R*T*tau*(fiot+firt)
+        propiedades["h"] = self.R*T*(1+tau*(fiot+firt)+delta*fird)
         return propiedades
 
     def _phi0(self, tau, delta):
         """Contribución ideal de la energía libre de Helmholtz eq. 7.5"""
+        return self._mix.phi0(tau, delta, self._x)
+
+    def _phir(self, tau, delta):
+        """Contribución residual de la energía libre de Helmholtz eq. 7.7"""
+        phir = self._mix.phir(tau, delta, self._x)
+        nfirni = self._mix.nfirni(tau, delta, self._x, phir)
+        return phir[:7]+(nfirni, )
+
+
+def _nonzero(method):
+    """Decorator for the GERGMixture equilibrium methods with the feed
+    composition as first argument, the components with null fraction are
+    removed, calculating with the mixture of the others, and added again to
+    the compositions of result"""
+    @wraps(method)
+    def wrapper(self, z, *args, **kwargs):
+        z = array(z, dtype=float)
+        z = z/z.sum()
+        mask = z > 0
+        if mask.all():
+            return method(self, z, *args, **kwargs)
+
+        mixture = getMixture(array(self.id)[mask])
+        result = method(mixture, z[mask], *args, **kwargs)
+        if isinstance(result, tuple):
+            # Stability analysis result
+            K = ones(len(z))
+            K[mask] = result[1]
+            result = result[0], K
+        elif isinstance(result, dict):
+            # The compositions of result are arrays of the reduced mixture,
+            # in phase envelope the K key is a list with an array by point
+            for key, fill in (("x", 0), ("y", 0), ("K", 1)):
+                value = result.get(key)
+                if isinstance(value, list):
+                    result[key] = [_expand(v, mask, fill) for v in value]
+                elif value is not None:
+                    result[key] = _expand(value, mask, fill)
+        return result
+    return wrapper
+
+
+def _expand(value, mask, fill):
+    """Composition array of the reduced mixture expanded to all components,
+    with fill value for the removed components"""
+    full = ones(len(mask))*fill
+    full[mask] = value
+    return full
+
+
+class GERGMixture(object):
+    """Compiled GERG-2008 equation for a set of components
+
+    The reducing functions parameters, the pure fluid residual terms and the
+    binary departure functions of the components are stacked in arrays when
+    created, so the residual Helmholtz energy of any composition is evaluated
+    in vectorized form. Use getMixture to share the instances, it's built only
+    once for each set of components.
+
+    The molar density is used here, in mol/m3, R in J/mol·K"""
+
+    def __init__(self, componente):
+        self.id = tuple(componente)
+        self.componentes = [GERG.componentes[i] for i in self.id]
+        N = len(self.id)
+        self.R = self.componentes[0].GERG["R"]
+        # The pure fluid equations are reduced with the critical parameters
+        # of GERG-2008, not with the parameters of reference equation
+        self.Tc = array([c.GERG.get("Tref", c.Tc) for c in self.componentes],
+                        dtype=float)
+        self.M = array([c.M for c in self.componentes], dtype=float)
+        self.rhoc = array([c.GERG.get("rhoref", c.rhoc)*1000./c.M
+                           for c in self.componentes])
+        self.Pc = array([c.Pc for c in self.componentes], dtype=float)
+        self.f_acent = array([c.f_acent for c in self.componentes])
+
+        # Reducing functions parameters, eq 7.9-7.10, for the pairs i<j of
+        # mixture, β is inverted when the pair is in reverse order in the
+        # GERG-2008 tables
+        i, j = triu_indices(N, 1)
+        self._i = i
+        self._j = j
+        Ii = zeros((len(i), N))
+        Ij = zeros((len(i), N))
+        Ii[range(len(i)), i] = 1
+        Ij[range(len(i)), j] = 1
+        self._Ii = Ii
+        self._Ij = Ij
+        prm = {}
+        for key in ("beta_t", "beta_v", "gamma_t", "gamma_v"):
+            prm[key] = array([GERG.Prop_c[key][min(a, b)][max(a, b)] for a, b
+                              in zip(array(self.id)[i], array(self.id)[j])])
+        index = array(GERG.index2008)[array(self.id)]
+        reverse = index[i] > index[j]
+        bt = where(reverse, 1./prm["beta_t"], prm["beta_t"])
+        bv = where(reverse, 1./prm["beta_v"], prm["beta_v"])
+        self._bT2 = bt**2
+        self._bv2 = bv**2
+        self._lastReducing = None, None
+        self._cT = 2*bt*prm["gamma_t"]*sqrt(self.Tc[i]*self.Tc[j])
+        self._cv = 2*bv*prm["gamma_v"]/8. * \
+            (self.rhoc[i]**(-1./3)+self.rhoc[j]**(-1./3))**3
+
+        # Residual terms, each one as
+        #   n·δ^d·τ^t·exp(-g·δ^c-η·(δ-ε)²-β·(δ-γ))
+        # the pure fluid terms with η=β=0 and the departure function terms
+        # with g=c=0, every term is owned by a component or by a pair
+        coef = {key: [] for key in ("n", "d", "t", "g", "c", "eta", "eps",
+                                    "beta", "gamma", "owner")}
+
+        def add(owner, n, d, t, **kw):
+            # The coefficient lists are zipped, some have extra values
+            size = min([len(n), len(d), len(t)]+[len(v) for v in kw.values()])
+            coef["n"] += n[:size]
+            coef["d"] += d[:size]
+            coef["t"] += t[:size]
+            for key in ("g", "c", "eta", "eps", "beta", "gamma"):
+                coef[key] += kw.get(key, [0]*size)[:size]
+            coef["owner"] += [owner]*size
+
+        for k, cmp in enumerate(self.componentes):
+            cte = cmp.GERG
+            add(k, cte["nr1"], cte["d1"], cte["t1"])
+            add(k, cte["nr2"], cte["d2"], cte["t2"], g=cte["gamma2"],
+                c=cte["c2"])
+
+        self._F = zeros(len(i))
+        for p, (a, b) in enumerate(zip(array(self.id)[i], array(self.id)[j])):
+            cte = GERG.fir_ij.get("%i-%i" % (min(a, b), max(a, b)))
+            if cte:
+                self._F[p] = GERG.Fij[a][b]
+                add(N+p, cte["nr1"], cte["d1"], cte["t1"])
+                if cte["nr2"]:
+                    add(N+p, cte["nr2"], cte["d2"], cte["t2"], eta=cte["n2"],
+                        eps=cte["e2"], beta=cte["b2"], gamma=cte["g2"])
+
+        for key, value in coef.items():
+            coef[key] = array(value, dtype=float)
+        self._coef = coef
+        owner = zeros((coef["n"].size, N+len(i)))
+        owner[range(coef["n"].size), coef["owner"].astype(int)] = 1
+        self._owner = owner
+
+        # Ideal gas contribution is calculated with the pure fluid equation
+        self._phi0 = []
+        # the unused hyperbolic terms are defined with null coefficient and
+        # temperature, change the temperature to avoid the indetermination
+        for cmp in self.componentes:
+            pure = cmp()
+            pure._ref("OTO")
+            pure._constants = cmp.GERG
+            cp = cmp.GERG["cp"].copy()
+            cp["hyp"] = [tita if ao else 1. for ao, tita in
+                         zip(cp["ao_hyp"], cp["hyp"])]
+            Fi0 = pure._PHIO(cp)
+            Fi0["R"] = cp.get("R", self.R)
+            self._phi0.append((pure, Fi0))
+
+    def reducing(self, x):
+        """Reducing temperature and molar density of mixture for the molar
+        fractions x, and its derivatives with the molar fractions, the last
+        composition result is saved to reuse in iterations"""
+        x = array(x, dtype=float)
+        key = x.tostring()
+        if key != self._lastReducing[0]:
+            Tr, dTr = self._reducing(x, self.Tc, self._cT, self._bT2)
+            vr, dvr = self._reducing(x, 1./self.rhoc, self._cv, self._bv2)
+            self._lastReducing = key, (Tr, 1./vr, dTr, -dvr/vr**2)
+        return self._lastReducing[1]
+
+    def reducingHessian(self, x):
+        """Second derivatives with the molar fractions of the reducing
+        temperature and molar density, as matrix"""
+        x = array(x, dtype=float)
+        Tr, rhor, dTr, drhor = self.reducing(x)
+        HTr = self._reducingHessian(x, self.Tc, self._cT, self._bT2)
+        Hvr = self._reducingHessian(x, 1./self.rhoc, self._cv, self._bv2)
+        dvr = -drhor/rhor**2
+        Hrhor = -Hvr*rhor**2+2*outer(dvr, dvr)*rhor**3
+        return HTr, Hrhor
+
+    def _reducing(self, x, Yc, c, b2):
+        """Reducing function eq 7.9 and derivatives, the pairs with both
+        fractions null don't contribute"""
+        xi = x[self._i]
+        xj = x[self._j]
+        den = b2*xi+xj
+        den = where(den == 0, 1, den)
+        f = xi*xj*(xi+xj)/den
+        dfi = xj*(xi+xj)/den+xi*xj/den*(1-b2*(xi+xj)/den)
+        dfj = xi*(xi+xj)/den+xi*xj/den*(1-(xi+xj)/den)
+        Y = dot(x**2, Yc)+dot(c, f)
+        dY = 2*x*Yc+dot(c*dfi, self._Ii)+dot(c*dfj, self._Ij)
+        return Y, dY
+
+    def _reducingHessian(self, x, Yc, c, b2):
+        """Second derivatives of reducing function eq 7.9, with the pair
+        function as u/d, u=xi·xj·(xi+xj), d=β²·xi+xj"""
+        xi = x[self._i]
+        xj = x[self._j]
+        d = b2*xi+xj
+        d = where(d == 0, 1, d)
+        u = xi*xj*(xi+xj)
+        ui = 2*xi*xj+xj**2
+        uj = xi**2+2*xi*xj
+        fii = 2*xj/d-2*ui*b2/d**2+2*u*b2**2/d**3
+        fjj = 2*xi/d-2*uj/d**2+2*u/d**3
+        fij = 2*(xi+xj)/d-(ui+uj*b2)/d**2+2*u*b2/d**3
+        H = diag(2*Yc+dot(c*fii, self._Ii)+dot(c*fjj, self._Ij))
+        H[self._i, self._j] = c*fij
+        H[self._j, self._i] = c*fij
+        return H
+
+    def _terms(self, tau, delta):
+        """Residual terms and its derivatives added by owner, return a array
+        with rows α, δ·α_δ, δ²·α_δδ, τ·α_τ, τ²·α_ττ, δ·τ·α_δτ, δ·τ²·α_δττ"""
+        cf = self._coef
+        d = cf["d"]
+        t = cf["t"]
+        gdc = cf["g"]*delta**cf["c"]
+        de = delta-cf["eps"]
+        E = cf["n"]*delta**d*tau**t*exp_a(
+            -gdc-cf["eta"]*de**2-cf["beta"]*(delta-cf["gamma"]))
+        K = d-cf["c"]*gdc-2*cf["eta"]*delta*de-cf["beta"]*delta
+        Kd = -d-cf["c"]*(cf["c"]-1)*gdc-2*cf["eta"]*delta**2
+        EK = E*K
+        Ett = E*t*(t-1)
+        terms = array([E, EK, E*(K**2+Kd), E*t, Ett, EK*t, Ett*K])
+        return dot(terms, self._owner)
+
+    def phir(self, tau, delta, x, hessian=False):
+        """Residual contribution to the free Helmholtz energy eq. 7.7 and
+        derivatives, return the values for the mixture and the derivatives
+        with the molar fractions of α, α_δ and α_τ, with hessian the second
+        derivatives of α with the molar fractions are added as matrix"""
+        x = array(x, dtype=float)
+        N = len(self.id)
+        owner = self._terms(tau, delta)
+        pure = owner[:, :N]
+        dep = owner[:, N:]*self._F
+        xi = x[self._i]
+        xj = x[self._j]
+        mix = dot(pure, x)+dot(dep, xi*xj)
+        dx = pure+dot(dep*xj, self._Ii)+dot(dep*xi, self._Ij)
+
+        fir, fird, firdd, firt, firtt, firdt, firdtt = mix
+        fird /= delta
+        firdd /= delta**2
+        firt /= tau
+        firtt /= tau**2
+        firdt /= delta*tau
+        firdtt /= delta*tau**2
+        result = (fir, firt, firtt, fird, firdd, firdt, firdtt,
+                  dx[0], dx[1]/delta, dx[3]/tau)
+        if hessian:
+            # Only the departure function is nonlinear in composition
+            firxx = zeros((N, N))
+            firxx[self._i, self._j] = dep[0]
+            firxx[self._j, self._i] = dep[0]
+            result += (firxx, )
+        return result
+
+    def nfirni(self, tau, delta, x, phir=None):
+        """Derivatives of residual Helmholtz energy with the mole numbers,
+        ∂(n·αr)/∂ni, eq. 7.25"""
+        x = array(x, dtype=float)
+        if phir is None:
+            phir = self.phir(tau, delta, x)
+        fir, firt, firtt, fird, firdd, firdt, firdtt, firx, firdx, firtx = \
+            phir
+        Tr, rhor, dTr, drhor = self.reducing(x)
+        n_Trni = dTr-dot(x, dTr)
+        n_rhorni = drhor-dot(x, drhor)
+        n_firni = delta*fird*(1-n_rhorni/rhor)+tau*firt*n_Trni/Tr + \
+            firx-dot(x, firx)
+        return fir+n_firni
+
+    def lnphi(self, T, rho, x):
+        """Fugacity coefficients logarithm of components at T, K and molar
+        density, mol/m3"""
+        Tr, rhor, dTr, drhor = self.reducing(x)
+        tau = Tr/T
+        delta = rho/rhor
+        phir = self.phir(tau, delta, x)
+        Z = 1+delta*phir[3]
+        return self.nfirni(tau, delta, x, phir)-log_a(Z)
+
+    def lnphiDerivatives(self, T, rho, x):
+        """Fugacity coefficients logarithm of components at T, K and molar
+        density, mol/m3, with its analytic derivatives, return:
+            lnphi: logarithm of fugacity coefficients
+            dn: n·∂lnφi/∂nj at constant T and P, as matrix
+            dT: ∂lnφi/∂lnT at constant P and composition
+            dP: ∂lnφi/∂lnP at constant T and composition
+
+        The derivatives of μi=∂(n·αr)/∂ni are calculated applying the
+        operator n·∂/∂nj at constant T, V through τ, δ and the molar
+        fractions, with the second derivatives of the reducing functions
+        and the residual terms, then converted to constant pressure,
+        Michelsen, M.L., Mollerup, J.M. Thermodynamic Models: Fundamentals
+        & Computational Aspects. 2nd Ed. Tie-Line Publications, 2007, ch. 2"""
+        x = array(x, dtype=float)
+        x = x/x.sum()
+        Tr, rhor, dTr, drhor = self.reducing(x)
+        HTr, Hrhor = self.reducingHessian(x)
+        tau = Tr/T
+        delta = rho/rhor
+        fir, firt, firtt, fird, firdd, firdt, firdtt, firx, firdx, firtx, \
+            firxx = self.phir(tau, delta, x, hessian=True)
+
+        # n·∂/∂nj of reducing functions, relative to its value
+        Tn = (dTr-dot(x, dTr))/Tr
+        Rn = (drhor-dot(x, drhor))/rhor
+        Dd = 1-Rn
+
+        # n·∂/∂nj of n·∂Y/∂ni/Y for the reducing functions
+        def reducing2(H, Y, Yn):
+            Hx = dot(H, x)
+            return (H-Hx[:, None]-Hx[None, :]+dot(x, Hx))/Y-Yn[None, :] - \
+                outer(Yn, Yn)
+        DTn = reducing2(HTr, Tr, Tn)
+        DRn = reducing2(Hrhor, rhor, Rn)
+
+        # n·∂/∂nj of αr derivatives
+        firxn = firx-dot(x, firx)
+        Dfird = firdx-dot(x, firdx)+tau*firdt*Tn+delta*firdd*Dd
+        Dfirt = firtx-dot(x, firtx)+tau*firtt*Tn+delta*firdt*Dd
+        G = firxx-dot(firxx, x)[:, None]+tau*outer(firtx, Tn) + \
+            delta*outer(firdx, Dd)
+        Dfirxn = G-firxn[None, :]-dot(x, G)[None, :]
+
+        mu = fir+firxn+tau*firt*Tn+delta*fird*Dd
+        nmu = (mu-fir)[None, :]+Dfirxn + \
+            tau*firt*outer(Tn, Tn)+tau*outer(Tn, Dfirt)+tau*firt*DTn + \
+            delta*fird*outer(Dd, Dd)+delta*outer(Dd, Dfird) - \
+            delta*fird*DRn
+
+        # Pressure derivatives, n·∂P/∂ni/ρRT and ∂P/∂ρ/RT
+        Pn = 1+delta*fird*(1+Dd)+delta*Dfird
+        Prho = 1+2*delta*fird+delta**2*firdd
+        Z = 1+delta*fird
+        dn = nmu+1-outer(Pn, Pn)/Prho
+        dP = Z*Pn/Prho-1
+        mut = firt+firtx-dot(x, firtx)+(firt+tau*firtt)*Tn+delta*firdt*Dd
+        dT = -tau*mut+1-Pn*(Z-delta*tau*firdt)/Prho
+        return mu-log_a(Z), dn, dT, dP
+
+    def phi0(self, tau, delta, x):
+        """Ideal gas contribution to the free Helmholtz energy eq. 7.5, the
+        pure fluid contribution is evaluated at its reduced variables"""
+        x = array(x, dtype=float)
+        Tr, rhor, dTr, drhor = self.reducing(x)
+        rho = delta*rhor
+        T = Tr/tau
         fio = fiot = fiott = fiod = fiodd = fiodt = 0
         nfioni = []   # ðnao/ðni
-        for i, componente in enumerate(self.comp):
-            deltai = delta*self.rhoc/componente.rhoc
-            taui = componente.Tc*tau/self.Tc
-            fio_, fiot_, fiott_, fiod_, fiodd_, fiodt_ = componente._phi0(
-                componente.GERG["cp"], taui, deltai)
-            fio += self.xi[i]*(fio_+log(self.xi[i]))
-            fiot += self.xi[i]*fiot_
-            fiott += self.xi[i]*fiott_
-            fiod += self.xi[i]*fiod_
-            fiodd += self.xi[i]*fiodd_
-            fiodt += self.xi[i]*fiodt_
-            nfioni.append(fio_+1+log(self.xi[i]))
+        for xk, Tc, rhoc, (pure, Fi0) in zip(x, self.Tc, self.rhoc,
+                                             self._phi0):
+            fio_, fiot_, fiott_, fiod_, fiodd_, fiodt_ = pure._phi0(
+                Fi0, Tc/T, rho/rhoc)
+            lnx = log_a(xk) if xk > 0 else 0
+            fio += xk*(fio_+lnx)
+            fiot += xk*fiot_*Tc/Tr
+            fiott += xk*fiott_*(Tc/Tr)**2
+            fiod += xk*fiod_*rhor/rhoc
+            fiodd += xk*fiodd_*(rhor/rhoc)**2
+            nfioni.append(fio_+1+lnx)
         return fio, fiot, fiott, fiod, fiodd, fiodt, nfioni
 
-    def _phir(self, tau, delta):
-        """Contribución residual de la energía libre de Helmholtz eq. 7.7"""
-        fir = firt = firtt = fird = firdd = firdt = firdtt = 0
-        firxi = []
-        firxixj = zeros((len(self.comp), len(self.comp)))
-        firdxi = []
-        firtxi = []
-
-        for i, componente in enumerate(self.comp):
-            deltai = delta*self.rhoc/componente.rhoc
-            taui = componente.Tc*tau/self.Tc
-            fir_, firt_, firtt_, fird_, firdd_, firdt_, firdtt_, B_, C_ = \
-                componente._phir(taui, deltai)
-            fir += self.xi[i]*fir_
-            firt += self.xi[i]*firt_
-            firtt += self.xi[i]*firtt_
-            fird += self.xi[i]*fird_
-            firdd += self.xi[i]*firdd_
-            firdt += self.xi[i]*firdt_
-
-            firxi.append(fir_)
-            firdxi.append(fird_)
-            firtxi.append(firt_)
-
-        # Contribución residual cruzada eq 7.8
-        for i, x_i in enumerate(self.xi):
-            for j, x_j in enumerate(self.xi):
-                if j > i:
-                    (fir_, firt_, firtt_, fird_, firdd_, firdt_, firdtt_, B_,
-                        C_) = self._phijr(i, j, tau, delta)
-                    fir += x_i*x_j*self.Fij[self.id[i]][self.id[j]]*fir_
-                    firt += x_i*x_j*self.Fij[self.id[i]][self.id[j]]*firt_
-                    firtt += x_i*x_j*self.Fij[self.id[i]][self.id[j]]*firtt_
-                    fird += x_i*x_j*self.Fij[self.id[i]][self.id[j]]*fird_
-                    firdd += x_i*x_j*self.Fij[self.id[i]][self.id[j]]*firdd_
-                    firdt += x_i*x_j*self.Fij[self.id[i]][self.id[j]]*firdt_
-
-                    firxi[i] += x_j*self.Fij[self.id[i]][self.id[j]]*fir_
-                    firxixj[i, j] = self.Fij[self.id[i]][self.id[j]]*fir_
-                    firdxi[i] += x_j*self.Fij[self.id[i]][self.id[j]]*fird_
-                    firtxi[i] += x_j*self.Fij[self.id[i]][self.id[j]]*firt_
-
-        suma = suma_rho = suma_T = 0
-        for i, x_i in enumerate(self.xi):
-            suma += x_i*firxi[i]
-            suma_rho += x_i*self.rhocxi[i]
-            suma_T += x_i*self.Tcxi[i]
-
-        n_rhocni = []
-        n_Tcni = []
-        for i, x_i in enumerate(self.xi):
-            n_rhocni.append(self.rhocxi[i]-suma_rho)
-            n_Tcni.append(self.Tcxi[i]-suma_T)
-
-        n_firni = []  # ðar/ðni
-        nfirni = []   # ðnar/ðni
-        for i, componente in enumerate(self.comp):
-            n_firni.append(delta*fird*(1-1./self.rhoc*n_rhocni[i]) +
-                           tau*firt/self.Tc*n_Tcni[i]+firxi[i]-suma)
-            nfirni.append(fir_+n_firni[i])
-        return fir, firt, firtt, fird, firdd, firdt, firdtt, nfirni
-
-    def _phijr(self, i, j, tau, delta):
-        txt = str(i)+"-"+str(j)
-        constants = self.fir_ij.get(txt, 0)
-        fir = fird = firdd = firt = firtt = firdt = firdtt = B = C = 0
-        if constants:
-            delta_0 = 1e-50
-            nr1 = constants["nr1"]
-            d1 = constants["d1"]
-            t1 = constants["t1"]
-            for i in range(len(constants.get("nr1", []))):
-                # Polinomial terms
-                fir += nr1[i]*delta**d1[i]*tau**t1[i]
-                fird += nr1[i]*d1[i]*delta**(d1[i]-1)*tau**t1[i]
-                firdd += nr1[i]*d1[i]*(d1[i]-1)*delta**(d1[i]-2)*tau**t1[i]
-                firt += nr1[i]*t1[i]*delta**d1[i]*tau**(t1[i]-1)
-                firtt += nr1[i]*t1[i]*(t1[i]-1)*delta**d1[i]*tau**(t1[i]-2)
-                firdt += nr1[i]*t1[i]*d1[i]*delta**(d1[i]-1)*tau**(t1[i]-1)
-                firdtt += nr1[i]*t1[i]*d1[i]*(t1[i]-1)*delta**(d1[i]-1)*tau**(t1[i]-2)
-                B += nr1[i]*d1[i]*delta_0**(d1[i]-1)*tau**t1[i]
-                C += nr1[i]*d1[i]*(d1[i]-1)*delta_0**(d1[i]-2)*tau**t1[i]
-
-            nr2 = constants["nr2"]
-            if nr2:
-                d2 = constants["d2"]
-                t2 = constants["t2"]
-                n2 = constants["n2"]
-                e2 = constants["e2"]
-                b2 = constants["b2"]
-                g2 = constants["g2"]
-                for i in range(len(constants.get("nr2", []))):
-                    # Gaussian terms
-                    fir += nr2[i]*delta**d2[i]*tau**t2[i] * \
-                        exp(-n2[i]*(delta-e2[i])**2-b2[i]*(tau-g2[i])**(2))
-                    fird += nr2[i]*delta**d2[i]*tau**t2[i] * \
-                        exp(-n2[i]*(delta-e2[i])**2-b2[i]*(tau-g2[i])**(2)) * \
-                        (d2[i]/delta-2*n2[i]*(delta-e2[i]))
-                    firdd += nr2[i]*tau**t2[i] * \
-                        exp(-n2[i]*(delta-e2[i])**2-b2[i]*(tau-g2[i])**(2)) * \
-                        (-2*n2[i]*delta**d2[i]+4*n2[i]**2*delta**d2[i] *
-                         (delta-e2[i])**2-4*d2[i]*n2[i]*delta**2*(delta-e2[i])+d2[i]*2*delta)
-                    firt += nr2[i]*delta**d2[i]*tau**t2[i] * \
-                        exp(-n2[i]*(delta-e2[i])**2-b2[i]*(tau-g2[i])**(2)) * \
-                        (t2[i]/tau-2*b2[i]*(tau-g2[i]))
-                    firtt += nr2[i]*delta**d2[i]*tau**t2[i] * \
-                        exp(-n2[i]*(delta-e2[i])**2-b2[i]*(tau-g2[i])**(2)) * \
-                        ((t2[i]/tau-2*b2[i]*(tau-g2[i]))**(2)-t2[i]/tau**2-2*b2[i])
-                    firdt += nr2[i]*delta**d2[i]*tau**t2[i] * \
-                        exp(-n2[i]*(delta-e2[i])**2-b2[i]*(tau-g2[i])**(2)) * \
-                        (t2[i]/tau-2*b2[i]*(tau-g2[i])) * \
-                        (d2[i]/delta-2*n2[i]*(delta-e2[i]))
-                    firdtt += nr2[i]*delta**d2[i]*tau**t2[i] * \
-                        exp(-n2[i]*(delta-e2[i])**2-b2[i]*(tau-g2[i])**(2)) * \
-                        ((t2[i]/tau-2*b2[i]*(tau-g2[i]))**(2)-t2[i]/tau**2-2*b2[i]) * \
-                        (d2[i]/delta-2*n2[i]*(delta-e2[i]))
-                    B += nr2[i]*delta_0**d2[i]*tau**t2[i] * \
-                        exp(-n2[i]*(delta_0-e2[i])**2-b2[i]*(tau-g2[i])**(2)) * \
-                        (d2[i]/delta_0-2*n2[i]*(delta_0-e2[i]))
-                    C += nr2[i]*tau**t2[i] * \
-                        exp(-n2[i]*(delta_0-e2[i])**2-b2[i]*(tau-g2[i])**(2)) * \
-                        (-2*n2[i]*delta_0**d2[i]+4*n2[i]**2*delta_0**d2[i]*(delta_0-e2[i])**2 -
-                         4*d2[i]*n2[i]*delta_0**2*(delta_0-e2[i])+d2[i]*2*delta_0)
-
-        return fir, firt, firtt, fird, firdd, firdt, firdtt, B, C
-
-    def flash(self):
-        """Cálculo de los coeficientes de reparto entre fases"""
-        #Estimación inicial de K mediante correlación wilson Eq 5.61 Pag 82
-        Ki = []
-        for componente in self.comp:
-            Ki.append(componente.Pc/self.P*exp(5.373*(1.+componente.f_acent)*(1.-componente.Tc/self.T)))
-
-        def f(Q):
-            sum = 0
-            for i, x in enumerate(self.xi):
-                sum += x*(Ki[i]-1.)/(1.+Q+Q*Ki[i])
-            return sum
-
-        if f(0) > 0 and f(1) > 0:
-            # x>1, vapor only
-            xi = self.xi
-            yi = self.xi
-            Q = 1
-        elif f(0) < 0 and f(1) < 0:
-            # x<0, liquid only
-            xi = self.xi
-            yi = self.xi
-            Q = 0
+    def pressure(self, T, rho, x):
+        """Pressure, Pa, at T, K and molar density, mol/m3"""
+        Tr, rhor = self.reducing(x)[:2]
+        delta = rho/rhor
+        fird = self.phir(Tr/T, delta, x)[3]
+        return rho*self.R*T*(1+delta*fird)
+
+    def density(self, T, P, x, rho0=None, tol=1e-12, maxiter=50):
+        """Molar density, mol/m3, of mixture at T, K and P, Pa, solved by
+        Newton iteration in ln ρ, by default start from the ideal gas
+        density, use rho0 to search for the liquid root. Return None if
+        the iteration don't find a mechanically stable root"""
+        x = array(x, dtype=float)
+        Tr, rhor, dTr, drhor = self.reducing(x)
+        tau = Tr/T
+        RT = self.R*T
+        if rho0 is None:
+            rho0 = P/RT
+        liquid = rho0 > rhor
+        rho = rho0
+        stable = None
+        spinodal = 0
+        for i in range(maxiter):
+            delta = rho/rhor
+            fir, firt, firtt, fird, firdd = self.phir(tau, delta, x)[:5]
+            dPdrho = RT*(1+2*delta*fird+delta**2*firdd)
+            if dPdrho <= 0:
+                # Inside the spinodal, go back to the last stable point, if
+                # it happen again and again the phase root don't exist
+                spinodal += 1
+                if spinodal > 5:
+                    return None
+                if stable is None:
+                    rho = rho*1.5 if liquid else rho/1.5
+                else:
+                    rho = (rho+stable)/2
+                continue
+            stable = rho
+            Pcalc = rho*RT*(1+delta*fird)
+            step = (P-Pcalc)/rho/dPdrho
+            step = max(min(step, 0.5), -0.5)
+            rho *= exp_a(step)
+            if abs(step) < tol:
+                break
+        else:
+            return None
+
+        if not liquid:
+            # The vapor root must be connected with the ideal gas, discard
+            # the spurious roots far from the range of equation with the
+            # pressure at half density
+            fird = self.phir(tau, rho/2/rhor, x)[3]
+            if not 0 < rho/2*RT*(1+rho/2/rhor*fird) < P:
+                return None
+        return rho
+
+    def _root(self, T, P, x, phase=None, rho=None):
+        """Molar density of the phase root, "liquid" or "vapor", or the root
+        with lower Gibbs free energy if phase isn't specified, if the phase
+        root don't exist return the other. In iterations the density of the
+        previous step can be given in rho as initial value"""
+        if rho is not None:
+            rho = self.density(T, P, x, rho)
+            if rho is not None:
+                return rho
+
+        rho0 = 3*self.reducing(x)[1]
+        if phase == "vapor":
+            rho = self.density(T, P, x)
+            return rho if rho is not None else self.density(T, P, x, rho0)
+        elif phase == "liquid":
+            rho = self.density(T, P, x, rho0)
+            return rho if rho is not None else self.density(T, P, x)
+
+        rhoV = self.density(T, P, x)
+        rhoL = self.density(T, P, x, rho0)
+        if rhoV is None:
+            return rhoL
+        elif rhoL is None or abs(rhoL-rhoV) < 1e-8*rhoL:
+            return rhoV
+        elif self._gr(T, rhoL, x) < self._gr(T, rhoV, x):
+            return rhoL
         else:
-            # two phases
-            Qo = 0.5
-            while True:
-                Q = Qo
-                Qo = fsolve(Vr, Q)
-                xi = []
-                yi = []
-                for i, fraccion in enumerate(self.xi):
-                    xi.append(fraccion/(1+Qo*(Ki[i]-1)))
-                    yi.append(fraccion*Ki[i]/(1+Qo*(Ki[i]-1)))
-
-                fi, Fi = self.fug(self.rho, self.T)
-                fiv = r_[yi]*r_[self.titaiv]*self.P
-                fil = r_[xi]*r_[self.titail]*self.P
-                # criterio de convergencia Eq 21
-                if sum((fil/fiv-1)**2) < 1e-15 and (Q-Qo)**2 < 1e-15:
+            return rhoV
+
+    def _gr(self, T, rho, x):
+        """Residual Gibbs free energy, gr/RT, at the state"""
+        Tr, rhor = self.reducing(x)[:2]
+        delta = rho/rhor
+        fir, firt, firtt, fird = self.phir(Tr/T, delta, x)[:4]
+        Z = 1+delta*fird
+        return fir+Z-1-log_a(Z)
+
+    def lnphiTP(self, T, P, x, phase=None, rho=None):
+        """Logarithm of fugacity coefficients at T, K and P, Pa, see _root
+        for phase and rho meaning, return too the molar density, mol/m3"""
+        x = array(x, dtype=float)
+        x = x/x.sum()
+        rho = self._root(T, P, x, phase, rho)
+        return self.lnphi(T, rho, x), rho
+
+    def _molar(self, T, rho, x):
+        """Molar enthalpy, J/mol, and entropy, J/mol·K, of a phase"""
+        Tr, rhor = self.reducing(x)[:2]
+        tau = Tr/T
+        delta = rho/rhor
+        fio, fiot = self.phi0(tau, delta, x)[:2]
+        fir, firt, firtt, fird = self.phir(tau, delta, x)[:4]
+        h = self.R*T*(1+tau*(fiot+firt)+delta*fird)
+        s = self.R*(tau*(fiot+firt)-fio-fir)
+        return h, s
+
+    def _wilson(self, T, P):
+        """Wilson estimation of partition coefficients, Eq 5.61 Pag 82"""
+        return self.Pc/P*exp_a(5.373*(1+self.f_acent)*(1-self.Tc/T))
+
+    def _singlePhase(self, z, T, rho):
+        """Equilibrium result of a single phase state, classified as vapor
+        above the reducing temperature or below the reducing density"""
+        Tr, rhor = self.reducing(z)[:2]
+        vapor = T > Tr or rho < rhor
+        return {"T": T,
+                "P": self.pressure(T, rho, z),
+                "beta": 1. if vapor else 0.,
+                "x": z,
+                "y": z,
+                "K": ones(len(z)),
+                "rhoL": rho,
+                "rhoV": rho,
+                "converged": True,
+                "iterations": 0}
+
+    @_nonzero
+    def stability(self, z, T, P, tol=1e-10, maxiter=200):
+        """Tangent plane distance stability analysis with vapor-like and
+        liquid-like trial phases started from Wilson partition coefficients,
+        solved with successive substitution.
+        Michelsen, M.L. The isothermal flash problem. Part I. Stability.
+        Fluid Phase Equilib. 1982, 9, 1-19.
+
+        Return a boolean with the stability and the partition coefficients
+        estimated from the most unstable trial phase"""
+        lnz = log_a(z)
+        lnphiz, rho = self.lnphiTP(T, P, z)
+        d = lnz+lnphiz
+        Kw = self._wilson(T, P)
+
+        stable = True
+        K = Kw
+        tm_min = -1e-8
+        for trial in (Kw, 1/Kw):
+            lnW = lnz+log_a(trial)
+            trivial = False
+            rhoW = None
+            for i in range(maxiter):
+                W = exp_a(lnW)
+                lnphiW, rhoW = self.lnphiTP(T, P, W, rho=rhoW)
+                lnW_new = d-lnphiW
+                err = absolute(lnW_new-lnW).max()
+                lnW = lnW_new
+                if dot(lnW-lnz, lnW-lnz) < 1e-8 or \
+                        not isfinite(lnW).all() or lnW.max() > 100:
+                    # Trivial solution or diverged trial phase
+                    trivial = True
+                    break
+                if err < tol:
                     break
+            if trivial:
+                continue
+            W = exp_a(lnW)
+            tm = 1-W.sum()
+            if tm < tm_min:
+                stable = False
+                tm_min = tm
+                w = W/W.sum()
+                if trial is Kw:
+                    K = w/z
                 else:
-                    Ki = r_[self.titail]/r_[self.titaiv]
-        return Ki, xi, yi, Q
-
-
-id_GERG = [i.id for i in GERG.componentes]
+                    K = z/w
+        return stable, K
+
+    def _equilibriumPhases(self, z, T, P, lnK, rhoL=None, rhoV=None):
+        """Phase split for the partition coefficients, return the residual
+        of equilibrium condition and the phases"""
+        K = exp_a(lnK)
+        beta = RachfordRice(z, K)
+        x = z/(1+beta*(K-1))
+        y = K*x
+        lnphiL, rhoL = self.lnphiTP(T, P, x, "liquid", rhoL)
+        lnphiV, rhoV = self.lnphiTP(T, P, y, "vapor", rhoV)
+        return lnK+lnphiV-lnphiL, (beta, x/x.sum(), y/y.sum(), rhoL, rhoV)
+
+    @_nonzero
+    def flashTP(self, z, T, P, tol=1e-10, maxiter=100):
+        """Isothermal flash of feed z at T, K and P, Pa
+
+        The stability analysis decide if the feed split, then the partition
+        coefficients are solved with successive substitution in lnK, near
+        the solution it switch to Newton iteration with the analytic
+        derivatives of fugacity coefficients with the mole numbers
+
+        Return a dict with the equilibrium:
+            T, P: Temperature, K and pressure, Pa
+            beta: Vapor molar fraction
+            x, y: Liquid and vapor molar fractions
+            K: Partition coefficients
+            rhoL, rhoV: Liquid and vapor molar density, mol/m3
+            converged, iterations: Convergence details"""
+        stable, K = self.stability(z, T, P)
+        if stable:
+            return self._singlePhase(z, T, self._root(T, P, z))
+
+        lnK = log_a(K)
+        g, phases = self._equilibriumPhases(z, T, P, lnK)
+        err = absolute(g).max()
+        for i in range(maxiter):
+            if err < tol:
+                break
+            rho = phases[3:]
+            if err < 1e-3:
+                try:
+                    J = self._flashJacobian(z, T, phases)
+                    lnK_new = lnK+solve(J, -g)
+                except LinAlgError:
+                    lnK_new = lnK-g
+            else:
+                lnK_new = lnK-g
+            g_new, phases_new = self._equilibriumPhases(
+                z, T, P, lnK_new, *rho)
+            err_new = absolute(g_new).max()
+            if err_new > err and err < 1e-3:
+                # Rejected Newton step, continue with successive substitution
+                lnK_new = lnK-g
+                g_new, phases_new = self._equilibriumPhases(
+                    z, T, P, lnK_new, *rho)
+                err_new = absolute(g_new).max()
+            lnK, g, phases, err = lnK_new, g_new, phases_new, err_new
+
+        beta, x, y, rhoL, rhoV = phases
+        if not 0 < beta < 1 or absolute(lnK).max() < 1e-6:
+            return self._singlePhase(z, T, self._root(T, P, z))
+        return {"T": T,
+                "P": P,
+                "beta": beta,
+                "x": x,
+                "y": y,
+                "K": exp_a(lnK),
+                "rhoL": rhoL,
+                "rhoV": rhoV,
+                "converged": err < tol,
+                "iterations": i}
+
+    def _flashJacobian(self, z, T, phases):
+        """Analytic jacobian of the equilibrium residual of
+        _equilibriumPhases with lnK, the vapor mole numbers change with lnK
+        directly and through the vapor fraction of Rachford-Rice equation"""
+        beta, x, y, rhoL, rhoV = phases
+        dnL = self.lnphiDerivatives(T, rhoL, x)[1]
+        dnV = self.lnphiDerivatives(T, rhoV, y)[1]
+        w = x*y/z
+        dv = beta*(1-beta)*diag(w)+outer(w, w)/((y-x)**2/z).sum()
+        return eye(len(z))+dot(dnV/beta+dnL/(1-beta), dv)
+
+    def _jacobian(self, f, X, F, h=1e-7):
+        """Jacobian of f by forward differences, used only to check the
+        analytic jacobians"""
+        J = empty((len(F), len(X)))
+        for j in range(len(X)):
+            Xh = X.copy()
+            Xh[j] += h
+            J[:, j] = (f(Xh)-F)/h
+        return J
+
+    @_nonzero
+    def flashPH(self, z, P, h, T0=300.):
+        """Flash of feed z at P, Pa with molar enthalpy h, J/mol"""
+        return self._flashP(z, P, h, 0, T0)
+
+    @_nonzero
+    def flashPS(self, z, P, s, T0=300.):
+        """Flash of feed z at P, Pa with molar entropy s, J/mol·K"""
+        return self._flashP(z, P, s, 1, T0)
+
+    def _flashP(self, z, P, value, index, T0):
+        """Solve the temperature of flash at P with the enthalpy or entropy
+        specified, both monotone in temperature at constant pressure so the
+        solution is bracketed and solved with brentq"""
+        def f(T):
+            eq = self.flashTP(z, T, P)
+            prop = (1-eq["beta"])*self._molar(T, eq["rhoL"], eq["x"])[index] \
+                + eq["beta"]*self._molar(T, eq["rhoV"], eq["y"])[index]
+            return prop-value
+
+        Tmin, Tmax = T0/1.2, T0*1.2
+        while f(Tmin) > 0 and Tmin > 20:
+            Tmin /= 1.5
+        while f(Tmax) < 0 and Tmax < 3000:
+            Tmax *= 1.5
+        T = brentq(f, Tmin, Tmax, xtol=1e-10)
+        return self.flashTP(z, T, P)
+
+    @_nonzero
+    def saturation(self, z, beta, T=None, P=None, tol=1e-10, maxiter=50):
+        """Point of the phase envelope with vapor molar fraction beta at
+        T, K or P, Pa specified, the bubble point with beta=0 and the dew
+        point with beta=1, return a dict as flashTP
+
+        Solved with Newton iteration in lnK, lnT, lnP from Wilson partition
+        coefficients, Michelsen, M.L. Calculation of phase envelopes and
+        critical points for multicomponent mixtures. Fluid Phase Equilib.
+        1980, 4, 1-10"""
+        X, J, converged, iterations = self._saturationPoint(
+            z, beta, T, P, tol, maxiter)
+        return self._saturationResult(z, beta, X, converged, iterations)
+
+    def _saturationPoint(self, z, beta, T, P, tol, maxiter):
+        """Solve the saturation point, return the variables lnK, lnT, lnP,
+        the jacobian and the convergence details"""
+        N = len(z)
+        if T is not None:
+            lnA = log_a(self._wilson(T, 1.))
+
+            def f(lnP):
+                K = exp_a(clip(lnA-lnP, -500, 500))
+                return dot(z, (K-1)/(1-beta+beta*K))
+            P0 = log_a(dot(z, exp_a(lnA)))
+            P1 = -log_a(dot(z, exp_a(-lnA)))
+            lnP = P0 if P0 == P1 else brentq(f, P1-1e-6, P0+1e-6)
+            X = concatenate((lnA-lnP, [log_a(T), lnP]))
+            s = N
+        elif P is not None:
+            def f(T):
+                K = exp_a(clip(log_a(self._wilson(T, P)), -500, 500))
+                return dot(z, (K-1)/(1-beta+beta*K))
+            T0 = brentq(f, 0.2*self.Tc.min(), 5*self.Tc.max())
+            X = concatenate((log_a(self._wilson(T0, P)),
+                             [log_a(T0), log_a(P)]))
+            s = N+1
+        else:
+            raise ValueError("T or P must be specified")
+
+        # The Wilson correlation is poor for nonideal mixtures, improve the
+        # initial values with successive substitution in lnK and a Newton
+        # step in the free variable for the material balance
+        v = 2*N+1-s
+        for i in range(maxiter):
+            g = self._saturationResidual(z, beta, X)[0]
+            X[:N] -= g[:N]
+            g1 = self._saturationResidual(z, beta, X)[0][N]
+            Xh = X.copy()
+            Xh[v] += 1e-6
+            g2 = self._saturationResidual(z, beta, Xh)[0][N]
+            if g2 == g1:
+                break
+            dv = max(min(-g1*1e-6/(g2-g1), 0.2), -0.2)
+            X[v] += dv
+            if absolute(g[:N]).max() < 1e-2 and abs(dv) < 1e-2:
+                break
+        return self._saturationNewton(z, beta, X, s, X[s], tol, maxiter)
+
+    def _saturationResidual(self, z, beta, X, rhox=None, rhoy=None):
+        """Residual of the equilibrium equations in a phase envelope point,
+        the phase with higher molar mass is taken as liquid, so the
+        incipient phase change to liquid after the critical point"""
+        N = len(z)
+        lnK = X[:N]
+        T = exp_a(X[N])
+        P = exp_a(X[N+1])
+        K = exp_a(lnK)
+        x = z/(1-beta+beta*K)
+        y = K*x
+        if self._lighter(x, y):
+            phases = ("liquid", "vapor")
+        else:
+            phases = ("vapor", "liquid")
+        lnphix, rhox = self.lnphiTP(T, P, x, phases[0], rhox)
+        lnphiy, rhoy = self.lnphiTP(T, P, y, phases[1], rhoy)
+        return concatenate((lnK+lnphiy-lnphix, [(y-x).sum()])), rhox, rhoy
+
+    def _saturationJacobian(self, z, beta, X, s, rhox, rhoy):
+        """Analytic jacobian of the phase envelope point equations in X,
+        with the densities of phases in the last evaluation of residual,
+        the last row is the specification of variable s"""
+        N = len(z)
+        K = exp_a(X[:N])
+        T = exp_a(X[N])
+        x = z/(1-beta+beta*K)
+        y = K*x
+        lnphix, dnx, dTx, dPx = self.lnphiDerivatives(T, rhox, x)
+        lnphiy, dny, dTy, dPy = self.lnphiDerivatives(T, rhoy, y)
+        w = x*y/z
+        J = zeros((N+2, N+2))
+        J[:N, :N] = eye(N)+dny*((1-beta)*w/y.sum())+dnx*(beta*w/x.sum())
+        J[:N, N] = dTy-dTx
+        J[:N, N+1] = dPy-dPx
+        J[N, :N] = w
+        J[N+1, s] = 1
+        return J
+
+    def _lighter(self, x, y):
+        """Check if the phase y has lower molar mass than x"""
+        return dot(y, self.M)/y.sum() <= dot(x, self.M)/x.sum()
+
+    def _saturationNewton(self, z, beta, X, s, S, tol, maxiter):
+        """Newton solution of phase envelope point with the variable s of X
+        specified to S, return the solution, the jacobian in it and the
+        convergence details"""
+        N = len(z)
+
+        # The densities of last evaluation are used as initial values
+        rho = [None, None]
+
+        def F(X):
+            g, rho[0], rho[1] = self._saturationResidual(z, beta, X, *rho)
+            return concatenate((g, [X[s]-S]))
+
+        Fo = F(X)
+        converged = False
+        for i in range(maxiter):
+            J = self._saturationJacobian(z, beta, X, s, *rho)
+            try:
+                dX = solve(J, -Fo)
+            except LinAlgError:
+                break
+            # Limit the step in temperature and pressure
+            scale = min(1, 0.2/max(absolute(dX[N:]).max(), 1e-10),
+                        2/max(absolute(dX[:N]).max(), 1e-10))
+            X = X+scale*dX
+            Fo = F(X)
+            if absolute(dX).max()*scale < tol or absolute(Fo).max() < tol:
+                converged = absolute(X[:N]).max() > 1e-6
+                break
+        return X, J, converged, i+1
+
+    def _saturationResult(self, z, beta, X, converged, iterations):
+        N = len(z)
+        T = exp_a(X[N])
+        P = exp_a(X[N+1])
+        K = exp_a(X[:N])
+        g, rhox, rhoy = self._saturationResidual(z, beta, X)
+        x = z/(1-beta+beta*K)
+        y = K*x
+        if self._lighter(x, y):
+            rhoL, rhoV, xL, yV = rhox, rhoy, x/x.sum(), y/y.sum()
+        else:
+            rhoL, rhoV, xL, yV = rhoy, rhox, y/y.sum(), x/x.sum()
+            beta = 1-beta
+            K = 1/K
+        return {"T": T,
+                "P": P,
+                "beta": beta,
+                "x": xL,
+                "y": yV,
+                "K": K,
+                "rhoL": rhoL,
+                "rhoV": rhoV,
+                "converged": converged,
+                "iterations": iterations}
+
+    @_nonzero
+    def bubblePoint(self, z, T=None, P=None):
+        """Bubble point of z at T, K or P, Pa"""
+        return self.saturation(z, 0., T=T, P=P)
+
+    @_nonzero
+    def dewPoint(self, z, T=None, P=None):
+        """Dew point of z at T, K or P, Pa"""
+        return self.saturation(z, 1., T=T, P=P)
+
+    @_nonzero
+    def envelope(self, z, P0=1e5, beta=1., **kwargs):
+        """Trace the phase envelope of z for the vapor molar fraction beta,
+        starting at P0, Pa, in the dew side for beta=1, and continuing
+        through the critical point to the other side until P0 again, see
+        lib.eos.PhaseEnvelope for the other options and the returned dict,
+        with pressures in Pa"""
+        N = len(z)
+        X, J, converged, iterations = self._saturationPoint(
+            z, beta, None, P0, 1e-10, 50)
+        if not converged:
+            return {"T": [], "P": [], "K": [], "critical": None,
+                    "cricondenbar": None, "cricondentherm": None}
+
+        def newton(X, s, S):
+            return self._saturationNewton(z, beta, X, s, S, 1e-10, 20)
+        return PhaseEnvelope(X, J, newton, P0, **kwargs)
+
+_mixtures = {}
+
+
+
+
+def getMixture(componente):
+    """Return the shared compiled GERGMixture of the componente indices, it's
+    built only the first time the set of components is requested"""
+    key = tuple([int(i) for i in componente])
+    try:
+        return _mixtures[key]
+    except KeyError:
+        mixture = GERGMixture(key)
+        _mixtures[key] = mixture
+        return mixture
+
+
+id_GERG = GERG.componentes.ids
 
 
 if __name__ == "__main__":
@@ -703,3 +1383,25 @@ if __name__ == "__main__":
 #    aire=GERG([15], [1.], P=0.1, T=500)
 #    print "%0.1f %0.4f %0.3f %0.3f %0.5f %0.4f %0.2f" % (aire.T, aire.rho, aire.h.kJkg, aire.s.kJkgK, aire.cv.kJkgK, aire.cp.kJkgK, aire.w), aire.P.MPa
 
+
+    # Check of analytic jacobians of flash and phase envelope against
+    # forward differences
+    mix = getMixture([0, 3, 4, 5])
+    z = array([0.6, 0.2, 0.12, 0.08])
+    lnK = log_a(array([3.7, 0.55, 0.14, 0.037]))
+    g, phases = mix._equilibriumPhases(z, 250., 3e6, lnK, None, None)
+    rho = phases[3:]
+    J = mix._jacobian(lambda lnK: mix._equilibriumPhases(
+        z, 250., 3e6, lnK, *rho)[0], lnK, g)
+    print "flash", absolute(mix._flashJacobian(z, 250., phases)-J).max()
+
+    X = concatenate((log_a([2.5, 0.6, 0.2, 0.08]), log_a([240., 3e6])))
+    g, rhox, rhoy = mix._saturationResidual(z, 1., X)
+
+    def F(X):
+        g = mix._saturationResidual(z, 1., X, rhox, rhoy)[0]
+        return concatenate((g, [0]))
+    J = mix._jacobian(F, X, F(X), 1e-9)
+    J[-1, -1] = 1
+    print "saturation", absolute(
+        mix._saturationJacobian(z, 1., X, 5, rhox, rhoy)-J).max()
@@ -9,10 +9,15 @@ from __future__ import division
 from math import sqrt, log, exp, tan, atan, acos, sin, pi
 from cmath import log as log_c
 
+from numpy import (asarray, broadcast_arrays, clip, errstate, maximum, nan,
+                   ones, where, zeros)
+from numpy import log as log_a
+
 from scipy.optimize import fsolve
 from PyQt4.QtGui import QApplication
 
 from lib import unidades
+from lib.cache import cached, stateKey
 from config import Fluid
 
 properties = {
@@ -177,10 +182,7 @@ def _PSat_T(T):
     >>> "%.8f" % _PSat_T(500)
     '2.63889776'
     """
-    if T < 273.15:
-        T = 273.15
-    elif T > Tc:
-        T = Tc
+    T = clip(T, 273.15, Tc)
     n = [0, 0.11670521452767E+04, -0.72421316703206E+06, -0.17073846940092E+02,
          0.12020824702470E+05, -0.32325550322333E+07, 0.14915108613530E+02,
          -0.48232657361591E+04, 0.40511340542057E+06, -0.23855557567849E+00,
@@ -198,10 +200,7 @@ def _TSat_P(P):
     >>> "%.6f" % _TSat_P(10)
     '584.149488'
     """
-    if P < 611.212677/1e6:
-        P = 611.212677/1e6
-    elif P > 22.064:
-        P = 22.064
+    P = clip(P, 611.212677/1e6, 22.064)
     n = [0, 0.11670521452767E+04, -0.72421316703206E+06, -0.17073846940092E+02,
          0.12020824702470E+05, -0.32325550322333E+07, 0.14915108613530E+02,
          -0.48232657361591E+04, 0.40511340542057E+06, -0.23855557567849E+00,
@@ -224,10 +223,7 @@ def _PSat_h(h):
     """
     hmin_Ps3 = _Region1(623.15, _PSat_T(623.15))["h"]
     hmax_Ps3 = _Region2(623.15, _PSat_T(623.15))["h"]
-    if h < hmin_Ps3:
-        h = hmin_Ps3
-    if h > hmax_Ps3:
-        h = hmax_Ps3
+    h = clip(h, hmin_Ps3, hmax_Ps3)
     nu = h/2600
     I = [0, 1, 1, 1, 1, 5, 7, 8, 14, 20, 22, 24, 28, 36]
     J = [0, 1, 3, 4, 36, 3, 0, 24, 16, 16, 3, 18, 8, 24]
@@ -432,7 +428,7 @@ def _Region1(T, P):
     propiedades["s"] = R*(Tr*gt-g)
     propiedades["cp"] = -R*Tr**2*gtt
     propiedades["cv"] = R*(-Tr**2*gtt+(gp-Tr*gpt)**2/gpp)
-    propiedades["w"] = sqrt(R*T*1000*gp**2/((gp-Tr*gpt)**2/(Tr**2*gtt)-gpp))
+    propiedades["w"] = (R*T*1000*gp**2/((gp-Tr*gpt)**2/(Tr**2*gtt)-gpp))**0.5
     propiedades["alfav"] = (1-Tr*gpt/gp)/T
     propiedades["kt"] = -Pr*gpp/gp/P
     propiedades["region"] = 1
@@ -601,7 +597,7 @@ def Region2_cp0(Tr, Pr):
     no = [-0.96927686500217E+01, 0.10086655968018E+02, -0.56087911283020E-02,
           0.71452738081455E-01, -0.40710498223928E+00, 0.14240819171444E+01,
           -0.43839511319450E+01, -0.28408632460772E+00, 0.21268463753307E-01]
-    go = log(Pr)
+    go = log_a(Pr)
     gop = Pr**-1
     gopp = -Pr**-2
     got = gott = gopt = 0
@@ -1043,7 +1039,7 @@ def _Region3(rho, T):
 
     d = rho/rhoc
     Tr = Tc/T
-    g = n[0]*log(d)
+    g = n[0]*log_a(d)
     gd = n[0]*d**-1
     gdd = -n[0]*d**-2
     gt = gtt = gdt = 0
@@ -1063,7 +1059,7 @@ def _Region3(rho, T):
     propiedades["s"] = R*(Tr*gt-g)
     propiedades["cp"] = R*(-Tr**2*gtt+(d*gd-d*Tr*gdt)**2/(2*d*gd+d**2*gdd))
     propiedades["cv"] = -R*Tr**2*gtt
-    propiedades["w"] = sqrt(R*T*1000*(2*d*gd+d**2*gdd-(d*gd-d*Tr*gdt)**2/Tr**2/gtt))
+    propiedades["w"] = (R*T*1000*(2*d*gd+d**2*gdd-(d*gd-d*Tr*gdt)**2/Tr**2/gtt))**0.5
     propiedades["alfav"] = (gd-Tr*gdt)/(2*gd+d*gdd)/T
     propiedades["kt"] = 1/(2*d*gd+d**2*gdd)/rho/R/T*1000
     propiedades["alfap"] = (1-Tr*gdt/gd)/T
@@ -2409,7 +2405,7 @@ def Region5_cp0(Tr, Pr):
     Jo = [0, 1, -3, -2, -1, 2]
     no = [-0.13179983674201e2, 0.68540841634434e1, -0.24805148933466e-1,
           0.36901534980333, -0.31161318213925e1, -0.32961626538917]
-    go = log(Pr)
+    go = log_a(Pr)
     gop = Pr**-1
     gopp = -Pr**-2
     got = gott = gopt = 0
@@ -2979,6 +2975,270 @@ def _Bound_hs(h, s):
     return region
 
 
+# Vectorized region definitions and states, the basic equations of regions
+# and the backward equations of subregions work with arrays as input too
+def _Bound_TP_array(T, P):
+    """Region definition for arrays of input T and P, region 0 for points out
+    of bound"""
+    T, P = broadcast_arrays(asarray(T, dtype=float), asarray(P, dtype=float))
+    region = zeros(T.shape, dtype=int)
+    with errstate(all="ignore"):
+        Tsat = _TSat_P(P)
+        T_b23 = _t_P(P)
+
+        low = (Pmin <= P) & (P <= Ps_623)
+        region[low & (273.15 <= T) & (T <= Tsat)] = 1
+        region[low & (Tsat < T) & (T <= 1073.15)] = 2
+
+        high = (Ps_623 < P) & (P <= 100)
+        region[high & (273.15 <= T) & (T <= 623.15)] = 1
+        region[high & (T_b23 <= T) & (T <= 1073.15)] = 2
+        region[high & (623.15 < T) & (T < T_b23)] = 3
+
+        region[(1073.15 < T) & (T <= 2273.15) & (Pmin <= P) & (P <= 50)] = 5
+    return region
+
+
+def _Bound_Px_array(P, y, key, Psat):
+    """Common region definition for arrays of input P and h or s
+    key: name of second input, h or s
+    Psat: function to calculate the saturation pressure of region 3"""
+    P, y = broadcast_arrays(asarray(P, dtype=float), asarray(y, dtype=float))
+    region = zeros(P.shape, dtype=int)
+    with errstate(all="ignore"):
+        Tsat = _TSat_P(P)
+        ymin = _Region1(273.15, P)[key]
+        y14 = _Region1(Tsat, P)[key]
+        y24 = _Region2(Tsat, P)[key]
+        y13 = _Region1(623.15, P)[key]
+        y32 = _Region2(_t_P(P), P)[key]
+        y25 = _Region2(1073.15, P)[key]
+        ymax = _Region5(2273.15, P)[key]
+        P34 = Psat(y)
+
+        low = (Pmin <= P) & (P <= Ps_623)
+        region[low & (ymin <= y) & (y <= y14)] = 1
+        region[low & (y14 < y) & (y < y24)] = 4
+        region[low & (y24 <= y) & (y <= y25)] = 2
+        region[low & (y25 < y) & (y <= ymax)] = 5
+
+        mid = (Ps_623 < P) & (P < Pc)
+        region[mid & (ymin <= y) & (y <= y13)] = 1
+        region[mid & (y13 < y) & (y < y32) & (P < P34)] = 4
+        region[mid & (y13 < y) & (y < y32) & (P >= P34)] = 3
+        region[mid & (y32 <= y) & (y <= y25)] = 2
+        region[mid & (y25 < y) & (y <= ymax)] = 5
+
+        high = (Pc <= P) & (P <= 100)
+        region[high & (ymin <= y) & (y <= y13)] = 1
+        region[high & (y13 < y) & (y < y32)] = 3
+        region[high & (y32 <= y) & (y <= y25)] = 2
+        region[high & (P <= 50) & (y25 <= y) & (y <= ymax)] = 5
+    return region
+
+
+def _Bound_Ph_array(P, h):
+    """Region definition for arrays of input P and h, region 0 for points out
+    of bound"""
+    return _Bound_Px_array(P, h, "h", _PSat_h)
+
+
+def _Bound_Ps_array(P, s):
+    """Region definition for arrays of input P and s, region 0 for points out
+    of bound"""
+    return _Bound_Px_array(P, s, "s", _PSat_s)
+
+
+def _Backward2_T_Ph_array(P, h):
+    """Backward equation for region 2 with arrays, T=f(P,h)"""
+    with errstate(all="ignore"):
+        T = where(P <= 4, _Backward2a_T_Ph(P, h), where(
+            (P <= 6.546699678) | (h >= _hbc_P(P)),
+            _Backward2b_T_Ph(P, h), _Backward2c_T_Ph(P, h)))
+    return maximum(_TSat_P(P), T)
+
+
+def _Backward2_T_Ps_array(P, s):
+    """Backward equation for region 2 with arrays, T=f(P,s)"""
+    with errstate(all="ignore"):
+        T = where(P <= 4, _Backward2a_T_Ps(P, s), where(
+            s >= 5.85, _Backward2b_T_Ps(P, s), _Backward2c_T_Ps(P, s)))
+    return maximum(_TSat_P(P), T)
+
+
+def _Backward3_vT_Ph_array(P, h):
+    """Backward equations for region 3 with arrays, v=f(P,h) and T=f(P,h)"""
+    with errstate(all="ignore"):
+        a = h <= _h_3ab(P)
+        v = where(a, _Backward3a_v_Ph(P, h), _Backward3b_v_Ph(P, h))
+        T = where(a, _Backward3a_T_Ph(P, h), _Backward3b_T_Ph(P, h))
+    return v, T
+
+
+def _Backward3_vT_Ps_array(P, s):
+    """Backward equations for region 3 with arrays, v=f(P,s) and T=f(P,s)"""
+    with errstate(all="ignore"):
+        a = s <= sc
+        v = where(a, _Backward3a_v_Ps(P, s), _Backward3b_v_Ps(P, s))
+        T = where(a, _Backward3a_T_Ps(P, s), _Backward3b_T_Ps(P, s))
+    return v, T
+
+
+def _Region_T_array(funcion, T, P, y, key, maxiter=50):
+    """Newton iteration over temperature at constant pressure for arrays
+    funcion: basic equation of region
+    T: initial values of temperature
+    y: objective values of h or s, defined by key"""
+    for i in range(maxiter):
+        fase = funcion(T, P)
+        if key == "h":
+            dT = (fase["h"]-y)/fase["cp"]
+        else:
+            dT = (fase["s"]-y)*T/fase["cp"]
+        T = T-dT
+        if (abs(dT) < 1e-10*T).all():
+            break
+    return T
+
+
+def _Region3_rho_array(rho, T, P, maxiter=50):
+    """Newton iteration over density in region 3 for arrays, rho=f(T,P)"""
+    for i in range(maxiter):
+        fase = _Region3(rho, T)
+        drho = (fase["P"]-P)*rho*fase["kt"]
+        rho = rho-drho
+        if (abs(drho) < 1e-12*rho).all():
+            break
+    return rho
+
+
+def _Region3_rhoT_array(rho, T, P, y, key, maxiter=50):
+    """Newton iteration over density and temperature in region 3 for arrays,
+    rho, T=f(P,y) with y enthalpy or entropy defined by key"""
+    for i in range(maxiter):
+        fase = _Region3(rho, T)
+        dPdrho = 1/rho/fase["kt"]
+        dPdT = fase["P"]*fase["alfap"]
+        if key == "h":
+            dydrho = 1000*(dPdrho/rho-T*dPdT/rho**2)
+            dydT = fase["cv"]+1000*dPdT/rho
+        else:
+            dydrho = -1000*dPdT/rho**2
+            dydT = fase["cv"]/T
+
+        f1 = fase["P"]-P
+        f2 = fase[key]-y
+        det = dPdrho*dydT-dPdT*dydrho
+        drho = (f1*dydT-f2*dPdT)/det
+        dT = (dPdrho*f2-dydrho*f1)/det
+        rho = rho-drho
+        T = T-dT
+        if (abs(drho) < 1e-12*rho).all() and (abs(dT) < 1e-12*T).all():
+            break
+    return rho, T
+
+
+def _fill_array(propiedades, fase, mask):
+    """Copy the properties calculated for the points in mask"""
+    for key in propiedades:
+        if fase.get(key) is not None:
+            propiedades[key][mask] = fase[key]
+
+
+def _states_array(shape, region):
+    """Empty dict of properties for the array calculation"""
+    propiedades = {"region": region.copy()}
+    for key in ("T", "P", "v", "h", "s", "cp", "cv", "w", "alfav", "kt",
+                "x"):
+        propiedades[key] = ones(shape)*nan
+    return propiedades
+
+
+def states_TP(T, P):
+    """Calculate properties for arrays of T, K and P, MPa
+    Return a dict with arrays of properties with the same keys of region
+    functions, nan for points out of bound"""
+    T, P = broadcast_arrays(asarray(T, dtype=float), asarray(P, dtype=float))
+    region = _Bound_TP_array(T, P)
+    propiedades = _states_array(T.shape, region)
+
+    with errstate(all="ignore"):
+        for r, funcion in ((1, _Region1), (2, _Region2), (5, _Region5)):
+            mask = region == r
+            if mask.any():
+                _fill_array(propiedades, funcion(T[mask], P[mask]), mask)
+
+        mask = region == 3
+        if mask.any():
+            t = T[mask]
+            p = P[mask]
+            # The backward equation in region 3 have many subregions, it's
+            # used only as initial value for points in region 3
+            rho = asarray([1/_Backward3_v_PT(Pi, Ti) for Pi, Ti in zip(p, t)])
+            rho = _Region3_rho_array(rho, t, p)
+            _fill_array(propiedades, _Region3(rho, t), mask)
+    return propiedades
+
+
+def _states_Px_array(P, y, key):
+    """Common state calculation for arrays of P and h or s"""
+    P, y = broadcast_arrays(asarray(P, dtype=float), asarray(y, dtype=float))
+    if key == "h":
+        region = _Bound_Ph_array(P, y)
+        Backward = {1: _Backward1_T_Ph, 2: _Backward2_T_Ph_array}
+        Backward3 = _Backward3_vT_Ph_array
+    else:
+        region = _Bound_Ps_array(P, y)
+        Backward = {1: _Backward1_T_Ps, 2: _Backward2_T_Ps_array}
+        Backward3 = _Backward3_vT_Ps_array
+    propiedades = _states_array(P.shape, region)
+
+    with errstate(all="ignore"):
+        for r, funcion in ((1, _Region1), (2, _Region2), (5, _Region5)):
+            mask = region == r
+            if mask.any():
+                p = P[mask]
+                if r == 5:
+                    To = 1500*ones(p.shape)
+                else:
+                    To = Backward[r](p, y[mask])
+                T = _Region_T_array(funcion, To, p, y[mask], key)
+                _fill_array(propiedades, funcion(T, p), mask)
+
+        # Two phases points over 623.15K are calculated with region 3
+        Tsat = _TSat_P(P)
+        mask = (region == 4) & (Tsat <= 623.15)
+        if mask.any():
+            p = P[mask]
+            T = Tsat[mask]
+            y1 = _Region1(T, p)[key]
+            y2 = _Region2(T, p)[key]
+            x = (y[mask]-y1)/(y2-y1)
+            _fill_array(propiedades, _Region4(p, x), mask)
+
+        mask = (region == 3) | ((region == 4) & (Tsat > 623.15))
+        if mask.any():
+            p = P[mask]
+            vo, To = Backward3(p, y[mask])
+            rho, T = _Region3_rhoT_array(1/vo, To, p, y[mask], key)
+            _fill_array(propiedades, _Region3(rho, T), mask)
+    return propiedades
+
+
+def states_Ph(P, h):
+    """Calculate properties for arrays of P, MPa and h, kJ/kg
+    Return a dict with arrays of properties with the same keys of region
+    functions, nan for points out of bound"""
+    return _states_Px_array(P, h, "h")
+
+
+def states_Ps(P, s):
+    """Calculate properties for arrays of P, MPa and s, kJ/kgK
+    Return a dict with arrays of properties with the same keys of region
+    functions, nan for points out of bound"""
+    return _states_Px_array(P, s, "s")
+
+
 def prop0(T, P):
     """Ideal gas properties"""
     if T <= 1073.15:
@@ -3018,6 +3278,9 @@ class IAPWS97(object):
 
     Optional:
     l   -   Wavelength of light, for refractive index
+    raw -   Boolean to calculate only the basic properties (T, P, v, rho, h,
+            s, cp, cv, w, x, region) as plain floats in SI units, without
+            unit objects, phases or transport properties, for inner loops
 
     Definitions options:
     T, P    Not valid for two-phases region
@@ -3091,7 +3354,8 @@ class IAPWS97(object):
               "h": None,
               "s": None,
               "v": 0.0,
-              "l": 0.5893}
+              "l": 0.5893,
+              "raw": False}
     status = 0
     msg = "Unknown variables"
 
@@ -3141,6 +3405,12 @@ class IAPWS97(object):
 
         return var1, var2
 
+    def _stateKey(self):
+        """Key of state in cache, the input pair"""
+        return stateKey(("IAPWS97", self._thermo, self.args(),
+                         self.kwargs["l"], self.kwargs["raw"]))
+
+    @cached
     def calculo(self):
         propiedades = None
         args = self.args()
@@ -3322,6 +3592,10 @@ class IAPWS97(object):
         else:
             raise NotImplementedError("Bad incoming variables")
 
+        if self.kwargs["raw"]:
+            self.fillRaw(propiedades)
+            return
+
         self.M = unidades.Dimensionless(M)
         self.Pc = unidades.Pressure(Pc, "MPa")
         self.Tc = unidades.Temperature(Tc)
@@ -3374,6 +3648,23 @@ class IAPWS97(object):
             self.cp_cv = unidades.Dimensionless(None)
             self.w = unidades.Speed(None)
 
+    def fillRaw(self, estado):
+        """Fill basic properties as floats in SI units"""
+        self.region = estado["region"]
+        self.x = float(estado["x"])
+        self.T = float(estado["T"])
+        self.P = float(estado["P"])*1e6
+        self.v = float(estado["v"])
+        self.rho = 1/self.v
+        self.h = float(estado["h"])*1000
+        self.s = float(estado["s"])*1000
+        for key, factor in (("cp", 1000), ("cv", 1000), ("w", 1)):
+            if estado[key] is None:
+                value = None
+            else:
+                value = float(estado[key])*factor
+            self.__setattr__(key, value)
+
     def fill(self, fase, estado):
         """Fill phase properties"""
         fase.M = unidades.Dimensionless(M)
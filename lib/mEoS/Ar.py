@@ -15,6 +15,16 @@ class Ar(MEoS):
     >>> argon=Ar(h=-11.589, P=1)
     >>> print "%0.1f %0.3f %0.3f %0.3f %0.5f %0.5f %0.5f %0.2f" % (argon.T, argon.rho, argon.u.kJkg, argon.h.kJkg, argon.s.kJkgK, argon.cv.kJkgK, argon.cp.kJkgK, argon.w)
     280.0 17.302 -69.385 -11.589 -0.51511 0.31441 0.53463 312.22
+
+    Near the critical point the saturation table must give the same state
+    that the full iteration and don't cross a wrong root
+    >>> argon=Ar(T=137.31, P=5.84e6)
+    >>> print "%0.2f %0.2f %0.1f" % (argon.T, argon.rho, argon.x)
+    137.31 1038.67 0.0
+    >>> print "%0.4f %0.4f %0.1f" % argon._saturation(135)
+    1002.5828 147.7687 2567434.1
+    >>> print "%0.4f %0.4f %0.1f" % argon._saturation(135, table=False)
+    1002.5828 147.7687 2567434.1
     """
     name = "argon"
     CASNumber = "7440-37-1"
@@ -86,6 +96,7 @@ class Ar(MEoS):
         "__name__": "Helmholtz equation of state for argon of Kunz and Wagner (2004).",
         "__doc__": u"""Kunz, O., Klimeck, R., Wagner, W., Jaeschke, M. "The GERG-2004 Wide-Range Reference Equation of State for Natural Gases and Other Mixtures," to be published as a GERG Technical Monograph, Fortschr.-Ber. VDI, VDI-Verlag, Düsseldorf, 2006.""",
         "R": 8.314472,
+        "Tref": 150.687, "rhoref": 13.407429659*M,
         "cp": CP1,
 
         "Tmin": Tt, "Tmax": 700., "Pmax": 1000000.0, "rhomax": 50.65, 
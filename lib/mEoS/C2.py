@@ -136,6 +136,7 @@ class C2(MEoS):
         "__name__": "Helmholtz equation of state for ethane of Kunz and Wagner (2004).",
         "__doc__":  u"""Kunz, O., Klimeck, R., Wagner, W., Jaeschke, M. "The GERG-2004 Wide-Range Reference Equation of State for Natural Gases and Other Mixtures," to be published as a GERG Technical Monograph, Fortschr.-Ber. VDI, VDI-Verlag, Düsseldorf, 2006.""",
         "R": 8.314472,
+        "Tref": 305.322, "rhoref": 6.870854540*M,
         "cp": CP2,
         
         "Tmin": Tt, "Tmax": 675.0, "Pmax": 900000.0, "rhomax": 22.419, 
@@ -158,6 +158,7 @@ class C3(MEoS):
         "__name__": "Helmholtz equation of state for propane of Kunz and Wagner (2004).",
         "__doc__":  u"""Kunz, O., Klimeck, R., Wagner, W., Jaeschke, M. "The GERG-2004 Wide-Range Reference Equation of State for Natural Gases and Other Mixtures," to be published as a GERG Technical Monograph, Fortschr.-Ber. VDI, VDI-Verlag, Düsseldorf, 2006.""",
         "R": 8.314472,
+        "Tref": 369.825, "rhoref": 5.000043088*M,
         "cp": CP3,
 
         "Tmin": 85.48, "Tmax": 500.0, "Pmax": 100000.0, "rhomax": 17.41, 
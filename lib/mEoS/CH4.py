@@ -125,6 +125,7 @@ class CH4(MEoS):
         "__name__": "Helmholtz equation of state for methane of Kunz and Wagner (2004).",
         "__doc__":  u"""Kunz, O., Klimeck, R., Wagner, W., Jaeschke, M. "The GERG-2004 Wide-Range Reference Equation of State for Natural Gases and Other Mixtures," to be published as a GERG Technical Monograph, Fortschr.-Ber. VDI, VDI-Verlag, Düsseldorf, 2006.""",
         "R": 8.314472,
+        "Tref": 190.564, "rhoref": 10.139342719*M,
         "cp": CP2,
 
         "Tmin": 90.6941, "Tmax": 625.0, "Pmax": 1000000.0, "rhomax": 40.072, 
@@ -91,6 +91,7 @@ class CO(MEoS):
         "__name__": "Helmholtz equation of state for carbon monoxide of Kunz and Wagner (2004).",
         "__doc__":  u"""Kunz, O., Klimeck, R., Wagner, W., Jaeschke, M. "The GERG-2004 Wide-Range Reference Equation of State for Natural Gases and Other Mixtures," to be published as a GERG Technical Monograph, Fortschr.-Ber. VDI, VDI-Verlag, Düsseldorf, 2006.""",
         "R": 8.314472,
+        "Tref": 132.86, "rhoref": 10.85*M,
         "cp": CP2,
 
         "Tmin": Tt, "Tmax": 500., "Pmax": 100000.0, "rhomax": 33.84, 
@@ -99,7 +100,7 @@ class CO(MEoS):
         "nr1":  [0.92310041400851, -0.248858452058e1, 0.58095213783396,
                  0.28859164394654e-1, 0.70256257276544e-1, 0.21687043269488e-3],
         "d1": [1, 1, 1, 2, 3, 7],
-        "t1": [0.25, 0.125, 1.5, 1.375, 0.25, 0.875],
+        "t1": [0.25, 1.125, 1.5, 1.375, 0.25, 0.875],
 
         "nr2": [0.13758331015182, -0.51501116343466e-1, -0.14865357483379,
                 -0.38857100886810e-1, -0.29100433948943e-1, 0.14155684466279e-1],
@@ -129,6 +129,7 @@ class CO2(MEoS):
         "__name__": "Helmholtz equation of state for carbon dioxide of Kunz and Wagner (2004)",
         "__doc__":  u"""Kunz, O., Klimeck, R., Wagner, W., Jaeschke, M. "The GERG-2004 Wide-Range Reference Equation of State for Natural Gases and Other Mixtures," to be published as a GERG Technical Monograph, Fortschr.-Ber. VDI, VDI-Verlag, Düsseldorf, 2006.""",
         "R": 8.314472,
+        "Tref": 304.1282, "rhoref": 10.624978698*M,
         "cp": CP2,
 
         "Tmin": Tt, "Tmax": 1100., "Pmax": 800000.0, "rhomax": 37.24, 
@@ -156,6 +156,7 @@ class H2S(MEoS):
         "__name__": "Helmholtz equation of state for propane of Kunz and Wagner (2008).",
         "__doc__":  u"""Kunz, O.; Wagner, W. -- The GERG-2008 Wide-Range Equation of State for Natural Gases and Other Mixtures- An Expansion of GERG-2004. J. Chem. Eng. Data, 2012, 57 (11), pp 3032–3091""",
         "R": 8.314472,
+        "Tref": 373.1, "rhoref": 10.19*M,
         "cp": CP5,
 
         "Tmin": Tt, "Tmax": 760.0, "Pmax": 170000.0, "rhomax": 29.12, 
@@ -135,6 +135,7 @@ class He(MEoS):
         "__doc__": u"""Kunz, O., Klimeck, R., Wagner, W., Jaeschke, M. "The GERG-2004 Wide-Range Reference Equation of State for Natural Gases and Other Mixtures," to be published as a GERG Technical Monograph,Fortschr.-Ber. VDI, VDI-Verlag, Düsseldorf, 2006.""",
         "__doi__": "http://dx.doi.org/Kunz, O., Klimeck, R., Wagner, W., Jaeschke, M. The GERG-2004 Wide-Range Reference Equation of State for Natural Gases and Other Mixtures",
         "R": 8.314472,
+        "Tref": 5.1953, "rhoref": 17.399*M,
         "cp": CP1,
 
         "Tmin": Tt, "Tmax": 1500.0, "Pmax": 100000.0, "rhomax": 88.73, 
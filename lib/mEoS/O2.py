@@ -78,6 +78,7 @@ class O2(MEoS):
         "__name__": "Helmholtz equation of state for oxygen of Kunz and Wagner (2004).",
         "__doc__":  u"""Kunz, O., Klimeck, R., Wagner, W., Jaeschke, M. "The GERG-2004 Wide-Range Reference Equation of State for Natural Gases and Other Mixtures," to be published as a GERG Technical Monograph, Fortschr.-Ber. VDI, VDI-Verlag, Düsseldorf, 2006.""",
         "R": 8.314472,
+        "Tref": 154.595, "rhoref": 13.63*M,
         "cp": CP1,
 
         "Tmin": Tt, "Tmax": 1000.0, "Pmax": 82000.0, "rhomax": 43.348, 
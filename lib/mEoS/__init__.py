@@ -1,143 +1,256 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
+###############################################################################
+# Multiparameter equations of state library
+#   - fluids: Static registry of available compounds, with the id in database,
+#       name, formula, synonym and path of class as module.class
+#   - Fluids: Sequence of fluid classes, the module of each compound is
+#       imported only when the class is used
+#   - __all__: Fluids with all compounds, in registry order, the index is the
+#       value saved in config and project files so don't change the order
+#   - id_mEoS: List of database id of compounds in __all__
+#
+# The registry let show the list of compounds or check the availability of a
+# compound without loading the ~110 modules of equations, if a new compound is
+# added it must be registered here
+###############################################################################
+
+import importlib
+
 from lib.meos import MEoS
 
-# Noble Gases
-import He
-import Ne
-import Ar
-import Kr
-import Xe
-
-# Gases
-import H2
-import D2
-import pH2
-import oH2
-import N2
-import O2
-import F2
-import H2O
-import D2O
-import CO2
-import CO
-import N2O
-import SO2
-import COS
-import NH3
-import H2S
-
-# Alkanes
-import CH4
-import C2
-import C3
-import nC4
-import iC4
-import nC5
-import neoC5
-import iC5
-import nC6
-import iC6
-import nC7
-import nC8
-import nC9
-import nC10
-import nC12
-
-# Naphthenes
-import Cyclopropane
-import Cyclopentane
-import Cyclohexane
-import C1Cyclohexane
-import C3Cyclohexane
-
-# Alkenes
-import Benzene
-import Toluene
-import Ethylene
-import Propylene
-import Butene_1
-import iButene
-import Cis_2_butene
-import Trans_2_butene
-import Propyne
-import C1Oleate
-import C1Linolenate
-import C1Linoleate
-import C1Palmitate
-import C1Stearate
-
-# Heteroatom
-import Methanol
-import Ethanol
-import Acetone
-import DME
-import DMC
-import NF3
-import SF6
-
-# CFCs
-import CF3I
-import C4F10
-import C5F12
-import R11
-import R12
-import R13
-import R14
-import R21
-import R22
-import R23
-import R32
-import R41
-import R113
-import R114
-import R115
-import R116
-import R123
-import R124
-import R125
-import R134a
-import R141b
-import R142b
-import R143a
-import R152a
-import R161
-import R218
-import R227ea
-import R236ea
-import R236fa
-import R245ca
-import R245fa
-import R365mfc
-import RC318
-import R1234yf
-import R1234ze
-
-# PseudoCompound
-import Air
-import R404a
-import R407c
-import R410a
-import R507a
-
-# Silicio
-import OctaC1Cyc4Siloxane
-import DecaC1Cyc5Siloxane
-import DodecaC1Cyc6Siloxane
-import OctaC1_3Siloxane
-import TetradecaC1_6Siloxane
-import DodecaC1_5Siloxane
-import DecaC1_4Siloxane
-import HexaC1_2Siloxane
-
-
-__all__ = MEoS.__subclasses__()
-id_mEoS = [i.id for i in __all__]
+
+fluids = [
+    # Noble Gases
+    (212, "helium", "He", "R-704", "He.He"),
+    (107, "neon", "Ne", "R-720", "Ne.Ne"),
+    (98, "argon", "Ar", "R-740", "Ar.Ar"),
+    (1, "krypton", "Kr", "", "Kr.Kr"),
+    (1, "xenon", "Xe", "", "Xe.Xe"),
+
+    # Gases
+    (1, "hydrogen", "H2", "R-702", "H2.H2"),
+    (1, "deuterium", "D2", "", "D2.D2"),
+    (1, "parahydrogen", "H2", "R-702p", "pH2.pH2"),
+    (1, "ortohydrogen", "H2", "R-702o", "oH2.oH2"),
+    (46, "nitrogen", "N2", "R-728", "N2.N2"),
+    (47, "oxygen", "O2", "R-732", "O2.O2"),
+    (208, "fluorine", "F2", "", "F2.F2"),
+    (62, "water", "H2O", "R-718", "H2O.H2O"),
+    (62, "heavy water", "D2O", "deuterium oxide", "D2O.D2O"),
+    (49, "carbon dioxide", "CO2", "R-744", "CO2.CO2"),
+    (48, "carbon monoxide", "CO", "", "CO.CO"),
+    (110, "nitrous oxide", "N2O", "R-744A", "N2O.N2O"),
+    (51, "sulfur dioxide", "SO2", "R-764", "SO2.SO2"),
+    (219, "carbonyl sulfide", "COS", "", "COS.COS"),
+    (63, "ammonia", "NH3", "R-717", "NH3.NH3"),
+    (50, "hydrogen sulfide", "H2S", "", "H2S.H2S"),
+
+    # Alkanes
+    (2, "methane", "CH4", "R-50", "CH4.CH4"),
+    (3, "ethane", "CH3CH3", "R-170", "C2.C2"),
+    (4, "propane", "CH3CH2CH3", "R-290", "C3.C3"),
+    (6, "n-butane", "CH3-(CH2)2-CH3", "R-600", "nC4.nC4"),
+    (5, "isobutane", "CH(CH3)3", "R-600a", "iC4.iC4"),
+    (8, "pentane", "CH3-(CH2)3-CH3", "R-601", "nC5.nC5"),
+    (9, "neopentane", "C(CH3)4", "", "neoC5.neoC5"),
+    (7, "isopentane", "(CH3)2-CH-CH2-CH3", "R-601a", "iC5.iC5"),
+    (10, "hexane", "CH3-(CH2)4-CH3", "", "nC6.nC6"),
+    (52, "isohexane", "(CH3)2-CH-(CH2)2-CH3", "", "iC6.iC6"),
+    (11, "heptane", "CH3-(CH2)5-CH3", "", "nC7.nC7"),
+    (12, "octane", "CH3-(CH2)6-CH3", "", "nC8.nC8"),
+    (13, "nonane", "CH3-(CH2)7-CH3", "", "nC9.nC9"),
+    (14, "decane", "CH3-(CH2)8-CH3", "", "nC10.nC10"),
+    (16, "dodecane", "CH3-(CH2)10-CH3", "", "nC12.nC12"),
+
+    # Naphthenes
+    (258, "cyclopropane", "cyclo(CH2)3", "", "Cyclopropane.Cyclopropane"),
+    (36, "cyclopropane", "C5H10", "", "Cyclopentane.Cyclopentane"),
+    (38, "cyclohexane", "cyclo(CH2)6", "", "Cyclohexane.Cyclohexane"),
+    (39, "methylcyclohexane", "C6H11-CH3", "", "C1Cyclohexane.C1Cyclohexane"),
+    (184, "propylcyclohexane", "C6H11-CH2CH2CH3", "",
+     "C3Cyclohexane.C3Cyclohexane"),
+
+    # Alkenes
+    (40, "benzene", "C6H6", "", "Benzene.Benzene"),
+    (41, "toluene", "C6H5-CH3", "", "Toluene.Toluene"),
+    (22, "ethylene", "CH2=CH2", "R-1150", "Ethylene.Ethylene"),
+    (23, "propylene", "CH2=CH-CH3", "R-1270", "Propylene.Propylene"),
+    (24, "butene", "CH3-CH2-CH=CH2", "", "Butene_1.Butene_1"),
+    (27, "isobutene", "CH2=C(CH3)2", "", "iButene.iButene"),
+    (25, "cis-butene", "CH3-CH=CH-CH3", "", "Cis_2_butene.Cis_2_butene"),
+    (26, "trans-butene ", "CH3-CH=CH-CH3", "",
+     "Trans_2_butene.Trans_2_butene"),
+    (66, "Propyne", "CH3-C≡CH", "", "Propyne.Propyne"),
+    (39, "methyl oleate", "C19H36O2", "", "C1Oleate.C1Oleate"),
+    (39, "methyl linolenate", "C19H32O2", "", "C1Linolenate.C1Linolenate"),
+    (39, "methyl linoleate", "C19H34O2", "", "C1Linoleate.C1Linoleate"),
+    (39, "methyl palmitate", "C17H34O2", "", "C1Palmitate.C1Palmitate"),
+    (39, "methyl stearate", "C19H38O2", "", "C1Stearate.C1Stearate"),
+
+    # Heteroatom
+    (117, "methanol", "CH3OH", "", "Methanol.Methanol"),
+    (134, "ethanol", "C2H6O", "R-170", "Ethanol.Ethanol"),
+    (140, "acetone", "CH3COCH3", "", "Acetone.Acetone"),
+    (133, "dimethylether", "CH3-O-CH3", "R-170", "DME.DME"),
+    (184, "dimethyl carbonate", "C3H6O3", "", "DMC.DMC"),
+    (60, "nitrogen trifluoride", "NF3", "", "NF3.NF3"),
+    (1, "sulfur hexafluoride", "SF6", "", "SF6.SF6"),
+
+    # CFCs
+    (645, "trifluoroiodomethane", "CF3I", "", "CF3I.CF3I"),
+    (232, "1,1,2-trichloro-1,2,2-trifluoroethane", "CCl2FCClF2", "R113",
+     "R113.R113"),
+    (693, "perfluorobutane", "C4F10", "", "C4F10.C4F10"),
+    (693, "perfluoropentane", "678-26-2", "", "C5F12.C5F12"),
+    (217, "trichlorofluoromethane", "CCl3F", "R11", "R11.R11"),
+    (216, "dichlorodifluoromethane", "CCl2F2", "R12", "R12.R12"),
+    (215, "chlorotrifluoromethane", "CClF3", "R13", "R13.R13"),
+    (218, "tetrafluoromethane", "CF4", "R14", "R14.R14"),
+    (642, "dichlorofluoromethane", "CHCl2F", "R21", "R21.R21"),
+    (220, "chlorodifluoromethane", "CHClF2", "R22", "R22.R22"),
+    (643, "trifluoromethane", "CHF3", "R23", "R23.R23"),
+    (645, "difluoromethane", "CH2F2", "R32", "R32.R32"),
+    (225, "fluoromethane", "CH3F", "R41", "R41.R41"),
+    (231, "1,2-dichloro-1,1,2,2-tetrafluoroethane", "CClF2CClF2", "R114",
+     "R114.R114"),
+    (229, "chloropentafluoroethane", "CClF2CF3", "R115", "R115.R115"),
+    (236, "hexafluoroethane", "CF3CF3", "R116", "R116.R116"),
+    (236, "2,2-dichloro-1,1,1-trifluoroethane", "CHCl2CF3", "R123",
+     "R123.R123"),
+    (236, "1-chloro-1,2,2,2-tetrafluoroethane", "CHClFCF3", "R124",
+     "R124.R124"),
+    (236, "pentafluoroethane", "CHF2CF3", "R125", "R125.R125"),
+    (236, "1,1,1,2-tetrafluoroethane", "CF3CH2F", "R134a", "R134a.R134a"),
+    (236, "1,1-dichloro-1-fluoroethane", "CCl2FCH3", "R141b", "R141b.R141b"),
+    (241, "1-chloro-1,1-difluoroethane", "CClF2CH3", "R142b", "R142b.R142b"),
+    (243, "1,1,1-trifluoroethane ", "CF3CH3", "R143a", "R143a.R143a"),
+    (245, "1,1-difluoroethane", "CHF2CH3", "R152a", "R152a.R152a"),
+    (247, "fluoroethane", "C2H5F", "R227ea", "R161.R161"),
+    (671, "octafluoropropane", "CF3CF2CF3", "R218", "R218.R218"),
+    (671, "1,1,1,2,3,3,3-heptafluoropropane", "CF3CHFCF3", "R227ea",
+     "R227ea.R227ea"),
+    (693, "1,1,1,2,3,3-hexafluoropropane", "CF3CHFCHF2", "R236ea",
+     "R236ea.R236ea"),
+    (671, "1,1,1,3,3,3-hexafluoropropane", "CF3CH2CF3", "R236fa",
+     "R236fa.R236fa"),
+    (693, "1,1,2,2,3-pentafluoropropane", "CHF2CF2CH2F", "R245ca",
+     "R245ca.R245ca"),
+    (671, "1,1,1,3,3-pentafluoropropane", "CF3CH2CHF2", "R245fa",
+     "R245fa.R245fa"),
+    (671, "1,1,1,3,3-pentafluorobutane", "CF3CH2CF2CH3", "R365mfc",
+     "R365mfc.R365mfc"),
+    (692, "octafluorocyclobutane ", "cyclo-C4F8", "RC318", "RC318.RC318"),
+    (671, "2,3,3,3-tetrafluoropropene", "CF3CF=CH2", "R-1234yf",
+     "R1234yf.R1234yf"),
+    (671, "trans-1,3,3,3-tetrafluoropropene", "CHF=CHCF3", "R-1234ze",
+     "R1234ze.R1234ze"),
+
+    # PseudoCompound
+    (475, "air", "N2+Ar+O2", "R-729", "Air.Air"),
+    (62, "R404A", "R125+R134a+R143a", "R404A", "R404a.R404A"),
+    (62, "R407C", "R32+R125+R134a", "R407C", "R407c.R407C"),
+    (62, "R410A", "R32+R125", "R410A", "R410a.R410A"),
+    (62, "R507A", "R125+R143a", "R507A", "R507a.R507A"),
+
+    # Silicio
+    (39, "octamethylcyclotetrasiloxane", "C8H24O4Si4", "D4",
+     "OctaC1Cyc4Siloxane.OctaC1Cyc4Siloxane"),
+    (39, "decamethylcyclopentasiloxane", "C10H30O5Si5", "D5",
+     "DecaC1Cyc5Siloxane.DecaC1Cyc5Siloxane"),
+    (39, "dodecamethylcyclohexasiloxane", "C12H36Si6O6", "D6",
+     "DodecaC1Cyc6Siloxane.DodecaC1Cyc6Siloxane"),
+    (39, "octamethyltrisiloxane", "C8H24O2Si3", "MDM",
+     "OctaC1_3Siloxane.OctaC1_3Siloxane"),
+    (39, "tetradecamethylhexasiloxane", "C14H42O5Si6", "MD4M",
+     "TetradecaC1_6Siloxane.TetradecaC1_6Siloxane"),
+    (39, "dodecamethylpentasiloxane", "C12H36Si5O4", "MD3M",
+     "DodecaC1_5Siloxane.DodecaC1_5Siloxane"),
+    (39, "decamethyltetrasiloxane", "C10H30Si4O3", "MD2M",
+     "DecaC1_4Siloxane.DecaC1_4Siloxane"),
+    (39, "hexamethyldisiloxane", "C6H18OSi2", "MM",
+     "HexaC1_2Siloxane.HexaC1_2Siloxane"),
+]
+
+
+class Fluids(object):
+    """Sequence of meos fluid classes with lazy import, the items are the
+    true classes but each module is imported the first time is accessed
+
+    >>> water = __all__[id_mEoS.index(62)]
+    >>> print water.__name__, water.Tc
+    H2O 647.096
+    >>> __all__.index(water)
+    12
+    """
+    def __init__(self, paths):
+        """paths: list of class path as module.class"""
+        self.paths = paths
+        self._classes = {}
+
+    def load(self, path):
+        """Return the class of fluid, importing its module if necessary"""
+        try:
+            return self._classes[path]
+        except KeyError:
+            module, name = path.split(".")
+            cls = getattr(importlib.import_module(
+                "lib.mEoS.%s" % module), name)
+            self._classes[path] = cls
+            return cls
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.load(path) for path in self.paths[index]]
+        return self.load(self.paths[index])
+
+    def __iter__(self):
+        for path in self.paths:
+            yield self.load(path)
+
+    def __add__(self, other):
+        return list(self)+list(other)
+
+    def __radd__(self, other):
+        return list(other)+list(self)
+
+    def _path(self, fluid):
+        return "%s.%s" % (fluid.__module__.split(".")[-1], fluid.__name__)
+
+    def index(self, fluid):
+        """Index of fluid class, it don't need import any module"""
+        return self.paths.index(self._path(fluid))
+
+    def __contains__(self, fluid):
+        return self._path(fluid) in self.paths
+
+    @property
+    def ids(self):
+        """List of database id of fluids, it don't need import any module"""
+        return [_ids[path] for path in self.paths]
+
+    def __repr__(self):
+        return "Fluids(%r)" % self.paths
+
+
+_ids = dict([(fluid[4], fluid[0]) for fluid in fluids])
+__all__ = Fluids([fluid[4] for fluid in fluids])
+id_mEoS = __all__.ids
 
 
 if __name__ == "__main__":
     import doctest
-    for module in __all__[2:3]:
-        print module.__module__
-        doctest.testmod(locals()[module.__module__])
+    doctest.testmod()
+
+    # Check the registry with the classes definition
+    for fluid, cls in zip(fluids, __all__):
+        data = (cls.id, cls.name, cls.formula, cls.synonym)
+        if data != fluid[:4]:
+            print fluid[4], data
+    if len(MEoS.__subclasses__()) != len(fluids):
+        print "Unregistered compounds:", [
+            c for c in MEoS.__subclasses__() if c not in __all__]
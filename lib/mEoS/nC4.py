@@ -129,6 +129,7 @@ class nC4(MEoS):
         "__name__": "Helmholtz equation of state for butane of Kunz and Wagner (2004).",
         "__doc__":  u"""Kunz, O., Klimeck, R., Wagner, W., Jaeschke, M. "The GERG-2004 Wide-Range Reference Equation of State for Natural Gases and Other Mixtures," to be published as a GERG Technical Monograph, Fortschr.-Ber. VDI, VDI-Verlag, Düsseldorf, 2006.""",
         "R": 8.314472,
+        "Tref": 425.125, "rhoref": 3.920016792*M,
         "cp": CP2,
 
         "Tmin": Tt, "Tmax": 575., "Pmax": 69000.0, "rhomax": 13.2, 
@@ -64,6 +64,7 @@ class nC9(MEoS):
         "__name__": "Helmholtz equation of state for propane of Kunz and Wagner (2008).",
         "__doc__":  u"""Kunz, O.; Wagner, W. -- The GERG-2008 Wide-Range Equation of State for Natural Gases and Other Mixtures- An Expansion of GERG-2004. J. Chem. Eng. Data, 2012, 57 (11), pp 3032–3091""",
         "R": 8.314472,
+        "Tref": 594.55, "rhoref": 1.81*M,
         "cp": CP2,
 
         "Tmin": Tt, "Tmax": 600.0, "Pmax": 800000.0, "rhomax": 6.06, 
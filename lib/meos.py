@@ -9,20 +9,26 @@
 #############################################################################
 
 import cPickle
+import hashlib
 import os
 from itertools import product
 from PyQt4.QtGui import QApplication
+from numpy import (arange, array, asarray, broadcast_arrays, concatenate,
+                   empty, errstate, nan, newaxis, ones, where, zeros)
 from scipy import exp, log, log10, sin, sinh, cosh, tanh, arctan, __version__
 if int(__version__.split(".")[1]) < 10:
     from scipy.constants import Bolzmann as Boltzmann
 else:
     from scipy.constants import Boltzmann
 from scipy.constants import pi, Avogadro, R
+from scipy.interpolate import PchipInterpolator
 from scipy.optimize import fsolve
 
 from lib import unidades, compuestos
+from lib.cache import cached, stateKey
+from lib.utilities import replaceFile
 from physics import R_atml
-from config import Fluid
+from config import Fluid, conf_dir
 
 data = [(QApplication.translate("pychemqt", "Temperature"), "T", unidades.Temperature),
         (QApplication.translate("pychemqt", "Reduced temperature"), "Tr", unidades.Dimensionless),
@@ -96,6 +102,71 @@ units = [p[2] for p in data]
 properties = dict(zip(keys, propiedades))
 inputData = [data[0], data[2], data[4], data[5], data[6], data[7], data[8], data[9]]
 
+
+# Precomputed saturation curves, a table for each fluid and equation, saved
+# in user config folder to avoid recalculation in each session
+satFile = conf_dir+"mEoS_sat.pkl"
+_satTables = None
+_satVersion = 2
+
+
+def _loadSatTables():
+    """Load the saved saturation tables, a damaged or incompatible file is
+    ignored, the tables are calculated again"""
+    try:
+        with open(satFile, "rb") as archivo:
+            tables = cPickle.load(archivo)
+    except Exception:
+        return {}
+    if not isinstance(tables, dict):
+        return {}
+    return tables
+
+
+def _saveSatTables(key, table):
+    """Add a saturation table to the file, the tables saved meanwhile by
+    other sessions are kept, the file is written in a temporal file and
+    renamed so a reader never get a partial file"""
+    tables = _loadSatTables()
+    tables[key] = table
+    temp = "%s.%i.tmp" % (satFile, os.getpid())
+    try:
+        if not os.path.isdir(conf_dir):
+            os.makedirs(conf_dir)
+        with open(temp, "wb") as archivo:
+            cPickle.dump(tables, archivo, cPickle.HIGHEST_PROTOCOL)
+        replaceFile(temp, satFile)
+    except (IOError, OSError) as error:
+        if os.path.isfile(temp):
+            os.remove(temp)
+        print "Saturation tables not saved in %s: %s" % (satFile, error)
+
+
+def _satTableValid(table):
+    """Check a saturation table is usable for interpolation, saved with the
+    current format and without missing points of grid"""
+    index = table.get("index")
+    if table.get("version") != _satVersion or not index or len(index) < 4:
+        return False
+    return all([j-i == 1 for i, j in zip(index[:-1], index[1:])])
+
+
+def _hashConstants(constants):
+    """Return a hash of the equation parameters to check the validity of the
+    saved saturation tables"""
+    def canonical(value):
+        if isinstance(value, dict):
+            return "{%s}" % ", ".join(["%r: %s" % (k, canonical(value[k]))
+                                       for k in sorted(value)
+                                       if k not in ("__phir__", "__sat__")])
+        elif isinstance(value, (list, tuple)):
+            return "[%s]" % ", ".join([canonical(v) for v in value])
+        elif isinstance(value, type):
+            return value.__name__
+        else:
+            return repr(value)
+    return hashlib.md5(canonical(constants)).hexdigest()
+
 class _fase(object):
     """Class to implement a null phase"""
     v = None
@@ -226,8 +297,14 @@ class MEoS(_fase):
               "rho0": 0, 
               "T0": 0}
     status = 0
+    _satLast = None
     msg = QApplication.translate("pychemqt", "Unknown Variables")
 
+    # Properties available in batch calculation
+    _batchProperties = ["T", "P", "rho", "v", "h", "s", "u", "g", "a", "cv",
+                        "cp", "cp_cv", "w", "Z", "fi", "f", "alfap", "betap",
+                        "x"]
+
     def __init__(self, **kwargs):
         """Incoming properties:
         T   -   Temperature, K
@@ -342,7 +419,11 @@ class MEoS(_fase):
             if self.status == 1:
                 converge = True
                 for input in self._mode.split("-"):
-                    if abs(self.kwargs[input]-self.__getattribute__(input)._data) > 1e-9:
+                    if input == "rho" and not self.kwargs["rho"]:
+                        input = "v"
+                    value = self.kwargs[input]
+                    if abs(value-self.__getattribute__(input)._data) > \
+                            1e-9*max(1, abs(value)):
                         converge = False
                         break
                 if not converge:
@@ -391,6 +472,20 @@ class MEoS(_fase):
 
         return bool(self._mode)
 
+    def _stateKey(self):
+        """Key of state in cache, the fluid with the equations and reference
+        state used and the input pair"""
+        inputs = []
+        for key in self._mode.split("-"):
+            if key == "rho":
+                inputs.append(self.kwargs["v"])
+            inputs.append(self.kwargs[key])
+        return stateKey((self.__class__.__name__, self.kwargs["eq"],
+                         self.kwargs["visco"], self.kwargs["thermal"],
+                         self.kwargs["ref"], self._mode, inputs,
+                         self.kwargs["rho0"], self.kwargs["T0"]))
+
+    @cached
     def calculo(self):
         T = self.kwargs["T"]
         rho = self.kwargs["rho"]
@@ -406,9 +501,10 @@ class MEoS(_fase):
         ref = self.kwargs["ref"]
 
         self._ref(ref)
+        self._satLast = None
 
         if self.id:
-            self.componente = compuestos.Componente(self.id)
+            self.componente = compuestos.getComponente(self.id)
 
         # Opcion de aceptar el nombre interno de la ecuacion
         if isinstance(eq, str) and eq in self.__class__.__dict__:
@@ -456,11 +552,12 @@ class MEoS(_fase):
                 
                 if self.kwargs["rho0"]:
                     rhoo = self.kwargs["rho0"]
-                elif T < 0.99*self.Tc and \
-                        self._Vapor_Pressure(T) < P:
-                    rhoo = self._Liquid_Density(T)
                 elif T < 0.99*self.Tc:
-                    rhoo = self._Vapor_Density(T)
+                    rhol, rhov, Ps = self._satGuess(T)
+                    if Ps < P:
+                        rhoo = rhol
+                    else:
+                        rhoo = rhov
                 elif T > 2*self.Tc or P > 2*self.Pc:
                     rhoo = self.eq[eq]["rhomax"]*self.M
                 elif 0.99*self.Tc <= T < self.Tc and self.Pc*0.9 < P < self.Pc:
@@ -662,8 +759,7 @@ class MEoS(_fase):
             T = float(T)
             propiedades = self._eq(rho, T)
             if T <= self.Tc:
-                rhol = self._Liquid_Density(T)
-                rhov = self._Vapor_Density(T)
+                rhol, rhov, Ps = self._satGuess(T)
                 if rhol > rho > rhov:
                     rhol, rhov, Ps = self._saturation(T)
                     x = (1/rho-1/rhol)/(1/rhov-1/rhol)
@@ -851,11 +947,8 @@ class MEoS(_fase):
 
         if phases:
             if self.Tt <= T < self.Tc:
-                rhol = self._Liquid_Density(T)
-                rhov = self._Vapor_Density(T)
+                rhol, rhov, Ps = self._satGuess(T)
                 if rinput is None or rinput[2] != 1 or rhov <= rho <= rhol:
-                    rhol = self._Liquid_Density(T)
-                    rhov = self._Vapor_Density(T)
                     rhom = 1/(0.5/rhol+0.5/rhov)
                     t = (self.Tc+self.Tc)/2
                     rhol2 = self._Liquid_Density(t)
@@ -906,6 +999,140 @@ class MEoS(_fase):
         else:
             return rho, T
 
+    @classmethod
+    def batch(cls, T, P, props=("rho", "h", "s", "cp"), eq=0, ref="OTO",
+              maxiter=50):
+        """Calculate the properties of a set of T-P states in a single
+        vectorized call, without create a instance for each point
+            T: Temperature, K
+            P: Pressure, Pa
+            props: list of properties to calculate, see _batchProperties
+            eq: Helmholtz equation to use, index or name
+            ref: Reference state code
+            maxiter: Maximum iterations for newton solver
+
+        The T and P inputs are broadcasted, so they can be a grid from
+        meshgrid. The density of all points is solved at once by a newton
+        iteration over pressure, points without convergence are retried with
+        fsolve. Return a dict with the properties as arrays in SI units, and
+        the status array with the same meaning of MEoS.status, the points
+        with error have nan as properties values"""
+        for prop in props:
+            if prop not in cls._batchProperties:
+                raise ValueError("Property %s not available in batch" % prop)
+
+        if isinstance(eq, str) and eq in cls.__dict__:
+            eq = cls.eq.index(cls.__dict__[eq])
+        if cls.eq[eq]["__type__"] != "Helmholtz":
+            raise NotImplementedError(
+                "Batch calculation only available for Helmholtz equations")
+
+        fluid = cls()
+        if fluid.id and not (fluid._vapor_Pressure and fluid._liquid_Density):
+            fluid.componente = compuestos.getComponente(fluid.id)
+        fluid._ref(ref)
+        fluid._constants = fluid.eq[eq]
+        fluid._eq = fluid._Helmholtz
+        fluid.R = unidades.SpecificHeat(fluid._constants["R"]/fluid.M, "kJkgK")
+
+        T, P = broadcast_arrays(asarray(T, dtype=float),
+                                asarray(P, dtype=float))
+        shape = T.shape
+        T = T.ravel()
+        P = P.ravel()
+        R = float(fluid.R)
+        Tc = float(fluid.Tc)
+        Pc = float(fluid.Pc)
+        rhoc = float(fluid.rhoc)
+        rhomax = fluid._constants["rhomax"]*fluid.M
+
+        def ancillary(coef, method, T, root, ref):
+            if coef:
+                return fluid._Ancillary(coef, T, root)*ref
+            return array([method(t) for t in T])
+
+        # Initial values with the same criteria of calculo
+        rho0 = P/T/R
+        rho0[(T > 2*Tc) | (P > 2*Pc)] = rhomax
+        rho0[(0.99*Tc <= T) & (T < Tc) & (0.9*Pc < P) & (P < Pc)] = rhoc
+        sub = T < 0.99*Tc
+        if sub.any():
+            Pv = ancillary(fluid._vapor_Pressure, fluid._Vapor_Pressure,
+                           T[sub], 0.5, Pc)
+            rhol = ancillary(fluid._liquid_Density, fluid._Liquid_Density,
+                             T[sub], 1./3, rhoc)
+            rhov = ancillary(fluid._vapor_Density, fluid._Vapor_Density,
+                             T[sub], 1./3, rhoc)
+            rho0[sub] = where(Pv < P[sub], rhol, rhov)
+
+        # Newton iteration over all points at once
+        rhoref = fluid._constants.get("rhoref", fluid.rhoc)
+        tau = fluid._constants.get("Tref", fluid.Tc)/T
+        rho = rho0.copy()
+        todo = arange(T.size)
+        with errstate(all="ignore"):
+            for i in range(maxiter):
+                delta = rho[todo]/rhoref
+                fird, firdd = fluid._phir(tau[todo], delta)[3:5]
+                Pi = (1+delta*fird)*R*T[todo]*rho[todo]
+                dPdrho = R*T[todo]*(1+2*delta*fird+delta**2*firdd)
+                step = (Pi-P[todo])/dPdrho
+                new = rho[todo]-step
+                rho[todo] = where(new > 0, new, rho[todo]/2)
+                todo = todo[~(abs(step) <= 1e-10*rho[todo])]
+                if not todo.size:
+                    break
+
+        status = ones(T.size, dtype=int)
+        for i in todo:
+            rinput = fsolve(lambda rho: fluid._eq(rho, T[i])["P"]-P[i],
+                            rho0[i], full_output=True)
+            if rinput[2] == 1:
+                rho[i] = rinput[0][0]
+            else:
+                status[i] = 0
+
+        Tmin = fluid._constants["Tmin"]
+        Tmax = fluid._constants["Tmax"]
+        status[(status == 1) & ((T < Tmin) | (T > Tmax) |
+                                (rho <= 0) | (rho > rhomax))] = 5
+        valid = status == 1
+
+        values = {"T": T, "P": P}
+        with errstate(all="ignore"):
+            prop = fluid._Helmholtz(rho[valid], T[valid])
+            v = 1/rho[valid]
+            h = prop["h"]*1000
+            s = prop["s"]*1000
+            values["rho"] = rho[valid]
+            values["v"] = v
+            values["h"] = h
+            values["s"] = s
+            values["u"] = h-P[valid]*v
+            values["g"] = h-T[valid]*s
+            values["a"] = values["u"]-T[valid]*s
+            values["cv"] = prop["cv"]*1000
+            values["cp"] = prop["cp"]*1000
+            values["cp_cv"] = prop["cp"]/prop["cv"]
+            values["w"] = prop["w"]
+            values["Z"] = P[valid]*v/T[valid]/R
+            values["fi"] = prop["fugacity"]
+            values["f"] = prop["fugacity"]*P[valid]
+            values["alfap"] = prop["alfap"]
+            values["betap"] = prop["betap"]
+            values["x"] = where((T[valid] <= Tc) & (rho[valid] > rhoc), 0., 1.)
+
+        result = {"status": status.reshape(shape)}
+        for key in props:
+            if key in ("T", "P"):
+                value = values[key]
+            else:
+                value = empty(T.size)
+                value.fill(nan)
+                value[valid] = values[key]
+            result[key] = value.reshape(shape)
+        return result
+
     def fillNone(self, fase):
         """Fill properties in null phase with a explicative msg"""
         if self.x == 0:
@@ -983,38 +1210,201 @@ class MEoS(_fase):
             fase.Prandt = None
         fase.epsilon = unidades.Dimensionless(self._Dielectric(fase.rho, self.T))
 
-    def _saturation(self, T=None):
-        """Saturation calculation for two phase search"""
+    def _saturation(self, T=None, table=True):
+        """Saturation calculation for two phase search
+        Use the precomputed saturation curve as initial value with a Newton
+        step to refine it, the full iteration is only done when the point is
+        out of table range or the refined value is not enough accurate
+            table: use the precomputed curve, False to force the full
+                iteration from the ancillary equations"""
         if not T:
             T = self.T
         T = float(T)
-        rhoLo = self._Liquid_Density(T)
-        rhoGo = self._Vapor_Density(T)
-        
-        def f(parr):
-            rhol, rhog = parr
-            deltaL = rhol/self.rhoc
-            deltaG = rhog/self.rhoc
-            liquido = self._eq(rhol, T)
-            vapor = self._eq(rhog, T)
-            Jl = deltaL*(1+deltaL*liquido["fird"])
-            Jv = deltaG*(1+deltaG*vapor["fird"])
-            Kl = deltaL*liquido["fird"]+liquido["fir"]+log(deltaL)
-            Kv = deltaG*vapor["fird"]+vapor["fir"]+log(deltaG)
-            return Kv-Kl, Jv-Jl
-
-        rhoL, rhoG = fsolve(f, [rhoLo, rhoGo])
+
+        # The two phases functions at fixed temperature ask again and again
+        # for the same saturation state
+        if table and self._satLast and self._satLast[0] == T:
+            return self._satLast[1:]
+
+        spline = None
+        if table:
+            spline = self._satSpline()
+        if spline and spline["Tmin"] <= T <= spline["Tmax"]:
+            rhoL, rhoG = self._satNewton(
+                T, float(spline["rhoL"](T)), float(spline["rhoG"](T)))
+            if rhoL is None:
+                rhoo = [float(spline["rhoL"](T)), float(spline["rhoG"](T))]
+                rhoL, rhoG = fsolve(self._Maxwell, rhoo, args=(T, ))
+        else:
+            rhoLo = self._Liquid_Density(T)
+            rhoGo = self._Vapor_Density(T)
+            rhoL, rhoG = fsolve(self._Maxwell, [rhoLo, rhoGo], args=(T, ))
+
         if rhoL == rhoG:
             Ps = self.Pc
         else:
-            liquido = self._eq(rhoL, T)
-            vapor = self._eq(rhoG, T)
-            deltaL = rhoL/self.rhoc
-            deltaG = rhoG/self.rhoc
+            Ps = self._satPressure(rhoL, rhoG, T)
+        self._satLast = (T, rhoL, rhoG, Ps)
+        return rhoL, rhoG, Ps
 
-            Ps = self.R*T*rhoL*rhoG/(rhoL-rhoG)*(liquido["fir"]-vapor["fir"]+log(deltaL/deltaG))
+    def _Maxwell(self, parr, T):
+        """Equal area criterion, equal pressure and Gibbs free energy in both
+        phases"""
+        rhol, rhog = parr
+        Kl, Jl = self._satKJ(rhol, T)
+        Kv, Jv = self._satKJ(rhog, T)
+        return Kv-Kl, Jv-Jl
+
+    def _satKJ(self, rho, T):
+        """Reduced Gibbs free energy and pressure functions used in the
+        equal area criterion"""
+        delta = rho/self.rhoc
+        fase = self._eq(rho, T)
+        J = delta*(1+delta*fase["fird"])
+        K = delta*fase["fird"]+fase["fir"]+log(delta)
+        return K, J
+
+    def _satPressure(self, rhoL, rhoG, T):
+        """Saturation pressure from the phase densities"""
+        liquido = self._eq(rhoL, T)
+        vapor = self._eq(rhoG, T)
+        deltaL = rhoL/self.rhoc
+        deltaG = rhoG/self.rhoc
+        return self.R*T*rhoL*rhoG/(rhoL-rhoG)*(
+            liquido["fir"]-vapor["fir"]+log(deltaL/deltaG))
+
+    def _satNewton(self, T, rhoL, rhoG, tol=1e-9):
+        """Single Newton step over the equal area criterion, the jacobian is
+        calculated by finite differences, each residual only depend of a
+        phase so the jacobian only need a evaluation more by phase
+        Return None if the refined point don't meet the tolerance"""
+        Kl, Jl = self._satKJ(rhoL, T)
+        Kv, Jv = self._satKJ(rhoG, T)
+        hL = rhoL*1e-7
+        hG = rhoG*1e-7
+        Kl2, Jl2 = self._satKJ(rhoL+hL, T)
+        Kv2, Jv2 = self._satKJ(rhoG+hG, T)
+        dKl, dJl = (Kl2-Kl)/hL, (Jl2-Jl)/hL
+        dKv, dJv = (Kv2-Kv)/hG, (Jv2-Jv)/hG
+
+        # Solve the 2x2 lineal system -Jacobian·dx = F
+        F1 = Kv-Kl
+        F2 = Jv-Jl
+        det = -dKl*dJv+dKv*dJl
+        if not det:
+            return None, None
+        rhoL -= (F1*dJv-F2*dKv)/det
+        rhoG -= (-dKl*F2+dJl*F1)/det
+
+        if rhoG <= 0 or rhoL <= rhoG:
+            return None, None
+        F1, F2 = self._Maxwell((rhoL, rhoG), T)
+        if abs(F1) > tol or abs(F2) > tol:
+            return None, None
+        return rhoL, rhoG
+
+    def _satGuess(self, T):
+        """Fast estimation of saturation properties to use as initial values
+        in iterations and to check the two phases region, using the
+        precomputed curve or the ancillary equations out of its range
+        Return rhoL, rhoG, Ps"""
+        spline = self._satSpline()
+        if spline and spline["Tmin"] <= T <= spline["Tmax"]:
+            rhoL = unidades.Density(float(spline["rhoL"](T)))
+            rhoG = unidades.Density(float(spline["rhoG"](T)))
+            Ps = unidades.Pressure(float(exp(spline["P"](T))))
+        else:
+            rhoL = self._Liquid_Density(T)
+            rhoG = self._Vapor_Density(T)
+            Ps = self._Vapor_Pressure(T)
         return rhoL, rhoG, Ps
 
+    def _satSpline(self):
+        """Monotone interpolation of the saturation curve for the equation in
+        use, the table is loaded from disk or calculated if its isn't
+        available or if the equation parameters has changed"""
+        global _satTables
+        splines = self._constants.setdefault("__sat__", {})
+        if self._eq.__name__ in splines:
+            return splines[self._eq.__name__]
+
+        if _satTables is None:
+            _satTables = _loadSatTables()
+
+        key = "%s-%s" % (self.__class__.__name__, self.kwargs["eq"])
+        hash = _hashConstants(self._constants)
+        table = _satTables.get(key)
+        if table is None or table.get("hash") != hash or \
+                table.get("version") != _satVersion:
+            # Set a empty value to avoid recursion while the table is built
+            splines[self._eq.__name__] = None
+            table = self._satTable()
+            table["hash"] = hash
+            _satTables[key] = table
+            _saveSatTables(key, table)
+
+        if not _satTableValid(table):
+            spline = None
+        else:
+            spline = {
+                "Tmin": table["T"][0],
+                "Tmax": table["T"][-1],
+                "P": PchipInterpolator(table["T"], log(table["P"])),
+                "rhoL": PchipInterpolator(table["T"], table["rhoL"]),
+                "rhoG": PchipInterpolator(table["T"], table["rhoG"])}
+        splines[self._eq.__name__] = spline
+        return spline
+
+    def _satTable(self, n=150):
+        """Calculate the saturation curve from the triple point to the
+        critical point, the points are concentrated near the critical point
+        to follow the curvature of densities. The table end in the first
+        point not solved, not consistent with the ancillary equations or with
+        pressure or vapor density not monotone, near the critical point the iteration can find wrong roots
+        and the interpolation mustn't cross them, the grid index of points
+        is saved to check the table has no gaps"""
+        Tmin = max(self.Tt, self._constants["Tmin"])
+        x = arange(n)/float(n)
+        Ts = self.Tc-(self.Tc-Tmin)*(1-x)**2
+
+        table = {"T": [], "P": [], "rhoL": [], "rhoG": [], "index": [],
+                 "version": _satVersion}
+        for i, T in enumerate(Ts):
+            T = float(T)
+            try:
+                rhoL, rhoG, Ps = self._saturation(T, table=False)
+                valid = self._satCheck(T, rhoL, rhoG, Ps)
+            except (ValueError, ZeroDivisionError, OverflowError):
+                valid = False
+            # The liquid density can have a maximum, water at 4ºC
+            if valid and table["T"] and (rhoG <= table["rhoG"][-1] or
+                                         Ps <= table["P"][-1]):
+                valid = False
+            if not valid:
+                if table["T"]:
+                    break
+                continue
+
+            table["index"].append(i)
+            table["T"].append(T)
+            table["P"].append(float(Ps))
+            table["rhoL"].append(float(rhoL))
+            table["rhoG"].append(float(rhoG))
+        return table
+
+    def _satCheck(self, T, rhoL, rhoG, Ps, tol=1e-8):
+        """Check a solution of equal area criterion, discard the failed
+        points, the trivial solution and the roots far from the ancillary
+        equations"""
+        if not 0 < rhoG < rhoL*0.999 or not 0 < Ps < self.Pc*1.1:
+            return False
+        F1, F2 = self._Maxwell((rhoL, rhoG), T)
+        if abs(F1) > tol or abs(F2) > tol:
+            return False
+        return abs(Ps/self._Vapor_Pressure(T)-1) < 0.05 and \
+            abs(rhoL/self._Liquid_Density(T)-1) < 0.05 and \
+            abs(rhoG/self._Vapor_Density(T)-1) < 0.1
+
     def _Helmholtz(self, rho, T):
         """Implementación general de la ecuación de estado Setzmann-Wagner, ecuación de estado de multiparámetros basada en la energía libre de Helmholtz"""
         rhoc = self._constants.get("rhoref", self.rhoc)
@@ -1545,165 +1935,191 @@ class MEoS(_fase):
         return cpsum*self.R
 
 
+    def _phirCoefficients(self):
+        """Compile the residual terms coefficients of equation in arrays, it's
+        done only once for each equation and saved in the constants dict"""
+        if "__phir__" in self._constants:
+            return self._constants["__phir__"]
+
+        def terms(keys, zipped=True, **default):
+            """Return the coefficients with keys as arrays, the polinomial
+            and exponential terms are zipped, the others indexed by nr"""
+            n = len(self._constants.get(keys[0], []))
+            if zipped:
+                n = min([len(self._constants.get(key, [])) for key in keys])
+            lst = []
+            for key in keys:
+                value = self._constants.get(key, [default.get(key)]*n)
+                lst.append(array(value[:n], dtype=float))
+            return lst
+
+        delta_0 = 1e-200
+        coef = {}
+        with errstate(all="ignore"):
+            # Polinomial terms are exponential terms with gamma=0 and c=0
+            n1, d1, t1 = terms(["nr1", "d1", "t1"])
+            n2, d2, g2, t2, c2 = terms(["nr2", "d2", "gamma2", "t2", "c2"])
+            n = concatenate((n1, n2))
+            d = concatenate((d1, d2))
+            t = concatenate((t1, t2))
+            g = concatenate((zeros(n1.size), g2))
+            c = concatenate((zeros(n1.size), c2))
+            ex = exp(-g*delta_0**c)
+            gc = g*c*delta_0**c
+            B = n*ex*delta_0**(d-1)*(d-gc)
+            C = n*ex*delta_0**(d-2)*((d-gc)*(d-1-gc)-g**2*c**2*delta_0**c)
+            coef["exp"] = (n, d, t, t*(t-1), g, c, g*c, g**2*c**2, B, C)
+
+            # Gaussian terms
+            n, d, t, a, e, b, g, exp1, exp2 = terms(
+                ["nr3", "d3", "t3", "alfa3", "epsilon3", "beta3", "gamma3",
+                 "exp1", "exp2"], zipped=False, exp1=2, exp2=2)
+            ex = exp(-a*(delta_0-e)**exp1)
+            B = n*delta_0**d*ex*(d/delta_0-2*a*(delta_0-e))
+            C = n*ex*(-2*a*delta_0**d+4*a**2*delta_0**d*(delta_0-e)**exp1 -
+                      4*d*a*delta_0**2*(delta_0-e)+d*2*delta_0)
+            coef["gauss"] = (n, d, t, a, e, b, g, exp1, exp2, B, C)
+
+            # Non analitic terms
+            coef["nonanalytic"] = terms(
+                ["nr4", "a4", "b4", "A", "B", "C", "D", "beta4"],
+                zipped=False)
+
+        self._constants["__phir__"] = coef
+        return coef
+
     def _phir(self, tau, delta):
+        """Residual contribution to the free Helmholtz energy and derivatives
+        The terms are evaluated as arrays with the coefficients compiled in
+        _phirCoefficients, tau and delta can be arrays of states too"""
         delta_0 = 1e-200
+        coef = self._phirCoefficients()
 
         fir = fird = firdd = firt = firtt = firdt = firdtt = B = C = 0
 
-        # Polinomial terms
-        nr1 = self._constants.get("nr1", [])
-        d1 = self._constants.get("d1", [])
-        t1 = self._constants.get("t1", [])
-        for n, d, t in zip(nr1, d1, t1):
-            fir += n*delta**d*tau**t
-            fird += n*d*delta**(d-1)*tau**t
-            firdd += n*d*(d-1)*delta**(d-2)*tau**t
-            firt += n*t*delta**d*tau**(t-1)
-            firtt += n*t*(t-1)*delta**d*tau**(t-2)
-            firdt += n*t*d*delta**(d-1)*tau**(t-1)
-            firdtt += n*t*d*(t-1)*delta**(d-1)*tau**(t-2)
-            B += n*d*delta_0**(d-1)*tau**t
-            C += n*d*(d-1)*delta_0**(d-2)*tau**t
-            
-        # Exponential terms
-        nr2 = self._constants.get("nr2", [])
-        d2 = self._constants.get("d2", [])
-        g2 = self._constants.get("gamma2", [])
-        t2 = self._constants.get("t2", [])
-        c2 = self._constants.get("c2", [])
-        for n, d, g, t, c in zip(nr2, d2, g2, t2, c2):
-            fir += n*delta**d*tau**t*exp(-g*delta**c)
-            fird += n*exp(-g*delta**c)*delta**(d-1)*tau**t*(d-g*c*delta**c)
-            firdd += n*exp(-g*delta**c)*delta**(d-2)*tau**t * \
-                ((d-g*c*delta**c)*(d-1-g*c*delta**c)-g**2*c**2*delta**c)
-            firt += n*t*delta**d*tau**(t-1)*exp(-g*delta**c)
-            firtt += n*t*(t-1)*delta**d*tau**(t-2)*exp(-g*delta**c)
-            firdt += n*t*delta**(d-1)*tau**(t-1)*(d-g*c*delta**c)*exp(-g*delta**c)
-            firdtt += n*t*(t-1)*delta**(d-1)*tau**(t-2)*(d-g*c*delta**c) * \
-                exp(-g*delta**c)
-            B += n*exp(-g*delta_0**c)*delta_0**(d-1)*tau**t*(d-g*c*delta_0**c)
-            C += n*exp(-g*delta_0**c)*(delta_0**(d-2)*tau**t *
-                ((d-g*c*delta_0**c)*(d-1-g*c*delta_0**c)-g**2*c**2*delta_0**c))
-
-        # Gaussian terms
-        nr3 = self._constants.get("nr3", [])
-        d3 = self._constants.get("d3", [])
-        t3 = self._constants.get("t3", [])
-        a3 = self._constants.get("alfa3", [])
-        e3 = self._constants.get("epsilon3", [])
-        b3 = self._constants.get("beta3", [])
-        g3 = self._constants.get("gamma3", [])
-        for i in range(len(nr3)):
-            exp1 = self._constants.get("exp1", [2]*len(nr3))
-            exp2 = self._constants.get("exp2", [2]*len(nr3))
-            fir += nr3[i]*delta**d3[i]*tau**t3[i] * \
-                exp(-a3[i]*(delta-e3[i])**exp1[i]-b3[i]*(tau-g3[i])**exp2[i])
-            fird += nr3[i]*delta**d3[i]*tau**t3[i] * \
-                exp(-a3[i]*(delta-e3[i])**exp1[i]-b3[i]*(tau-g3[i])**exp2[i]) * \
-                (d3[i]/delta-2*a3[i]*(delta-e3[i]))
-            firdd += nr3[i]*tau**t3[i]*exp(-a3[i]*(delta-e3[i])**exp1[i]-b3[i] *
-                (tau-g3[i])**exp2[i])*(-2*a3[i]*delta**d3[i]+4*a3[i]**2 *
-                delta**d3[i]*(delta-e3[i])**exp1[i]-4*d3[i]*a3[i]*delta**2 *
-                (delta-e3[i])+d3[i]*2*delta)
-            firt += nr3[i]*delta**d3[i]*tau**t3[i] * \
-                exp(-a3[i]*(delta-e3[i])**exp1[i]-b3[i]*(tau-g3[i])**exp2[i]) * \
-                (t3[i]/tau-2*b3[i]*(tau-g3[i]))
-            firtt += nr3[i]*delta**d3[i]*tau**t3[i] * \
-                exp(-a3[i]*(delta-e3[i])**exp1[i]-b3[i]*(tau-g3[i])**exp2[i]) * \
-                ((t3[i]/tau-2*b3[i]*(tau-g3[i]))**exp2[i]-t3[i]/tau**2-2*b3[i])
-            firdt += nr3[i]*delta**d3[i]*tau**t3[i] * \
-                exp(-a3[i]*(delta-e3[i])**exp1[i]-b3[i]*(tau-g3[i])**exp2[i]) * \
-                (t3[i]/tau-2*b3[i]*(tau-g3[i]))*(d3[i]/delta-2*a3[i]*(delta-e3[i]))
-            firdtt += nr3[i]*delta**d3[i]*tau**t3[i] * \
-                exp(-a3[i]*(delta-e3[i])**exp1[i]-b3[i]*(tau-g3[i])**exp2[i]) * \
-                ((t3[i]/tau-2*b3[i]*(tau-g3[i]))**exp2[i]-t3[i]/tau**2-2*b3[i]) * \
-                (d3[i]/delta-2*a3[i]*(delta-e3[i]))
-            B += nr3[i]*delta_0**d3[i]*tau**t3[i] * \
-                exp(-a3[i]*(delta_0-e3[i])**exp1[i]-b3[i]*(tau-g3[i])**exp2[i]) * \
-                (d3[i]/delta_0-2*a3[i]*(delta_0-e3[i]))
-            C += nr3[i]*tau**t3[i] * \
-                exp(-a3[i]*(delta_0-e3[i])**exp1[i]-b3[i]*(tau-g3[i])**exp2[i]) * \
-                (-2*a3[i]*delta_0**d3[i]+4*a3[i]**2*delta_0**d3[i] *
-                (delta_0-e3[i])**exp1[i]-4*d3[i]*a3[i]*delta_0**2*(delta_0-e3[i]) +
-                d3[i]*2*delta_0)
-
-        # Non analitic terms
-        nr4 = self._constants.get("nr4", [])
-        a4 = self._constants.get("a4", [])
-        b = self._constants.get("b4", [])
-        A = self._constants.get("A", [])
-        Bi = self._constants.get("B", [])
-        Ci = self._constants.get("C", [])
-        D = self._constants.get("D", [])
-        bt = self._constants.get("beta4", [])
-        for i in range(len(nr4)):
-            Tita = (1-tau)+A[i]*((delta-1)**2)**(0.5/bt[i])
-            F = exp(-Ci[i]*(delta-1)**2-D[i]*(tau-1)**2)
-            Fd = -2*Ci[i]*F*(delta-1)
-            Fdd = 2*Ci[i]*F*(2*Ci[i]*(delta-1)**2-1)
-            Ft = -2*D[i]*F*(tau-1)
-            Ftt = 2*D[i]*F*(2*D[i]*(tau-1)**2-1)
-            Fdt = 4*Ci[i]*D[i]*F*(delta-1)*(tau-1)
-            Fdtt = 4*Ci[i]*D[i]*F*(delta-1)*(2*D[i]*(tau-1)**2-1)
-
-            Delta = Tita**2+Bi[i]*((delta-1)**2)**a4[i]
-            Deltad = (delta-1)*(A[i]*Tita*2/bt[i]*((delta-1)**2)**(0.5/bt[i]-1) \
-                + 2*Bi[i]*a4[i]*((delta-1)**2)**(a4[i]-1))
-            if delta == 1:
-                Deltadd = 0
-                DeltaBd = 0
-                DeltaBdd = 0
-                DeltaBt = 0
-                DeltaBtt = 0
-                DeltaBdt = 0
-                DeltaBdtt = 0
-            else:
-                Deltadd = Deltad/(delta-1)+(delta-1)**2 * \
-                    (4*Bi[i]*a4[i]*(a4[i]-1)*((delta-1)**2)**(a4[i]-2) +
-                    2*A[i]**2/bt[i]**2*(((delta-1)**2)**(0.5/bt[i]-1))**2 +
-                    A[i]*Tita*4/bt[i]*(0.5/bt[i]-1)*((delta-1)**2)**(0.5/bt[i]-2))
-                DeltaBd = b[i]*Delta**(b[i]-1)*Deltad
-                DeltaBdd = b[i]*(Delta**(b[i]-1)*Deltadd+(b[i]-1)*Delta**(b[i]-2)*Deltad**2)
-                DeltaBt = -2*Tita*b[i]*Delta**(b[i]-1)
-                DeltaBtt = 2*b[i]*Delta**(b[i]-1)+4*Tita**2*b[i]*(b[i]-1)*Delta**(b[i]-2)
-                DeltaBdt = -A[i]*b[i]*2/bt[i]*Delta**(b[i]-1)*(delta-1)*((delta-1)**2) ** \
-                    (0.5/bt[i]-1)-2*Tita*b[i]*(b[i]-1)*Delta**(b[i]-2)*Deltad
-                DeltaBdtt = 2*b[i]*(b[i]-1)*Delta**(b[i]-2) * \
-                    (Deltad*(1+2*Tita**2*(b[i]-2)/Delta)+4*Tita*A[i] *
-                    (delta-1)/bt[i]*((delta-1)**2)**(0.5/bt[i]-1))
-
-            fir += nr4[i]*Delta**b[i]*delta*F
-            fird += nr4[i]*(Delta**b[i]*(F+delta*Fd)+DeltaBd*delta*F)
-            firdd += nr4[i]*(Delta**b[i]*(2*Fd+delta*Fdd)+2*DeltaBd *
-                (F+delta*Fd)+DeltaBdd*delta*F)
-            firt += nr4[i]*delta*(DeltaBt*F+Delta**b[i]*Ft)
-            firtt += nr4[i]*delta*(DeltaBtt*F+2*DeltaBt*Ft+Delta**b[i]*Ftt)
-            firdt += nr4[i]*(Delta**b[i]*(Ft+delta*Fdt)+delta*DeltaBd*Ft +
-                DeltaBt*(F+delta*Fd)+DeltaBdt*delta*F)
-            firdtt += nr4[i]*((DeltaBtt*F+2*DeltaBt*Ft+Delta**b[i]*Ftt) +
-                delta*(DeltaBdtt*F+DeltaBtt*Fd+2*DeltaBdt*Ft+2*DeltaBt*Fdt +
-                DeltaBt*Ftt+Delta**b[i]*Fdtt))
-
-            Tita_ = (1-tau)+A[i]*((delta_0-1)**2)**(0.5/bt[i])
-            Delta_ = Tita_**2+Bi[i]*((delta_0-1)**2)**a4[i]
-            Deltad_ = (delta_0-1)*(A[i]*Tita_*2/bt[i]*((delta_0-1)**2) **
-                (0.5/bt[i]-1)+2*Bi[i]*a4[i]*((delta_0-1)**2)**(a4[i]-1))
-            Deltadd_ = Deltad_/(delta_0-1)+(delta_0-1)**2 * \
-                (4*Bi[i]*a4[i]*(a4[i]-1)*((delta_0-1)**2)**(a4[i]-2)+2*A[i]**2 /
-                bt[i]**2*(((delta_0-1)**2)**(0.5/bt[i]-1))**2+A[i]*Tita_ *
-                4/bt[i]*(0.5/bt[i]-1)*((delta_0-1)**2)**(0.5/bt[i]-2))
-            DeltaBd_ = b[i]*Delta_**(b[i]-1)*Deltad_
-            DeltaBdd_ = b[i]*(Delta_**(b[i]-1)*Deltadd_ +
-                (b[i]-1)*Delta_**(b[i]-2)*Deltad_**2)
-            F_ = exp(-Ci[i]*(delta_0-1)**2-D[i]*(tau-1)**2)
-            Fd_ = -2*Ci[i]*F_*(delta_0-1)
-            Fdd_ = 2*Ci[i]*F_*(2*Ci[i]*(delta_0-1)**2-1)
-
-            B += nr4[i]*(Delta_**b[i]*(F_+delta_0*Fd_) +
-                DeltaBd_*delta_0*F_)
-            C += nr4[i]*(Delta_**b[i]*(2*Fd_+delta_0*Fdd_) +
-                2*DeltaBd_*(F_+delta_0*Fd_) +
-                DeltaBdd_*delta_0*F_)
+        tau_ = asarray(tau, dtype=float)[..., newaxis]
+        delta_ = asarray(delta, dtype=float)[..., newaxis]
+
+        with errstate(all="ignore"):
+            # Polinomial and exponential terms
+            n, d, t, tt, g, c, gc, g2c2, Bv, Cv = coef["exp"]
+            if n.size:
+                taut = tau_**t
+                deltac = delta_**c
+                E = n*taut*delta_**d*exp(-g*deltac)
+                K = d-gc*deltac
+                EK = E*K
+                fir += E.sum(-1)
+                fird += EK.sum(-1)/delta
+                firdd += (E*(K*(d-1-gc*deltac)-g2c2*deltac)).sum(-1)/delta**2
+                firt += (E*t).sum(-1)/tau
+                firtt += (E*tt).sum(-1)/tau**2
+                firdt += (EK*t).sum(-1)/delta/tau
+                firdtt += (EK*tt).sum(-1)/delta/tau**2
+                B += (Bv*taut).sum(-1)
+                C += (Cv*taut).sum(-1)
+
+            # Gaussian terms
+            n, d, t, a, e, b, g, exp1, exp2, Bv, Cv = coef["gauss"]
+            if n.size:
+                de = delta_-e
+                de1 = de**exp1
+                ft = tau_**t*exp(-b*(tau_-g)**exp2)
+                G = n*ft*exp(-a*de1)
+                E = G*delta_**d
+                Dd = d/delta_-2*a*de
+                Dt = t/tau_-2*b*(tau_-g)
+                Dtt = Dt**exp2-t/tau_**2-2*b
+                EDt = E*Dt
+                EDtt = E*Dtt
+                fir += E.sum(-1)
+                fird += (E*Dd).sum(-1)
+                firdd += (E*(4*a**2*de1-2*a) +
+                          G*d*delta_*(2-4*a*delta_*de)).sum(-1)
+                firt += EDt.sum(-1)
+                firtt += EDtt.sum(-1)
+                firdt += (EDt*Dd).sum(-1)
+                firdtt += (EDtt*Dd).sum(-1)
+                B += (Bv*ft).sum(-1)
+                C += (Cv*ft).sum(-1)
+
+            # Non analitic terms
+            n, a4, b, A, Bi, Ci, D, bt = coef["nonanalytic"]
+            if n.size:
+                dm = delta_-1
+                dm2 = dm**2
+                tm = tau_-1
+                Pbt = dm2**(0.5/bt-1)
+                Pa = dm2**(a4-1)
+                Tita = (1-tau_)+A*dm2**(0.5/bt)
+                F = exp(-Ci*dm2-D*tm**2)
+                Fd = -2*Ci*F*dm
+                Fdd = 2*Ci*F*(2*Ci*dm2-1)
+                Ft = -2*D*F*tm
+                Ftt = 2*D*F*(2*D*tm**2-1)
+                Fdt = 4*Ci*D*F*dm*tm
+                Fdtt = 4*Ci*D*F*dm*(2*D*tm**2-1)
+
+                Delta = Tita**2+Bi*dm2**a4
+                Deltad = dm*(A*Tita*2/bt*Pbt+2*Bi*a4*Pa)
+                Deltadd = Deltad/dm+dm2*(4*Bi*a4*(a4-1)*dm2**(a4-2) +
+                                         2*A**2/bt**2*Pbt**2 +
+                                         A*Tita*4/bt*(0.5/bt-1)*dm2**(0.5/bt-2))
+                DeltaB = Delta**b
+                DeltaB1 = b*Delta**(b-1)
+                DeltaB2 = b*(b-1)*Delta**(b-2)
+                DeltaBd = DeltaB1*Deltad
+                DeltaBdd = DeltaB1*Deltadd+DeltaB2*Deltad**2
+                DeltaBt = -2*Tita*DeltaB1
+                DeltaBtt = 2*DeltaB1+4*Tita**2*DeltaB2
+                DeltaBdt = -A*DeltaB1*2/bt*dm*Pbt-2*Tita*DeltaB2*Deltad
+                DeltaBdtt = 2*DeltaB2*(Deltad*(1+2*Tita**2*(b-2)/Delta) +
+                                       4*Tita*A*dm/bt*Pbt)
+
+                # The distance function derivatives are null at delta=1
+                critic = delta_ == 1
+                Deltadd = where(critic, 0, Deltadd)
+                DeltaBd = where(critic, 0, DeltaBd)
+                DeltaBdd = where(critic, 0, DeltaBdd)
+                DeltaBt = where(critic, 0, DeltaBt)
+                DeltaBtt = where(critic, 0, DeltaBtt)
+                DeltaBdt = where(critic, 0, DeltaBdt)
+                DeltaBdtt = where(critic, 0, DeltaBdtt)
+
+                fir += (n*DeltaB*delta_*F).sum(-1)
+                fird += (n*(DeltaB*(F+delta_*Fd)+DeltaBd*delta_*F)).sum(-1)
+                firdd += (n*(DeltaB*(2*Fd+delta_*Fdd)+2*DeltaBd*(F+delta_*Fd) +
+                             DeltaBdd*delta_*F)).sum(-1)
+                firt += (n*delta_*(DeltaBt*F+DeltaB*Ft)).sum(-1)
+                firtt += (n*delta_*(DeltaBtt*F+2*DeltaBt*Ft+DeltaB*Ftt)).sum(-1)
+                firdt += (n*(DeltaB*(Ft+delta_*Fdt)+delta_*DeltaBd*Ft +
+                             DeltaBt*(F+delta_*Fd)+DeltaBdt*delta_*F)).sum(-1)
+                firdtt += (n*((DeltaBtt*F+2*DeltaBt*Ft+DeltaB*Ftt) +
+                              delta_*(DeltaBdtt*F+DeltaBtt*Fd+2*DeltaBdt*Ft +
+                                      2*DeltaBt*Fdt+DeltaBt*Ftt+DeltaB*Fdtt))
+                           ).sum(-1)
+
+                # Virial coefficients
+                dm = delta_0-1
+                dm2 = dm**2
+                Pbt = dm2**(0.5/bt-1)
+                Pa = dm2**(a4-1)
+                Tita = (1-tau_)+A*dm2**(0.5/bt)
+                Delta = Tita**2+Bi*dm2**a4
+                Deltad = dm*(A*Tita*2/bt*Pbt+2*Bi*a4*Pa)
+                Deltadd = Deltad/dm+dm2*(4*Bi*a4*(a4-1)*dm2**(a4-2) +
+                                         2*A**2/bt**2*Pbt**2 +
+                                         A*Tita*4/bt*(0.5/bt-1)*dm2**(0.5/bt-2))
+                DeltaB1 = b*Delta**(b-1)
+                DeltaBd = DeltaB1*Deltad
+                DeltaBdd = DeltaB1*Deltadd+b*(b-1)*Delta**(b-2)*Deltad**2
+                F = exp(-Ci*dm2-D*tm**2)
+                Fd = -2*Ci*F*dm
+                Fdd = 2*Ci*F*(2*Ci*dm2-1)
+
+                B += (n*(Delta**b*(F+delta_0*Fd)+DeltaBd*delta_0*F)).sum(-1)
+                C += (n*(Delta**b*(2*Fd+delta_0*Fdd)+2*DeltaBd*(F+delta_0*Fd) +
+                         DeltaBdd*delta_0*F)).sum(-1)
 
         # Hard sphere term
         if self._constants.get("Fi", None):
@@ -1735,7 +2151,7 @@ class MEoS(_fase):
             ahdXX_virial = -(f**2-1)/(1-X_virial)**2+(3*(f**2+3*f)+(f**2-3*f)*(1+2*X_virial))/(1-X_virial)**4
             B += ahdX_virial*Xd
             C += ahdXX_virial*Xd**2
-        
+
         return fir, firt, firtt, fird, firdd, firdt, firdtt, B, C
 
 
@@ -1841,20 +2257,26 @@ class MEoS(_fase):
         else:
             return None
 
+    def _Ancillary(self, coef, T, root=1):
+        """Reduced value of a ancillary equation with the coefficients in coef
+        dict, T can be a array of temperatures too
+        root: Exponent for reduced temperature in equations 2, 4 and 6"""
+        eq = coef["eq"]
+        Tita = 1-T/self.Tc
+        if eq in [2, 4, 6]:
+            Tita = Tita**root
+        suma = sum([n*Tita**x for n, x in zip(coef["ao"], coef["exp"])])
+        if eq in [1, 2]:
+            Pr = suma+1
+        elif eq in [3, 4]:
+            Pr = exp(suma)
+        else:
+            Pr = exp(self.Tc/T*suma)
+        return Pr
+
     def _Vapor_Pressure(self, T):
         if self._vapor_Pressure:
-            eq = self._vapor_Pressure["eq"]
-            Tita = 1-T/self.Tc
-            if eq in [2, 4, 6]:
-                Tita = Tita**0.5
-            suma = sum([n*Tita**x for n, x in zip(
-                self._vapor_Pressure["ao"], self._vapor_Pressure["exp"])])
-            if eq in [1, 2]:
-                Pr = suma+1
-            elif eq in [3, 4]:
-                Pr = exp(suma)
-            else:
-                Pr = exp(self.Tc/T*suma)
+            Pr = self._Ancillary(self._vapor_Pressure, T, 0.5)
             Pv = unidades.Pressure(Pr*self.Pc)
         else:
             Pv = self.componente.Pv(T)
@@ -1862,18 +2284,7 @@ class MEoS(_fase):
 
     def _Liquid_Density(self, T):
         if self._liquid_Density:
-            eq = self._liquid_Density["eq"]
-            Tita = 1-T/self.Tc
-            if eq in [2, 4, 6]:
-                Tita = Tita**(1./3)
-            suma = sum([n*Tita**x for n, x in zip(
-                self._liquid_Density["ao"], self._liquid_Density["exp"])])
-            if eq in [1, 2]:
-                Pr = suma+1
-            elif eq in [3, 4]:
-                Pr = exp(suma)
-            else:
-                Pr = exp(self.Tc/T*suma)
+            Pr = self._Ancillary(self._liquid_Density, T, 1./3)
             rho = unidades.Density(Pr*self.rhoc)
         else:
             rho = self.componente.RhoL_DIPPR(T)
@@ -1881,18 +2292,7 @@ class MEoS(_fase):
 
     def _Vapor_Density(self, T):
         if self._vapor_Density:
-            eq = self._vapor_Density["eq"]
-            Tita = 1-T/self.Tc
-            if eq in [2, 4, 6]:
-                Tita = Tita**(1./3)
-            suma = sum([n*Tita**x for n, x in zip(
-                self._vapor_Density["ao"], self._vapor_Density["exp"])])
-            if eq in [1, 2]:
-                Pr = suma+1
-            elif eq in [3, 4]:
-                Pr = exp(suma)
-            else:
-                Pr = exp(self.Tc/T*suma)
+            Pr = self._Ancillary(self._vapor_Density, T, 1./3)
             rho = unidades.Density(Pr*self.rhoc)
         else:
             rho = self._Vapor_Density_Chouaieb(T)
@@ -9,12 +9,15 @@
 #   -Particle solid distributions
 #   -Fitting K
 #   -Other
-#       root3poly
+#       root_poly3, roots_poly3: Cubic polinomy roots
 #       Cunninghan factor
 ###############################################################################
 
-from math import exp, log, log10, sqrt, sin, pi, cos, acos
+from math import exp, log, log10, sqrt, sin, pi
 
+from numpy import (absolute, arccos, asarray, broadcast_arrays, clip, empty,
+                   errstate, nan, where)
+from numpy import cos as cos_a, sqrt as sqrt_a
 from scipy.constants import g, R, calorie, liter, atm, Btu, lb
 from scipy.special import cbrt
 from scipy.optimize import fsolve
@@ -463,31 +466,47 @@ def Ft(D):
 
 
 # Mathematical special functions
-def root_poly3(a1, a2, a3):
-    """Roots for a cubic polinomy, x^3 + a1*x^2 + a2*x + a3"""
+def roots_poly3(a1, a2, a3):
+    """Real roots for cubic polinomies, x^3 + a1*x^2 + a2*x + a3
+    Closed form solution, trigonometric when there are three real roots
+    and Cardano's formula otherwise, refined with a Newton step
+    The coefficients can be arrays to solve many polinomies in one call
+    Return an array with the roots in the last axis sorted, the complex
+    roots are set to nan"""
+    a1, a2, a3 = broadcast_arrays(*[asarray(a, dtype=float) for a in (a1, a2, a3)])
+    shape = a1.shape
+    a1, a2, a3 = a1.ravel(), a2.ravel(), a3.ravel()
     Q = (3*a2-a1**2)/9.
     L = (9*a1*a2-27*a3-2*a1**3)/54.
     D = Q**3+L**2
-    if D < 0:
-        tita = acos(L/(-Q**3)**0.5)
-        z1 = 2*(-Q)**0.5*cos(tita/3.+2.*pi/3)-a1/3.
-        z2 = 2*(-Q)**0.5*cos(tita/3.+4.*pi/3)-a1/3.
-        z3 = 2*(-Q)**0.5*cos(tita/3.)-a1/3.
-        z = [z1, z2, z3]
-    else:
-        S1 = cbrt((L+D**0.5))
-        S2 = cbrt((L-D**0.5))
-        if D > 0:
-            z = [S1+S2-a1/3.]
-        else:
-            z1 = cbrt(L)+cbrt(L)-a1/3.
-            z2 = -cbrt(L)-a1/3.
-            z = [z1, z2]
-#    print z[0]+z[1]+z[2], -a1
-#    print z[0]*z[1]+z[1]*z[2]+z[2]*z[0], a2
-#    print z[0]*z[1]*z[2], -a3
-    z.sort()
-    return z
+
+    z = empty((len(a1), 3))
+    z.fill(nan)
+    three = D < 0
+    q = sqrt_a(-Q[three])
+    tita = arccos(clip(L[three]/q**3, -1, 1))
+    for k in range(3):
+        z[three, k] = 2*q*cos_a((tita+2*k*pi)/3.)-a1[three]/3.
+    one = ~three
+    sD = sqrt_a(D[one])
+    z[one, 0] = cbrt(L[one]+sD)+cbrt(L[one]-sD)-a1[one]/3.
+    double = one & (D == 0) & (L != 0)
+    z[double, 1] = -cbrt(L[double])-a1[double]/3.
+
+    # Newton refinement, the formulas lose precision by cancellation
+    a1, a2, a3 = a1[:, None], a2[:, None], a3[:, None]
+    with errstate(divide="ignore", invalid="ignore"):
+        p = ((z+a1)*z+a2)*z+a3
+        zn = z-p/((3*z+2*a1)*z+a2)
+        pn = ((zn+a1)*zn+a2)*zn+a3
+        z = where(absolute(pn) < absolute(p), zn, z)
+    z.sort(axis=-1)
+    return z.reshape(shape+(3,))
+
+
+def root_poly3(a1, a2, a3):
+    """Roots for a cubic polinomy, x^3 + a1*x^2 + a2*x + a3"""
+    return [z for z in roots_poly3(a1, a2, a3) if z == z]
 
 
 # Other
@@ -6,7 +6,7 @@ from matplotlib import rcParams
 rcParams['backend'] = 'QT4Agg'  #Fija el backend de las ventanas de matplotlib a qt4
 rcParams['font.size'] = '9'
 from matplotlib.backends.backend_qt4agg import FigureCanvasQTAgg, NavigationToolbar2QT
-from pylab import Figure, plot,  title,  figtext,  xlabel,  grid,  show
+from matplotlib.figure import Figure
 from mpl_toolkits.mplot3d import Axes3D
 from scipy.optimize import fsolve
 from scipy import arange, linspace
@@ -3,32 +3,271 @@
 
 ###############################################################################
 # Module for project (group of equipment asociated in a graph) and many more
+#   - Project: Flowsheet with equipments and streams
+#   - DirectSubstitution, Wegstein, Broyden: Tear stream convergence methods
+#
+# The project is solved in sequential modular mode, the graph is splitted in
+# strongly connected components (recycle loops) calculated in topological
+# order, each loop is converged iterating over its tear streams
 ###############################################################################
 
 import os
+import cPickle
+import time
 from ConfigParser import ConfigParser
+from functools import partial
+from multiprocessing import Pool
+from Queue import Queue, Empty
 
-from pygraph.classes.graph import graph
+from numpy import (array, absolute, clip, dot, errstate, eye, isnan,
+                   maximum, outer, zeros)
+from pygraph.classes.digraph import digraph
+from pygraph.algorithms.accessibility import mutual_accessibility
 from pygraph.algorithms.cycles import find_cycle
 try:
     from pygraph.readwrite.dot import write
 except:
     from pygraph.readwrite.markup import write
 
-from lib.config import conf_dir
+from lib.config import conf_dir, setMainWindowConfig
+from lib.cache import stateKey
+from lib import unidades
 from lib.corriente import Corriente
 from equipment import equipments
 from equipment.flux import Mixer
 
 
+def streamVector(stream):
+    """Return the iteration variables of a tear stream as a array,
+    temperature, pressure and component molar flows"""
+    return array([stream.T, stream.P]+list(stream.caudalunitariomolar))
+
+
+def streamSolid(stream):
+    """Return the solid state of a stream as a array, component mass flows,
+    mean diameter and particle distribution, empty without solids"""
+    solido = getattr(stream, "solido", None)
+    if solido is None or not getattr(solido, "_def", 0):
+        return array([])
+    return array(list(solido.caudalUnitario)+[solido.diametro_medio] +
+                 list(solido.diametros)+list(solido.fracciones))
+
+
+def streamScale(x):
+    """Scale of iteration variables, the component molar flows are scaled
+    with the total molar flow so null flows don't break the residual, x can
+    be a array with the variables of several streams in rows"""
+    scale = absolute(x)
+    scale[..., 2:] = scale[..., 2:].sum(axis=-1)[..., None]
+    return maximum(scale, 1e-12)
+
+
+def vectorStream(x, stream):
+    """Inverse of streamVector, create a stream from iteration variables
+    with the other inputs of stream, the mixture and the mass flow inputs
+    are removed so the molar flows define the composition"""
+    kwargs = stream.kwargs.copy()
+    kwargs.update({"T": x[0],
+                   "P": x[1],
+                   "x": None,
+                   "caudalUnitarioMolar": list(clip(x[2:], 0, None)),
+                   "caudalUnitarioMasico": [],
+                   "mezcla": None})
+    return Corriente(**kwargs)
+
+
+class DirectSubstitution(object):
+    """Direct substitution, the next estimate of tear variables is the
+    value calculated in the loop"""
+    def __call__(self, x, gx):
+        return gx
+
+
+class Wegstein(DirectSubstitution):
+    """Wegstein acceleration, applied independently to each variable using
+    the secant slope of the last two iterations
+        x = q·x + (1-q)·g(x)     q = s/(s-1)
+    The acceleration factor is bounded to [qmin, qmax], the default range
+    avoid oscillation in strongly coupled loops"""
+    def __init__(self, qmin=-5., qmax=0.):
+        self.qmin = qmin
+        self.qmax = qmax
+        self.x = None
+        self.gx = None
+
+    def __call__(self, x, gx):
+        if self.x is None:
+            xnew = gx
+        else:
+            dx = x-self.x
+            dg = gx-self.gx
+            q = zeros(x.shape)
+            idx = dx != 0
+            s = dg[idx]/dx[idx]
+            with errstate(divide="ignore", invalid="ignore"):
+                q[idx] = s/(s-1)
+            q[isnan(q)] = self.qmin
+            q = clip(q, self.qmin, self.qmax)
+            xnew = q*x+(1-q)*gx
+        self.x = x
+        self.gx = gx
+        return xnew
+
+
+class Broyden(DirectSubstitution):
+    """Broyden quasi-Newton method for the loop residual f(x)=g(x)-x,
+    update the inverse jacobian with the good Broyden formula, the initial
+    jacobian -I give a direct substitution step first, the variables are
+    scaled with the values of the first iteration"""
+    def __init__(self):
+        self.H = None
+
+    def __call__(self, x, gx):
+        if self.H is None:
+            self.scale = streamScale(gx)
+        y = (x/self.scale).ravel()
+        f = ((gx-x)/self.scale).ravel()
+        if self.H is None:
+            self.H = -eye(len(y))
+        else:
+            dy = y-self.y
+            df = f-self.f
+            Hdf = dot(self.H, df)
+            den = dot(dy, Hdf)
+            if abs(den) > 1e-20:
+                self.H += outer(dy-Hdf, dot(dy, self.H))/den
+        self.y = y
+        self.f = f
+        return (y-dot(self.H, f)).reshape(x.shape)*self.scale
+
+
+def _solveBlockProcess(data):
+    """Calculate a block of project in a process of pool, the input and
+    output are pickled so the errors are catched here, return None if the
+    block can't be calculated in other process"""
+    try:
+        nodes, tear, items, streams, config, options=cPickle.loads(data)
+        project=Project(items=items, streams=streams, config=config)
+        loop, failed=project._solveBlock(nodes, tear, **options)
+        items=dict((node, project.items[node]) for node in nodes)
+        return cPickle.dumps((items, project.streams, loop, failed), 2)
+    except Exception:
+        return None
+
+
 class Project(object):
+    """Flowsheet of equipment connected by streams
+
+    The project is calculated in sequential modular mode, the calculation
+    order is defined from the project graph with recycle loops converged by
+    iteration over tear streams. The solver options are class attributes:
+        tolerance: relative tolerance for tear streams variables
+        maxiter: maximum number of iteration in each recycle loop
+        method: convergence method, key of convergenceMethods
+        propagationTolerance: relative tolerance to consider a calculated
+            stream unchanged, the recalculation don't propagate downstream
+            of unchanged streams
+        processes: number of process used to calculate concurrently the
+            independent branches of project, 0 for serial calculation, None
+            to use all the cpu cores
+        processTimeout: maximum time in seconds to wait for a block
+            calculated in other process, the block is calculated in this
+            process after it or if a process of pool die
+
+    Recycle loop with a divider returning the 70% of flow to the mixer, the
+    mixer outlet converge to 1/0.3 times the feed flow
+    >>> from lib.corriente import Corriente
+    >>> from equipment.flux import Mixer, Divider
+    >>> def recycle():
+    ...     project = Project(items={}, streams={})
+    ...     feed = Corriente(T=300, P=101325, caudalMasico=1, fraccionMolar=[1.])
+    ...     project.addItem("i1", feed)
+    ...     project.addItem("e1", Mixer(criterio=0))
+    ...     project.addItem("e2", Divider(salidas=2, split=[0.3, 0.7]))
+    ...     project.addItem("o1", Corriente())
+    ...     project.addStream(1, "i1", "e1")
+    ...     project.addStream(2, "e1", "e2")
+    ...     project.addStream(3, "e2", "o1")
+    ...     project.addStream(4, "e2", "e1", ind_up=1, ind_down=1)
+    ...     return project
+    >>> for method in ("direct", "wegstein", "broyden"):
+    ...     project = recycle()
+    ...     converged = project.solve(method=method)
+    ...     print method, converged, project.loops[0]["iterations"], \\
+    ...         "%0.5f" % project.getStream(2).caudalmasico
+    direct True 37 3.33333
+    wegstein True 4 3.33333
+    broyden True 4 3.33333
+
+    Solving again a converged project don't recalculate any equipment, and a
+    stream equal to the existing one isn't propagated downstream
+    >>> mixed = project.getItem(1).salida[0]
+    >>> project.getItem(1).dirty, project.getItem(2).dirty
+    (False, False)
+    >>> project.solve(), project.loops[0]["history"]
+    (True, [0])
+    >>> project.getItem(1).salida[0] is mixed
+    True
+    >>> feed = project.getStream(1)
+    >>> project.setStream(1, Corriente(
+    ...     T=300, P=101325, caudalMasico=1, fraccionMolar=[1.]))
+    >>> project.getStream(1) is feed
+    True
+
+    Two independent recycle loops are calculated concurrently with the same
+    result that in serial calculation
+    >>> def branches():
+    ...     project = Project(items={}, streams={})
+    ...     for i, split in ((1, 0.3), (2, 0.5)):
+    ...         feed = Corriente(T=300, P=101325, caudalMasico=i,
+    ...                          fraccionMolar=[1.])
+    ...         project.addItem("i%i" % i, feed)
+    ...         project.addItem("e%i" % (2*i-1), Mixer(criterio=0))
+    ...         project.addItem("e%i" % (2*i), Divider(
+    ...             salidas=2, split=[split, 1-split]))
+    ...         project.addItem("o%i" % i, Corriente())
+    ...         project.addStream(4*i-3, "i%i" % i, "e%i" % (2*i-1))
+    ...         project.addStream(4*i-2, "e%i" % (2*i-1), "e%i" % (2*i))
+    ...         project.addStream(4*i-1, "e%i" % (2*i), "o%i" % i)
+    ...         project.addStream(4*i, "e%i" % (2*i), "e%i" % (2*i-1),
+    ...                           ind_up=1, ind_down=1)
+    ...     return project
+    >>> serial, parallel = branches(), branches()
+    >>> serial.solve(processes=0), parallel.solve(processes=2)
+    (True, True)
+    >>> for key in (2, 3, 6, 7):
+    ...     print key, "%0.5f" % parallel.getStream(key).caudalmasico, \\
+    ...         parallel.getStream(key).caudalmasico == \\
+    ...         serial.getStream(key).caudalmasico
+    2 3.33333 True
+    3 1.00000 True
+    6 4.00000 True
+    7 2.00000 True
+    >>> [loop["history"] for loop in serial.loops] == \\
+    ...     [loop["history"] for loop in parallel.loops]
+    True
+    """
     MAGIC_NUMBER = 0x3051E
     FILE_VERSION = 10
-    def __init__(self, items={}, streams={}, config=None):
+    convergenceMethods = {"direct": DirectSubstitution,
+                          "wegstein": Wegstein,
+                          "broyden": Broyden}
+    tolerance = 1e-6
+    maxiter = 50
+    method = "wegstein"
+    propagationTolerance = 1e-9
+    processes = 0
+    processTimeout = 600
+
+    def __init__(self, items=None, streams=None, config=None):
         """
         items: diccionario con los equipos
         stream: diccionario con las corrientes
         """
+        if items is None:
+            items={}
+        if streams is None:
+            streams={}
         self.items=items
         self.out={}
         if not config:
@@ -39,6 +278,9 @@ class Project(object):
         self.graph=self.calGraph()
 
         self.downToStream={}
+        self.tear=[]
+        self.loops=[]
+        self.failed=[]
 
 #        import gv
 #        for item in items:
@@ -56,11 +298,12 @@ class Project(object):
         return len(self.streams)
 
     def calGraph(self):
-        grafo = graph()
+        grafo = digraph()
         for item in self.items:
             grafo.add_node(item, attrs = [("splines",  "")])
         for key, stream in self.streams.iteritems():
-            grafo.add_edge((stream[0], stream[1]), attrs = [("splines",  "")])
+            if not grafo.has_edge((stream[0], stream[1])):
+                grafo.add_edge((stream[0], stream[1]), attrs = [("splines",  "")])
         return grafo
 
     def getObject(self, id):
@@ -71,10 +314,12 @@ class Project(object):
 
     def setPFD(self, streams):
         self.streams=streams
+        self.graph=self.calGraph()
     def setItems(self, items):
         self.items=items
     def setStreams(self, streams):
         self.streams=streams
+        self.graph=self.calGraph()
     def setConfig(self, config):
         self.config=config
 
@@ -107,21 +352,46 @@ class Project(object):
         stream=(up, down, ind_up, ind_down, obj)
         if id not in self.streams.keys():
             self.streams[id]=stream
-            self.graph.add_edge((up, down))
+            if not self.graph.has_edge((up, down)):
+                self.graph.add_edge((up, down))
 
         if down[0]=="e":
-            eq=self.items[down]
-            if isinstance(eq, Mixer):
-                kwargs={"entrada": obj, "id_entrada": ind_down}
-            else:
-                kwargs={eq.kwargsInput[ind_down]: obj}
-            eq(**kwargs)
+            self.setEquipmentInput(down, ind_down, obj)
 
     def setStream(self, id, obj):
         stream=self.streams[id]
+        if not self.streamChanged(stream[-1], obj):
+            return
         self.streams[id]=stream[0:4]+(obj, )
         self.run("s%i" %id)
 
+    def streamChanged(self, old, new):
+        """Check if a stream state change, the same object can have changed
+        in place so it's considered changed too, the solid flows and
+        particle distribution are checked too"""
+        if old is new or old.status!=new.status:
+            return True
+        if not new.status or not hasattr(old, "caudalunitariomolar") or \
+                not hasattr(new, "caudalunitariomolar"):
+            return old.inputKey()!=new.inputKey()
+        x0=streamVector(old)
+        x1=streamVector(new)
+        if x0.shape!=x1.shape:
+            return True
+        error=absolute(x1-x0)/streamScale(x1)
+        if error.max()>self.propagationTolerance:
+            return True
+
+        # Solids aren't in the iteration variables, compare its state apart
+        s0=streamSolid(old)
+        s1=streamSolid(new)
+        if s0.shape!=s1.shape:
+            return True
+        if not s1.size:
+            return False
+        error=absolute(s1-s0)/maximum(absolute(s1), 1e-12)
+        return error.max()>self.propagationTolerance
+
     def getStream(self, id):
         return self.streams[id][-1]
 
@@ -140,38 +410,468 @@ class Project(object):
         return lista
 
 
+    def setEquipmentInput(self, name, ind_down, obj):
+        """Set the stream obj as input ind_down of equipment name"""
+        equip=self.items[name]
+        if isinstance(equip, Mixer):
+            kwargs={"entrada": obj, "id_entrada": ind_down}
+        else:
+            kwargs={equip.kwargsInput[ind_down]: obj}
+        equip(**kwargs)
+
     def run(self, name):
-        """Ejecuta el projecto de forma recursiva hasta que encuentra un equipo no resuelto"""
+        """Ejecuta el projecto de forma recursiva hasta que encuentra un equipo no resuelto
+        The propagation stop in streams unchanged and equipments with the same
+        inputs aren't recalculated. Projects with recycle loops are solved
+        with the sequential modular solver"""
+        if self.hasCycle():
+            self.solve()
+            return
+
         tipo=name[0]
-        ind=int(name[1])
+        ind=int(name[1:])
 
         if tipo=="i":
             obj=self.getInput(ind)
             if obj.status:
                 key, (up, down, ind_up, ind_down, oldobj)=self.getDownToEquip(name)[0]
                 self.setStream(key, obj)
-                self.run("s%i" %key)
 
         elif tipo=="e":
             obj=self.getItem(ind)
             if obj.status:
                 for key, (up, down, ind_up, ind_down, oldobj) in self.getDownToEquip(name):
                     self.setStream(key, obj.salida[ind_up])
-                    self.run("s%i" %key)
 
         elif tipo=="s":
             up, down, ind_up, ind_down, stream=self.streams[ind]
             if stream.status:
                 if down[0]=="e":
-                    equip=self.items[down]
-                    if isinstance(equip, Mixer):
-                        kwargs={"entrada": stream, "id_entrada": ind_down}
-                    else:
-                        kwargs={equip.kwargsInput[ind_down]: stream}
-                    equip(**kwargs)
+                    self.setEquipmentInput(down, ind_down, stream)
                     self.run(down)
                 elif down[0]=="o":
-                    self.setOutput(int(down[1]), stream)
+                    self.setOutput(int(down[1:]), stream)
+
+    def tearStreams(self, nodes, tear=()):
+        """Select the tear streams to break all cycles in the strongly
+        connected component with nodes. Greedy selection, in each cycle found
+        tear the edge going to the node with more feeds from outside the loop,
+        usually the mixer where the recycle enter, the recycle streams are
+        usually the last defined so ties are solved with higher stream id
+        tear: tear streams fixed by user, completed if they don't break all
+            cycles"""
+        edges={}
+        for key, (up, down, ind_up, ind_down, obj) in self.streams.iteritems():
+            if up in nodes and down in nodes and key not in tear:
+                edges.setdefault((up, down), []).append(key)
+
+        feeds={}
+        for up, down, ind_up, ind_down, obj in self.streams.itervalues():
+            if down in nodes and up not in nodes:
+                feeds[down]=feeds.get(down, 0)+1
+
+        tear=list(tear)
+        while True:
+            grafo=digraph()
+            grafo.add_nodes(nodes)
+            for edge in edges:
+                grafo.add_edge(edge)
+            cycle=find_cycle(grafo)
+            if not cycle:
+                break
+            cycleEdges=zip(cycle, cycle[1:]+cycle[:1])
+            edge=max(cycleEdges,
+                     key=lambda e: (feeds.get(e[1], 0), max(edges[e])))
+            tear+=edges.pop(edge)
+        return sorted(tear)
+
+    def calculationOrder(self, tear=None):
+        """Return the calculation order of project as a list of blocks
+        (nodes, tear), with nodes the item names of a strongly connected
+        component in calculation order and tear the list of its tear streams,
+        empty for blocks without recycle
+        tear: optional list with the tear streams to use, the others needed
+            are selected automatically"""
+        if tear is None:
+            tear=self.tear
+
+        # Condensation of graph in its strongly connected components
+        component={}
+        for node, nodes in mutual_accessibility(self.graph).iteritems():
+            component[node]=tuple(sorted(nodes))
+        blockEdges=set()
+        for up, down, ind_up, ind_down, obj in self.streams.itervalues():
+            if component[up]!=component[down]:
+                blockEdges.add((component[up], component[down]))
+
+        order=[]
+        for nodes in self._topologicalOrder(set(component.values()), blockEdges):
+            internal=[]
+            for key, (up, down, ind_up, ind_down, obj) in self.streams.iteritems():
+                if up in nodes and down in nodes:
+                    internal.append(key)
+
+            blockTear=self.tearStreams(nodes, [key for key in internal if key in tear])
+            edges=set()
+            for key in internal:
+                if key not in blockTear:
+                    edges.add(self.streams[key][0:2])
+            order.append((self._topologicalOrder(nodes, edges), blockTear))
+        return order
+
+    @staticmethod
+    def _topologicalOrder(nodes, edges):
+        """Kahn topological sort of nodes with the directed edges, the nodes
+        without precedence are taken in sorted order to give a reproducible
+        calculation order"""
+        inDegree=dict((node, 0) for node in nodes)
+        children=dict((node, []) for node in nodes)
+        for up, down in edges:
+            if up!=down:
+                inDegree[down]+=1
+                children[up].append(down)
+        ready=sorted(node for node in nodes if not inDegree[node])
+        order=[]
+        while ready:
+            node=ready.pop(0)
+            order.append(node)
+            for child in children[node]:
+                inDegree[child]-=1
+                if not inDegree[child]:
+                    ready.append(child)
+            ready.sort()
+        return order
+
+    def equipmentInputs(self, name):
+        """Return the kwargs with the input streams of equipment name"""
+        equip=self.items[name]
+        inputs=[]
+        for key, (up, down, ind_up, ind_down, obj) in self.streams.iteritems():
+            if down==name:
+                inputs.append((ind_down, obj))
+        inputs.sort(key=lambda x: x[0])
+        if isinstance(equip, Mixer):
+            kwargs={"entrada": [obj for ind, obj in inputs]}
+        else:
+            kwargs={}
+            for ind, obj in inputs:
+                kwargs[equip.kwargsInput[ind]]=obj
+        return kwargs
+
+    def calculateUnit(self, name):
+        """Calculate a single item of project and set its output streams,
+        the inputs streams must be already defined"""
+        if name[0]=="i":
+            obj=self.items[name]
+            outputs=[obj]
+        elif name[0]=="e":
+            equip=self.items[name]
+            equip(**self.equipmentInputs(name))
+            if not equip.status:
+                return False
+            outputs=equip.salida
+        else:
+            for key, (up, down, ind_up, ind_down, obj) in self.streams.iteritems():
+                if down==name:
+                    self.items[name]=obj
+            return True
+
+        for key, (up, down, ind_up, ind_down, obj) in self.streams.items():
+            if up==name and self.streamChanged(obj, outputs[ind_up]):
+                self.streams[key]=self.streams[key][0:4]+(outputs[ind_up], )
+        return True
+
+    def solve(self, tear=None, method=None, tol=None, maxiter=None,
+              callback=None, processes=None):
+        """Sequential modular solver of project
+        tear: list of streams to use as tear streams, the others needed are
+            selected automatically. A undefined tear stream is taken as empty
+            in first iteration, so it must go to a mixer or have a initial
+            estimate defined
+        method: convergence method for recycle loops, direct, wegstein or
+            broyden
+        tol: relative tolerance in tear stream variables
+        maxiter: maximum number of iterations in each loop
+        callback: function called in each loop iteration with arguments
+            (tear, iteration, residual), can be used to report progress
+        processes: number of process to calculate independent branches of
+            project concurrently, 0 for serial calculation and None to use
+            the processes class attribute
+
+        Return True if all loops converged and all items are solved, the
+        items not solved are saved in failed attribute and the report of each
+        loop is saved in loops attribute as a dict with keys: nodes, tear,
+        converged, iterations, residual and history, list of residual in each
+        iteration"""
+        if tear is not None:
+            self.tear=tear
+        if processes is None:
+            processes=self.processes
+        options={"method": method or self.method,
+                 "tol": tol or self.tolerance,
+                 "maxiter": maxiter or self.maxiter}
+
+        self.loops=[]
+        blocks=self.calculationOrder()
+        if processes!=0 and len(blocks)>1:
+            failed=self._solveParallel(blocks, options, callback, processes)
+        else:
+            failed=set()
+            for nodes, blockTear in blocks:
+                # Skip the items downstream of a unsolved equipment
+                if self._upstream(nodes) & failed:
+                    failed.update(nodes)
+                    continue
+                loop, blockFailed=self._solveBlock(nodes, blockTear,
+                                                   callback=callback, **options)
+                if loop:
+                    self.loops.append(loop)
+                failed.update(blockFailed)
+
+        self.failed=sorted(failed)
+        converged=not failed
+        for loop in self.loops:
+            if not loop["converged"]:
+                converged=False
+        return converged
+
+    def _upstream(self, nodes):
+        """Return the items upstream of the block with nodes"""
+        upstream=set()
+        for up, down, ind_up, ind_down, obj in self.streams.itervalues():
+            if down in nodes and up not in nodes:
+                upstream.add(up)
+        return upstream
+
+    def _solveBlock(self, nodes, tear, method, tol, maxiter, callback=None):
+        """Calculate a block of calculation order, return the loop report,
+        None for block without recycle, and the set of items failed"""
+        if tear:
+            loop=self._solveLoop(nodes, tear, method, tol, maxiter, callback)
+            if loop["residual"] is None:
+                return loop, set(nodes)
+            return loop, set()
+        else:
+            failed=set()
+            for node in nodes:
+                if not self.calculateUnit(node):
+                    failed.add(node)
+            return None, failed
+
+    def _blockDirty(self, nodes):
+        """Check if any equipment in block would be recalculated with the
+        current streams, used to avoid sending to other process blocks with
+        nothing to do"""
+        for node in nodes:
+            if node[0]!="e":
+                continue
+            equip=self.items[node]
+            kwargs=equip.kwargs.copy()
+            kwargs.update(self.equipmentInputs(node))
+            if (equip.__class__.__name__, stateKey(kwargs))!=equip._inputKey:
+                return True
+        return False
+
+    def _blockData(self, nodes, tear, options):
+        """Pickled data needed to calculate a block in other process, the
+        items upstream and downstream of block are sent as None only to
+        define the graph"""
+        items={}
+        streams={}
+        for key, stream in self.streams.iteritems():
+            if stream[0] in nodes or stream[1] in nodes:
+                streams[key]=stream
+                items[stream[0]]=None
+                items[stream[1]]=None
+        for node in nodes:
+            items[node]=self.items[node]
+        return cPickle.dumps((nodes, tear, items, streams, self.config,
+                              options), 2)
+
+    def _solveParallel(self, blocks, options, callback, processes):
+        """Calculate the blocks of calculation order with a process pool,
+        the blocks with all its upstream blocks calculated are independent
+        and run concurrently. Blocks without equipment or without changes in
+        its inputs are calculated in this process. The iteration reports of
+        loops calculated in other process are passed to callback at end.
+        If a worker die or a block exceed processTimeout the pool is
+        terminated and the remaining blocks are calculated in this process"""
+        blockIndex={}
+        for i, (nodes, tear) in enumerate(blocks):
+            for node in nodes:
+                blockIndex[node]=i
+        children=dict((i, set()) for i in range(len(blocks)))
+        pending={}
+        for i, (nodes, tear) in enumerate(blocks):
+            upstream=set(blockIndex[node] for node in self._upstream(nodes))
+            pending[i]=len(upstream)
+            for j in upstream:
+                children[j].add(i)
+
+        ready=[i for i in range(len(blocks)) if not pending[i]]
+        results=Queue()
+        pool=None
+        workers=[]
+        running={}
+        failed=set()
+        broken=False
+
+        def merge(i, data):
+            """Update the project with block i and release its children"""
+            self._mergeBlock(i, blocks, data, options, callback, failed)
+            for j in children[i]:
+                pending[j]-=1
+                if not pending[j]:
+                    ready.append(j)
+
+        while ready or running:
+            while ready:
+                i=ready.pop(0)
+                nodes, tear=blocks[i]
+                data=None
+                if not broken and not self._upstream(nodes) & failed and \
+                        len(ready)+len(running)>0 and self._blockDirty(nodes):
+                    try:
+                        data=self._blockData(nodes, tear, options)
+                    except (cPickle.PicklingError, TypeError):
+                        data=None
+
+                if data is None:
+                    merge(i, None)
+                else:
+                    if pool is None:
+                        pool=Pool(processes or None)
+                        # Pool replace silently a dead worker and its task is
+                        # lost, so the initial workers are checked apart
+                        workers=list(pool._pool)
+                    pool.apply_async(_solveBlockProcess, (data, ),
+                                     callback=partial(self._queueResult,
+                                                      results, i))
+                    running[i]=time.time()
+
+            if running:
+                try:
+                    i, data=results.get(timeout=1)
+                except Empty:
+                    dead=[p for p in workers if not p.is_alive()]
+                    late=time.time()-min(running.values())>self.processTimeout
+                    if not dead and not late:
+                        continue
+                    pool.terminate()
+                    pool.join()
+                    pool=None
+                    broken=True
+                    lost=sorted(running)
+                    running.clear()
+                    for i in lost:
+                        merge(i, None)
+                    continue
+
+                # Result of a block already calculated after a pool failure
+                if running.pop(i, None) is None:
+                    continue
+                merge(i, data)
+
+        if pool is not None:
+            pool.close()
+            pool.join()
+        return failed
+
+    @staticmethod
+    def _queueResult(queue, i, data):
+        queue.put((i, data))
+
+    def _mergeBlock(self, i, blocks, data, options, callback, failed):
+        """Update the project with the block calculated in other process, the
+        block is calculated in this process if data is None"""
+        nodes, tear=blocks[i]
+        if self._upstream(nodes) & failed:
+            failed.update(nodes)
+            return
+
+        if data is None:
+            loop, blockFailed=self._solveBlock(nodes, tear, callback=callback,
+                                               **options)
+        else:
+            items, streams, loop, blockFailed=cPickle.loads(data)
+            self.items.update(items)
+            for key, stream in streams.iteritems():
+                if self.streamChanged(self.streams[key][-1], stream[-1]):
+                    self.streams[key]=stream
+            if loop and callback:
+                for iteration, residual in enumerate(loop["history"]):
+                    callback(tear, iteration+1, residual)
+
+        if loop:
+            self.loops.append(loop)
+        failed.update(blockFailed)
+
+    def _solveLoop(self, nodes, tear, method, tol, maxiter, callback):
+        """Converge a recycle loop iterating over its tear streams, the tear
+        streams without value in first iteration are taken as empty so the
+        first pass is done without recycle. The iteration stop with residual
+        None if any equipment in loop can't be solved"""
+        accelerator=self.convergenceMethods[method]()
+        loop={"nodes": nodes,
+              "tear": tear,
+              "converged": False,
+              "iterations": 0,
+              "residual": None,
+              "history": []}
+
+        for iteration in range(1, maxiter+1):
+            x=[]
+            for key in tear:
+                obj=self.streams[key][-1]
+                if obj.status:
+                    x.append(streamVector(obj))
+                else:
+                    x.append(None)
+
+            solved=True
+            for node in nodes:
+                if not self.calculateUnit(node):
+                    solved=False
+                    break
+
+            calculated=[]
+            for key in tear:
+                up, down, ind_up, ind_down, obj=self.streams[key]
+                calculated.append(obj)
+
+            loop["iterations"]=iteration
+            if not solved or not all([obj.status for obj in calculated]):
+                loop["residual"]=None
+                loop["history"].append(None)
+                if callback:
+                    callback(tear, iteration, None)
+                break
+
+            gx=[streamVector(obj) for obj in calculated]
+            residual=0
+            for xi, gi in zip(x, gx):
+                if xi is None:
+                    residual=float("inf")
+                else:
+                    error=absolute(gi-xi)/streamScale(gi)
+                    residual=max(residual, error.max())
+            loop["residual"]=residual
+            loop["history"].append(residual)
+            if callback:
+                callback(tear, iteration, residual)
+
+            if residual<tol:
+                loop["converged"]=True
+                break
+
+            # Next estimate of tear streams
+            if all([xi is not None for xi in x]):
+                gx=array(gx)
+                xnew=accelerator(array(x), gx)
+                if xnew is not gx:
+                    for key, xi, obj in zip(tear, xnew, calculated):
+                        self.streams[key]=self.streams[key][0:4]+(vectorStream(xi, obj), )
+        return loop
 
     def writeToStream(self, stream):
         """Write the project to stream"""
@@ -202,9 +902,11 @@ class Project(object):
             stream.writeInt32(item[3])
             item[4].writeToStream(stream)
 
-    def loadFromStream(self, stream, huella=True, run=True):
+    def loadFromStream(self, stream, huella=True, run=True, memory=False):
         """Read project from stream
-        huella: boolean to save project file to pychemqt_temporal"""
+        huella: boolean to save project file to pychemqt_temporal
+        memory: use the project config in memory instead of save it to
+            pychemqtrc_temporal, for calculation without gui"""
         # read configuration
         config = ConfigParser()
         for i in range(stream.readInt32()):
@@ -220,9 +922,13 @@ class Project(object):
 #        config.set("Units", "specificvolume_square", "0")
 
         self.setConfig(config)
-        if not huella:
-            os.rename(conf_dir+"pychemqtrc_temporal", conf_dir+"pychemqtrc_temporal_bak")
-        config.write(open(conf_dir+"pychemqtrc_temporal", "w"))
+        if memory:
+            setMainWindowConfig(config)
+        else:
+            if not huella:
+                os.rename(conf_dir+"pychemqtrc_temporal", conf_dir+"pychemqtrc_temporal_bak")
+            config.write(open(conf_dir+"pychemqtrc_temporal", "w"))
+        unidades.resetConfig()
 
         # read equipments
         items = {}
@@ -259,8 +965,16 @@ class Project(object):
                     equip(**kwargs)
         self.setStreams(streams)
 
-        if not huella:
+        # Input and output items are defined by its streams
+        for key, (up, down, ind_up, ind_down, obj) in streams.iteritems():
+            if up[0]=="i" and self.items.get(up) is None:
+                self.items[up]=obj
+            if down[0]=="o" and self.items.get(down) is None:
+                self.items[down]=obj
+
+        if not huella and not memory:
             os.rename(conf_dir+"pychemqtrc_temporal_bak", conf_dir+"pychemqtrc_temporal")
+            unidades.resetConfig()
 
     def printer(self):
         # Draw as PNG
@@ -8,14 +8,13 @@
 
 
 from math import exp, log
-import sqlite3
 
 from numpy import polyval
 from scipy.optimize import fsolve
 from PyQt4.QtGui import QApplication
 
 from lib import unidades
-from lib.sql import databank_name
+from lib.sql import getElement
 
 
 class Reaction(object):
@@ -117,21 +116,18 @@ class Reaction(object):
         self.formulas = self.kwargs["formula"]
         self.keq = self.kwargs["keq"]
 
-        databank = sqlite3.connect(databank_name).cursor()
-        databank.execute("select nombre, peso_molecular, formula, \
-                         calor_formacion_gas from compuestos where id  IN \
-                         %s" % str(tuple(self.componentes)))
         nombre = []
         peso_molecular = []
         formula = []
         calor_reaccion = 0
         check_estequiometria = 0
-        for i, compuesto in enumerate(databank):
-            nombre.append(compuesto[0])
-            peso_molecular.append(compuesto[1])
-            formula.append(compuesto[2])
-            calor_reaccion += compuesto[3]*self.coeficientes[i]
-            check_estequiometria += self.coeficientes[i]*compuesto[1]
+        for i, indice in enumerate(self.componentes):
+            compuesto = getElement(indice)
+            nombre.append(compuesto[2])
+            peso_molecular.append(compuesto[3])
+            formula.append(compuesto[1])
+            calor_reaccion += compuesto[141]*self.coeficientes[i]
+            check_estequiometria += self.coeficientes[i]*compuesto[3]
         self.nombre = nombre
         self.peso_molecular = peso_molecular
         self.formula = formula
@@ -5,15 +5,58 @@
 # Module for properties database manipulation
 #   -createDatabase: Create empty database
 #
-#   -getElement
+#   -getConnection: Shared connection to a databank file
+#   -getElement: Component row, cached in memory
+#   -clearCache: Remove component rows from memory cache
 #   -copyElement
 #   -deleteElement
 #   -inserElementFromArray
 #   -updateElement
 #   -transformElement
+#
+# The connection to each databank is opened only once for each thread and
+# process, and the rows returned by getElement are cached by id, so the
+# database is read only once per component. The functions that modify a
+# databank clear the cached rows of the changed components.
 ###############################################################################
 
-import sqlite3, os
+import sqlite3, os, threading
+
+
+_pool = threading.local()
+_inherited = []
+_cache = {}
+
+
+def getConnection(name):
+    """Return the shared connection to databank file name, it's opened the
+    first time it's requested in each thread and process. A forked process
+    inherit the connections of parent, sqlite don't support its use in
+    other process so they are kept apart without use or close"""
+    pid = os.getpid()
+    if getattr(_pool, "pid", pid) != pid:
+        _inherited.append(_pool.connections)
+        del _pool.connections
+    _pool.pid = pid
+    try:
+        connections = _pool.connections
+    except AttributeError:
+        connections = _pool.connections = {}
+    try:
+        return connections[name]
+    except KeyError:
+        conn = sqlite3.connect(name)
+        connections[name] = conn
+        return conn
+
+
+def clearCache(indices=None):
+    """Remove the rows of indices from memory cache, all if not specified"""
+    if indices is None:
+        _cache.clear()
+    else:
+        for indice in indices:
+            _cache.pop(indice, None)
 
 
 def createDatabase(name):
@@ -295,56 +338,61 @@ def transformElement(elemento):
 
 def inserElementsFromArray(name, lista):
     """lista: array con datos de componentes en formato texto"""
-    conn = sqlite3.connect(name)
+    conn = getConnection(name)
     curs = conn.cursor()
     curs.execute("SELECT COUNT(*) AS Total FROM compuestos")
     numero=curs.fetchone()[0]
     if name==os.path.expanduser('~') + "/.pychemqt/"+"databank.db":
         numero+=1000
-    query="INSERT INTO compuestos VALUES "
+    indices=[]
     for indice, elemento in enumerate(lista):
         vals=transformElement(elemento)
         vals.insert(0, numero+indice+1)
-        curs.execute(query+str(tuple(vals)))
+        query="INSERT INTO compuestos VALUES (%s)" % ", ".join("?"*len(vals))
+        curs.execute(query, vals)
+        indices.append(vals[0])
 
     conn.commit()
-    conn.close()
+    clearCache(indices)
 
 def updateElement(elemento, indice):
     """lista: array con datos de componentes en formato texto"""
     variables=["formula", "nombre", "peso_molecular", "tc", "pc", "vc", "API", "Cp_ideal_A", "Cp_ideal_B", "Cp_ideal_C", "Cp_ideal_D", "Cp_ideal_E", "Cp_ideal_F", "antoine_A", "antoine_B", "antoine_C", "henry_A", "henry_B", "henry_C", "henry_D", "visco_A", "visco_B", "tension_A", "tension_B", "rhoS_DIPPR_EQ", "rhoS_DIPPR_A", "rhoS_DIPPR_B", "rhoS_DIPPR_C", "rhoS_DIPPR_D", "rhoS_DIPPR_E", "rhoS_DIPPR_tmin", "rhoS_DIPPR_tmax", "rhoL_DIPPR_EQ", "rhoL_DIPPR_A", "rhoL_DIPPR_B", "rhoL_DIPPR_C", "rhoL_DIPPR_D", "rhoL_DIPPR_E", "rhoL_DIPPR_tmin", "rhoL_DIPPR_tmax", "Pv_DIPPR_EQ", "Pv_DIPPR_A", "Pv_DIPPR_B", "Pv_DIPPR_C", "Pv_DIPPR_D", "Pv_DIPPR_E", "Pv_DIPPR_tmin", "Pv_DIPPR_tmax", "Hv_DIPPR_EQ", "Hv_DIPPR_A", "Hv_DIPPR_B", "Hv_DIPPR_C", "Hv_DIPPR_D", "Hv_DIPPR_E", "Hv_DIPPR_tmin", "Hv_DIPPR_tmax", "CpS_DIPPR_EQ", "CpS_DIPPR_A", "CpS_DIPPR_B", "CpS_DIPPR_C", "CpS_DIPPR_D", "CpS_DIPPR_E", "CpS_DIPPR_tmin", "CpS_DIPPR_tmax", "CpL_DIPPR_EQ", "CpL_DIPPR_A", "CpL_DIPPR_B", "CpL_DIPPR_C", "CpL_DIPPR_D", "CpL_DIPPR_E", "CpL_DIPPR_tmin", "CpL_DIPPR_tmax", "CpG_DIPPR_EQ", "CpG_DIPPR_A", "CpG_DIPPR_B", "CpG_DIPPR_C", "CpG_DIPPR_D", "CpG_DIPPR_E", "CpG_DIPPR_tmin", "CpG_DIPPR_tmax", "muL_DIPPR_EQ", "muL_DIPPR_A", "muL_DIPPR_B", "muL_DIPPR_C", "muL_DIPPR_D", "muL_DIPPR_E", "muL_DIPPR_tmin", "muL_DIPPR_tmax", "muG_DIPPR_EQ", "muG_DIPPR_A", "muG_DIPPR_B", "muG_DIPPR_C", "muG_DIPPR_D", "muG_DIPPR_E", "muG_DIPPR_tmin", "muG_DIPPR_tmax", "ThcondL_DIPPR_EQ", "ThcondL_DIPPR_A", "ThcondL_DIPPR_B", "ThcondL_DIPPR_C", "ThcondL_DIPPR_D", "ThcondL_DIPPR_E", "ThcondL_DIPPR_tmin", "ThcondL_DIPPR_tmax", "ThcondG_DIPPR_EQ", "ThcondG_DIPPR_A", "ThcondG_DIPPR_B", "ThcondG_DIPPR_C", "ThcondG_DIPPR_D", "ThcondG_DIPPR_E", "ThcondG_DIPPR_tmin", "ThcondG_DIPPR_tmax", "tension_DIPPR_EQ", "tension_DIPPR_A", "tension_DIPPR_B", "tension_DIPPR_C", "tension_DIPPR_D", "tension_DIPPR_E", "tension_DIPPR_tmin", "tension_DIPPR_tmax", "momento_dipolar", "constante_volumen_liquido", "constante_rackett", "densidad_especifica", "factor_acentrico", "parametro_solubilidad", "watson", "MSRK_A", "MSRK_B", "Stiehl", "t_ebullicion", "t_fusion", "CAS_id", "formula_alternativa", "UNIFAC", "diametro_molecular", "Eps_k", "UNIQUAC_area", "UNIQUAC_volumen", "factor_acentrico_modificado", "calor_formacion_gas", "energia_libre_gas", "volumen_wilson", "calor_combustion_neto", "calor_combustion_bruto", "nombre_alternativo", "volumen_caracteristico", "calor_formacion_solido", "energia_libre_solido", "parametro_polar", "smile"]
     vals=transformElement(elemento)
 
-    conn = sqlite3.connect(databank_Custom_name)
-    curs = conn.cursor()
+    columns=[]
+    values=[]
     for variable, valor in zip(variables, vals):
-        if isinstance(valor, int):
-            curs.execute('UPDATE compuestos SET %s=%i WHERE id==%i' %(variable, valor, indice))
-        elif isinstance(valor, float):
-            curs.execute('UPDATE compuestos SET %s=%f WHERE id==%i' %(variable, valor, indice))
-        elif isinstance(valor, str):
-            valor='"'+valor+'"'
-            curs.execute('UPDATE compuestos SET %s=%s WHERE id==%i' %(variable, valor, indice))
+        if isinstance(valor, (int, float, str)):
+            columns.append("%s=?" % variable)
+            values.append(valor)
+    values.append(indice)
+
+    conn = getConnection(databank_Custom_name)
+    conn.execute("UPDATE compuestos SET %s WHERE id==?" % ", ".join(columns), values)
     conn.commit()
-    conn.close()
+    clearCache([indice])
 
 def deleteElement(indice):
     """lista: array con datos de componentes en formato texto"""
-    conn = sqlite3.connect(databank_Custom_name)
-    curs = conn.cursor()
-    curs.execute("DELETE FROM compuestos WHERE id=%i" % indice)
+    conn = getConnection(databank_Custom_name)
+    conn.execute("DELETE FROM compuestos WHERE id==?", (indice, ))
     conn.commit()
-    conn.close()
+    clearCache([indice])
 
 def getElement(indice):
+    try:
+        return _cache[indice]
+    except KeyError:
+        pass
+
     if indice>1000:
-        databank_Custom=sqlite3.connect(databank_Custom_name).cursor()
-        databank_Custom.execute("select * from compuestos where id==%i"%indice)
-        componente=databank_Custom.fetchone()
+        conn=getConnection(databank_Custom_name)
     else:
-        databank=sqlite3.connect(databank_name).cursor()
-        databank.execute("select * from compuestos where id==%i"%indice)
-        componente=databank.fetchone()
+        conn=getConnection(databank_name)
+    componente=conn.execute("SELECT * FROM compuestos WHERE id==?", (indice, )).fetchone()
+    if componente is not None:
+        _cache[indice]=componente
     return componente
 
 def copyElement(indice):
@@ -355,14 +403,15 @@ def copyElement(indice):
             vals.append(i.encode())
         else:
             vals.append(i)
-    conn = sqlite3.connect(databank_Custom_name)
-    curs = conn.cursor()
-    curs.execute("INSERT INTO compuestos VALUES"+str((1000+N_comp_Custom+1, )+ tuple(vals)))
+    vals.insert(0, 1000+N_comp_Custom+1)
+    conn = getConnection(databank_Custom_name)
+    conn.execute("INSERT INTO compuestos VALUES (%s)" % ", ".join("?"*len(vals)), vals)
     conn.commit()
-    conn.close()
+    clearCache([vals[0]])
+    return vals[0]
 
 databank_name=os.environ["pychemqt"] + 'dat'+os.sep+'databank.db'
-databank=sqlite3.connect(databank_name).cursor()
+databank=getConnection(databank_name).cursor()
 databank.execute("SELECT COUNT(*) AS Total FROM compuestos")
 N_comp=databank.fetchone()[0]
 
@@ -372,7 +421,7 @@ if not os.path.isdir(conf_dir):
 if not os.path.isfile(conf_dir + "databank.db"):
     createDatabase(conf_dir + 'databank.db')
 databank_Custom_name=conf_dir + 'databank.db'
-databank_Custom=sqlite3.connect(databank_Custom_name).cursor()
+databank_Custom=getConnection(databank_Custom_name).cursor()
 databank_Custom.execute("SELECT COUNT(*) AS Total FROM compuestos")
 N_comp_Custom=databank_Custom.fetchone()[0]
 
@@ -0,0 +1,104 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# Timing report of application start, enabled with the --profile-startup
+# command line option
+#   - StartupProfile: Record the time of start stages and module imports and
+#       write the report
+#
+# The imports are timed replacing the builtin __import__ while the profile is
+# installed, only the calls that load new modules are reported. The time of
+# an import include its nested imports, the self time exclude them.
+###############################################################################
+
+import __builtin__
+import sys
+import time
+
+
+class StartupProfile(object):
+    """Startup timing report
+        filename: file to write the report, default standard output"""
+    def __init__(self, filename=""):
+        self.filename = filename
+        self.start = time.time()
+        self.stages = []
+        self.imports = []
+        self.modules = 0
+        self._stack = []
+        self._import = None
+
+    def install(self):
+        """Start the timing of imports"""
+        if self._import is None:
+            self._import = __builtin__.__import__
+            __builtin__.__import__ = self._timedImport
+
+    def uninstall(self):
+        """Stop the timing of imports"""
+        if self._import is not None:
+            __builtin__.__import__ = self._import
+            self._import = None
+
+    def _timedImport(self, name, globals=None, locals=None, fromlist=None,
+                     level=-1):
+        loaded = len(sys.modules)
+        self._stack.append(0)
+        start = time.time()
+        try:
+            return self._import(name, globals, locals, fromlist, level)
+        finally:
+            total = time.time()-start
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += total
+            else:
+                self.modules += len(sys.modules)-loaded
+            if len(sys.modules) > loaded:
+                if fromlist and "*" not in fromlist:
+                    name = "%s (%s)" % (name, ", ".join(fromlist))
+                importer = ""
+                if globals:
+                    importer = globals.get("__name__", "")
+                count = len(sys.modules)-loaded
+                self.imports.append((total, total-nested, count, name,
+                                     importer))
+
+    def stage(self, name):
+        """Mark the start of a stage, it end with the next stage"""
+        self.stages.append((time.time(), unicode(name).replace("\n", " ")))
+
+    def finish(self):
+        """Stop the profile and write the report"""
+        end = time.time()
+        self.uninstall()
+        if self.filename:
+            with open(self.filename, "w") as fh:
+                self.report(fh, end)
+        else:
+            self.report(sys.stdout, end)
+            sys.stdout.flush()
+
+    def report(self, fh, end=None, limit=40):
+        """Write the report to file fh
+            end: time of start end, default now
+            limit: number of imports to show, sorted by time"""
+        if end is None:
+            end = time.time()
+        fh.write("Startup time: %0.3f s\n\n" % (end-self.start))
+
+        fh.write("Stages:\n")
+        fh.write("%8s %8s  %s\n" % ("start", "time", "stage"))
+        stages = self.stages+[(end, "")]
+        for (start, name), (stop, _) in zip(stages[:-1], stages[1:]):
+            line = "%8.3f %8.3f  %s\n" % (start-self.start, stop-start, name)
+            fh.write(line.encode("utf-8"))
+
+        imports = sorted(self.imports, reverse=True)
+        fh.write("\nImports, %i modules loaded, %i slowest:\n" % (
+            self.modules, min(limit, len(imports))))
+        fh.write("%8s %8s %8s  %s\n" % ("time", "self", "modules", "import"))
+        for total, own, count, name, importer in imports[:limit]:
+            fh.write("%8.3f %8.3f %8i  %s [%s]\n" % (
+                total, own, count, name, importer))
@@ -6,11 +6,15 @@
 #   - WaitforClick: Thread for draw stream in PFD
 #   - Evaluate: Thread to insolate entity calculation from gui, used in streams,
 #       equipment, and project
+#   - TaskPool: Thread to run independent tasks in a pool of worker processes
 ###############################################################################
 
+from multiprocessing import Pool
+from Queue import Queue, Empty
 from time import sleep
+import traceback
 
-from PyQt4.QtCore import QThread, QMutex
+from PyQt4.QtCore import QThread, QMutex, pyqtSignal
 
 
 class WaitforClick(QThread):
@@ -45,3 +49,65 @@ class Evaluate(QThread):
         self.mutex.lock()
         self.entity(**self.kwargs)
         self.mutex.unlock()
+
+
+def _runTask(args):
+    """Worker of TaskPool, the exceptions are returned as traceback text so
+    a failed task don't lock the pool"""
+    index, function, task = args
+    try:
+        return index, function(*task), None
+    except Exception:
+        return index, None, traceback.format_exc()
+
+
+class TaskPool(QThread):
+    """Thread to run a list of independent tasks in a pool of worker processes
+    without block the gui, the result of each task is emitted as soon as it's
+    available and cancel drop the pending tasks
+        function: picklable function to run, module level function
+        tasks: list of tuples with the arguments of each task
+        processes: number of worker processes, None to use all cpu cores"""
+    taskFinished = pyqtSignal(object)
+    taskError = pyqtSignal(str)
+    progress = pyqtSignal(int, int)
+
+    def __init__(self, function, tasks, processes=None, parent=None):
+        super(TaskPool, self).__init__(parent)
+        self.function = function
+        self.tasks = tasks
+        self.processes = processes
+        self.cancelled = False
+        self.errors = []
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        queue = Queue()
+        pool = Pool(self.processes)
+        for i, task in enumerate(self.tasks):
+            pool.apply_async(_runTask, ((i, self.function, task), ),
+                             callback=queue.put)
+
+        done = 0
+        total = len(self.tasks)
+        try:
+            while done < total and not self.cancelled:
+                try:
+                    index, result, error = queue.get(timeout=0.1)
+                except Empty:
+                    continue
+                done += 1
+                if error:
+                    self.errors.append(error)
+                    self.taskError.emit(error)
+                else:
+                    self.taskFinished.emit(result)
+                self.progress.emit(done, total)
+        finally:
+            if self.cancelled:
+                pool.terminate()
+            else:
+                pool.close()
+            pool.join()
@@ -78,6 +78,63 @@ def K2Re(K):
     return (K - 273.15) / 1.25
 
 
+_format = {}
+
+
+def _numericFormat(magnitud):
+    """Return the numeric format options of magnitud from preferences, the
+    file is read only the first time, call resetConfig if it change"""
+    if not _format:
+        Preferences = ConfigParser()
+        Preferences.read(conf_dir+"pychemqtrc")
+        for option in Preferences.options("NumericFormat"):
+            _format[option] = eval(Preferences.get("NumericFormat", option))
+    return _format[magnitud.lower()]
+
+
+def resetConfig():
+    """Refresh the cached project configuration and numeric format
+    preferences, must be called when any of them change"""
+    unidad.Config = getMainWindowConfig()
+    _format.clear()
+
+
+class _Conversion(object):
+    """Descriptor to get the value of an unidad instance in other unit, the
+    value is calculated when requested with the func conversion function"""
+    def __init__(self, func):
+        self.func = func
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        return self.func(float(obj))
+
+
+class _Rate(object):
+    """Descriptor for proportional units, value divided by conversion rate"""
+    def __init__(self, rate):
+        self.rate = rate
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        return float(obj) / self.rate
+
+
+class _UnitType(type):
+    """Metaclass of unidad, define in each class the magnitud name and a
+    descriptor for each unit in rates dict, the units defined explicitly in
+    class, like gauge pressures, are respected"""
+    def __init__(cls, name, bases, dct):
+        super(_UnitType, cls).__init__(name, bases, dct)
+        if "magnitud" not in dct:
+            cls.magnitud = name
+        for key, rate in cls.rates.iteritems():
+            if key not in dct:
+                setattr(cls, key, _Rate(rate))
+
+
 class unidad(float):
     """
     Generic class to model units
@@ -91,7 +148,11 @@ class unidad(float):
             Each magnitud is a tuple with format (Name, title)
         __units_set__: Dict with standart unit for units system,
             altsi, si, metric, cgs, english
+
+    The value is saved in the float in the SI unit, the value in any other
+    unit is calculated only when is requested
     """
+    __metaclass__ = _UnitType
     __title__ = ""
     rates = {}
     __text__ = []
@@ -100,52 +161,39 @@ class unidad(float):
     _magnitudes = []
     __units_set__ = []
     Config = getMainWindowConfig()
-    
-    def __init__(self, data, unit="", magnitud=""):
-        """Non proportional magnitudes (Temperature, Pressure)
-        must rewrite this method"""
-        if not magnitud:
-            magnitud = self.__class__.__name__
-        self.magnitud = magnitud
+    code = ""
 
+    def __init__(self, data, unit="", magnitud=""):
+        if magnitud:
+            self.magnitud = magnitud
         if data is None:
-            self._data = 0
             self.code = "n/a"
-        else:
-            self._data = data
-            self.code = ""
-
-        if unit == "conf":
-            unit = self.__units__[self.Config.getint('Units', magnitud)]
-        try:
-            conversion = self.__class__.rates[unit]
-        except:
-            raise ValueError(
-                QApplication.translate("pychemqt", "Wrong input code"))
-
-        self._data *= conversion
-        for key in self.__class__.rates:
-            self.__setattr__(key, self._data / self.__class__.rates[key])
 
     def __new__(cls, data, unit="", magnitud=""):
         """Non proportional magnitudes (Temperature, Pressure)
         must rewrite this method"""
-        cls.Config = getMainWindowConfig()
-
         if data:
             data = float(data)
         else:
             data = 0.
 
-        if not magnitud:
-            magnitud = cls.__name__
-
         if not unit:
             unit = cls.__units__[0]
         elif unit == "conf":
+            if not magnitud:
+                magnitud = cls.__name__
             unit = cls.__units__[cls.Config.getint('Units', magnitud)]
 
-        return float.__new__(cls, data * cls.rates[unit])
+        try:
+            conversion = cls.rates[unit]
+        except KeyError:
+            raise ValueError(
+                QApplication.translate("pychemqt", "Wrong input code"))
+        return float.__new__(cls, data * conversion)
+
+    @property
+    def _data(self):
+        return float(self)
 
     def config(self, magnitud=""):
         """Using config file return the value in the configurated unit"""
@@ -183,9 +231,7 @@ if a unit define several magnitudes, must be fill the _magnitudes variable"""
             magnitud = self.__class__.__name__
         if not unit:
             unit = self.func(magnitud)
-        Preferences = ConfigParser()
-        Preferences.read(conf_dir+"pychemqtrc")
-        kwargs = eval(Preferences.get("NumericFormat", magnitud))
+        kwargs = _numericFormat(magnitud)
         value = self.__getattribute__(unit)
         return representacion(value, **kwargs)
 
@@ -249,9 +295,7 @@ with support for class unidad operations: txt, config. func."""
 
     def format(self, unit):
         """Using config file return the unit value in desired numeric format"""
-        Preferences = ConfigParser()
-        Preferences.read(conf_dir+"pychemqtrc")
-        kwargs = eval(Preferences.get("NumericFormat", "Dimensionless"))
+        kwargs = _numericFormat("Dimensionless")
         return representacion(self, **kwargs)
 
     @property
@@ -283,73 +327,28 @@ class Temperature(unidad):
     __units_set__ = {"altsi": "C", "si": "K", "metric": "C", "cgs": "C",
                      "english": "F"}
 
-    def __init__(self, data, unit="K", magnitud=""):
-
-        if not magnitud:
-            magnitud = self.__class__.__name__
-        self.magnitud = magnitud
-
-        if data is None:
-            data = 0
-            self.code = "n/a"
-        else:
-            data = data
-            self.code = ""
-
-        if unit == "conf":
-            unit = self.__units__[self.Config.getint('Units', magnitud)]
-
-        if unit == "K":
-            self._data = data
-        elif unit == "C":
-            self._data = C2K(data)
-        elif unit == "F":
-            self._data = F2K(data)
-        elif unit == "R":
-            self._data = R2K(data)
-        elif unit == "Re":
-            self._data = Re2K(data)
-        else:
-            raise ValueError(
-                QApplication.translate("pychemqt", "Wrong input code"))
-
-        self.K = self._data
-        self.C = K2C(self._data)
-        self.F = K2F(self._data)
-        self.R = K2R(self._data)
-        self.Re = K2Re(self._data)
+    _toK = {"K": float, "C": C2K, "F": F2K, "R": R2K, "Re": Re2K}
+    K = _Conversion(float)
+    C = _Conversion(K2C)
+    F = _Conversion(K2F)
+    R = _Conversion(K2R)
+    Re = _Conversion(K2Re)
 
     def __new__(cls, data, unit="K", magnitud=""):
-        cls.Config = getMainWindowConfig()
-
         if data is None:
-            cls.code = "n/a"
             data = 0.
-        else:
-            cls.code = ""
-            data = float(data)
-
-        if not magnitud:
-            magnitud = cls.__name__
 
         if unit == "conf":
+            if not magnitud:
+                magnitud = cls.__name__
             unit = cls.__units__[cls.Config.getint('Units', magnitud)]
 
-        if unit == "K":
-            cls._data = data
-        elif unit == "C":
-            cls._data = C2K(data)
-        elif unit == "F":
-            cls._data = F2K(data)
-        elif unit == "R":
-            cls._data = R2K(data)
-        elif unit == "Re":
-            cls._data = Re2K(data)
-        else:
+        try:
+            conversion = cls._toK[unit]
+        except KeyError:
             raise ValueError(
                 QApplication.translate("pychemqt", "Wrong input code"))
-
-        return float.__new__(cls, cls._data)
+        return float.__new__(cls, conversion(float(data)))
 
 
 class DeltaT(unidad):
@@ -1200,59 +1199,31 @@ class Pressure(unidad):
     __units_set__ = {"altsi": "bar", "si": "Pa", "metric": "Pa",
                      "cgs": "dyncm2", "english": "psi"}
 
-    def __init__(self, data, unit="Pa", magnitud=""):
-        if not magnitud:
-            magnitud = self.__class__.__name__
-        self.magnitud = magnitud
-
-        if unit == "conf":
-            unit = self.__units__[self.Config.getint('Units', magnitud)]
-
-        if unit == "barg":
-            self._data = data*k.bar+k.atm
-        elif unit == "psig":
-            self._data = data*k.psi+k.atm
-        elif unit == "kgcm2g":
-            self._data = data*k.g/k.centi**2+k.atm
-        else:
-            self._data = data * self.__class__.rates[unit]
-
-        if data is None:
-            self._data = 0
-            self.code = "n/a"
-        else:
-            self.code = ""
-
-        for key in self.__class__.rates:
-            self.__setattr__(key, self._data/self.__class__.rates[key])
-
-        self.barg = (self.Pa-k.atm)/k.bar
-        self.psig = (self.Pa-k.atm)/k.psi
-        self.kgcm2g = (self.Pa-k.atm)*k.centi**2/k.g
+    _gauge = {"barg": k.bar, "psig": k.psi, "kgcm2g": k.g/k.centi**2}
+    barg = _Conversion(lambda Pa: (Pa-k.atm)/k.bar)
+    psig = _Conversion(lambda Pa: (Pa-k.atm)/k.psi)
+    kgcm2g = _Conversion(lambda Pa: (Pa-k.atm)*k.centi**2/k.g)
 
     def __new__(cls, data, unit="Pa", magnitud=""):
-        cls.Config = getMainWindowConfig()
-
         if data is None:
-            data = 0
-            cls.code = "n/a"
+            data = 0.
         else:
-            cls.code = ""
             data = float(data)
 
         if unit == "conf":
-            unit = cls.__units__[cls.Config.getint('Units', 'Pressure')]
-
-        if unit == "barg":
-            cls._data = data*k.bar+k.atm
-        elif unit == "psig":
-            cls._data = data*k.psi+k.atm
-        elif unit == "kgcm2g":
-            cls._data = data*k.g/k.centi**2+k.atm
-        else:
-            cls._data = data * cls.rates[unit]
+            if not magnitud:
+                magnitud = cls.__name__
+            unit = cls.__units__[cls.Config.getint('Units', magnitud)]
 
-        return float.__new__(cls, cls._data)
+        if unit in cls._gauge:
+            value = data*cls._gauge[unit]+k.atm
+        else:
+            try:
+                value = data*cls.rates[unit]
+            except KeyError:
+                raise ValueError(
+                    QApplication.translate("pychemqt", "Wrong input code"))
+        return float.__new__(cls, value)
 
 
 class DeltaP(unidad):
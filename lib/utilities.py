@@ -6,10 +6,21 @@
 #   - format2txt: function to convert dict format config in a string value
 #   - representacion
 #   - colors
+#   - replaceFile: Rename a file overwriting the destination in all platforms
 #################################################################################
 
 
+import os
 import random
+import sys
+
+
+def replaceFile(source, target):
+    """Rename source to target overwriting it if exist, in windows os.rename
+    fail with a existing target so it's removed first"""
+    if sys.platform == "win32" and os.path.isfile(target):
+        os.remove(target)
+    os.rename(source, target)
 
 
 def format2txt(formato):
@@ -3,6 +3,18 @@
 
 import os
 import sys
+
+# Startup timing report, with the --profile-startup[=file] option
+profile = None
+for arg in sys.argv[1:]:
+    if arg == "--profile-startup" or arg.startswith("--profile-startup="):
+        sys.argv.remove(arg)
+        from lib.startup import StartupProfile
+        profile = StartupProfile(arg.partition("=")[2])
+        profile.install()
+        profile.stage("Importing Qt")
+        break
+
 import urllib2
 import shutil
 
@@ -19,6 +31,8 @@ sys.path.append(path)
 conf_dir = os.path.expanduser('~') + os.sep+".pychemqt"+os.sep
 os.environ["pychemqt"] = path + os.path.sep
 
+if profile:
+    profile.stage("Creating application")
 app = QtGui.QApplication(sys.argv)
 app.setOrganizationName("pychemqt")
 app.setOrganizationDomain("pychemqt")
@@ -34,13 +48,14 @@ if qtTranslator.load("qt_" + locale,
    QtCore.QLibraryInfo.location(QtCore.QLibraryInfo.TranslationsPath)):
     app.installTranslator(qtTranslator)
 
-# Check external modules
-from tools.dependences import optional_modules
+# Check external modules, only searched, they are imported when used
+if profile:
+    profile.stage("Checking optional modules")
+from tools.dependences import optional_modules, findModule
 for module, use in optional_modules:
-    try:
-        __import__(module)
+    if findModule(module):
         os.environ[module] = "True"
-    except ImportError:
+    else:
         print(QtGui.QApplication.translate("pychemqt", "%s don't found, %s"
                                            % (module, use)).toUtf8())
         os.environ[module] = ""
@@ -57,6 +72,8 @@ class SplashScreen(QtGui.QSplashScreen):
     def showMessage(self, msg):
         """Método para mostrar mensajes en la parte inferior de la ventana de
         splash"""
+        if profile:
+            profile.stage(msg)
         labelAlignment = QtCore.Qt.Alignment(QtCore.Qt.AlignBottom |
                                              QtCore.Qt.AlignRight |
                                              QtCore.Qt.AlignAbsolute)
@@ -68,6 +85,8 @@ class SplashScreen(QtGui.QSplashScreen):
         QtGui.QSplashScreen.clearMessage(self)
         QtGui.QApplication.processEvents()
 
+if profile:
+    profile.stage("Showing splash")
 splash = SplashScreen()
 
 # Check config files
@@ -111,24 +130,11 @@ splash.showMessage(QtGui.QApplication.translate("pychemqt",
                                                 "Checking custom database..."))
 from lib.sql import createDatabase
 
-# Import internal libraries
-splash.showMessage(QtGui.QApplication.translate("pychemqt",
-                                                "Importing libraries..."))
-from UI import texteditor, newComponent, flujo, charts, plots, viewComponents
-from UI.widgets import createAction, ClickableLabel, TreeEquipment
-from lib.config import conf_dir, getComponents
-from lib.project import Project
-from lib.EoS import K, H
-from lib import unidades
-
-
+# Import internal libraries, the dialogs, charts and tools are imported by
+# main window when they are used
 splash.showMessage(QtGui.QApplication.translate("pychemqt",
                                                 "Importing equipments..."))
-from equipment import *
-
-splash.showMessage(QtGui.QApplication.translate("pychemqt", "Importing tools..."))
-from tools import UI_confComponents, UI_confTransport, UI_confThermo, UI_confUnits, UI_confResolution, UI_databank, UI_unitConverter, UI_steamTables, UI_psychrometry
-from UI.conversor_unidades import moneda
+import equipment
 
 splash.showMessage(QtGui.QApplication.translate("pychemqt", "Loading main window..."))
 from UI.mainWindow import UI_pychemqt
@@ -146,5 +152,8 @@ if pychemqt.Preferences.getboolean("General", 'Load_Last_Project'):
 
 
 splash.finish(pychemqt)
+if profile:
+    profile.stage("Showing main window")
+    QtCore.QTimer.singleShot(0, profile.finish)
 pychemqt.show()
 sys.exit(app.exec_())
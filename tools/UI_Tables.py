@@ -30,7 +30,7 @@
 #   - EditAxis: Dialog to configure axes plot properties
 ###############################################################################
 
-import inspect, csv, os, cPickle, gzip
+import inspect, csv, os, cPickle
 from functools import partial
 from string import maketrans
 from math import ceil, floor, log10, atan, pi
@@ -38,10 +38,12 @@ from ConfigParser import ConfigParser
 
 from PyQt4 import QtCore, QtGui
 from numpy import arange, append, concatenate, meshgrid, zeros, linspace, logspace, max, transpose, delete, insert, log
+from scipy.optimize import brentq
 from matplotlib.lines import Line2D
 from matplotlib.font_manager import FontProperties
 
-from lib import meos, mEoS, unidades, plot, iapws, config
+from lib import meos, mEoS, unidades, plot, iapws, config, chartStore
+from lib.thread import TaskPool
 from lib.utilities import format2txt, representacion
 from UI.widgets import Entrada_con_unidades, ClickableLabel, Tabla, createAction, LineStyleCombo, MarkerCombo, ColorSelector, InputFond, Status
 from UI.delegate import CheckEditor
@@ -371,7 +373,9 @@ class plugin(QtGui.QMenu):
         z: property for axis z, optional to 3D plot"""
         index = self.config.getint("MEoS", "fluid")
         fluid=mEoS.__all__[index]
-        filename = "%s.pkl" % (fluid.formula)
+        filename = chartStore.chartName(
+            fluid, self.config.getint("MEoS", "eq"), getReference(self.config),
+            get_points(self.parent().Preferences))
 
         if z:
             title=QtGui.QApplication.translate(
@@ -401,36 +405,7 @@ class plugin(QtGui.QMenu):
             k = self.config.getint("Units", unitz)
             ztxt = "%s, %s" %(z, meos.units[meos.keys.index(z)].__text__[k])
             grafico.plot.ax.set_zlabel(ztxt)
-
-        self.parent().statusbar.showMessage(QtGui.QApplication.translate(
-            "pychemqt", "Loading cached data..."))
-        QtGui.QApplication.processEvents()
-        data = grafico._getData()
-        if not data:
-            self.parent().progressBar.setValue(0)
-            self.parent().progressBar.setVisible(True)
-            self.parent().statusbar.showMessage(QtGui.QApplication.translate(
-                "pychemqt", "Calculating data, be patient..."))
-            QtGui.QApplication.processEvents()
-            data = self.calculatePlot(fluid)
-            conf = {}
-            conf["fluid"] = index
-            conf["eq"] = self.config.getint("MEoS", "eq")
-            conf["visco"] = self.config.getint("MEoS", "visco")
-            conf["thermal"] = self.config.getint("MEoS", "thermal")
-            data["config"] = conf
-            grafico._saveData(data)
-            self.parent().progressBar.setVisible(False)
-        self.parent().statusbar.showMessage(
-            QtGui.QApplication.translate("pychemqt", "Plotting..."))
-        QtGui.QApplication.processEvents()
-        grafico.config=data["config"]
-
-        if z:
-            plot2D3D(grafico, data, self.parent().Preferences, x, y, z)
         else:
-            plot2D3D(grafico, data, self.parent().Preferences, x, y)
-
             if not xscale:
                 if x in ["P", "rho", "v"]:
                     xscale = "log"
@@ -448,239 +423,122 @@ class plugin(QtGui.QMenu):
         grafico.plot.ax._gridOn = grid
         grafico.plot.ax.grid(grid)
 
+        self.parent().statusbar.showMessage(QtGui.QApplication.translate(
+            "pychemqt", "Loading cached data..."))
+        QtGui.QApplication.processEvents()
+        data = grafico._getData([x, y, z])
         self.parent().centralwidget.currentWidget().addSubWindow(grafico)
         grafico.show()
-        self.parent().statusbar.clearMessage()
+        if data:
+            self.parent().statusbar.showMessage(
+                QtGui.QApplication.translate("pychemqt", "Plotting..."))
+            QtGui.QApplication.processEvents()
+            grafico.config=data["config"]
+            plot2D3D(grafico, data, self.parent().Preferences, x, y, z)
+            grafico.plot.draw()
+            self.parent().statusbar.clearMessage()
+        else:
+            self.calculatePlot(fluid, grafico)
+
+    def calculatePlot(self, fluid, grafico):
+        """Calculate data for plot in a pool of worker processes, each line
+        is a independent task, the lines are plotted as they are available
+        and the data are saved when all the lines are finished
+            fluid: class of meos fluid to calculate
+            grafico: PlotMEoS instance to plot the lines"""
+        option = {}
+        option["eq"] = self.config.getint("MEoS", "eq")
+        option["visco"] = self.config.getint("MEoS", "visco")
+        option["thermal"] = self.config.getint("MEoS", "thermal")
+        option["ref"] = getReference(self.config)
+        conf = option.copy()
+        conf["fluid"] = self.config.getint("MEoS", "fluid")
+        grafico.config = conf
+        data = {"config": conf}
+        for key in ("x", "T", "P", "v", "h", "s"):
+            data[key] = {}
 
-    def calculatePlot(self, fluid):
-        """Calculate data for plot
-            fluid: class of meos fluid to calculate"""
-        data = {}
-        points = get_points(self.parent().Preferences)
+        Preferences = self.parent().Preferences
+        points = get_points(Preferences)
+        tasks = []
 
-        # Calculate melting line
+        # Melting and sublimation lines
         if fluid._melting:
-            self.parent().statusbar.showMessage(QtGui.QApplication.translate(
-                "pychemqt", "Calculating melting line..."))
             T = linspace(fluid._melting["Tmin"], fluid._melting["Tmax"], points)
-            fluidos = []
-            for Ti in T:
-                P = fluid._Melting_Pressure(Ti)
-                fluido = calcPoint(fluid, self.config, T=Ti, P=P)
-                if fluido:
-                    fluidos.append(fluido)
-                self.parent().progressBar.setValue(5*len(fluidos)/len(T))
-                QtGui.QApplication.processEvents()
-            if fluidos:
-                data["melting"]={}
-                for x in prop_pickle:
-                    dat_propiedad=[]
-                    for fluido in fluidos:
-                        num = fluido.__getattribute__(x)
-                        if num is not None:
-                            dat_propiedad.append(num._data)
-                        else:
-                            dat_propiedad.append(None)
-                    data["melting"][x]=dat_propiedad
-
-        # Calculate sublimation line
+            tasks.append((fluid, option, "melting", None, "T", T))
         if fluid._sublimation:
-            self.parent().statusbar.showMessage(QtGui.QApplication.translate(
-                "pychemqt", "Calculating sublimation line..."))
-            T = linspace(fluid._sublimation["Tmin"], fluid._sublimation["Tmax"], points)
-            fluidos = []
-            for Ti in T:
-                P = fluid._Sublimation_Pressure(Ti)
-                fluido = calcPoint(fluid, self.config, T=Ti, P=P)
-                if fluido:
-                    fluidos.append(fluido)
-                self.parent().progressBar.setValue(5+5*len(fluidos)/len(T))
-                QtGui.QApplication.processEvents()
-            if fluidos:
-                data["sublimation"]={}
-                for x in prop_pickle:
-                    dat_propiedad=[]
-                    for fluido in fluidos:
-                        num = fluido.__getattribute__(x)
-                        if num is not None:
-                            dat_propiedad.append(num._data)
-                        else:
-                            dat_propiedad.append(None)
-                    data["sublimation"][x]=dat_propiedad
-
+            T = linspace(fluid._sublimation["Tmin"],
+                         fluid._sublimation["Tmax"], points)
+            tasks.append((fluid, option, "sublimation", None, "T", T))
 
+        # Liquid-Vapour saturation lines and isoquality lines
         T = list(concatenate([linspace(fluid.Tt, 0.9*fluid.Tc, points),
                               linspace(0.9*fluid.Tc, 0.99*fluid.Tc, points),
                               linspace(0.99*fluid.Tc, fluid.Tc, points)]))
         for i in range(2, 0, -1):
             del T[points*i]
-
-        # Calculate saturation
+        for fase in (0, 1):
+            tasks.append((fluid, option, "saturation_%i" % fase, None, "T", T))
+        for value in self.LineList("Isoquality", Preferences):
+            tasks.append((fluid, option, "x", value, "T", T))
+
+        # Isolines
+        eq = fluid.eq[option["eq"]]
+        T, P = getGrid(fluid, eq, points)
+        lines = (("T", "Isotherm", "P", P),
+                 ("P", "Isobar", "T", T),
+                 ("v", "Isochor", "T", T),
+                 ("h", "Isoenthalpic", "T", T),
+                 ("s", "Isoentropic", "T", T))
+        for key, name, var, values in lines:
+            for value in self.LineList(name, Preferences, fluid):
+                tasks.append((fluid, option, key, value, var, values))
+
+        thread = TaskPool(calcLine, tasks, parent=self)
+        cancel = QtGui.QPushButton(
+            QtGui.QApplication.translate("pychemqt", "Cancel"))
+        cancel.clicked.connect(thread.cancel)
+        self.parent().statusbar.addPermanentWidget(cancel)
+        self.parent().progressBar.setValue(0)
+        self.parent().progressBar.setVisible(True)
         self.parent().statusbar.showMessage(QtGui.QApplication.translate(
-            "pychemqt", "Calculating Liquid-Vapour saturation line..."))
-        if x == "P" and y == "T":
-            fases = [0]
+            "pychemqt", "Calculating data, be patient..."))
+
+        thread.taskFinished.connect(partial(self._lineCalculated, grafico, data))
+        thread.progress.connect(self._plotProgress)
+        thread.finished.connect(
+            partial(self._plotFinished, grafico, data, thread, cancel))
+        thread.start()
+
+    def _lineCalculated(self, grafico, data, result):
+        """Save and plot a line when it's calculated"""
+        key, value, line = result
+        if value is None:
+            data[key] = line
         else:
-            fases = [0, 1]
-        for fase in fases:
-            fluidos = []
-            for Ti in T:
-                fluidos.append(fluid(T=Ti, x=fase))
-                self.parent().progressBar.setValue(10+5*fase+5*len(fluidos)/len(T))
-                QtGui.QApplication.processEvents()
-
-            data["saturation_%i" %fase]={}
-            for x in prop_pickle:
-                dat_propiedad=[]
-                for fluido in fluidos:
-                    num = fluido.__getattribute__(x)
-                    if num is not None:
-                        dat_propiedad.append(num._data)
-                    else:
-                        dat_propiedad.append(None)
-                data["saturation_%i" %fase][x]=dat_propiedad
-
-        # Calculate isoquality lines
-        data["x"]={}
-        self.parent().statusbar.showMessage(QtGui.QApplication.translate(
-            "pychemqt", "Calculating isoquality lines..."))
-        values = self.LineList("Isoquality", self.parent().Preferences)
-        for i, value in enumerate(values):
-            fluidos = calcIsoline(fluid, self.config,
-                                  "T", "x", T, value, 20, i, 20,
-                                  len(values), self.parent().progressBar)
-
-            data["x"][value]={}
-            for x in prop_pickle:
-                dat_propiedad=[]
-                for fluido in fluidos:
-                    num = fluido.__getattribute__(x)
-                    if num is not None:
-                        dat_propiedad.append(num._data)
-                    else:
-                        dat_propiedad.append(None)
-                data["x"][value][x]=dat_propiedad
-
-        eq = fluid.eq[self.parent().currentConfig.getint("MEoS", "eq")]
-        T = list(concatenate([linspace(eq["Tmin"], 0.9*fluid.Tc, points),
-                              linspace(0.9*fluid.Tc, 0.99*fluid.Tc, points),
-                              linspace(0.99*fluid.Tc, fluid.Tc, points),
-                              linspace(fluid.Tc, 1.01*fluid.Tc, points),
-                              linspace(1.01*fluid.Tc, 1.1*fluid.Tc, points),
-                              linspace(1.1*fluid.Tc, eq["Tmax"], points)]))
-        Pmin = eq["Pmin"]*1000
-        Pmax = eq["Pmax"]*1000
-        P = list(concatenate([logspace(log10(Pmin), log10(0.9*fluid.Pc), points),
-                              linspace(0.9*fluid.Pc, 0.99*fluid.Pc, points),
-                              linspace(0.99*fluid.Pc, fluid.Pc, points),
-                              linspace(fluid.Pc, 1.01*fluid.Pc, points),
-                              linspace(1.01*fluid.Pc, 1.1*fluid.Pc, points),
-                              logspace(log10(1.1*fluid.Pc), log10(Pmax), points)]))
-        for i in range(5, 0, -1):
-            del T[points*i]
-            del P[points*i]
-
-        # Calculate isotherm lines
-        data["T"]={}
-        self.parent().statusbar.showMessage(QtGui.QApplication.translate(
-            "pychemqt", "Calculating isotherm lines..."))
-        values = self.LineList("Isotherm", self.parent().Preferences, fluid)
-        for i, value in enumerate(values):
-            fluidos = calcIsoline(fluid, self.config,
-                                  "P", "T", P, value, 40, i, 10,
-                                  len(values), self.parent().progressBar)
-            data["T"][value]={}
-            for x in prop_pickle:
-                dat_propiedad=[]
-                for fluido in fluidos:
-                    num = fluido.__getattribute__(x)
-                    if num is not None:
-                        dat_propiedad.append(num._data)
-                    else:
-                        dat_propiedad.append(None)
-                data["T"][value][x]=dat_propiedad
-
-        # Calculate isobar lines
-        data["P"]={}
-        self.parent().statusbar.showMessage(QtGui.QApplication.translate(
-            "pychemqt", "Calculating isobar lines..."))
-        values = self.LineList("Isobar", self.parent().Preferences, fluid)
-        for i, value in enumerate(values):
-            fluidos = calcIsoline(fluid, self.config,
-                                  "T", "P", T, value, 50, i, 10,
-                                  len(values), self.parent().progressBar)
-            data["P"][value]={}
-            for x in prop_pickle:
-                dat_propiedad=[]
-                for fluido in fluidos:
-                    num = fluido.__getattribute__(x)
-                    if num is not None:
-                        dat_propiedad.append(num._data)
-                    else:
-                        dat_propiedad.append(None)
-                data["P"][value][x]=dat_propiedad
-
-        # Calculate isochor lines
-        data["v"]={}
-        self.parent().statusbar.showMessage(QtGui.QApplication.translate(
-            "pychemqt", "Calculating isochor lines..."))
-        values = self.LineList("Isochor", self.parent().Preferences, fluid)
-        for i, value in enumerate(values):
-            fluidos = calcIsoline(fluid, self.config,
-                                  "T", "v", T, value, 60, i, 10,
-                                  len(values), self.parent().progressBar)
-            data["v"][value]={}
-            for x in prop_pickle:
-                dat_propiedad=[]
-                for fluido in fluidos:
-                    num = fluido.__getattribute__(x)
-                    if num is not None:
-                        dat_propiedad.append(num._data)
-                    else:
-                        dat_propiedad.append(None)
-                data["v"][value][x]=dat_propiedad
-
-        # Calculate isoenthalpic lines
-        data["h"]={}
-        self.parent().statusbar.showMessage(QtGui.QApplication.translate(
-            "pychemqt", "Calculating isoenthalpic lines..."))
-        values = self.LineList("Isoenthalpic", self.parent().Preferences, fluid)
-        for i, value in enumerate(values):
-            fluidos = calcIsoline(fluid, self.config,
-                                  "T", "h", T, value, 70, i, 10,
-                                  len(values), self.parent().progressBar)
-            data["h"][value]={}
-            for x in prop_pickle:
-                dat_propiedad=[]
-                for fluido in fluidos:
-                    num = fluido.__getattribute__(x)
-                    if num is not None:
-                        dat_propiedad.append(num._data)
-                    else:
-                        dat_propiedad.append(None)
-                data["h"][value][x]=dat_propiedad
-
-        # Calculate isoentropic lines
-        data["s"]={}
-        self.parent().statusbar.showMessage(QtGui.QApplication.translate(
-            "pychemqt", "Calculating isoentropic lines..."))
-        values = self.LineList("Isoentropic", self.parent().Preferences, fluid)
-        for i, value in enumerate(values):
-            fluidos = calcIsoline(fluid, self.config,
-                                  "T", "s", T, value, 80, i, 20,
-                                  len(values), self.parent().progressBar)
-            data["s"][value]={}
-            for x in prop_pickle:
-                dat_propiedad=[]
-                for fluido in fluidos:
-                    num = fluido.__getattribute__(x)
-                    if num is not None:
-                        dat_propiedad.append(num._data)
-                    else:
-                        dat_propiedad.append(None)
-                data["s"][num][x]=dat_propiedad
-
-        return data
+            data[key][value] = line
+        plotLine(grafico, self.parent().Preferences, key, value, line,
+                 grafico.x, grafico.y, grafico.z)
+        grafico.plot.draw()
+
+    def _plotProgress(self, done, total):
+        self.parent().progressBar.setValue(100*done/total)
+
+    def _plotFinished(self, grafico, data, thread, cancel):
+        """Save data when the plot calculation is finished, the data of a
+        cancelled or failed calculation aren't saved"""
+        self.parent().statusbar.removeWidget(cancel)
+        cancel.deleteLater()
+        self.parent().progressBar.setVisible(False)
+        if thread.cancelled:
+            self.parent().statusbar.showMessage(QtGui.QApplication.translate(
+                "pychemqt", "Plot calculation cancelled"))
+        elif thread.errors:
+            self.parent().statusbar.showMessage(QtGui.QApplication.translate(
+                "pychemqt", "Error calculating %i lines") % len(thread.errors))
+        else:
+            grafico._saveData(data)
+            self.parent().statusbar.clearMessage()
 
     @staticmethod
     def LineList(name, Preferences, fluid=None):
@@ -721,10 +579,10 @@ class Ui_ChooseFluid(QtGui.QDialog):
         layout = QtGui.QGridLayout(self)
 
         self.lista = QtGui.QListWidget()
-        for fluido in mEoS.__all__:
-            txt=fluido.name
-            if fluido.synonym:
-                txt+=" ("+fluido.synonym+")"
+        for id, name, formula, synonym, path in mEoS.fluids:
+            txt=name
+            if synonym:
+                txt+=" ("+synonym+")"
             self.lista.addItem(txt)
         self.lista.itemDoubleClicked.connect(self.accept)
         layout.addWidget(self.lista,1,1,3,1)
@@ -2831,26 +2689,40 @@ class PlotMEoS(QtGui.QWidget):
         self.parent.centralwidget.currentWidget().addSubWindow(tabla)
         tabla.show()
 
-    def _getData(self):
-        """Get data from file"""
-        filenameHard = os.environ["pychemqt"]+"dat"+os.sep+"mEoS"+ \
-                       os.sep+self.filename+".gz"
-        filenameSoft = config.conf_dir+self.filename
-        file = ""
-        if os.path.isfile(filenameSoft):
-            with open(filenameSoft) as archivo:
+    def _getData(self, props=None):
+        """Get data from file
+            props: list with the properties to load, used to plot only the
+                axes properties, by default all the properties are loaded as
+                lists to let edit the data"""
+        props = [prop for prop in props or [] if prop] or None
+        data = chartStore.load(self.filename, props)
+
+        # Charts saved in project files before the columnar store
+        legacy = config.conf_dir+self.filename
+        if data is None and self.filename.endswith(".pkl") and \
+                os.path.isfile(legacy):
+            with open(legacy, "rb") as archivo:
                 data = cPickle.load(archivo)
             return data
-        elif os.path.isfile(filenameHard):
-            with gzip.GzipFile(filenameHard, 'rb') as archivo:
-                data = cPickle.load(archivo)
-            self._saveData(data)
-            return data
+
+        if data is not None and props is None:
+            for kind, lines in data.iteritems():
+                if kind == "config":
+                    continue
+                if lines and isinstance(lines.keys()[0], str):
+                    lines = {None: lines}
+                for line in lines.itervalues():
+                    for prop in line:
+                        line[prop] = line[prop].tolist()
+        return data
 
     def _saveData(self, data):
         """Save changes in data to file"""
-        with open(config.conf_dir+self.filename, 'wb') as file:
-            cPickle.dump(data, file)
+        if self.filename.endswith(".pkl"):
+            with open(config.conf_dir+self.filename, 'wb') as file:
+                cPickle.dump(data, file)
+        else:
+            chartStore.save(self.filename, data)
 
     def click(self, event):
         """Update input and graph annotate when mouse click over chart"""
@@ -3008,11 +2880,9 @@ class PlotMEoS(QtGui.QWidget):
             zmax = stream.readFloat()
             grafico.plot.ax.set_zlim(zmin, zmax)
 
-        data = grafico._getData()
-        if z:
+        data = grafico._getData([x, y, z])
+        if data:
             plot2D3D(grafico, data, parent.Preferences, x, y, z)
-        else:
-            plot2D3D(grafico, data, parent.Preferences, x, y)
             
         if xscale:
             grafico.plot.ax.set_xscale(xscale)
@@ -3272,23 +3142,7 @@ class EditPlot(QtGui.QWidget):
             value=dialog.input[prop].value
 
             eq = fluid.eq[self.mainwindow.currentConfig.getint("MEoS", "eq")]
-            T = list(concatenate([linspace(eq["Tmin"], 0.9*fluid.Tc, points),
-                                  linspace(0.9*fluid.Tc, 0.99*fluid.Tc, points),
-                                  linspace(0.99*fluid.Tc, fluid.Tc, points),
-                                  linspace(fluid.Tc, 1.01*fluid.Tc, points),
-                                  linspace(1.01*fluid.Tc, 1.1*fluid.Tc, points),
-                                  linspace(1.1*fluid.Tc, eq["Tmax"], points)]))
-            Pmin = eq["Pmin"]*1000
-            Pmax = eq["Pmax"]*1000
-            P = list(concatenate([logspace(log10(Pmin), log10(0.9*fluid.Pc), points),
-                                  linspace(0.9*fluid.Pc, 0.99*fluid.Pc, points),
-                                  linspace(0.99*fluid.Pc, fluid.Pc, points),
-                                  linspace(fluid.Pc, 1.01*fluid.Pc, points),
-                                  linspace(1.01*fluid.Pc, 1.1*fluid.Pc, points),
-                                  logspace(log10(1.1*fluid.Pc), log10(Pmax), points)]))
-            for i in range(5, 0, -1):
-                del T[points*i]
-                del P[points*i]
+            T, P = getGrid(fluid, eq, points)
 
             if prop == 0:
                 # Calcualte isotherm line
@@ -3362,16 +3216,7 @@ class EditPlot(QtGui.QWidget):
                 name = "Isoquality"
                 unidad = unidades.Dimensionless
 
-            line = {value: {}}
-            for x in prop_pickle:
-                dat_propiedad=[]
-                for fluido in fluidos:
-                    num = fluido.__getattribute__(x)
-                    if num is not None:
-                        dat_propiedad.append(num._data)
-                    else:
-                        dat_propiedad.append(None)
-                line[value][x]=dat_propiedad
+            line = {value: _getLineData(fluidos)}
 
             format = getLineFormat(self.mainwindow.Preferences, name)
             transform = _getunitTransform((self.plotMEoS.x, self.plotMEoS.y))
@@ -3636,50 +3481,303 @@ class AxisWidget(QtGui.QGroupBox):
         lyt.addWidget(self.max,4,2)
 
 
-def calcIsoline(fluid, config, var, fix, valuevar, valuefix, ini, step, end, total, bar):
+# Isoline continuation parameters, max relative deviation between predicted
+# and calculated density before halve the step and max number of halving
+ISOLINE_TOLERANCE = 0.05
+ISOLINE_REFINE = 4
+
+
+def calcIsoline(fluid, config, var, fix, valuevar, valuefix, ini=0, step=0,
+                end=0, total=1, bar=None):
+    """Calculate a isoline with a predictor-corrector continuation, the
+    density and temperature of each point are extrapolated from the last two
+    points of the same phase and used as initial values of solver. When the
+    isoline cross the saturation line the saturation point is inserted, and
+    the step is halved where the prediction is poor, near the critical point.
+    In two phases region the points are calculated with the quality from the
+    saturation points, the solver can converge to a single phase root with
+    the same fixed property, a compressed liquid in isoenthalpic lines
+        fluid: class of meos fluid
+        config: ConfigParser instance or dict with the equations to use
+        var: key of the variable property in line
+        fix: key of the fixed property of line
+        valuevar: list with the values of variable property
+        valuefix: value of fixed property
+        ini, step, end, total, bar: progress bar parameters, optional
+
+    Isoenthalpic line of CO2 in the two phases region below the saturated
+    liquid at 260 K, without gaps and without the compressed liquid points
+    with the same enthalpy
+    >>> from lib.mEoS.CO2 import CO2
+    >>> option = {"eq": 0, "visco": 0, "thermal": 0, "ref": "OTO"}
+    >>> h = calcPoint(CO2, option, T=260., x=0.).h
+    >>> T = linspace(220, 400, 40)[:9]
+    >>> for p in calcIsoline(CO2, option, "T", "h", T, h):
+    ...     print "%0.2f %0.3f %0.3f" % (p.T, p.P.MPa, p.x)
+    220.00 0.599 0.240
+    224.62 0.724 0.218
+    229.23 0.867 0.196
+    233.85 1.030 0.172
+    238.46 1.216 0.146
+    243.08 1.424 0.119
+    247.69 1.658 0.090
+    252.31 1.919 0.059
+    256.92 2.209 0.025
+    """
     fluidos = []
-    fase = None
-    rhoo = 0
-    To = 0
-    for Ti in valuevar:
-        kwargs = {var: Ti, fix: valuefix, "rho0": rhoo, "T0": To}
-        fluido = calcPoint(fluid, config, **kwargs)
-        if fluido and fluido.status and (fluido.rho != rhoo or fluido.T != To):
-            if var not in ("T", "P") or fix not in ("T", "P"):
-                rhoo = fluido.rho
-                To = fluido.T
-
+    branch = []
+    sat = _isolineSaturation(fluid, config, var, fix, valuefix)
+    todo = [(value, 0, None) for value in reversed(valuevar)]
+    done = 0
+    while todo:
+        value, level, fluido = todo.pop()
+
+        # Phase boundary known in advance in isotherm and isobar lines
+        if sat and branch and \
+                (getattr(branch[-1], var)-sat[0])*(value-sat[0]) < 0:
+            if branch[-1].x == sat[1].x:
+                points = sat[1:]
+            else:
+                points = sat[:0:-1]
+            fluidos.extend(points)
+            branch = [points[-1]]
+
+        predicted = _isolinePredict(branch, var, value)
+        twophases = False
+        if fluido is None and branch and 0 < branch[-1].x < 1:
+            fluido = _isolineTwoPhase(fluid, config, var, fix, value, valuefix)
+            twophases = fluido is not None
+        if fluido is None:
+            kwargs = {var: value, fix: valuefix}
+            kwargs.update(predicted)
+            fluido = calcPoint(fluid, config, **kwargs)
+            if (fluido is None or not fluido.status) and predicted:
+                # Bad prediction, use the full solver
+                del kwargs["rho0"], kwargs["T0"]
+                fluido = calcPoint(fluid, config, **kwargs)
+
+        if fluido and fluido.status and fix != "x" and not twophases:
+            if fluidos and fluido.rho == fluidos[-1].rho and \
+                    fluido.T == fluidos[-1].T:
+                fluido = None
+            elif not sat and branch and _phase(branch[-1]) != _phase(fluido):
+                points = _isolineBoundary(fluid, config, var, fix, valuefix,
+                                          branch[-1], fluido)
+                fluidos.extend(points)
+                branch = points
+            elif len(branch) > 1 and abs(fluido.rho-predicted["rho0"]) > \
+                    ISOLINE_TOLERANCE*fluido.rho:
+                if level < ISOLINE_REFINE:
+                    middle = (getattr(branch[-1], var)+value)/2.
+                    todo.append((value, level+1, fluido))
+                    todo.append((middle, level+1, None))
+                    continue
+
+                # The prediction is still poor, the seeded solver can be
+                # converged to a root of other phase, accept the point only if
+                # the full solver get the same root or a root near the
+                # prediction, else the point is dropped
+                full = calcPoint(fluid, config, **{var: value, fix: valuefix})
+                if full and full.status and \
+                        abs(full.rho-predicted["rho0"]) <= \
+                        ISOLINE_TOLERANCE*full.rho:
+                    fluido = full
+                elif not full or not full.status or \
+                        abs(full.rho-fluido.rho) > 1e-6*fluido.rho:
+                    fluido = None
+                    if not level:
+                        done += 1
+                    continue
+
+        if fluido and fluido.status:
             fluidos.append(fluido)
-#            if var in ("T", "P") and fix in ("T", "P"):
-#                if fase is None:
-#                    fase = fluido.x
-#                if fase != fluido.x and fase <= 0:
-#                    if fluido.P < fluid.Pc and fluido.T < fluid.Tc:
-#                        fluido_x0 = calcPoint(fluid, config, **{fix: valuefix, "x": 0.})
-#                        fluidos.insert(-1, fluido_x0)
-#                elif fase != fluido.x and fase >= 1:
-#                    if fluido.P < fluid.Pc and fluido.T < fluid.Tc:
-#                        fluido_x1 = calcPoint(fluid, config, **{fix: valuefix, "x": 1.})
-#                        fluidos.insert(-1, fluido_x1)
-#                if fase != fluido.x and fluido.x >= 1:
-#                    if fluido.P < fluid.Pc and fluido.T < fluid.Tc:
-#                        fluido_x1 = calcPoint(fluid, config, **{fix: valuefix, "x": 1.})
-#                        fluidos.insert(-1, fluido_x1)
-##                        rhoo = fluido_x1.rho
-##                        To = fluido_x1.T
-#                elif fase != fluido.x and fluido.x <= 0:
-#                    if fluido.P < fluid.Pc and fluido.T < fluid.Tc:
-#                        fluido_x0 = calcPoint(fluid, config, **{fix: valuefix, "x": 0.})
-#                        fluidos.insert(-1, fluido_x0)
-##                        rhoo = fluido_x0.rho
-##                        To = fluido_x0.T
-#                fase = fluido.x
-
-        bar.setValue(ini+end*step/total+end/total*len(fluidos)/len(valuevar))
-        QtGui.QApplication.processEvents()
+            branch.append(fluido)
+        elif level and todo and todo[-1][2]:
+            # Failed refinement, accept the point without more halving
+            value, level, fluido = todo.pop()
+            todo.append((value, ISOLINE_REFINE, fluido))
+        else:
+            # Out of the isoline range, restart the continuation
+            branch = []
+
+        if not level:
+            done += 1
+        if bar is not None:
+            bar.setValue(ini+end*step/total+end/total*done/len(valuevar))
+            QtGui.QApplication.processEvents()
     return fluidos
 
 
+def _phase(fluido):
+    """Return the phase of point, 0 liquid, 1 vapor or 0.5 two phases"""
+    if fluido.x <= 0:
+        return 0
+    elif fluido.x >= 1:
+        return 1
+    else:
+        return 0.5
+
+
+def _isolinePredict(branch, var, value):
+    """Return the initial values of density and temperature for the point
+    with var=value of isoline, extrapolated from the last points"""
+    if not branch:
+        return {}
+    last = branch[-1]
+    rho, T = last.rho, last.T
+    if len(branch) > 1:
+        prev = branch[-2]
+        delta = getattr(last, var)-getattr(prev, var)
+        if delta:
+            f = (value-getattr(last, var))/delta
+            if rho+(last.rho-prev.rho)*f > 0:
+                rho += (last.rho-prev.rho)*f
+            if T+(last.T-prev.T)*f > 0:
+                T += (last.T-prev.T)*f
+    return {"rho0": float(rho), "T0": float(T)}
+
+
+def _isolineTwoPhase(fluid, config, var, fix, value, valuefix):
+    """Return the point of isoline in two phases region with var=value,
+    calculated with the quality from the saturation points, None if the
+    isoline point is not in two phases region"""
+    if var not in ("T", "P") or fix not in ("h", "s", "u", "v", "rho"):
+        return None
+    if var == "T" and not fluid.Tt <= value < fluid.Tc:
+        return None
+    if var == "P" and value >= fluid.Pc:
+        return None
+    try:
+        liquido = calcPoint(fluid, config, **{var: value, "x": 0.})
+        vapor = calcPoint(fluid, config, **{var: value, "x": 1.})
+    except (ValueError, ZeroDivisionError, OverflowError):
+        return None
+    if not liquido or not vapor:
+        return None
+
+    # The specific volume is the lineal property with quality, not density
+    if fix == "rho":
+        fl, fv, f = 1./liquido.rho, 1./vapor.rho, 1./valuefix
+    else:
+        fl, fv, f = getattr(liquido, fix), getattr(vapor, fix), valuefix
+    x = (f-fl)/(fv-fl)
+    if not 0 < x < 1:
+        return None
+    return calcPoint(fluid, config, **{var: value, "x": x})
+
+
+def _isolineSaturation(fluid, config, var, fix, valuefix):
+    """Return the saturation values of isotherm and isobar lines as a tuple
+    with the variable value, the liquid and the vapor saturation points,
+    None for other lines or if the line don't cross the saturation line"""
+    if var not in ("T", "P") or fix not in ("T", "P"):
+        return None
+    if fix == "T" and not fluid.Tt <= valuefix < fluid.Tc:
+        return None
+    if fix == "P" and valuefix >= fluid.Pc:
+        return None
+    liquido = calcPoint(fluid, config, **{fix: valuefix, "x": 0.})
+    vapor = calcPoint(fluid, config, **{fix: valuefix, "x": 1.})
+    if liquido and vapor:
+        return getattr(liquido, var), liquido, vapor
+
+
+def _isolineBoundary(fluid, config, var, fix, valuefix, prev, fluido):
+    """Return a list with the saturation point of isoline between two
+    consecutive points in different phases, solved with the saturation
+    condition of the single phase point"""
+    if prev.x <= 0 or fluido.x <= 0:
+        x = 0.
+    else:
+        x = 1.
+    if (0 < prev.x < 1) == (0 < fluido.x < 1):
+        return []
+
+    def f(value):
+        point = calcPoint(fluid, config, **{var: value, "x": x})
+        return getattr(point, fix)-valuefix
+
+    a = getattr(prev, var)
+    b = getattr(fluido, var)
+    try:
+        value = brentq(f, a, b, xtol=abs(b-a)*1e-6)
+    except (ValueError, AttributeError, RuntimeError):
+        return []
+    point = calcPoint(fluid, config, **{var: value, "x": x})
+    if point:
+        return [point]
+    return []
+
+
+def calcLine(fluid, option, key, value, var, values):
+    """Calculate a line of meos plot, used as task of process pool so it
+    can't use the gui
+        fluid: class of meos fluid
+        option: dict with the index of eq, visco and thermal equations and
+            the reference state
+        key: type of line, melting, sublimation, saturation_0, saturation_1
+            or the fixed property key of isoline
+        value: value of fixed property of isoline, None for the other lines
+        var: key of the variable property in line
+        values: list with the values of variable property
+    Return a tuple with key, value and the dict with line properties"""
+    if key == "melting":
+        fluidos = [calcPoint(fluid, option, T=T, P=fluid._Melting_Pressure(T))
+                   for T in values]
+    elif key == "sublimation":
+        fluidos = [calcPoint(fluid, option, T=T,
+                             P=fluid._Sublimation_Pressure(T))
+                   for T in values]
+    elif key.startswith("saturation"):
+        fase = int(key[-1])
+        fluidos = [fluid(T=T, x=fase, **option) for T in values]
+    else:
+        fluidos = calcIsoline(fluid, option, var, key, values, value)
+    return key, value, _getLineData([f for f in fluidos if f])
+
+
+def _getLineData(fluidos):
+    """Return a dict with the list of values of properties in prop_pickle of
+    the fluids in line"""
+    data = {}
+    for x in prop_pickle:
+        dat_propiedad=[]
+        for fluido in fluidos:
+            num = fluido.__getattribute__(x)
+            if num is not None:
+                dat_propiedad.append(num._data)
+            else:
+                dat_propiedad.append(None)
+        data[x]=dat_propiedad
+    return data
+
+
+def getGrid(fluid, eq, points):
+    """Return the temperature and pressure list used as variable of
+    isolines, with more points near the critical point
+        fluid: class of meos fluid
+        eq: dict with the equation used
+        points: number of points in each segment"""
+    T = list(concatenate([linspace(eq["Tmin"], 0.9*fluid.Tc, points),
+                          linspace(0.9*fluid.Tc, 0.99*fluid.Tc, points),
+                          linspace(0.99*fluid.Tc, fluid.Tc, points),
+                          linspace(fluid.Tc, 1.01*fluid.Tc, points),
+                          linspace(1.01*fluid.Tc, 1.1*fluid.Tc, points),
+                          linspace(1.1*fluid.Tc, eq["Tmax"], points)]))
+    Pmin = eq["Pmin"]*1000
+    Pmax = eq["Pmax"]*1000
+    P = list(concatenate([logspace(log10(Pmin), log10(0.9*fluid.Pc), points),
+                          linspace(0.9*fluid.Pc, 0.99*fluid.Pc, points),
+                          linspace(0.99*fluid.Pc, fluid.Pc, points),
+                          linspace(fluid.Pc, 1.01*fluid.Pc, points),
+                          linspace(1.01*fluid.Pc, 1.1*fluid.Pc, points),
+                          logspace(log10(1.1*fluid.Pc), log10(Pmax), points)]))
+    for i in range(5, 0, -1):
+        del T[points*i]
+        del P[points*i]
+    return T, P
+
+
 def get_points(Preferences):
     """Get point number to plot lines from Preferences"""
     definition = Preferences.getint("MEOS", "definition")
@@ -3778,80 +3876,80 @@ def plot2D3D(grafico, data, Preferences, x, y, z=None):
         x: Key for x axis
         y: Key for y axis
         z: Key for z axis Optional for 3D plot"""
+    for key in ("saturation_0", "saturation_1", "melting", "sublimation"):
+        if key in data:
+            plotLine(grafico, Preferences, key, None, data[key], x, y, z)
+    for key in ("x", "T", "P", "v", "rho", "h", "s"):
+        for value in sorted(data.get(key, {})):
+            plotLine(grafico, Preferences, key, value, data[key][value],
+                     x, y, z)
+
+
+def plotLine(grafico, Preferences, key, value, line, x, y, z=None):
+    """Plot a line of meos data if it's meaningful with the plot axes
+    Parameters:
+        grafico: plot
+        Preferences: ConfigParser instance from mainwindow preferencesChanged
+        key: type of line, saturation_0, saturation_1, melting, sublimation
+            or the fixed property key of isoline
+        value: value of fixed property of isoline, None for the other lines
+        line: dict with the properties list of line
+        x: Key for x axis
+        y: Key for y axis
+        z: Key for z axis Optional for 3D plot"""
+    if not len(line[x]):
+        return
 
     functionx = _getunitTransform(x)
     functiony = _getunitTransform(y)
     functionz = _getunitTransform(z)
     transform = (functionx, functiony, functionz)
 
-    # Plot saturation lines
-    format = getLineFormat(Preferences, "saturation")
-    if x == "P" and y == "T":
-        satLines = [(QtGui.QApplication.translate("pychemqt", "Saturation Line"), 0)]
-    else:
-        satLines = [(QtGui.QApplication.translate("pychemqt", "Liquid Saturation Line"), 0),
-                    (QtGui.QApplication.translate("pychemqt", "Vapor Saturation Line"), 1)]
-    for label, fase in satLines:
-        xsat = map(functionx, data["saturation_%i" %fase][x])
-        ysat = map(functiony, data["saturation_%i" %fase][y])
-        if z:
-            zsat = map(functionz, data["saturation_%i" %fase][z])
-            grafico.plot.ax.plot(xsat, ysat, zsat, label=label, **format)
-        else:
-            grafico.plot.ax.plot(xsat, ysat, label=label, **format)
-
-    # Plot melting and sublimation lines
-    if "melting" in data:
-        label = QtGui.QApplication.translate("pychemqt", "Melting Line")
-        xmel = map(functionx, data["melting"][x])
-        ymel = map(functiony, data["melting"][y])
-        if z:
-            zmel = map(functionz, data["melting"][z])
-            grafico.plot.ax.plot(xmel, ymel, zmel, label=label, **format)
+    # Plot saturation, melting and sublimation lines
+    if value is None:
+        if key == "saturation_0" and x == "P" and y == "T":
+            label = QtGui.QApplication.translate("pychemqt", "Saturation Line")
+        elif key == "saturation_1" and x == "P" and y == "T":
+            return
         else:
-            grafico.plot.ax.plot(xmel, ymel, label=label, **format)
-    if "sublimation" in data:
-        xsub = map(functionx, data["sublimation"][x])
-        ysub = map(functiony, data["sublimation"][y])
-        label = QtGui.QApplication.translate("pychemqt", "Sublimation Line")
+            label = {
+                "saturation_0": QtGui.QApplication.translate(
+                    "pychemqt", "Liquid Saturation Line"),
+                "saturation_1": QtGui.QApplication.translate(
+                    "pychemqt", "Vapor Saturation Line"),
+                "melting": QtGui.QApplication.translate(
+                    "pychemqt", "Melting Line"),
+                "sublimation": QtGui.QApplication.translate(
+                    "pychemqt", "Sublimation Line")}[key]
+        format = getLineFormat(Preferences, "saturation")
+        xi = map(functionx, line[x])
+        yi = map(functiony, line[y])
         if z:
-            zmel = map(functionz, data["melting"][z])
-            grafico.plot.ax.plot(xmel, ymel, zmel, label=label, **format)
+            zi = map(functionz, line[z])
+            grafico.plot.ax.plot(xi, yi, zi, label=label, **format)
         else:
-            grafico.plot.ax.plot(xsub, ysub, label=label, **format)
-
-    # Plot quality isolines
-    if x not in ["P", "T"] or y not in ["P", "T"] or z:
-        format = getLineFormat(Preferences, "Isoquality")
-        plotIsoline(data["x"], (x, y, z), "x", unidades.Dimensionless, grafico, transform, **format)
-
-    # Plot isotherm lines
-    if x != "T" and y != "T" or z:
-        format = getLineFormat(Preferences, "Isotherm")
-        plotIsoline(data["T"], (x, y, z), "T", unidades.Temperature, grafico, transform, **format)
-
-    # Plot isobar lines
-    if x != "P" and y != "P" or z:
-        format = getLineFormat(Preferences, "Isobar")
-        plotIsoline(data["P"], (x, y, z), "P", unidades.Pressure, grafico, transform, **format)
-
-    # Plot isochor lines
-    if x not in ["rho", "v"] and y not in ["rho", "v"] or z:
-        format = getLineFormat(Preferences, "Isochor")
-        plotIsoline(data["v"], (x, y, z), "v", unidades.SpecificVolume, grafico, transform, **format)
-        # Plot isodeensity lines
-        if "rho" in data:
-            plotIsoline(data["rho"], (x, y, z), "rho", unidades.Density, grafico, transform, **format)
-
-    # Plot isoenthalpic lines
-    if x != "h" and y != "h" or z:
-        format = getLineFormat(Preferences, "Isoenthalpic")
-        plotIsoline(data["h"], (x, y, z), "h", unidades.Enthalpy, grafico, transform, **format)
-
-    # Plot isoentropic lines
-    if x != "s" and y != "s" or z:
-        format = getLineFormat(Preferences, "Isoentropic")
-        plotIsoline(data["s"], (x, y, z), "s", unidades.SpecificHeat, grafico, transform, **format)
+            grafico.plot.ax.plot(xi, yi, label=label, **format)
+        return
+
+    # Isolines are plotted only if the fixed property isn't an axis
+    if key == "x":
+        visible = x not in ["P", "T"] or y not in ["P", "T"]
+    elif key in ["v", "rho"]:
+        visible = x not in ["rho", "v"] and y not in ["rho", "v"]
+    else:
+        visible = x != key and y != key
+    if visible or z:
+        name, unidad = {
+            "x": ("Isoquality", unidades.Dimensionless),
+            "T": ("Isotherm", unidades.Temperature),
+            "P": ("Isobar", unidades.Pressure),
+            "v": ("Isochor", unidades.SpecificVolume),
+            "rho": ("Isochor", unidades.Density),
+            "h": ("Isoenthalpic", unidades.Enthalpy),
+            "s": ("Isoentropic", unidades.SpecificHeat)}[key]
+        format = getLineFormat(Preferences, name)
+        plotIsoline({value: line}, (x, y, z), key, unidad, grafico, transform,
+                    **format)
 
 
 def _getunitTransform(eje):
@@ -3870,6 +3968,17 @@ def _getunitTransform(eje):
         return lambda val: val*factor if val is not None else nan
     
 
+def getReference(config):
+    """Return the code of reference state defined in config, the custom
+    reference state isn't supported in meos calculation so it use the
+    default"""
+    if config.has_option("MEoS", "reference"):
+        ref = config.get("MEoS", "reference")
+        if ref in ("OTO", "NBP", "IIR", "ASHRAE"):
+            return ref
+    return "OTO"
+
+
 def calcPoint(fluid, config, **kwargs):
     if isinstance(config, dict):
         option = config
@@ -3878,6 +3987,7 @@ def calcPoint(fluid, config, **kwargs):
         option["eq"] = config.getint("MEoS", "eq")
         option["visco"] = config.getint("MEoS", "visco")
         option["thermal"] = config.getint("MEoS", "thermal")
+        option["ref"] = getReference(config)
     kwargs.update(option)
     Tmin = fluid.eq[option["eq"]]["Tmin"]
     Tmax = fluid.eq[option["eq"]]["Tmax"]
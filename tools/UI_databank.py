@@ -13,6 +13,7 @@ os.environ["pychemqt"]="/home/jjgomera/pychemqt/"
 from PyQt4 import QtGui
 
 from lib import sql
+from lib.compuestos import clearComponentes
 from UI import viewComponents
 
 
@@ -134,7 +135,8 @@ class UI_databank_widget(QtGui.QWidget):
         indice = self.currentIndice
         if indice > 0:
             Dialog = viewComponents.View_Component(indice)
-            Dialog.exec_()
+            if Dialog.exec_():
+                clearComponentes([indice])
 
     @property
     def currentIndice(self):
@@ -149,11 +151,14 @@ class UI_databank_widget(QtGui.QWidget):
             self.rellenar()
 
     def copyComponent(self):
-        sql.copyElement(self.currentIndice)
+        indice = sql.copyElement(self.currentIndice)
+        clearComponentes([indice])
         self.rellenar()
 
     def deleteComponent(self):
-        sql.deleteElement(self.currentIndice)
+        indice = self.currentIndice
+        sql.deleteElement(indice)
+        clearComponentes([indice])
         self.rellenar()
 
 
@@ -3,9 +3,14 @@
 
 ###############################################################################
 # Module to show optional dependences availability
+#   - optional_modules: List of optional modules and the feature disabled if
+#       they are not available
+#   - findModule: Search a module without import it
+#   - ShowDependences: Dialog to show optional modules availability
 ###############################################################################
 
 import os
+import pkgutil
 
 from PyQt4 import QtGui
 
@@ -29,6 +34,22 @@ optional_modules = (
     )
 
 
+def findModule(module):
+    """Return the file of module if it's available or None if not found, the
+    module is searched in import path without import it, so checking the
+    optional modules at start don't load big libraries not used yet"""
+    try:
+        loader = pkgutil.find_loader(module)
+    except ImportError:
+        return None
+    if loader is None:
+        return None
+    try:
+        return loader.get_filename(module)
+    except (AttributeError, ImportError):
+        return str(loader)
+
+
 class ShowDependences(QtGui.QDialog):
     """Dialog to show optional dependences availability"""
     def __init__(self, parent=None):
@@ -46,8 +67,7 @@ class ShowDependences(QtGui.QDialog):
 
         for module, txt in optional_modules:
             if os.environ[module] == "True":
-                mod = __import__(module)
-                estado = mod.__file__
+                estado = findModule(module)
             else:
                 estado = QtGui.QApplication.translate("pychemqt", "not found")
             item = QtGui.QTreeWidgetItem([module, estado])
@@ -63,7 +63,7 @@ class ShowReference(QtGui.QDialog):
 
         # MEoS
         link = []
-        objects = [mEoS.MEoS]+mEoS.__all__
+        objects = [mEoS.MEoS]+list(mEoS.__all__)
 
         for objeto in objects:
             item = QtGui.QTreeWidgetItem([objeto.__name__, ""])